@@ -0,0 +1,89 @@
+"""
+Utilidades compartidas por los scripts de benchmark.
+Incluye medición de tiempo y memoria pico, generación de datos sintéticos
+y la impresión de tablas de resultados.
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Agregar el directorio raíz al path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def measure(fn, *args, **kwargs):
+    """
+    Ejecuta fn midiendo tiempo de pared y memoria pico asignada (tracemalloc).
+
+    Returns:
+        tuple: (resultado, segundos, memoria_pico_mb)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak / 1024 ** 2
+
+
+def make_synthetic_fraud(n_rows, n_features=16, fraud_rate=0.02, seed=42, dtype=np.float32):
+    """
+    Genera una matriz de features ya preprocesada y un target desbalanceado.
+    El target depende linealmente de algunas features para que el AUC sea informativo.
+
+    Returns:
+        tuple: (X, y)
+    """
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n_rows, n_features), dtype=np.float32).astype(dtype, copy=False)
+    weights = rng.standard_normal(n_features).astype(np.float32)
+    score = X @ weights + rng.standard_normal(n_rows, dtype=np.float32) * 2
+    threshold = np.quantile(score, 1 - fraud_rate)
+    y = (score > threshold).astype(np.int8)
+    return X, y
+
+
+def make_synthetic_transactions(n_rows, seed=42, n_merchants=8, n_locations=50):
+    """
+    Genera transacciones con el mismo esquema que financial_fraud_dataset.csv.
+
+    Returns:
+        pd.DataFrame: Transacciones sintéticas.
+    """
+    rng = np.random.default_rng(seed)
+    merchants = np.array([f'merchant_{i}' for i in range(n_merchants)])
+    locations = np.array([f'LOC{i}' for i in range(n_locations)])
+    devices = np.array(['mobile', 'desktop', 'tablet'])
+
+    return pd.DataFrame({
+        'transaction_id': [f'{i:032x}' for i in rng.integers(0, 2 ** 62, size=n_rows)],
+        'timestamp': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365 * 86400, size=n_rows), unit='s'),
+        'amount': np.round(rng.lognormal(4, 1.2, size=n_rows), 2),
+        'merchant_category': merchants[rng.integers(0, n_merchants, size=n_rows)],
+        'customer_id': [f'{i:032x}' for i in rng.integers(0, 2 ** 62, size=n_rows)],
+        'customer_age': rng.integers(18, 90, size=n_rows),
+        'customer_location': locations[rng.integers(0, n_locations, size=n_rows)],
+        'device_type': devices[rng.integers(0, 3, size=n_rows)],
+        'previous_transactions': rng.integers(0, 50, size=n_rows),
+        'is_fraud': (rng.random(n_rows) < 0.02).astype(int)
+    })
+
+
+def print_table(rows, title=None):
+    """
+    Imprime una lista de diccionarios como tabla.
+    """
+    if title:
+        print("\n" + "="*70)
+        print(title)
+        print("="*70)
+    print(pd.DataFrame(rows).to_string(index=False, float_format=lambda v: f"{v:,.4f}"))
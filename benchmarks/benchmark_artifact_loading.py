@@ -0,0 +1,84 @@
+"""
+Benchmark de tamaño y tiempo de carga de los artefactos del modelo.
+Compara joblib (con y sin compresión) con el formato compacto (mmap y comprimido)
+para RandomForest de distinto tamaño, además del tiempo de leer solo la cabecera.
+
+Uso:
+    python benchmarks/benchmark_artifact_loading.py --trees 100 300 --repeats 5
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import joblib
+from sklearn.ensemble import RandomForestClassifier
+
+from bench_utils import make_synthetic_fraud, print_table
+from mlops_pipeline.src.artifacts import save_artifact, load_artifact, read_artifact_metadata
+
+
+FORMATS = {
+    'joblib': lambda obj, path: joblib.dump(obj, path),
+    'joblib_zlib3': lambda obj, path: joblib.dump(obj, path, compress=('zlib', 3)),
+    'compact_mmap': lambda obj, path: save_artifact(obj, path, artifact_format='compact', compression='none'),
+    'compact_zlib3': lambda obj, path: save_artifact(obj, path, artifact_format='compact',
+                                                     compression='zlib', level=3),
+    'compact_lzma6': lambda obj, path: save_artifact(obj, path, artifact_format='compact',
+                                                     compression='lzma', level=6),
+}
+
+
+def median_time(fn, repeats):
+    """Mediana del tiempo de ejecución de fn en segundos."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de carga de artefactos")
+    parser.add_argument('--trees', type=int, nargs='+', default=[100, 300])
+    parser.add_argument('--max-depth', type=int, default=None)
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    X, y = make_synthetic_fraud(args.rows, fraud_rate=0.1)
+    rows = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_trees in args.trees:
+            model = RandomForestClassifier(n_estimators=n_trees, max_depth=args.max_depth,
+                                           n_jobs=-1, random_state=42).fit(X, y)
+            print(f"\n🌲 RandomForest con {n_trees} árboles entrenado")
+
+            for name, save in FORMATS.items():
+                path = os.path.join(tmp, f'model_{n_trees}_{name}.bin')
+                start = time.perf_counter()
+                save(model, path)
+                save_s = time.perf_counter() - start
+
+                if name.startswith('joblib'):
+                    load = lambda: joblib.load(path)
+                    header_s = None
+                else:
+                    load = lambda: load_artifact(path, verify=False)
+                    header_s = median_time(lambda: read_artifact_metadata(path), args.repeats)
+
+                rows.append({
+                    'trees': n_trees,
+                    'format': name,
+                    'size_mb': os.path.getsize(path) / 1024 ** 2,
+                    'save_s': save_s,
+                    'load_s': median_time(load, args.repeats),
+                    'header_ms': header_s * 1000 if header_s is not None else float('nan')
+                })
+                print(f"  ✓ {name}")
+
+    print_table(rows, title="RESULTADOS - TAMAÑO Y CARGA DE ARTEFACTOS")
@@ -0,0 +1,89 @@
+"""
+Benchmark de la lectura de archivos de transacciones comprimidos.
+Compara el throughput de DataLoader sobre el CSV sin comprimir con la lectura de
+gzip y zstd: descompresión de pandas (compression='infer', en el mismo hilo) frente a
+la descompresión en streaming de DataLoader, con y sin hilo de descompresión.
+zstd se omite si el paquete 'zstandard' no está instalado.
+
+Uso:
+    python benchmarks/benchmark_compressed_loading.py --rows 1000000
+"""
+
+import argparse
+import gzip
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+from bench_utils import measure, make_synthetic_transactions, print_table
+from mlops_pipeline.src import config
+from mlops_pipeline.src.cargar_datos import DataLoader, zstandard
+
+
+def loader_read(path, threaded):
+    config.DECOMPRESS_THREADED = threaded
+    loader = DataLoader(use_cache=False)
+    loader.data_path = path
+    return loader.load_data()
+
+
+def pandas_read(path):
+    """Lectura de referencia: pandas descomprime según la extensión."""
+    loader = DataLoader(use_cache=False)
+    return pd.read_csv(path, engine=loader.engine, **loader.read_csv_kwargs(path))
+
+
+def compress(csv_path, compression):
+    target = f"{csv_path}.{'gz' if compression == 'gzip' else 'zst'}"
+    with open(csv_path, 'rb') as src:
+        if compression == 'gzip':
+            with gzip.open(target, 'wb', compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 8 << 20)
+        else:
+            with open(target, 'wb') as dst:
+                zstandard.ZstdCompressor(level=3).copy_stream(src, dst)
+    return target
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de lectura de archivos comprimidos")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'transactions.csv')
+        make_synthetic_transactions(args.rows).to_csv(csv_path, index=False)
+        raw_mb = os.path.getsize(csv_path) / 1024 ** 2
+
+        variants = [('sin comprimir', csv_path, lambda p: loader_read(p, True))]
+        for compression in ['gzip', 'zstd']:
+            if compression == 'zstd' and zstandard is None:
+                print("⚠️  'zstandard' no está instalado: se omite zstd")
+                continue
+            path = compress(csv_path, compression)
+            variants += [
+                (f'{compression} (pandas)', path, pandas_read),
+                (f'{compression} (streaming)', path, lambda p: loader_read(p, False)),
+                (f'{compression} (streaming + hilo)', path, lambda p: loader_read(p, True))
+            ]
+
+        rows = []
+        for name, path, fn in variants:
+            seconds = []
+            for _ in range(args.repeats):
+                df, elapsed, peak = measure(fn, path)
+                seconds.append(elapsed)
+            rows.append({
+                'variant': name,
+                'file_mb': os.path.getsize(path) / 1024 ** 2,
+                'load_s': min(seconds),
+                'raw_mb_per_s': raw_mb / min(seconds),
+                'peak_mb': peak,
+                'rows': len(df)
+            })
+            print(f"  ✓ {name}")
+
+    print_table(rows, title="RESULTADOS - LECTURA DE ARCHIVOS COMPRIMIDOS")
@@ -0,0 +1,86 @@
+"""
+Benchmark de la carga del CSV de transacciones.
+Compara la lectura sin tipos (todas las columnas inferidas y luego descartadas) con
+la lectura tipada y con poda de columnas de DataLoader, con los motores "c" y
+"pyarrow", y con la caché columnar mapeada en memoria (ya creada), y reporta tiempo
+de carga, memoria pico y memoria del DataFrame.
+
+La memoria pico se mide con tracemalloc, que no ve el pool de memoria de Arrow:
+para pyarrow se informa además el pico de ese pool.
+
+Uso:
+    python benchmarks/benchmark_csv_loading.py --rows 2000000
+"""
+
+import argparse
+import os
+import tempfile
+
+import pandas as pd
+
+from bench_utils import measure, make_synthetic_transactions, print_table
+from mlops_pipeline.src import config
+from mlops_pipeline.src.cargar_datos import DataLoader
+from mlops_pipeline.src.columnar_cache import ColumnarCache
+
+
+def untyped_load(path):
+    """Carga original: tipos inferidos y columnas irrelevantes descartadas tras parsear."""
+    return pd.read_csv(path).drop(columns=config.IRRELEVANT_COLS, errors='ignore')
+
+
+def typed_load(path, engine, cache_dir=None):
+    loader = DataLoader(engine=engine, use_cache=cache_dir is not None)
+    loader.data_path = path
+    loader.cache = ColumnarCache(cache_dir)
+    return loader.load_data()
+
+
+def arrow_peak_mb():
+    try:
+        import pyarrow as pa
+        return pa.default_memory_pool().max_memory() / 1024 ** 2
+    except ImportError:
+        return float('nan')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de carga del CSV")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'transactions.csv')
+        make_synthetic_transactions(args.rows).to_csv(csv_path, index=False)
+        cache_dir = os.path.join(tmp, 'cache')
+        print(f"📄 CSV de {os.path.getsize(csv_path) / 1024 ** 2:,.1f} MB y {args.rows:,} filas")
+        typed_load(csv_path, 'auto', cache_dir)  # Conversión única a la caché columnar
+
+        variants = [
+            ('sin tipos (c)', untyped_load),
+            ('tipado (c)', lambda p: typed_load(p, 'c')),
+            ('tipado (pyarrow)', lambda p: typed_load(p, 'pyarrow')),
+            ('caché columnar (mmap)', lambda p: typed_load(p, 'auto', cache_dir))
+        ]
+        rows = []
+        for name, fn in variants:
+            seconds = []
+            for _ in range(args.repeats):
+                df, elapsed, peak = measure(fn, csv_path)
+                seconds.append(elapsed)
+            rows.append({
+                'variant': name,
+                'parse_s': min(seconds),
+                'rows_per_s': args.rows / min(seconds),
+                'peak_mb': peak,
+                'arrow_peak_mb': arrow_peak_mb() if 'pyarrow' in name else 0.0,
+                'frame_mb': df.memory_usage(deep=True).sum() / 1024 ** 2
+            })
+            print(f"  ✓ {name}")
+
+    print_table(rows, title="RESULTADOS - CARGA DEL CSV")
+    baseline = rows[0]
+    for row in rows[1:]:
+        print(f"\n⚡ {row['variant']}: {baseline['parse_s'] / row['parse_s']:.2f}x más rápido, "
+              f"DataFrame {baseline['frame_mb'] / row['frame_mb']:.1f}x más pequeño")
@@ -0,0 +1,76 @@
+"""
+Benchmark del motor de evaluación frente a las métricas de sklearn.
+Compara el cálculo de métricas + curva ROC con llamadas independientes de sklearn
+y el bootstrap de Poisson vectorizado con un bootstrap clásico por remuestreo.
+
+Uso:
+    python benchmarks/benchmark_evaluation.py --rows 100000 1000000 --bootstrap 200
+"""
+
+import argparse
+
+import numpy as np
+from sklearn.metrics import (
+    accuracy_score, precision_score, recall_score, f1_score,
+    roc_auc_score, average_precision_score, roc_curve
+)
+
+from bench_utils import measure, print_table
+from mlops_pipeline.src.evaluation import evaluate_scores
+
+
+def sklearn_metrics(y, scores, threshold=0.5):
+    """Métricas calculadas una a una como en la versión anterior del pipeline."""
+    y_pred = (scores >= threshold).astype(int)
+    roc_curve(y, scores)
+    return {
+        'accuracy': accuracy_score(y, y_pred),
+        'precision': precision_score(y, y_pred, zero_division=0),
+        'recall': recall_score(y, y_pred),
+        'f1_score': f1_score(y, y_pred),
+        'roc_auc': roc_auc_score(y, scores),
+        'average_precision': average_precision_score(y, scores)
+    }
+
+
+def resampling_bootstrap(y, scores, n_bootstrap, seed=42):
+    """Bootstrap clásico: remuestrea índices y recalcula el AUC en cada réplica."""
+    rng = np.random.default_rng(seed)
+    aucs = [roc_auc_score(y[idx], scores[idx])
+            for idx in (rng.integers(0, len(y), len(y)) for _ in range(n_bootstrap))]
+    return np.quantile(aucs, [0.025, 0.975])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark del motor de evaluación")
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--bootstrap', type=int, default=200)
+    parser.add_argument('--resampling-bootstrap', type=int, default=20,
+                        help="Réplicas del bootstrap clásico (se extrapola al total)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    rows = []
+    for n_rows in args.rows:
+        scores = rng.random(n_rows)
+        y = (rng.random(n_rows) < 0.02 + 0.1 * scores).astype(int)
+
+        reference, sklearn_s, _ = measure(sklearn_metrics, y, scores)
+        engine, engine_s, _ = measure(evaluate_scores, y, scores, n_bootstrap=0)
+        result, bootstrap_s, peak_mb = measure(evaluate_scores, y, scores, n_bootstrap=args.bootstrap)
+        _, resampling_s, _ = measure(resampling_bootstrap, y, scores, args.resampling_bootstrap)
+
+        rows.append({
+            'rows': n_rows,
+            'sklearn_s': sklearn_s,
+            'engine_s': engine_s,
+            'max_abs_diff': max(abs(reference[k] - engine[k]) for k in reference),
+            f'engine_boot{args.bootstrap}_s': bootstrap_s,
+            'engine_boot_peak_mb': peak_mb,
+            f'resampling_boot{args.bootstrap}_s': resampling_s * args.bootstrap / args.resampling_bootstrap,
+            'auc_ci_low': result['ci']['roc_auc'][0],
+            'auc_ci_high': result['ci']['roc_auc'][1]
+        })
+        print(f"  ✓ {n_rows:,} filas")
+
+    print_table(rows, title="RESULTADOS - MOTOR DE EVALUACIÓN")
@@ -0,0 +1,114 @@
+"""
+Benchmark de la ruta numérica float32 frente a float64.
+Recorre CSV → DataLoader → FeatureEngineer → estrategia de desbalanceo → modelos
+con ambas precisiones, mide la memoria de cada etapa y verifica que las métricas
+y probabilidades difieran menos que la tolerancia indicada.
+
+Uso:
+    python benchmarks/benchmark_float32.py --rows 500000
+"""
+
+import argparse
+import os
+import tempfile
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+
+from bench_utils import measure, make_synthetic_transactions, print_table
+from mlops_pipeline.src import config
+from mlops_pipeline.src.cargar_datos import DataLoader
+from mlops_pipeline.src.ft_engineering import FeatureEngineer
+from mlops_pipeline.src.model_training_evaluation import ModelTrainer
+
+
+def run_path(csv_path, use_float32):
+    """
+    Ejecuta la ruta completa con la precisión indicada sin tocar los artefactos del proyecto.
+
+    Returns:
+        tuple: (métricas de memoria/tiempo, probabilidades por modelo, AUC por modelo)
+    """
+    loader = DataLoader(use_float32=use_float32)
+    loader.data_path = csv_path
+    df, load_s, load_peak = measure(loader.load_data)
+
+    engineer = FeatureEngineer(use_float32=use_float32)
+    df = engineer.create_features(df)
+    X = df.drop(config.TARGET_VARIABLE, axis=1)
+    y = df[config.TARGET_VARIABLE]
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=config.TEST_SIZE, random_state=config.RANDOM_STATE, stratify=y
+    )
+
+    preprocessor = engineer._create_preprocessor(X_train)
+    X_train_p, prep_s, prep_peak = measure(preprocessor.fit_transform, X_train)
+    X_test_p = preprocessor.transform(X_test)
+
+    trainer = ModelTrainer(cv_folds=1)
+    (X_res, y_res), res_s, res_peak = measure(trainer.imbalance_strategy, X_train_p, y_train)
+
+    probabilities, aucs, fit_seconds = {}, {}, 0.0
+    for name, model in trainer.build_models(y_train).items():
+        model = clone(model)
+        _, seconds, _ = measure(model.fit, X_res, y_res)
+        fit_seconds += seconds
+        probabilities[name] = model.predict_proba(X_test_p)[:, 1]
+        aucs[name] = roc_auc_score(y_test, probabilities[name])
+
+    stats = {
+        'dtype': 'float32' if use_float32 else 'float64',
+        'frame_mb': df.memory_usage(deep=False).sum() / 1024 ** 2,
+        'matrix_dtype': str(X_train_p.dtype),
+        'matrix_mb': X_train_p.nbytes / 1024 ** 2,
+        'resampled_mb': X_res.nbytes / 1024 ** 2,
+        'load_peak_mb': load_peak,
+        'preprocess_peak_mb': prep_peak,
+        'resample_peak_mb': res_peak,
+        'load_s': load_s,
+        'preprocess_s': prep_s,
+        'resample_s': res_s,
+        'fit_s': fit_seconds
+    }
+    return stats, probabilities, aucs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark float32 vs float64")
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--prob-tolerance', type=float, default=1e-3,
+                        help="Máxima diferencia absoluta media de probabilidades")
+    parser.add_argument('--auc-tolerance', type=float, default=1e-3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'transactions.csv')
+        make_synthetic_transactions(args.rows).to_csv(csv_path, index=False)
+
+        stats64, probs64, auc64 = run_path(csv_path, use_float32=False)
+        stats32, probs32, auc32 = run_path(csv_path, use_float32=True)
+
+    print_table([stats64, stats32], title="MEMORIA Y TIEMPO POR ETAPA")
+
+    rows, all_ok = [], True
+    for name in probs64:
+        prob_diff = np.abs(probs64[name] - probs32[name].astype(np.float64))
+        auc_diff = abs(auc64[name] - auc32[name])
+        ok = prob_diff.mean() <= args.prob_tolerance and auc_diff <= args.auc_tolerance
+        all_ok &= ok
+        rows.append({
+            'model': name,
+            'auc_float64': auc64[name],
+            'auc_float32': auc32[name],
+            'auc_diff': auc_diff,
+            'prob_mean_diff': prob_diff.mean(),
+            'prob_max_diff': prob_diff.max(),
+            'within_tolerance': ok
+        })
+    print_table(rows, title="DIFERENCIAS DE MÉTRICAS Y PROBABILIDADES")
+
+    savings = 1 - stats32['resampled_mb'] / stats64['resampled_mb']
+    print(f"\n💾 Ahorro de memoria en la matriz remuestreada: {savings:.1%}")
+    print("✅ Dentro de tolerancia" if all_ok else "⚠️ Diferencias fuera de tolerancia")
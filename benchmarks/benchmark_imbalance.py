@@ -0,0 +1,71 @@
+"""
+Benchmark de las estrategias de desbalanceo de ModelTrainer.
+Compara tiempo de pared, memoria pico y ROC-AUC (LogisticRegression sobre un
+holdout) para cada estrategia y tamaño de train.
+
+Uso:
+    python benchmarks/benchmark_imbalance.py
+    python benchmarks/benchmark_imbalance.py --sizes 10000 1000000 --strategies undersample scalable_smote
+"""
+
+import argparse
+
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+
+from bench_utils import measure, make_synthetic_fraud, print_table
+from mlops_pipeline.src.imbalance import IMBALANCE_STRATEGIES, get_imbalance_strategy
+
+
+# SMOTE exacto de imblearn no es viable a partir de este tamaño en una sola máquina
+EXACT_SMOTE_MAX_ROWS = 1_000_000
+
+
+def run_benchmark(sizes, strategies, holdout_rows=200_000):
+    """
+    Ejecuta el benchmark y devuelve una fila de resultados por (tamaño, estrategia).
+    """
+    rows = []
+
+    for n_rows in sizes:
+        # Train y holdout salen de la misma distribución (misma semilla de pesos)
+        X_all, y_all = make_synthetic_fraud(n_rows + holdout_rows)
+        X, y = X_all[:n_rows], y_all[:n_rows]
+        X_test, y_test = X_all[n_rows:], y_all[n_rows:]
+        print(f"\n📦 Train sintético: {X.shape} ({X.nbytes / 1024 ** 2:,.1f} MB, fraude={y.mean():.2%})")
+
+        for name in strategies:
+            if name == 'smote' and n_rows > EXACT_SMOTE_MAX_ROWS:
+                print(f"  ⏭️  {name}: omitido (> {EXACT_SMOTE_MAX_ROWS:,} filas)")
+                continue
+
+            strategy = get_imbalance_strategy(name)
+            (X_res, y_res), seconds, peak_mb = measure(strategy, X, y)
+
+            model = LogisticRegression(max_iter=200, class_weight='balanced' if strategy.reweights else None)
+            model.fit(X_res, y_res)
+            auc = roc_auc_score(y_test, model.predict_proba(X_test)[:, 1])
+
+            rows.append({
+                'rows': n_rows,
+                'strategy': name,
+                'resampled_rows': X_res.shape[0],
+                'seconds': seconds,
+                'peak_mb': peak_mb,
+                'roc_auc': auc
+            })
+            print(f"  ✓ {name:<15} {seconds:8.2f}s  {peak_mb:10,.1f} MB  AUC={auc:.4f}")
+            del X_res, y_res
+
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de estrategias de desbalanceo")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument('--strategies', nargs='+', default=list(IMBALANCE_STRATEGIES),
+                        choices=list(IMBALANCE_STRATEGIES))
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sizes, args.strategies)
+    print_table(results, title="RESULTADOS - ESTRATEGIAS DE DESBALANCEO")
@@ -0,0 +1,62 @@
+"""
+Benchmark del entrenamiento por shards frente al entrenamiento en un solo proceso.
+Para LogisticRegression y RandomForest compara el tiempo de entrenamiento, el
+speedup y el ROC-AUC en un holdout al variar el número de shards.
+
+Uso:
+    python benchmarks/benchmark_sharded_training.py --rows 1000000 --shards 2 4 8
+"""
+
+import argparse
+import os
+import time
+
+from sklearn.base import clone
+from sklearn.model_selection import train_test_split
+
+from bench_utils import make_synthetic_fraud, print_table
+from mlops_pipeline.src.evaluation import evaluate_scores
+from mlops_pipeline.src.model_training_evaluation import ModelTrainer
+from mlops_pipeline.src.sharded_training import ShardedTrainer, LocalProcessBackend
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de entrenamiento por shards")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--features', type=int, default=16)
+    parser.add_argument('--shards', type=int, nargs='+', default=[2, 4, 8])
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    args = parser.parse_args()
+
+    print(f"🖥️  CPUs disponibles: {os.cpu_count()}")
+    X, y = make_synthetic_fraud(args.rows, n_features=args.features, fraud_rate=0.05)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+    # Los modelos y sus hiperparámetros son los del pipeline (class_weight sin remuestreo)
+    models = ModelTrainer(cv_folds=1, imbalance_strategy='class_weight').build_models(y_train)
+    rows = []
+
+    for model_name in ('LogisticRegression', 'RandomForest'):
+        model = clone(models[model_name])
+        if 'n_jobs' in model.get_params():
+            model.set_params(n_jobs=1)  # Un proceso de referencia, sin paralelismo interno
+
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        baseline_s = time.perf_counter() - start
+        baseline_auc = evaluate_scores(y_test, model.predict_proba(X_test)[:, 1], n_bootstrap=0)['roc_auc']
+        rows.append({'model': model_name, 'shards': 1, 'fit_s': baseline_s, 'speedup': 1.0,
+                     'roc_auc': baseline_auc, 'auc_diff': 0.0})
+        print(f"  ✓ {model_name}: un proceso")
+
+        for n_shards in args.shards:
+            trainer = ShardedTrainer(n_shards=n_shards, backend=LocalProcessBackend(args.n_jobs))
+            start = time.perf_counter()
+            merged = trainer.fit(model, X_train, y_train)
+            fit_s = time.perf_counter() - start
+            auc = evaluate_scores(y_test, merged.predict_proba(X_test)[:, 1], n_bootstrap=0)['roc_auc']
+            rows.append({'model': model_name, 'shards': n_shards, 'fit_s': fit_s,
+                         'speedup': baseline_s / fit_s, 'roc_auc': auc, 'auc_diff': auc - baseline_auc})
+            print(f"  ✓ {model_name}: {n_shards} shards")
+
+    print_table(rows, title="RESULTADOS - ENTRENAMIENTO POR SHARDS")
@@ -0,0 +1,94 @@
+"""
+Benchmark de la codificación categórica densa frente a la dispersa.
+Usa vocabularios grandes de comercios y ubicaciones y compara memoria de la
+matriz transformada, throughput de transformación, tiempo de entrenamiento de
+LogisticRegression y XGBoost y su ROC-AUC.
+
+Uso:
+    python benchmarks/benchmark_sparse_encoding.py --rows 200000 --merchants 3000 --locations 5000
+"""
+
+import argparse
+import time
+
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+
+from bench_utils import measure, make_synthetic_transactions, print_table
+from mlops_pipeline.src import config
+from mlops_pipeline.src.ft_engineering import FeatureEngineer
+from mlops_pipeline.src.model_training_evaluation import ModelTrainer
+
+
+VARIANTS = {
+    'dense_onehot': dict(sparse_output=False, categorical_encoding='onehot', max_categories=None),
+    'sparse_onehot': dict(sparse_output=True, categorical_encoding='onehot', max_categories=None),
+    'sparse_onehot_capped': dict(sparse_output=True, categorical_encoding='onehot', max_categories=100),
+    'sparse_hashing': dict(sparse_output=True, categorical_encoding='hashing', max_categories=None),
+}
+
+
+def matrix_mb(X):
+    """Memoria ocupada por una matriz densa o dispersa."""
+    if sparse.issparse(X):
+        return (X.data.nbytes + X.indices.nbytes + X.indptr.nbytes) / 1024 ** 2
+    return X.nbytes / 1024 ** 2
+
+
+def run_variant(name, params, X_train, X_test, y_train, y_test):
+    """Ajusta el preprocesador de la variante y entrena los modelos que aceptan CSR."""
+    config.CATEGORY_MAX_CATEGORIES = params['max_categories']
+    engineer = FeatureEngineer(sparse_output=params['sparse_output'],
+                               categorical_encoding=params['categorical_encoding'])
+    preprocessor = engineer._create_preprocessor(X_train)
+
+    X_train_p, fit_s, peak_mb = measure(preprocessor.fit_transform, X_train)
+    start = time.perf_counter()
+    X_test_p = preprocessor.transform(X_test)
+    rows_per_s = X_test.shape[0] / (time.perf_counter() - start)
+
+    row = {
+        'variant': name,
+        'columns': X_train_p.shape[1],
+        'matrix_mb': matrix_mb(X_train_p),
+        'preprocess_peak_mb': peak_mb,
+        'preprocess_s': fit_s,
+        'transform_rows_s': rows_per_s
+    }
+
+    models = ModelTrainer(cv_folds=1, imbalance_strategy='class_weight').build_models(y_train)
+    for model_name in ('LogisticRegression', 'XGBoost'):
+        model = clone(models[model_name])
+        _, seconds, _ = measure(model.fit, X_train_p, y_train)
+        row[f'{model_name}_fit_s'] = seconds
+        row[f'{model_name}_auc'] = roc_auc_score(y_test, model.predict_proba(X_test_p)[:, 1])
+
+    return row
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark codificación densa vs dispersa")
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--merchants', type=int, default=3_000)
+    parser.add_argument('--locations', type=int, default=5_000)
+    parser.add_argument('--variants', nargs='+', default=list(VARIANTS), choices=list(VARIANTS))
+    args = parser.parse_args()
+
+    df = make_synthetic_transactions(args.rows, n_merchants=args.merchants, n_locations=args.locations)
+    df = df.drop(columns=config.IRRELEVANT_COLS)
+    X = df.drop(config.TARGET_VARIABLE, axis=1)
+    y = df[config.TARGET_VARIABLE]
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=config.TEST_SIZE, random_state=config.RANDOM_STATE, stratify=y
+    )
+
+    original_max_categories = config.CATEGORY_MAX_CATEGORIES
+    try:
+        results = [run_variant(name, VARIANTS[name], X_train, X_test, y_train, y_test)
+                   for name in args.variants]
+    finally:
+        config.CATEGORY_MAX_CATEGORIES = original_max_categories
+
+    print_table(results, title="RESULTADOS - CODIFICACIÓN DENSA VS DISPERSA")
@@ -0,0 +1,96 @@
+"""
+Benchmark de la validación de datos.
+Compara la validación original (un recorrido completo por cada tipo de chequeo:
+esquema, tipos, nulos con df.isnull() y cada regla de negocio por separado) con la
+pasada única por bloques de DataValidator.validation_report, que además devuelve
+conteos y filas de ejemplo de cada regla, y con validate_stream sobre lotes del
+DataFrame (acumuladores combinados, en serie y en procesos).
+
+Uso:
+    python benchmarks/benchmark_validation.py --rows 20000000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from bench_utils import measure, print_table
+from mlops_pipeline.src import config
+from mlops_pipeline.src.data_validation import DataValidator
+
+
+def make_typed_transactions(n_rows, seed=42):
+    """Transacciones con los tipos con los que las carga DataLoader (sin columnas irrelevantes)."""
+    rng = np.random.default_rng(seed)
+    category = lambda values: pd.Categorical.from_codes(rng.integers(0, len(values), n_rows), values)
+    return pd.DataFrame({
+        'amount': rng.lognormal(4, 1.2, size=n_rows).astype(np.float32),
+        'merchant_category': category(['electronics', 'fashion', 'fuel', 'grocery']),
+        'customer_age': rng.integers(18, 90, size=n_rows).astype(np.int16),
+        'customer_location': category(['CA', 'FL', 'NY', 'TX']),
+        'device_type': category(['desktop', 'mobile', 'tablet']),
+        'previous_transactions': rng.integers(0, 50, size=n_rows).astype(np.int32),
+        'is_fraud': (rng.random(n_rows) < 0.02).astype(np.int8)
+    })
+
+
+def batches(df, batch_size):
+    for start in range(0, len(df), batch_size):
+        yield df.iloc[start:start + batch_size]
+
+
+def legacy_validate(df):
+    """Validación original: un recorrido por chequeo y solo un resultado booleano."""
+    expected = config.NUMERICAL_COLS + config.CATEGORICAL_COLS + [config.TARGET_VARIABLE]
+    if [col for col in expected if col not in df.columns]:
+        return False
+    if not all(pd.api.types.is_numeric_dtype(df[col]) for col in config.NUMERICAL_COLS):
+        return False
+    if df.isnull().sum().sum() > 0:
+        return False
+    if (df['amount'] < 0).sum() > 0:
+        return False
+    if ((df['customer_age'] < 18) | (df['customer_age'] > 100)).sum() > 0:
+        return False
+    if not all(val in [0, 1] for val in df[config.TARGET_VARIABLE].unique()):
+        return False
+    return (df['previous_transactions'] < 0).sum() == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de la validación de datos")
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_typed_transactions(args.rows)
+    print(f"📄 DataFrame de {args.rows:,} filas ({df.memory_usage(deep=True).sum() / 1024 ** 2:,.1f} MB)")
+
+    validator = DataValidator()
+    variants = [
+        ('original (un recorrido por chequeo)', legacy_validate),
+        ('informe en una pasada', lambda frame: validator.validation_report(frame)['passed']),
+        ('streaming (lotes de 1M)', lambda frame: validator.validate_stream(
+            batches(frame, 1_000_000), n_jobs=1)['passed']),
+        ('streaming (lotes de 1M, 2 procesos)', lambda frame: validator.validate_stream(
+            batches(frame, 1_000_000), n_jobs=2)['passed'])
+    ]
+    rows = []
+    for name, fn in variants:
+        seconds = []
+        for _ in range(args.repeats):
+            passed, elapsed, peak = measure(fn, df)
+            seconds.append(elapsed)
+        rows.append({
+            'variant': name,
+            'validate_s': min(seconds),
+            'rows_per_s': args.rows / min(seconds),
+            'peak_mb': peak,
+            'passed': passed
+        })
+        print(f"  ✓ {name}")
+
+    print_table(rows, title="RESULTADOS - VALIDACIÓN")
+    for row in rows[1:]:
+        print(f"\n⚡ {row['variant']}: {rows[0]['validate_s'] / row['validate_s']:.2f}x más rápido")
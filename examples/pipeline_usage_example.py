@@ -39,6 +39,11 @@ def example_data_loading():
         print(f"\n📊 Primeras 3 filas:")
         print(df.head(3))
         
+        # Muestra estratificada del 1% leyendo solo las filas elegidas (índice de offsets)
+        sample = loader.sample(frac=0.01, stratify=True)
+        print(f"\n🎯 Muestra estratificada del 1%: {len(sample):,} filas, "
+              f"tasa de fraude {sample['is_fraud'].mean():.2%} (dataset: {df['is_fraud'].mean():.2%})")
+        
         return df
     else:
         print("❌ Error al cargar datos")
@@ -62,20 +62,23 @@ def print_menu():
 
 
 def run_full_pipeline():
-    """Ejecuta el pipeline completo E2E."""
+    """Ejecuta el pipeline completo E2E (las etapas sin cambios se leen de la caché)."""
     print("\n" + "="*60)
     print("  EJECUTANDO PIPELINE COMPLETO")
     print("="*60 + "\n")
     
     try:
-        from mlops_pipeline.src.model_training_evaluation import ModelTrainer
+        from mlops_pipeline.src.pipeline_runner import build_training_dag
         
-        trainer = ModelTrainer()
-        trainer.run_pipeline()
+        runner, trainer = build_training_dag()
+        outputs = runner.run()
         
         print("\n✅ Pipeline completado exitosamente!")
         print(f"   - Modelo guardado: best_model.joblib")
-        print(f"   - Preprocesador guardado: preprocessor.joblib")
+        if outputs['preprocessor']['saved']:
+            print(f"   - Preprocesador guardado: {outputs['preprocessor']['path']}")
+        else:
+            print(f"   - Preprocesador sin cambios: {outputs['preprocessor']['path']}")
         
     except Exception as e:
         print(f"\n❌ Error al ejecutar el pipeline: {str(e)}")
@@ -90,64 +93,60 @@ def validate_data_only():
     print("="*60 + "\n")
     
     try:
-        from mlops_pipeline.src.cargar_datos import DataLoader
-        from mlops_pipeline.src.data_validation import DataValidator
+        from mlops_pipeline.src.pipeline_runner import build_training_dag
         
-        loader = DataLoader()
-        df = loader.load_data()
-        
-        if not df.empty:
-            validator = DataValidator()
-            if validator.validate_data(df):
-                print("\n✅ Validación completada - Datos correctos!")
-            else:
-                print("\n❌ Validación fallida - Revisa los errores anteriores")
+        runner, _ = build_training_dag()
+        runner.run(['validate'])
+        print("\n✅ Validación completada - Datos correctos!")
         
     except Exception as e:
         print(f"\n❌ Error: {str(e)}")
 
 
 def feature_engineering_only():
-    """Solo ejecuta ingeniería de características."""
+    """Solo ejecuta ingeniería de características (reutiliza carga y validación cacheadas)."""
     print("\n" + "="*60)
     print("  INGENIERÍA DE CARACTERÍSTICAS")
     print("="*60 + "\n")
     
     try:
-        from mlops_pipeline.src.cargar_datos import DataLoader
-        from mlops_pipeline.src.data_validation import DataValidator
-        from mlops_pipeline.src.ft_engineering import FeatureEngineer
+        from mlops_pipeline.src.pipeline_runner import build_training_dag
         
-        loader = DataLoader()
-        df = loader.load_data()
+        runner, _ = build_training_dag()
+        outputs = runner.run(['features', 'preprocessor'])
         
-        if not df.empty:
-            validator = DataValidator()
-            if validator.validate_data(df):
-                engineer = FeatureEngineer()
-                X_train, X_test, y_train, y_test = engineer.process(df)
-                
-                print(f"\n✅ Procesamiento completado!")
-                print(f"   - Shape X_train: {X_train.shape}")
-                print(f"   - Shape X_test: {X_test.shape}")
-                print(f"   - Preprocesador guardado: preprocessor.joblib")
+        print(f"\n✅ Procesamiento completado!")
+        print(f"   - Shape X_train: {outputs['features']['X_train'].shape}")
+        print(f"   - Shape X_test: {outputs['features']['X_test'].shape}")
+        if outputs['preprocessor']['saved']:
+            print(f"   - Preprocesador guardado: {outputs['preprocessor']['path']}")
+        else:
+            print(f"   - Preprocesador sin cambios: {outputs['preprocessor']['path']}")
         
     except Exception as e:
         print(f"\n❌ Error: {str(e)}")
 
 
 def train_models_only():
-    """Solo entrena modelos (asume que ya existen datos preprocesados)."""
+    """Solo entrena modelos, a partir de las features y el remuestreo cacheados."""
     print("\n" + "="*60)
     print("  ENTRENANDO MODELOS")
     print("="*60 + "\n")
     
-    print("⚠️  Esta opción requiere ejecutar primero la opción 3")
-    print("   (Ingeniería de Características) o el pipeline completo.\n")
+    print("ℹ️  Las etapas previas (carga, validación, features y remuestreo) se leen")
+    print("   de la caché si sus entradas no cambiaron; si no, se ejecutan primero.\n")
     
-    response = input("¿Deseas ejecutar el pipeline completo? (s/n): ")
-    if response.lower() == 's':
-        run_full_pipeline()
+    try:
+        from mlops_pipeline.src.pipeline_runner import build_training_dag
+        
+        runner, trainer = build_training_dag()
+        train_stages = [name for name in runner.stages if name.startswith('train:')]
+        runner.run(force=train_stages)
+        
+        print(f"\n✅ Entrenamiento completado! Mejor modelo: {trainer.best_model_name}")
+        
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
 
 
 def start_api():
@@ -245,6 +244,7 @@ def show_project_info():
    │   ├── data_validation.py             (DataValidator)
    │   ├── ft_engineering.py              (FeatureEngineer)
    │   ├── model_training_evaluation.py   (ModelTrainer)
+   │   ├── pipeline_runner.py             (DAG con caché por etapa)
    │   ├── model_deploy.py                (API REST)
    │   ├── model_monitoring.py            (Dashboard)
    │   └── comprension_eda.ipynb          (EDA Notebook)
@@ -5,7 +5,6 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
-import joblib
 import sys
 from pathlib import Path
 
@@ -14,8 +13,10 @@ sys.path.insert(0, str(project_root))
 
 try:
     from mlops_pipeline.src import cargar_datos, data_validation, config
+    from mlops_pipeline.src.artifacts import load_artifact
 except ImportError:
     import cargar_datos, data_validation, config
+    from artifacts import load_artifact
 
 st.set_page_config(page_title="Detección de Fraude", page_icon="", layout="wide")
 
@@ -43,8 +44,8 @@ def cargar_modelo_y_preprocessor():
         preprocessor_path = project_root / "preprocessor.joblib"
         if not model_path.exists():
             return None, None, "Modelo no encontrado"
-        modelo = joblib.load(model_path)
-        preprocessor = joblib.load(preprocessor_path) if preprocessor_path.exists() else None
+        modelo = load_artifact(str(model_path))
+        preprocessor = load_artifact(str(preprocessor_path)) if preprocessor_path.exists() else None
         return modelo, preprocessor, None
     except Exception as e:
         return None, None, str(e)
@@ -0,0 +1,268 @@
+"""
+Módulo de persistencia de artefactos (modelo y preprocesador).
+
+Formato compacto:
+    [MAGIC | versión | longitud de cabecera] [cabecera JSON] [pickle] [buffers alineados]
+
+- La cabecera JSON (tipo de modelo, features, umbral, checksum...) se lee sin deserializar.
+- Sin compresión, el pickle usa el protocolo 5 con buffers fuera de banda: los arreglos
+  grandes se escriben alineados y al cargar se mapean en memoria en lugar de copiarse.
+- Con compresión, todo el pickle se comprime (el mmap no aplica).
+
+Los archivos joblib existentes se siguen cargando de forma transparente.
+"""
+
+import os
+import bz2
+import json
+import lzma
+import mmap
+import zlib
+import pickle
+import struct
+import hashlib
+from datetime import datetime
+import joblib
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    from mlops_pipeline.src import config
+except ImportError:
+    from . import config
+
+
+MAGIC = b"MLOPSART"
+FORMAT_VERSION = 1
+PREAMBLE = struct.Struct('<8sHI')  # magic, versión, longitud de la cabecera
+ALIGNMENT = 64
+# Buffers más pequeños se quedan dentro del pickle: alinearlos no compensa
+OUT_OF_BAND_MIN_BYTES = 4096
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _compress(data, method, level):
+    if method == 'zlib':
+        return zlib.compress(data, level)
+    if method == 'bz2':
+        return bz2.compress(data, max(1, min(level, 9)))
+    if method == 'lzma':
+        return lzma.compress(data, preset=level)
+    if method == 'zstd':
+        if zstandard is None:
+            raise ValueError("La compresión 'zstd' requiere el paquete 'zstandard'.")
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    raise ValueError(f"Compresión desconocida: '{method}'. Opciones: none, zlib, bz2, lzma, zstd")
+
+
+def _decompress(data, method):
+    if method == 'zlib':
+        return zlib.decompress(data)
+    if method == 'bz2':
+        return bz2.decompress(data)
+    if method == 'lzma':
+        return lzma.decompress(data)
+    if method == 'zstd':
+        if zstandard is None:
+            raise ValueError("El artefacto usa 'zstd' y el paquete 'zstandard' no está instalado.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Compresión desconocida en el artefacto: '{method}'")
+
+
+def is_compact_artifact(path):
+    """Indica si el archivo usa el formato compacto."""
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def save_artifact(obj, path, metadata=None, artifact_format=None, compression=None, level=None):
+    """
+    Guarda un objeto (modelo o preprocesador) en disco.
+
+    Args:
+        obj: Objeto a persistir.
+        path (str): Ruta de destino.
+        metadata (dict, optional): Metadatos legibles sin deserializar
+                                   (features, umbral, métricas...).
+        artifact_format (str, optional): "compact" o "joblib". Por defecto config.ARTIFACT_FORMAT.
+        compression (str, optional): Compresión del formato compacto. Por defecto config.ARTIFACT_COMPRESSION.
+        level (int, optional): Nivel de compresión. Por defecto config.ARTIFACT_COMPRESSION_LEVEL.
+
+    Returns:
+        dict: Cabecera escrita (vacía para el formato joblib).
+    """
+    artifact_format = artifact_format if artifact_format is not None else config.ARTIFACT_FORMAT
+    compression = compression if compression is not None else config.ARTIFACT_COMPRESSION
+    level = level if level is not None else config.ARTIFACT_COMPRESSION_LEVEL
+
+    if artifact_format == 'joblib':
+        joblib.dump(obj, path)
+        return {}
+    if artifact_format != 'compact':
+        raise ValueError(f"Formato de artefacto desconocido: '{artifact_format}'. Opciones: compact, joblib")
+
+    buffers = []
+
+    def _out_of_band(buffer):
+        # Devolver True serializa el buffer dentro del pickle
+        if buffer.raw().nbytes < OUT_OF_BAND_MIN_BYTES:
+            return True
+        buffers.append(buffer)
+        return False
+
+    if compression == 'none':
+        data = pickle.dumps(obj, protocol=5, buffer_callback=_out_of_band)
+    else:
+        data = _compress(pickle.dumps(obj, protocol=5), compression, level)
+    raws = [buffer.raw() for buffer in buffers]
+
+    # Distribución del contenido: pickle y luego cada buffer alineado a 64 bytes
+    layout, offset = [], len(data)
+    for raw in raws:
+        offset = _align(offset)
+        layout.append({'offset': offset, 'size': raw.nbytes})
+        offset += raw.nbytes
+
+    checksum = hashlib.sha256(data)
+    position = len(data)
+    for raw, entry in zip(raws, layout):
+        checksum.update(b'\0' * (entry['offset'] - position))
+        checksum.update(raw)
+        position = entry['offset'] + entry['size']
+
+    header = {
+        'format_version': FORMAT_VERSION,
+        'model_type': type(obj).__name__,
+        'module': type(obj).__module__,
+        'created_at': datetime.now().isoformat(),
+        'compression': compression,
+        'pickle_protocol': 5,
+        'pickle_size': len(data),
+        'buffers': layout,
+        'payload_size': position,
+        'checksum': f'sha256:{checksum.hexdigest()}',
+        'metadata': metadata or {}
+    }
+    header_bytes = json.dumps(header, default=str).encode('utf-8')
+    payload_start = _align(PREAMBLE.size + len(header_bytes))
+
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b'\0' * (payload_start - f.tell()))
+        f.write(data)
+        for raw, entry in zip(raws, layout):
+            f.write(b'\0' * (payload_start + entry['offset'] - f.tell()))
+            f.write(raw)
+    # Reemplazo atómico: un proceso que esté leyendo nunca ve un archivo a medio escribir
+    os.replace(tmp_path, path)
+    return header
+
+
+def _read_header(f):
+    """Lee la cabecera de un artefacto compacto y devuelve (cabecera, inicio del contenido)."""
+    magic, version, header_len = PREAMBLE.unpack(f.read(PREAMBLE.size))
+    if magic != MAGIC:
+        raise ValueError("El archivo no es un artefacto en formato compacto.")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Versión de artefacto no soportada: {version}")
+    header = json.loads(f.read(header_len).decode('utf-8'))
+    return header, _align(PREAMBLE.size + header_len)
+
+
+def read_artifact_metadata(path):
+    """
+    Lee la cabecera de un artefacto sin deserializar el objeto.
+
+    Args:
+        path (str): Ruta del artefacto.
+
+    Returns:
+        dict: Cabecera (model_type, checksum, compression, metadata...).
+              Para artefactos joblib devuelve {'format': 'joblib'}.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            return {'format': 'joblib'}
+        f.seek(0)
+        header, _ = _read_header(f)
+    header['format'] = 'compact'
+    return header
+
+
+def artifact_checksum(path):
+    """
+    Huella de un artefacto: el checksum de la cabecera en el formato compacto o el
+    sha256 del archivo completo para artefactos joblib.
+
+    Args:
+        path (str): Ruta del artefacto.
+
+    Returns:
+        str: 'sha256:<hex>'.
+    """
+    header = read_artifact_metadata(path)
+    if 'checksum' in header:
+        return header['checksum']
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return f'sha256:{digest.hexdigest()}'
+
+
+def load_artifact(path, mmap_mode=True, verify=None):
+    """
+    Carga un artefacto compacto o joblib.
+
+    Args:
+        path (str): Ruta del artefacto.
+        mmap_mode (bool): Mapear en memoria los buffers de artefactos sin compresión.
+        verify (bool, optional): Verificar el checksum. Por defecto config.ARTIFACT_VERIFY_CHECKSUM.
+
+    Returns:
+        object: Objeto deserializado.
+
+    Raises:
+        FileNotFoundError: Si el archivo no existe.
+        ValueError: Si el checksum no coincide.
+    """
+    verify = verify if verify is not None else config.ARTIFACT_VERIFY_CHECKSUM
+
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            return joblib.load(path)
+        f.seek(0)
+        header, payload_start = _read_header(f)
+
+        if mmap_mode and header['compression'] == 'none':
+            # El mapa queda referenciado por los arreglos que apuntan a él
+            content = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))[payload_start:]
+        else:
+            f.seek(payload_start)
+            content = memoryview(f.read(header['payload_size']))
+
+    if verify:
+        digest = hashlib.sha256(content[:header['payload_size']]).hexdigest()
+        if f'sha256:{digest}' != header['checksum']:
+            raise ValueError(f"Checksum inválido en el artefacto '{path}': el archivo está corrupto.")
+
+    data = content[:header['pickle_size']]
+    if header['compression'] != 'none':
+        return pickle.loads(_decompress(data, header['compression']))
+
+    buffers = [content[b['offset']:b['offset'] + b['size']] for b in header['buffers']]
+    return pickle.loads(data, buffers=buffers)
+
+
+if __name__ == "__main__":
+    # Mostrar la cabecera de los artefactos del proyecto sin deserializarlos
+    for artifact_path in (config.MODEL_PATH, config.PREPROCESSOR_PATH):
+        if os.path.exists(artifact_path):
+            print(f"\n{artifact_path}:")
+            print(json.dumps(read_artifact_metadata(artifact_path), indent=2, ensure_ascii=False))
@@ -1,13 +1,370 @@
 """
 Módulo para carga de datos del dataset de fraude financiero.
-Define la clase DataLoader que se encarga de cargar y limpiar inicialmente los datos.
+Define la clase DataLoader que se encarga de cargar y limpiar inicialmente los datos,
+y WatermarkStore, que guarda hasta dónde se leyó cada archivo para la ingesta
+incremental de transacciones nuevas (DataLoader.load_new).
 """
 
+import io
+import os
+import glob
+import json
+import zlib
+import queue
+import threading
+import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 try:
     from mlops_pipeline.src import config
+    from mlops_pipeline.src.columnar_cache import ColumnarCache, prefix_hash
+    from mlops_pipeline.src.row_index import RowIndex
 except ImportError:
     from . import config
+    from .columnar_cache import ColumnarCache, prefix_hash
+    from .row_index import RowIndex
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip', '.gzip': 'gzip', '.zst': 'zstd', '.zstd': 'zstd'}
+
+
+def csv_engine(engine=None):
+    """
+    Resuelve el motor de parseo de CSV.
+
+    Args:
+        engine (str, optional): "auto", "pyarrow" o "c". Por defecto config.CSV_ENGINE.
+
+    Returns:
+        str: "pyarrow" si se pidió (o "auto" y pyarrow está instalado), si no "c".
+    """
+    engine = engine if engine is not None else config.CSV_ENGINE
+    if engine == "auto":
+        try:
+            import pyarrow  # noqa: F401
+            return "pyarrow"
+        except ImportError:
+            return "c"
+    return engine
+
+
+_END = object()
+
+
+def read_ahead(iterable, depth):
+    """
+    Consume un iterable en un hilo productor con una cola acotada, de modo que la E/S
+    y el parseo del siguiente elemento se solapan con el procesamiento del actual.
+    
+    Args:
+        iterable: Fuente de elementos (por ejemplo, un lector de CSV por bloques).
+        depth (int): Elementos como máximo en espera; 0 consume en el hilo actual.
+    
+    Yields:
+        Los elementos del iterable, en orden. Las excepciones del productor se relanzan.
+    """
+    if depth <= 0:
+        yield from iterable
+        return
+    
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    
+    def produce():
+        try:
+            for item in iterable:
+                while not stop.is_set():
+                    try:
+                        buffer.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            buffer.put(_END)
+        except BaseException as e:  # Se relanza en el consumidor
+            buffer.put(e)
+    
+    producer = threading.Thread(target=produce, name="read-ahead", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Si el consumidor abandona el generador, el productor termina en el siguiente put
+        stop.set()
+        producer.join()
+
+
+def compression_of(path):
+    """Compresión de un archivo según su extensión: "gzip", "zstd" o None."""
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(str(path))[1].lower())
+
+
+def _gzip_blocks(raw, buffer_bytes):
+    """Bloques descomprimidos de un gzip (admite varios miembros concatenados)."""
+    decompressor = zlib.decompressobj(wbits=31)
+    pending = False
+    while True:
+        data = raw.read(buffer_bytes)
+        if not data:
+            break
+        while data:
+            pending = True
+            # max_length acota cada bloque aunque el ratio de compresión sea alto
+            block = decompressor.decompress(data, buffer_bytes)
+            if block:
+                yield block
+            if decompressor.eof:
+                data, pending = decompressor.unused_data, False
+                decompressor = zlib.decompressobj(wbits=31)
+            else:
+                data = decompressor.unconsumed_tail
+    if pending:
+        raise EOFError("Archivo gzip truncado")
+
+
+def _zstd_blocks(raw, buffer_bytes):
+    """Bloques descomprimidos de un zstd (admite varios frames concatenados)."""
+    reader = zstandard.ZstdDecompressor().stream_reader(raw, read_size=buffer_bytes, read_across_frames=True)
+    while True:
+        block = reader.read(buffer_bytes)
+        if not block:
+            return
+        yield block
+
+
+class DecompressingReader(io.RawIOBase):
+    """
+    Flujo de lectura que descomprime un archivo gzip o zstd por bloques grandes.
+    Con read_ahead_blocks > 0 la lectura y la descompresión ocurren en un hilo aparte
+    (zlib y zstd liberan el GIL), solapadas con el parseo del CSV.
+    """
+    
+    def __init__(self, path, compression, buffer_bytes, read_ahead_blocks):
+        if compression == 'zstd' and zstandard is None:
+            raise ValueError("La compresión 'zstd' requiere el paquete 'zstandard'.")
+        self._raw = open(path, 'rb', buffering=0)
+        blocks = _zstd_blocks if compression == 'zstd' else _gzip_blocks
+        self._blocks = read_ahead(blocks(self._raw, buffer_bytes), read_ahead_blocks)
+        self._current = memoryview(b'')
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        while not len(self._current):
+            block = next(self._blocks, None)
+            if block is None:
+                return 0
+            self._current = memoryview(block)
+        n = min(len(buffer), len(self._current))
+        buffer[:n] = self._current[:n]
+        self._current = self._current[n:]
+        return n
+    
+    def close(self):
+        if not self.closed:
+            self._blocks.close()  # Detiene el hilo de descompresión antes de cerrar el archivo
+            self._raw.close()
+        super().close()
+
+
+def open_source(path, buffer_bytes=None, threaded=None):
+    """
+    Abre un archivo de datos en modo binario, descomprimiéndolo al vuelo si es .gz o .zst.
+    
+    Args:
+        path (str): Archivo de datos.
+        buffer_bytes (int, optional): Tamaño de lectura y de buffer. Por defecto
+                                      config.DECOMPRESS_BUFFER_BYTES.
+        threaded (bool, optional): Descomprimir en un hilo aparte. Por defecto
+                                   config.DECOMPRESS_THREADED.
+    
+    Returns:
+        Objeto de archivo binario (cerrarlo libera el hilo de descompresión).
+    """
+    buffer_bytes = buffer_bytes if buffer_bytes is not None else config.DECOMPRESS_BUFFER_BYTES
+    threaded = threaded if threaded is not None else config.DECOMPRESS_THREADED
+    compression = compression_of(path)
+    if compression is None:
+        return open(path, 'rb', buffering=buffer_bytes)
+    depth = config.DECOMPRESS_READ_AHEAD if threaded else 0
+    return io.BufferedReader(DecompressingReader(path, compression, buffer_bytes, depth),
+                             buffer_size=buffer_bytes)
+
+
+def read_csv(path, **kwargs):
+    """
+    pd.read_csv que descomprime en streaming los archivos .gz/.zst con open_source.
+    Los archivos sin comprimir se pasan por ruta (el motor pyarrow los lee en paralelo).
+    Con chunksize devuelve un lector que cierra el archivo al cerrarse.
+    """
+    if compression_of(path) is None:
+        return pd.read_csv(path, **kwargs)
+    handle = open_source(path)
+    try:
+        result = pd.read_csv(handle, **kwargs)
+    except BaseException:
+        handle.close()
+        raise
+    if kwargs.get('chunksize') or kwargs.get('iterator'):
+        _close_reader = result.close
+        
+        def close():
+            _close_reader()
+            handle.close()
+        result.close = close
+        return result
+    handle.close()
+    return result
+
+
+def read_chunks(path, chunksize, **kwargs):
+    """
+    Lee un CSV por bloques de chunksize filas con los tipos declarados en kwargs.
+    
+    Un bloque en el que los tipos no aplican (texto en una columna numérica, nulos en una
+    entera, desbordamiento) se vuelve a parsear sin tipos, como hace read_file con el
+    archivo completo, y la lectura tipada continúa en el bloque siguiente. Así se aceptan
+    los mismos archivos que load_data y la validación informa de los valores inválidos.
+    
+    Args:
+        path (str): Archivo CSV (sin comprimir, .gz o .zst).
+        chunksize (int): Filas por bloque.
+        **kwargs: Argumentos de lectura (read_csv_kwargs: usecols y dtype).
+    
+    Yields:
+        pd.DataFrame: Bloques con el número de fila de datos como índice.
+    """
+    start = 0  # Filas de datos ya entregadas
+    while True:
+        # El lector que falla no se reutiliza: se abre otro saltando las filas entregadas
+        skiprows = range(1, start + 1) if start else None
+        try:
+            with read_csv(path, engine='c', chunksize=chunksize, skiprows=skiprows, **kwargs) as reader:
+                for chunk in reader:
+                    chunk.index = pd.RangeIndex(start, start + len(chunk))
+                    start += len(chunk)
+                    yield chunk
+            return
+        except (ValueError, TypeError, OverflowError) as e:
+            print(f"⚠️  {path}: los tipos declarados no aplican en el bloque desde la fila {start:,} "
+                  f"({str(e)[:80]}); bloque leído con tipos inferidos")
+        chunk = read_csv(path, engine='c', skiprows=range(1, start + 1) if start else None, nrows=chunksize,
+                         usecols=kwargs['usecols'])
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk
+        if len(chunk) < chunksize:
+            return
+
+
+def file_watermark(path, offset, n_rows):
+    """
+    Marca de agua de un archivo: bytes del origen ya leídos y filas que contienen.
+    
+    Args:
+        path (str): Archivo de origen.
+        offset (int): Primer byte sin leer (los anteriores ya se procesaron).
+        n_rows (int): Filas de datos contenidas en los bytes leídos.
+    """
+    return {'offset': int(offset), 'n_rows': int(n_rows), 'prefix_hash': prefix_hash(path, offset)}
+
+
+def watermark_intact(path, watermark):
+    """Indica si un archivo conserva la parte ya leída, es decir, si solo creció por el final."""
+    if watermark is None or os.path.getsize(path) < watermark['offset']:
+        return False
+    return prefix_hash(path, watermark['offset']) == watermark['prefix_hash']
+
+
+def ends_with_newline(path):
+    """Indica si la última fila de un archivo sin comprimir está terminada."""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def read_tail(path, offset=None, complete_only=True, **kwargs):
+    """
+    Parsea las filas de un CSV sin comprimir a partir de un offset de bytes.
+    
+    Args:
+        path (str): CSV sin comprimir.
+        offset (int, optional): Byte de inicio de la primera fila a leer. Por defecto,
+                                justo después de la cabecera.
+        complete_only (bool): Ignorar una última fila sin salto de línea (puede estar a
+                              medio escribir); se leerá en la siguiente llamada.
+        **kwargs: Argumentos de pd.read_csv.
+    
+    Returns:
+        tuple: (DataFrame con las filas leídas, primer byte sin leer)
+    """
+    with open(path, 'rb') as f:
+        header = f.readline()
+        f.seek(offset if offset is not None else len(header))
+        start = f.tell()
+        data = f.read()
+    if complete_only:
+        data = data[:data.rfind(b'\n') + 1]
+    return pd.read_csv(io.BytesIO(header + data), **kwargs), start + len(data)
+
+
+class WatermarkStore:
+    """
+    Marcas de agua de la ingesta incremental, por archivo de origen, en un JSON.
+    """
+    
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str, optional): Archivo JSON. Por defecto config.INGESTION_WATERMARKS_PATH.
+        """
+        self.path = path or config.INGESTION_WATERMARKS_PATH
+    
+    def load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def get(self, source):
+        return self.load().get(os.path.abspath(source))
+    
+    def update(self, watermarks):
+        """Guarda las marcas de agua de varios archivos (escritura atómica)."""
+        marks = self.load()
+        marks.update({os.path.abspath(source): mark for source, mark in watermarks.items()})
+        self._write(marks)
+    
+    def reset(self, source=None):
+        """Olvida la marca de agua de un archivo (o todas): se volverá a leer completo."""
+        marks = self.load()
+        if source is None:
+            marks = {}
+        else:
+            marks.pop(os.path.abspath(source), None)
+        self._write(marks)
+    
+    def _write(self, marks):
+        tmp = f"{self.path}.tmp-{os.getpid()}"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(marks, f, indent=2)
+        os.replace(tmp, self.path)
 
 
 class DataLoader:
@@ -15,28 +372,370 @@ class DataLoader:
     Clase responsable de cargar el dataset y realizar la limpieza inicial.
     """
     
-    def __init__(self):
-        """Inicializa el DataLoader con las configuraciones del archivo config.py"""
+    def __init__(self, use_float32=None, engine=None, use_cache=None, n_jobs=None):
+        """
+        Inicializa el DataLoader con las configuraciones del archivo config.py
+        
+        Args:
+            use_float32 (bool, optional): Parsear las columnas numéricas directamente
+                                          como float32. Si es None, usa config.USE_FLOAT32.
+            engine (str, optional): Motor de parseo ("auto", "pyarrow" o "c").
+                                    Si es None, usa config.CSV_ENGINE.
+            use_cache (bool, optional): Usar la caché columnar mapeada en memoria.
+                                        Si es None, usa config.DATASET_CACHE_ENABLED.
+            n_jobs (int, optional): Procesos para leer varios archivos en paralelo.
+                                    Si es None, usa config.DATA_LOAD_N_JOBS.
+        """
         self.data_path = config.DATA_PATH
         self.irrelevant_cols = config.IRRELEVANT_COLS
+        self.use_float32 = use_float32 if use_float32 is not None else config.USE_FLOAT32
+        self.engine = csv_engine(engine)
+        self.use_cache = use_cache if use_cache is not None else config.DATASET_CACHE_ENABLED
+        self.cache = ColumnarCache()
+        self.n_jobs = n_jobs if n_jobs is not None else config.DATA_LOAD_N_JOBS
+        self.watermarks = WatermarkStore()
+        self.pending_watermarks = {}
+    
+    def column_dtypes(self, columns):
+        """
+        Construye los tipos explícitos de lectura a partir de config.py.
+        
+        Args:
+            columns (list): Columnas que se van a leer.
+        
+        Returns:
+            dict: Tipo por columna (solo las columnas con tipo conocido).
+        """
+        dtypes = {col: dtype for col, dtype in config.COLUMN_DTYPES.items() if col in columns}
+        if self.use_float32:
+            # En modo float32 las columnas numéricas se parsean sin pasar por float64
+            dtypes.update({col: np.float32 for col in config.NUMERICAL_COLS if col in columns})
+        dtypes.update({col: 'category' for col in config.CATEGORICAL_COLS if col in columns})
+        return dtypes
+    
+    def read_csv_kwargs(self, path, columns=None):
+        """
+        Argumentos de lectura de un CSV: solo las columnas relevantes y con tipos explícitos.
+        La cabecera se lee aparte para no parsear las columnas irrelevantes (IDs UUID).
+        
+        Args:
+            path (str): Archivo CSV.
+            columns (list, optional): Subconjunto de columnas a leer (por defecto todas
+                                      las relevantes).
+        """
+        header = read_csv(path, nrows=0).columns
+        usecols = [col for col in header if col not in self.irrelevant_cols
+                   and (columns is None or col in columns)]
+        return {'usecols': usecols, 'dtype': self.column_dtypes(usecols)}
     
-    def load_data(self) -> pd.DataFrame:
+    def source_files(self, start_date=None, end_date=None, path=None):
         """
-        Carga los datos desde el archivo CSV y elimina columnas irrelevantes.
+        Archivos del origen de datos, con poda de particiones por fecha.
+        
+        Args:
+            start_date, end_date (str o Timestamp, optional): Rango de fechas (incluido).
+            path (str, optional): Origen. Por defecto self.data_path.
+        
+        Returns:
+            list: Rutas de los archivos a leer, en orden.
+        """
+        sources = resolve_sources(path or self.data_path)
+        start = pd.Timestamp(start_date) if start_date is not None else None
+        end = pd.Timestamp(end_date) if end_date is not None else None
+        # Los archivos sin partición de fecha no se pueden podar y se conservan
+        return [file for file, date in sources
+                if date is None or ((start is None or date >= start) and (end is None or date <= end))]
+    
+    def iter_batches(self, batch_size=None, columns=None, read_ahead_batches=None, path=None,
+                     start_date=None, end_date=None):
+        """
+        Recorre el dataset por lotes tipados sin materializarlo completo.
+        
+        Si la caché columnar del archivo es válida, los lotes son vistas del dataset
+        mapeado en memoria. Si no, el CSV se parsea por bloques (motor "c", read_chunks)
+        en un hilo que lee por adelantado hasta read_ahead_batches lotes; un lote en el
+        que los tipos declarados no aplican se lee con tipos inferidos. Las columnas
+        categóricas de cada lote solo contienen las categorías presentes en ese lote. Con
+        varios archivos (glob o particiones) se recorren en orden y todos deben tener el
+        mismo esquema.
+        
+        Args:
+            batch_size (int, optional): Filas por lote. Por defecto config.STREAM_BATCH_SIZE.
+            columns (list, optional): Columnas a conservar (las irrelevantes se descartan siempre).
+            read_ahead_batches (int, optional): Lotes leídos por adelantado. Por defecto
+                                                config.STREAM_READ_AHEAD.
+            path (str, optional): Archivo, glob o directorio a leer. Por defecto self.data_path.
+            start_date, end_date (str o Timestamp, optional): Poda de particiones por fecha.
+        
+        Yields:
+            pd.DataFrame: Lotes de hasta batch_size filas.
+        """
+        batch_size = batch_size if batch_size is not None else config.STREAM_BATCH_SIZE
+        read_ahead_batches = (read_ahead_batches if read_ahead_batches is not None
+                              else config.STREAM_READ_AHEAD)
+        expected = None
+        for file in self.source_files(start_date, end_date, path):
+            kwargs = self.read_csv_kwargs(file, columns)
+            expected = _check_schema(file, kwargs['usecols'], expected)
+            
+            cached = self.cache.load(file, self.read_csv_kwargs(file)) if self.use_cache else None
+            if cached is not None:
+                cached = cached[kwargs['usecols']]
+                for start in range(0, len(cached), batch_size):
+                    yield cached.iloc[start:start + batch_size]
+                continue
+            
+            yield from read_ahead(read_chunks(file, batch_size, **kwargs), read_ahead_batches)
+    
+    def read_file(self, path, expected_columns=None, verbose=True):
+        """
+        Lee un archivo con tipos explícitos, usando y alimentando la caché columnar.
+        
+        Args:
+            path (str): Archivo CSV.
+            expected_columns (list, optional): Columnas que debe tener (esquema de referencia).
+            verbose (bool): Imprimir el progreso.
+        
+        Returns:
+            pd.DataFrame: Datos del archivo.
+        
+        Raises:
+            ValueError: Si las columnas no coinciden con expected_columns.
+        """
+        kwargs = self.read_csv_kwargs(path)
+        _check_schema(path, kwargs['usecols'], expected_columns)
+        if self.use_cache:
+            df = self.cache.load(path, kwargs)
+            if df is not None:
+                if verbose:
+                    print(f"✓ Datos mapeados desde la caché columnar: {self.cache.entry_dir(path)}")
+                return df
+            df = self.extend_cache(path, kwargs, verbose)
+            if df is not None:
+                return df
+        typed = True
+        try:
+            df = read_csv(path, engine=self.engine, **kwargs)
+        except (ValueError, TypeError, OverflowError) as e:
+            # Nulos o valores fuera de rango en columnas enteras: se lee sin tipos
+            # para que la validación informe el problema
+            print(f"⚠️  {path}: los tipos declarados no aplican ({str(e)[:80]}); leyendo con tipos inferidos")
+            df = read_csv(path, usecols=kwargs['usecols'])
+            typed = False
+        if verbose:
+            print(f"✓ Datos parseados (motor: {self.engine}). "
+                  f"Memoria: {df.memory_usage(deep=True).sum() / 1024 ** 2:.2f} MB")
+        
+        if self.use_cache:
+            # Un parseo sin los tipos declarados no se cachea: la recarga debe tener los
+            # mismos tipos que este parseo y la entrada no podría extenderse con filas tipadas
+            entry = self.cache.store(df, path, kwargs, watermark=_full_watermark(path, len(df))) if typed else None
+            if entry is None:
+                self.cache.invalidate(path)
+                if verbose:
+                    print("⚠️  Datos sin los tipos declarados: no se guardan en la caché columnar")
+                return df
+            if verbose:
+                print(f"✓ Caché columnar creada en: {entry}")
+            df = self.cache.load(path, kwargs)
+        return df
+    
+    def row_index(self, path=None):
+        """
+        Índice de offsets de filas del CSV, creado o actualizado si el archivo creció.
+        
+        Args:
+            path (str, optional): CSV sin comprimir. Por defecto self.data_path.
+        
+        Returns:
+            RowIndex: Índice al día con el archivo.
+        
+        Raises:
+            ValueError: Si el origen no es un único archivo sin comprimir.
+        """
+        files = self.source_files(path=path)
+        if len(files) != 1 or compression_of(files[0]) is not None:
+            raise ValueError(f"El índice de filas requiere un único CSV sin comprimir: {path or self.data_path}")
+        return RowIndex(files[0]).update()
+    
+    def sample(self, n=None, frac=None, stratify=False, random_state=None, path=None):
+        """
+        Muestra aleatoria del dataset leyendo solo las filas elegidas (vía RowIndex).
+        
+        Args:
+            n (int, optional): Tamaño de la muestra.
+            frac (float, optional): Fracción de filas (si no se da n).
+            stratify (bool): Conservar la proporción de fraude (config.TARGET_VARIABLE).
+            random_state (int, optional): Semilla. Por defecto config.RANDOM_STATE.
+            path (str, optional): CSV a muestrear. Por defecto self.data_path.
+        
+        Returns:
+            pd.DataFrame: Filas muestreadas con los mismos tipos y columnas que load_data,
+                          con su número de fila en el archivo como índice.
+        """
+        index = self.row_index(path)
+        return index.sample(n=n, frac=frac, stratify=stratify, random_state=random_state,
+                            **self.read_csv_kwargs(index.path))
+    
+    def read_rows(self, start, stop, path=None):
+        """
+        Lee el rango de filas [start, stop) del CSV sin recorrer las anteriores.
+        
+        Args:
+            start, stop (int): Rango de filas de datos (sin contar la cabecera).
+            path (str, optional): CSV a leer. Por defecto self.data_path.
+        
+        Returns:
+            pd.DataFrame: Filas del rango con su número de fila como índice.
+        """
+        index = self.row_index(path)
+        return index.read_range(start, stop, **self.read_csv_kwargs(index.path))
+    
+    def extend_cache(self, path, kwargs, verbose=True):
+        """
+        Si el archivo solo creció desde que se creó su entrada de caché, parsea únicamente
+        las filas añadidas y extiende la entrada en el sitio.
+        
+        Returns:
+            pd.DataFrame o None: Datos completos mapeados desde la caché extendida, o None
+                                 si la entrada no se puede extender (hay que releer).
+        """
+        watermark = self.cache.watermark(path, kwargs)
+        if compression_of(path) is not None or not watermark_intact(path, watermark):
+            return None
+        try:
+            tail, end = read_tail(path, watermark['offset'], complete_only=False,
+                                  engine=self.engine, **kwargs)
+        except (ValueError, TypeError, OverflowError):
+            return None
+        n_rows = watermark['n_rows'] + len(tail)
+        if self.cache.append(tail, path, kwargs, watermark=_full_watermark(path, n_rows)) is None:
+            return None
+        if verbose:
+            print(f"✓ Caché columnar extendida con {len(tail):,} filas nuevas: {self.cache.entry_dir(path)}")
+        return self.cache.load(path, kwargs)
+    
+    def read_new(self, path, watermark, kwargs):
+        """
+        Lee las filas de un archivo posteriores a su marca de agua.
+        
+        Un CSV sin comprimir se lee desde el offset guardado (solo filas completas). Un
+        archivo comprimido se descomprime entero y se descartan las filas ya leídas. Si
+        el archivo cambió en vez de crecer, se lee completo.
+        
+        Args:
+            path (str): Archivo de origen.
+            watermark (dict o None): Marca de agua de la lectura anterior.
+            kwargs (dict): Argumentos de lectura (read_csv_kwargs).
+        
+        Returns:
+            tuple: (DataFrame con las filas nuevas, nueva marca de agua)
+        """
+        if watermark is not None and not watermark_intact(path, watermark):
+            print(f"⚠️  {path} cambió desde la última lectura (no solo creció); se lee completo")
+            watermark = None
+        if compression_of(path) is None:
+            offset = watermark['offset'] if watermark else None
+            df, end = _typed_parse(lambda **kw: read_tail(path, offset, engine=self.engine, **kw), kwargs)
+            n_rows = (watermark['n_rows'] if watermark else 0) + len(df)
+            return df, file_watermark(path, end, n_rows)
+        
+        size = os.path.getsize(path)
+        if watermark is not None and watermark['offset'] == size:
+            return pd.DataFrame(columns=kwargs['usecols']), watermark
+        df = _typed_parse(lambda **kw: read_csv(path, engine=self.engine, **kw), kwargs)
+        skip = watermark['n_rows'] if watermark else 0
+        return df.iloc[skip:].reset_index(drop=True), file_watermark(path, size, len(df))
+    
+    def load_new(self, start_date=None, end_date=None, commit=True) -> pd.DataFrame:
+        """
+        Carga solo las transacciones añadidas desde la última llamada.
+        
+        Cada archivo del origen tiene una marca de agua (bytes y filas ya leídos) en
+        config.INGESTION_WATERMARKS_PATH. Los archivos nuevos se leen completos y los que
+        crecieron, solo desde su marca de agua. Una última fila sin salto de línea se
+        deja para la siguiente llamada. Como en iter_batches, las columnas categóricas
+        solo contienen las categorías presentes en las filas nuevas.
+        
+        Args:
+            start_date, end_date (str o Timestamp, optional): Poda de particiones por fecha.
+            commit (bool): Guardar las nuevas marcas de agua al terminar. Con False quedan
+                           en pending_watermarks hasta llamar a commit_new (por ejemplo,
+                           después de procesar las filas con éxito).
+        
+        Returns:
+            pd.DataFrame: Filas nuevas con los mismos tipos y columnas que load_data.
+        """
+        try:
+            print(f"Cargando transacciones nuevas desde: {self.data_path}")
+            frames, marks, expected = [], {}, None
+            for file in self.source_files(start_date, end_date):
+                kwargs = self.read_csv_kwargs(file)
+                expected = _check_schema(file, kwargs['usecols'], expected)
+                df, marks[file] = self.read_new(file, self.watermarks.get(file), kwargs)
+                if len(df):
+                    print(f"  {file}: {len(df):,} filas nuevas")
+                    frames.append(df)
+            if expected is None:
+                raise FileNotFoundError(self.data_path)
+            
+            df = concat_frames(frames) if frames else pd.DataFrame(columns=expected)
+            self.pending_watermarks.update(marks)
+            if commit:
+                self.commit_new()
+            print(f"✓ Transacciones nuevas: {len(df):,}")
+            return df
+        
+        except FileNotFoundError:
+            print(f"✗ Error: No se encontró el archivo en {self.data_path}")
+            return pd.DataFrame()
+        
+        except Exception as e:
+            print(f"✗ Error inesperado al cargar transacciones nuevas: {str(e)}")
+            return pd.DataFrame()
+    
+    def commit_new(self):
+        """Guarda las marcas de agua pendientes de load_new(commit=False)."""
+        if self.pending_watermarks:
+            self.watermarks.update(self.pending_watermarks)
+            self.pending_watermarks = {}
+    
+    def load_data(self, start_date=None, end_date=None) -> pd.DataFrame:
+        """
+        Carga los datos omitiendo las columnas irrelevantes.
+        
+        El origen (config.DATA_PATH) puede ser un archivo, un glob o un directorio de
+        particiones (por ejemplo date=YYYY-MM-DD/). Con varios archivos se leen en
+        paralelo en procesos (config.DATA_LOAD_N_JOBS), se exige el mismo esquema a
+        todos y las categorías se unifican al concatenar.
+        
+        Args:
+            start_date, end_date (str o Timestamp, optional): Poda de particiones por fecha (incluidas).
         
         Returns:
             pd.DataFrame: DataFrame con los datos cargados y limpiados.
         """
         try:
             print(f"Cargando datos desde: {self.data_path}")
-            df = pd.read_csv(self.data_path)
-            print(f"✓ Datos cargados exitosamente. Shape: {df.shape}")
+            files = self.source_files(start_date, end_date)
+            if not files:
+                raise FileNotFoundError(self.data_path)
             
-            # Eliminar columnas irrelevantes
-            df = df.drop(columns=self.irrelevant_cols, errors='ignore')
-            print(f"✓ Columnas irrelevantes eliminadas: {self.irrelevant_cols}")
-            print(f"✓ Shape final: {df.shape}")
+            if len(files) == 1:
+                df = self.read_file(files[0])
+            else:
+                expected = self.read_csv_kwargs(files[0])['usecols']
+                n_jobs = min(self.n_jobs if self.n_jobs > 0 else (os.cpu_count() or 1), len(files))
+                print(f"  {len(files)} archivos; leyendo con {n_jobs} procesos")
+                frames = Parallel(n_jobs=n_jobs, backend='loky')(
+                    delayed(_read_partition)(file, self.use_float32, self.engine, self.use_cache,
+                                             self.irrelevant_cols, expected)
+                    for file in files
+                )
+                df = concat_frames(frames)
             
+            print(f"✓ Datos cargados exitosamente. Shape: {df.shape}")
+            print(f"✓ Columnas irrelevantes omitidas en la lectura: {self.irrelevant_cols}")
             return df
             
         except FileNotFoundError:
@@ -49,6 +748,83 @@ class DataLoader:
             return pd.DataFrame()
 
 
+def resolve_sources(path):
+    """
+    Resuelve un origen de datos en la lista de archivos que lo componen.
+    
+    Args:
+        path (str): Un archivo, un patrón glob o un directorio. En un directorio se
+                    recorren los subdirectorios (particiones como date=YYYY-MM-DD/).
+    
+    Returns:
+        list: Tuplas (archivo, fecha de la partición o None), ordenadas por ruta.
+    """
+    if os.path.isdir(path):
+        files = [os.path.join(root, name)
+                 for root, _, names in os.walk(path)
+                 for name in names if name.endswith(tuple(config.DATA_FILE_EXTENSIONS))]
+    elif glob.has_magic(path):
+        files = [file for file in glob.glob(path, recursive=True) if os.path.isfile(file)]
+    else:
+        files = [path] if os.path.exists(path) else []
+    return [(file, partition_date(file)) for file in sorted(files)]
+
+
+def partition_date(path):
+    """Fecha de la partición (<PARTITION_KEY>=YYYY-MM-DD) en la ruta, o None."""
+    prefix = f"{config.PARTITION_KEY}="
+    for part in reversed(os.path.normpath(path).split(os.sep)):
+        if part.startswith(prefix):
+            try:
+                return pd.Timestamp(part[len(prefix):])
+            except ValueError:
+                return None
+    return None
+
+
+def concat_frames(frames):
+    """
+    Concatena DataFrames con el mismo esquema conservando las columnas categóricas:
+    las categorías de cada archivo se unifican (ordenadas) antes de concatenar.
+    """
+    frames = [frame for frame in frames if len(frame.columns)]
+    categorical = [col for col in frames[0].columns
+                   if all(isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames)]
+    for col in categorical:
+        categories = sorted(set().union(*(frame[col].cat.categories for frame in frames)))
+        frames = [frame.assign(**{col: frame[col].cat.set_categories(categories)}) for frame in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+def _full_watermark(path, n_rows):
+    """Marca de agua de un archivo leído completo, o None si no se puede extender después."""
+    if compression_of(path) is not None or not ends_with_newline(path):
+        return None
+    return file_watermark(path, os.path.getsize(path), n_rows)
+
+
+def _typed_parse(parse, kwargs):
+    """Parsea con los tipos declarados y, si no aplican, con tipos inferidos (como read_file)."""
+    try:
+        return parse(**kwargs)
+    except (ValueError, TypeError, OverflowError):
+        return parse(usecols=kwargs['usecols'])
+
+
+def _check_schema(path, columns, expected):
+    """Exige que un archivo tenga las mismas columnas que el primero; devuelve la referencia."""
+    if expected is not None and list(columns) != list(expected):
+        raise ValueError(f"Esquema distinto en '{path}': columnas {list(columns)}, se esperaban {list(expected)}")
+    return list(columns)
+
+
+def _read_partition(path, use_float32, engine, use_cache, irrelevant_cols, expected_columns):
+    """Lee un archivo en un worker (la configuración del proceso padre se pasa explícita)."""
+    loader = DataLoader(use_float32=use_float32, engine=engine, use_cache=use_cache)
+    loader.irrelevant_cols = irrelevant_cols
+    return loader.read_file(path, expected_columns=expected_columns, verbose=False)
+
+
 if __name__ == "__main__":
     # Prueba del módulo
     loader = DataLoader()
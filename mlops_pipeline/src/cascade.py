@@ -0,0 +1,137 @@
+"""
+Módulo de scoring en cascada.
+Define CascadeClassifier: un modelo barato (etapa 1) puntúa todas las transacciones y
+solo las que caen en una banda de probabilidad incierta se envían al modelo caro
+(etapa 2). La banda se calibra offline con calibrate_band para que la decisión de la
+cascada difiera de la del modelo caro en como máximo una fracción dada de las
+transacciones; esa fracción acota la pérdida de accuracy frente al modelo caro.
+"""
+
+import numpy as np
+try:
+    from mlops_pipeline.src import config
+except ImportError:
+    from . import config
+
+
+class CascadeClassifier:
+    """
+    Clasificador de dos etapas con interfaz predict/predict_proba.
+    """
+
+    def __init__(self, first_stage, second_stage, low, high, threshold=None,
+                 first_stage_name=None, second_stage_name=None):
+        """
+        Args:
+            first_stage: Modelo barato que puntúa todo el tráfico.
+            second_stage: Modelo caro para la banda incierta.
+            low (float): Límite inferior (incluido) de la banda incierta.
+            high (float): Límite superior (excluido) de la banda incierta.
+            threshold (float, optional): Umbral de decisión. Por defecto config.DECISION_THRESHOLD.
+            first_stage_name (str, optional): Nombre del modelo de la etapa 1.
+            second_stage_name (str, optional): Nombre del modelo de la etapa 2.
+        """
+        self.first_stage = first_stage
+        self.second_stage = second_stage
+        self.low = low
+        self.high = high
+        self.threshold = threshold if threshold is not None else config.DECISION_THRESHOLD
+        self.first_stage_name = first_stage_name or type(first_stage).__name__
+        self.second_stage_name = second_stage_name or type(second_stage).__name__
+        self.classes_ = getattr(second_stage, 'classes_', np.array([0, 1]))
+
+    def predict_proba_with_stage(self, X):
+        """
+        Puntúa con la etapa 1 y reenvía la banda incierta a la etapa 2.
+
+        Returns:
+            tuple: (probabilidades de fraude, etapa que produjo cada score: 1 o 2)
+        """
+        proba = self.first_stage.predict_proba(X)[:, 1]
+        stage = np.ones(len(proba), dtype=np.int8)
+        uncertain = (proba >= self.low) & (proba < self.high)
+        if uncertain.any():
+            proba = proba.copy()
+            proba[uncertain] = self.second_stage.predict_proba(X[uncertain])[:, 1]
+            stage[uncertain] = 2
+        return proba, stage
+
+    def predict_proba(self, X):
+        proba, _ = self.predict_proba_with_stage(X)
+        return np.column_stack([1 - proba, proba])
+
+    def predict(self, X):
+        proba, _ = self.predict_proba_with_stage(X)
+        return (proba >= self.threshold).astype(int)
+
+
+def calibrate_band(first_proba, second_proba, y_true=None, threshold=None, max_disagreement=None,
+                   grid_size=None):
+    """
+    Busca la banda [low, high) que envía menos tráfico a la etapa 2 manteniendo el
+    desacuerdo con las decisiones del modelo caro por debajo de max_disagreement.
+
+    Fuera de la banda la cascada decide con la etapa 1, así que solo hay desacuerdo en
+    las filas fuera de la banda donde ambas etapas deciden distinto. Como la accuracy
+    solo puede cambiar en esas filas, el desacuerdo acota la pérdida de accuracy.
+
+    Args:
+        first_proba (array): Probabilidades de la etapa 1 en datos de calibración.
+        second_proba (array): Probabilidades de la etapa 2 en los mismos datos.
+        y_true (array, optional): Etiquetas reales, para informar la pérdida de accuracy observada.
+        threshold (float, optional): Umbral de decisión. Por defecto config.DECISION_THRESHOLD.
+        max_disagreement (float, optional): Fracción máxima de decisiones distintas del modelo caro.
+                                            Por defecto config.CASCADE_MAX_ACCURACY_LOSS.
+        grid_size (int, optional): Candidatos por límite. Por defecto config.CASCADE_BAND_GRID.
+
+    Returns:
+        dict: low, high, second_stage_fraction, disagreement y, con y_true, accuracy_loss.
+    """
+    threshold = threshold if threshold is not None else config.DECISION_THRESHOLD
+    max_disagreement = max_disagreement if max_disagreement is not None else config.CASCADE_MAX_ACCURACY_LOSS
+    grid_size = grid_size if grid_size is not None else config.CASCADE_BAND_GRID
+
+    p1 = np.asarray(first_proba, dtype=np.float64)
+    p2 = np.asarray(second_proba, dtype=np.float64)
+    n = len(p1)
+    disagree = (p1 >= threshold) != (p2 >= threshold)
+
+    # Candidatos: cuantiles de la etapa 1 a cada lado del umbral (más los extremos)
+    below, above = p1[p1 < threshold], p1[p1 >= threshold]
+    quantiles = np.linspace(0, 1, grid_size)
+    lows = np.unique(np.r_[0.0, np.quantile(below, quantiles) if len(below) else [], threshold])
+    # La banda excluye high: el siguiente flotante hace que el propio cuantil quede dentro
+    above_q = np.nextafter(np.quantile(above, quantiles), np.inf) if len(above) else []
+    highs = np.unique(np.r_[threshold, above_q, np.inf])
+
+    # Conteos acumulados: filas y desacuerdos por debajo de low / desde high
+    order = np.argsort(p1, kind='mergesort')
+    p_sorted, disagree_sorted = p1[order], disagree[order]
+    cum_disagree = np.r_[0, np.cumsum(disagree_sorted)]
+    idx_low = np.searchsorted(p_sorted, lows, side='left')
+    idx_high = np.searchsorted(p_sorted, highs, side='left')
+
+    routed = (idx_high[None, :] - idx_low[:, None]) / n
+    outside = (cum_disagree[idx_low][:, None]
+               + (cum_disagree[-1] - cum_disagree[idx_high])[None, :]) / n
+    feasible = (outside <= max_disagreement) & (idx_high[None, :] >= idx_low[:, None])
+
+    # La banda que abarca todo siempre es factible (desacuerdo 0)
+    candidates = np.where(feasible, routed, np.inf)
+    i, j = np.unravel_index(np.argmin(candidates), candidates.shape)
+    low, high = float(lows[i]), float(highs[j])
+
+    uncertain = (p1 >= low) & (p1 < high)
+    result = {
+        'low': low,
+        'high': high,
+        'threshold': threshold,
+        'second_stage_fraction': float(uncertain.mean()),
+        'disagreement': float((disagree & ~uncertain).mean()),
+        'max_disagreement': max_disagreement
+    }
+    if y_true is not None:
+        y_true = np.asarray(y_true)
+        cascade_pred = np.where(uncertain, p2, p1) >= threshold
+        result['accuracy_loss'] = float(((p2 >= threshold) == y_true).mean() - (cascade_pred == y_true).mean())
+    return result
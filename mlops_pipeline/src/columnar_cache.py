@@ -0,0 +1,331 @@
+"""
+Módulo de caché columnar del dataset.
+Convierte una sola vez el CSV en un directorio con un archivo binario por columna
+(valores crudos, o códigos más un diccionario de categorías para las categóricas)
+y un manifest.json con el esquema y la huella del origen. Las cargas siguientes
+mapean las columnas en memoria (np.memmap): no se parsea texto, no se copian los
+datos y los procesos que leen el mismo dataset comparten las páginas del sistema.
+El mapeo es copy-on-write: el DataFrame admite asignaciones, que copian solo las
+páginas modificadas y nunca se escriben en la caché.
+Si el origen solo creció por el final, la entrada se extiende en el sitio con las
+filas nuevas (append) en lugar de regenerarse.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+try:
+    from mlops_pipeline.src import config
+except ImportError:
+    from . import config
+
+
+MANIFEST_FILE = "manifest.json"
+CACHE_VERSION = 2
+PREFIX_HASH_BYTES = 64 * 1024  # Bytes al inicio y al final de la parte ya leída que deben coincidir
+
+
+def source_fingerprint(path, sample_bytes=None, samples=None):
+    """
+    Huella barata de un archivo: tamaño, mtime y hash de bloques muestreados.
+
+    Los bloques se reparten uniformemente (el primero al inicio y el último al final),
+    así que detecta cambios sin leer el archivo completo.
+
+    Args:
+        path (str): Archivo de origen.
+        sample_bytes (int, optional): Bytes por bloque. Por defecto config.DATASET_CACHE_SAMPLE_BYTES.
+        samples (int, optional): Bloques muestreados. Por defecto config.DATASET_CACHE_SAMPLES.
+
+    Returns:
+        dict: size, mtime_ns y sample_hash.
+    """
+    sample_bytes = sample_bytes if sample_bytes is not None else config.DATASET_CACHE_SAMPLE_BYTES
+    samples = samples if samples is not None else config.DATASET_CACHE_SAMPLES
+    stat = os.stat(path)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        last_offset = max(stat.st_size - sample_bytes, 0)
+        for offset in np.unique(np.linspace(0, last_offset, max(samples, 1)).astype(np.int64)):
+            f.seek(int(offset))
+            digest.update(f.read(sample_bytes))
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sample_hash': digest.hexdigest()}
+
+
+def prefix_hash(path, end):
+    """
+    Hash del inicio y del final de los primeros `end` bytes de un archivo.
+
+    Permite comprobar que un archivo que creció conserva la parte ya leída (cabecera
+    incluida) sin releerla. Como la huella muestreada, no detecta cambios en el medio.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        digest.update(f.read(min(PREFIX_HASH_BYTES, end)))
+        f.seek(max(end - PREFIX_HASH_BYTES, 0))
+        digest.update(f.read(min(PREFIX_HASH_BYTES, end)))
+    return digest.hexdigest()
+
+
+class ColumnarCache:
+    """
+    Caché en disco de DataFrames en formato columnar mapeable en memoria.
+    Cada archivo de origen tiene una entrada; se invalida si cambian la huella del
+    archivo o las opciones de lectura (columnas y tipos).
+    """
+
+    def __init__(self, cache_dir=None):
+        """
+        Args:
+            cache_dir (str, optional): Directorio de la caché. Por defecto config.DATASET_CACHE_DIR.
+        """
+        self.cache_dir = cache_dir or config.DATASET_CACHE_DIR
+
+    def entry_dir(self, path):
+        """Directorio de la entrada de un archivo de origen."""
+        key = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{os.path.basename(path)}-{key}")
+
+    def read_manifest(self, path):
+        manifest_path = os.path.join(self.entry_dir(path), MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def watermark(self, path, options):
+        """
+        Marca de agua de la entrada (hasta qué byte del origen cubre), o None si no hay
+        entrada para estas opciones o no se puede extender.
+        """
+        manifest = self.read_manifest(path)
+        if manifest is None or manifest.get('version') != CACHE_VERSION:
+            return None
+        if manifest.get('options') != _normalize(options):
+            return None
+        return manifest.get('watermark')
+
+    def is_valid(self, path, options, manifest=None):
+        """Indica si la entrada corresponde al archivo actual y a las opciones de lectura."""
+        manifest = manifest if manifest is not None else self.read_manifest(path)
+        if manifest is None or manifest.get('version') != CACHE_VERSION:
+            return False
+        if manifest.get('options') != _normalize(options):
+            return False
+        return manifest.get('source') == source_fingerprint(path)
+
+    def load(self, path, options):
+        """
+        Carga la entrada de un archivo mapeando sus columnas en memoria.
+
+        Args:
+            path (str): Archivo de origen.
+            options (dict): Opciones de lectura con las que se generó la entrada.
+
+        Returns:
+            pd.DataFrame o None: DataFrame mapeado en memoria, o None si no hay entrada válida.
+        """
+        manifest = self.read_manifest(path)
+        if not self.is_valid(path, options, manifest):
+            return None
+        entry = self.entry_dir(path)
+        n_rows = manifest['n_rows']
+        data = {}
+        for column in manifest['columns']:
+            values = _map_column(os.path.join(entry, column['file']), column['dtype'], n_rows)
+            if column['kind'] == 'category':
+                data[column['name']] = pd.Categorical.from_codes(values, categories=column['categories'])
+            elif column['kind'] == 'datetime':
+                data[column['name']] = values.view(column['datetime_dtype'])
+            else:
+                data[column['name']] = values
+        # copy=False conserva cada columna sobre su memmap (sin consolidar bloques)
+        return pd.DataFrame(data, copy=False)
+
+    def store(self, df, path, options, watermark=None):
+        """
+        Escribe el DataFrame como entrada del archivo de origen.
+        La entrada se escribe en un directorio temporal y se publica con un rename.
+
+        Solo se guardan columnas numéricas, de fecha o categóricas. Una columna de texto
+        (object) se guardaría como categórica y la recarga no tendría el tipo del parseo,
+        así que un DataFrame con alguna no se cachea.
+
+        Args:
+            df (pd.DataFrame): Datos ya parseados y tipados.
+            path (str): Archivo de origen.
+            options (dict): Opciones de lectura usadas para parsearlo.
+            watermark (dict, optional): Hasta qué byte del origen cubre la entrada; sin
+                                        marca de agua la entrada no se puede extender.
+
+        Returns:
+            str o None: Directorio de la entrada, o None si el DataFrame tiene columnas
+                        que no se pueden mapear.
+        """
+        if not all(_is_mappable(df[name]) for name in df.columns):
+            return None
+        entry = self.entry_dir(path)
+        tmp_entry = f"{entry}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        os.makedirs(tmp_entry)
+
+        columns = []
+        for i, name in enumerate(df.columns):
+            series = df[name]
+            column = {'name': name, 'file': f"col_{i:04d}.bin"}
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                categorical = series.array
+                values = categorical.codes
+                column.update(kind='category', categories=categorical.categories.tolist())
+            elif pd.api.types.is_datetime64_dtype(series):
+                values = series.to_numpy().view(np.int64)
+                column.update(kind='datetime', datetime_dtype=str(series.dtype))
+            else:
+                values = series.to_numpy()
+                column.update(kind='numeric')
+            column['dtype'] = values.dtype.str
+            np.ascontiguousarray(values).tofile(os.path.join(tmp_entry, column['file']))
+            columns.append(column)
+
+        manifest = {
+            'version': CACHE_VERSION,
+            'source': source_fingerprint(path),
+            'options': _normalize(options),
+            'n_rows': len(df),
+            'columns': columns,
+            'watermark': watermark
+        }
+        with open(os.path.join(tmp_entry, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp_entry, entry)
+        return entry
+
+    def append(self, df, path, options, watermark=None):
+        """
+        Extiende en el sitio la entrada de un origen que creció por el final.
+
+        Los valores nuevos se añaden al final de cada archivo de columna. Si aparecen
+        categorías nuevas, la columna se reescribe (solo sus códigos) con las categorías
+        ordenadas, igual que en una carga completa. El manifest se publica al final con
+        un rename: hasta entonces los lectores ven la entrada anterior, y los bytes
+        añadidos por una extensión interrumpida se descartan en la siguiente.
+
+        Args:
+            df (pd.DataFrame): Filas nuevas, parseadas con las mismas opciones.
+            path (str): Archivo de origen.
+            options (dict): Opciones de lectura de la entrada.
+            watermark (dict, optional): Nueva marca de agua de la entrada.
+
+        Returns:
+            str o None: Directorio de la entrada, o None si las filas nuevas no encajan
+                        (columnas o tipos distintos) y hay que regenerarla con store.
+        """
+        manifest = self.read_manifest(path)
+        if manifest is None or manifest.get('options') != _normalize(options):
+            return None
+        if list(df.columns) != [column['name'] for column in manifest['columns']]:
+            return None
+        entry = self.entry_dir(path)
+        n_rows, total = manifest['n_rows'], manifest['n_rows'] + len(df)
+
+        # Primero se preparan todas las columnas: si alguna no encaja no se escribe nada
+        plans = []
+        for column in manifest['columns']:
+            column = dict(column)
+            values, rewrite = _append_values(df[column['name']], column, entry, n_rows)
+            if values is None:
+                return None
+            plans.append((column, values, rewrite))
+
+        columns, replaced = [], []
+        for i, (column, values, rewrite) in enumerate(plans):
+            if rewrite:
+                replaced.append(column['file'])
+                column['file'] = f"col_{i:04d}_{total}.bin"
+                np.ascontiguousarray(values).tofile(os.path.join(entry, column['file']))
+            else:
+                file_path = os.path.join(entry, column['file'])
+                with open(file_path, 'r+b') as f:
+                    f.truncate(n_rows * values.dtype.itemsize)
+                    f.seek(0, os.SEEK_END)
+                    np.ascontiguousarray(values).tofile(f)
+            columns.append(column)
+
+        manifest.update(source=source_fingerprint(path), n_rows=total, columns=columns,
+                        watermark=watermark)
+        tmp_manifest = os.path.join(entry, f"{MANIFEST_FILE}.tmp-{os.getpid()}")
+        with open(tmp_manifest, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_manifest, os.path.join(entry, MANIFEST_FILE))
+        for file in replaced:
+            os.remove(os.path.join(entry, file))
+        return entry
+
+    def invalidate(self, path=None):
+        """Elimina la entrada de un archivo (o toda la caché si path es None)."""
+        shutil.rmtree(self.entry_dir(path) if path else self.cache_dir, ignore_errors=True)
+
+
+def _is_mappable(series):
+    """Indica si la columna tiene un tipo que la caché recarga igual (no texto object)."""
+    return (isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_datetime64_dtype(series)
+            or (pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_object_dtype(series)))
+
+
+def _map_column(file_path, dtype, n_rows):
+    if n_rows == 0:
+        return np.empty(0, dtype=dtype)
+    # Vista ndarray sobre el memmap: comparte memoria sin propagar la subclase a pandas.
+    # mode='c' (copy-on-write): las escrituras quedan en memoria y no llegan al archivo
+    return np.memmap(file_path, dtype=dtype, mode='c', shape=(n_rows,)).view(np.ndarray)
+
+
+def _append_values(series, column, entry, n_rows):
+    """
+    Valores a escribir de una columna al extender una entrada.
+
+    Returns:
+        tuple: (valores, reescribir). Con reescribir=True los valores son la columna
+               completa (categorías nuevas); si no, solo las filas nuevas. (None, False)
+               si la serie no encaja con la columna guardada.
+    """
+    dtype = np.dtype(column['dtype'])
+    if column['kind'] == 'category':
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            return None, False
+        categorical = series.array
+        known = column['categories']
+        known_set = set(known)
+        new = [category for category in categorical.categories if category not in known_set]
+        if not new:
+            return pd.Categorical(series, categories=known).codes.astype(dtype), False
+        try:
+            categories = sorted(known + new)
+        except TypeError:
+            return None, False
+        if len(categories) - 1 > np.iinfo(dtype).max:
+            return None, False
+        # Los códigos guardados se remapean a las categorías ordenadas
+        mapping = pd.Index(categories).get_indexer(known).astype(dtype)
+        old = _map_column(os.path.join(entry, column['file']), dtype, n_rows)
+        old = np.where(old >= 0, mapping[np.maximum(old, 0)], -1).astype(dtype)
+        new_codes = pd.Categorical(series, categories=categories).codes.astype(dtype)
+        column['categories'] = categories
+        return np.concatenate([old, new_codes]), True
+    if column['kind'] == 'datetime':
+        if str(series.dtype) != column['datetime_dtype']:
+            return None, False
+        return series.to_numpy().view(np.int64), False
+    if not (pd.api.types.is_numeric_dtype(series) and series.to_numpy().dtype == dtype):
+        return None, False
+    return series.to_numpy(), False
+
+
+def _normalize(options):
+    """Opciones de lectura en forma comparable con el JSON del manifest."""
+    return json.loads(json.dumps(options, default=str))
@@ -8,6 +8,14 @@ DATA_PATH = "financial_fraud_dataset.csv"
 MODEL_PATH = "best_model.joblib"
 PREPROCESSOR_PATH = "preprocessor.joblib"
 
+# Formato de los artefactos: "compact" (cabecera de metadatos + pickle protocolo 5 con
+# buffers fuera de banda, mapeables en memoria) o "joblib" (pickle clásico).
+# La carga detecta el formato automáticamente, por lo que ambos conviven.
+ARTIFACT_FORMAT = "compact"
+ARTIFACT_COMPRESSION = "none"  # "none" (permite mmap), "zlib", "bz2", "lzma" o "zstd" (si está instalado)
+ARTIFACT_COMPRESSION_LEVEL = 3
+ARTIFACT_VERIFY_CHECKSUM = True  # Verificar el SHA-256 del contenido al cargar
+
 # ==================== VARIABLES DEL DATASET ====================
 TARGET_VARIABLE = "is_fraud"
 IRRELEVANT_COLS = ["transaction_id", "timestamp", "customer_id"]
@@ -18,13 +26,148 @@ NUMERICAL_COLS = ["amount", "customer_age", "previous_transactions"]
 # Columnas categóricas
 CATEGORICAL_COLS = ["merchant_category", "customer_location", "device_type"]
 
+# Mantener toda la ruta numérica (CSV → preprocesamiento → remuestreo → modelos → API)
+# en float32 cuando los estimadores lo soportan. Reduce a la mitad la memoria de las matrices.
+USE_FLOAT32 = False
+
 # Valores permitidos para las columnas categóricas (se determinarán dinámicamente)
 ALLOWED_TYPES = []  # No aplicable para este dataset
 
+# ==================== CARGA DE DATOS ====================
+# DATA_PATH puede ser un archivo, un glob ("data/*.csv") o un directorio de particiones (date=YYYY-MM-DD/)
+DATA_FILE_EXTENSIONS = [".csv", ".csv.gz", ".csv.zst"]  # Archivos que se leen al recorrer un directorio
+PARTITION_KEY = "date"  # Clave de las particiones por fecha en las rutas (date=2024-01-31/)
+DATA_LOAD_N_JOBS = -1  # Procesos para leer varios archivos en paralelo
+# Tipos explícitos al parsear el CSV; las columnas de CATEGORICAL_COLS se leen como 'category'
+COLUMN_DTYPES = {
+    "amount": "float32",
+    "customer_age": "int16",  # int8 desbordaría en silencio con edades inválidas (> 127)
+    "previous_transactions": "int32",
+    "is_fraud": "int8"
+}
+CSV_ENGINE = "auto"  # "auto" (pyarrow multihilo si está instalado), "pyarrow" o "c"
+DATASET_CACHE_ENABLED = True  # Convertir el CSV una vez a columnas binarias y mapearlas en memoria
+DATASET_CACHE_DIR = ".data_cache"
+DATASET_CACHE_SAMPLE_BYTES = 1 << 20  # Bytes por bloque en el hash muestreado del archivo de origen
+DATASET_CACHE_SAMPLES = 8  # Bloques muestreados (repartidos entre el inicio y el final del archivo)
+STREAM_BATCH_SIZE = 100_000  # Filas por lote en DataLoader.iter_batches
+STREAM_READ_AHEAD = 2  # Lotes leídos por adelantado en un hilo aparte (0 lee en el hilo del consumidor)
+DECOMPRESS_BUFFER_BYTES = 8 << 20  # Bytes por lectura al descomprimir archivos .gz/.zst en streaming
+DECOMPRESS_THREADED = True  # Descomprimir en un hilo aparte, solapado con el parseo
+DECOMPRESS_READ_AHEAD = 4  # Bloques descomprimidos en espera (memoria ~ bloques × DECOMPRESS_BUFFER_BYTES)
+ROW_INDEX_DIR = ".row_index"  # Índices de offsets de filas para muestreo y lectura por rangos
+ROW_INDEX_BLOCK_BYTES = 16 << 20  # Bytes por bloque al recorrer el CSV para construir el índice
+INGESTION_WATERMARKS_PATH = ".ingestion_watermarks.json"  # Hasta dónde se leyó cada archivo en DataLoader.load_new
+
+# ==================== VALIDACIÓN DE DATOS ====================
+# Reglas por fila de DataValidator: rango ("min"/"max", incluidos) o valores permitidos ("allowed").
+# Además se comprueban siempre el esquema, los tipos y los nulos de las columnas esperadas.
+VALIDATION_RULES = {
+    "amount_non_negative": {"column": "amount", "min": 0},
+    "customer_age_range": {"column": "customer_age", "min": 18, "max": 100},
+    "is_fraud_binary": {"column": "is_fraud", "allowed": [0, 1]},
+    "previous_transactions_non_negative": {"column": "previous_transactions", "min": 0}
+}
+VALIDATION_SAMPLE_ROWS = 5  # Índices de filas de ejemplo guardados por regla incumplida
+VALIDATION_BLOCK_ROWS = 1 << 20  # Filas por bloque de la pasada de validación (acota la memoria de las máscaras)
+VALIDATION_N_JOBS = 1  # Procesos de DataValidator.validate_stream (-1: todos los núcleos)
+VALIDATION_MODE = "quarantine"  # "strict" (cualquier violación aborta) o "quarantine" (se apartan las filas inválidas)
+MAX_REJECT_RATE = 0.01  # Fracción máxima de filas en cuarentena; por encima se aborta el pipeline
+QUARANTINE_DIR = "quarantine"  # CSV con las filas rechazadas y sus motivos (uno por ejecución)
+
+# ==================== CODIFICACIÓN CATEGÓRICA ====================
+SPARSE_OUTPUT = False  # Mantener la matriz transformada dispersa (CSR) en entrenamiento y API
+CATEGORICAL_ENCODING = "onehot"  # "onehot" o "hashing" (ancho fijo, tolera valores no vistos)
+CATEGORY_MIN_FREQUENCY = None  # Frecuencia mínima (conteo o proporción); el resto se agrupa como 'infrequent'
+CATEGORY_MAX_CATEGORIES = None  # Máximo de columnas one-hot por variable (incluida 'infrequent')
+HASHING_N_FEATURES = 1024  # Columnas generadas por el encoder de hashing
+
 # ==================== PARÁMETROS DE MODELADO ====================
 TEST_SIZE = 0.2
 RANDOM_STATE = 42
 
+# ==================== MANEJO DEL DESBALANCEO ====================
+IMBALANCE_STRATEGY = "smote"  # "class_weight", "undersample", "smote" o "scalable_smote"
+IMBALANCE_RATIO_THRESHOLD = 2.0  # Ratio mayoritaria:minoritaria a partir del cual se balancea
+SMOTE_K_NEIGHBORS = 5  # Vecinos usados para interpolar muestras sintéticas
+SMOTE_BATCH_SIZE = 10000  # Filas por lote en la búsqueda de vecinos y en la síntesis (scalable_smote)
+SMOTE_MAX_REFERENCE_SIZE = 50000  # Por encima, los vecinos se buscan en una muestra (búsqueda aproximada)
+
+# ==================== XGBOOST ====================
+XGB_N_ESTIMATORS = 300  # Máximo de rondas de boosting (el early stopping decide cuántas se conservan)
+XGB_TREE_METHOD = "hist"  # Construcción de árboles por histogramas
+XGB_MAX_BIN = 256  # Bins por feature del método hist
+XGB_N_JOBS = -1  # Hilos de XGBoost (-1 = todos los núcleos)
+XGB_EARLY_STOPPING_ROUNDS = 30  # Rondas sin mejora en validación antes de detenerse (None lo desactiva)
+XGB_VALIDATION_SIZE = 0.15  # Fracción del train, separada antes de remuestrear, para el early stopping
+
+# ==================== EVALUACIÓN ====================
+DECISION_THRESHOLD = 0.5  # Umbral de probabilidad para clasificar una transacción como fraude
+BOOTSTRAP_ITERATIONS = 200  # Réplicas bootstrap para los intervalos de confianza (0 las desactiva)
+BOOTSTRAP_CONFIDENCE_LEVEL = 0.95
+BOOTSTRAP_MAX_CHUNK_ELEMENTS = 20_000_000  # Tamaño máximo (réplicas × umbrales) de cada bloque vectorizado
+BOOTSTRAP_MAX_BINS = 10_000  # Bloques contiguos de scores en el bootstrap (error del AUC ~ 1/bloques)
+THRESHOLD_SWEEP_POINTS = 19  # Umbrales equiespaciados en (0, 1) del barrido de métricas
+
+# ==================== PRESUPUESTO DE LATENCIA ====================
+LATENCY_BUDGET_MS_P99 = 50.0  # p99 máximo (ms) de la predicción de una transacción; None lo desactiva
+MAX_MODEL_SIZE_MB = 200.0  # Tamaño máximo del modelo serializado; None lo desactiva
+LATENCY_SINGLE_ROW_CALLS = 200  # Predicciones de una fila medidas por modelo candidato
+LATENCY_BATCH_SIZE = 1000  # Filas por lote en la medición de lotes
+LATENCY_BATCH_CALLS = 20  # Lotes medidos por modelo candidato
+
+# ==================== SCORING EN CASCADA ====================
+CASCADE_ENABLED = True  # Calibrar y exportar una cascada (modelo barato + mejor modelo) al entrenar
+CASCADE_FIRST_STAGE = "LogisticRegression"  # Modelo barato que puntúa todo el tráfico
+CASCADE_MAX_ACCURACY_LOSS = 0.01  # Fracción máxima de decisiones distintas de las del mejor modelo
+CASCADE_BAND_GRID = 200  # Candidatos por límite de la banda incierta en la calibración
+CASCADE_MODEL_PATH = "cascade_model.joblib"
+SERVING_MODE = "single"  # "single" (mejor modelo) o "cascade" (requiere CASCADE_MODEL_PATH)
+
+# ==================== SCORING CON DEADLINE ====================
+DEADLINE_HEADER = "X-Deadline-Ms"  # Cabecera con el tiempo máximo de respuesta en ms
+FALLBACK_MODEL_PATH = "fallback_model.joblib"  # Modelo más rápido que el mejor, usado si no llega al deadline
+LATENCY_EWMA_ALPHA = 0.2  # Peso de cada llamada observada en la estimación de costo por modelo
+DEADLINE_SAFETY_FACTOR = 1.2  # Margen aplicado a la estimación de costo antes de compararla con el deadline
+
+# ==================== VALIDACIÓN CRUZADA ====================
+CV_FOLDS = 5  # Folds estratificados para seleccionar el modelo (<= 1 desactiva la CV)
+CV_N_JOBS = -1  # Procesos para evaluar los pares (modelo, fold) en paralelo
+CV_CONFIDENCE_LEVEL = 0.95  # Nivel de confianza de los intervalos de las métricas
+CV_SELECTION_CRITERION = "lower_ci"  # "mean" (media del AUC) o "lower_ci" (cota inferior del IC)
+CV_CACHE_DIR = ".cv_cache"  # Folds preprocesados y remuestreados reutilizables entre ejecuciones
+CV_CACHE_MAX_ENTRIES = 3  # Juegos de folds conservados en la caché (se eliminan los menos usados)
+
+# ==================== ENTRENAMIENTO DISTRIBUIDO ====================
+SHARDED_TRAINING_SHARDS = 1  # Shards de filas para LogisticRegression y RandomForest (1 lo desactiva)
+SHARDED_TRAINING_N_JOBS = -1  # Procesos locales que entrenan los shards
+
+# ==================== REENTRENAMIENTO INCREMENTAL ====================
+INCREMENTAL_XGB_ROUNDS = 50  # Rondas de boosting adicionales de XGBoost por actualización
+INCREMENTAL_RF_TREES = 20  # Árboles adicionales de RandomForest (warm_start) por actualización
+INCREMENTAL_LINEAR_MAX_ITER = 20  # Iteraciones de LogisticRegression partiendo de los coeficientes actuales
+INCREMENTAL_HOLDOUT_SIZE = 0.3  # Fracción de los datos nuevos reservada para la puerta de promoción
+PROMOTION_METRICS = ["roc_auc", "average_precision"]  # Métricas que no pueden empeorar
+PROMOTION_TOLERANCE = 0.005  # Caída máxima permitida en cada métrica para promover el candidato
+
+# ==================== EJECUCIÓN DEL PIPELINE (DAG) ====================
+PIPELINE_CACHE_DIR = ".pipeline_cache"  # Salidas de cada etapa indexadas por la huella de sus entradas
+PIPELINE_MAX_WORKERS = 4  # Etapas independientes ejecutadas a la vez (hilos)
+
+# ==================== REPORTES DE ENTRENAMIENTO ====================
+REPORT_DIR = "reports"  # Métricas almacenadas y gráficos generados
+REPORT_FORMATS = ["png"]  # Formatos de salida de los gráficos (png, svg, pdf...)
+REPORT_DPI = 150  # Resolución de los gráficos rasterizados
+REPORT_BACKGROUND = True  # Renderizar en un proceso aparte, fuera de la ruta crítica del entrenamiento
+
+# ==================== PROFILING DEL PIPELINE ====================
+PROFILING_ENABLED = True  # Registrar tiempo de pared, CPU y memoria por etapa en un JSON por ejecución
+PROFILE_DIR = "profiles"  # Directorio de los perfiles JSON (y de los volcados de cProfile)
+PROFILE_TRACE_MEMORY = False  # tracemalloc: memoria pico asignada por etapa (añade sobrecosto)
+PROFILE_CPROFILE = False  # Volcar un archivo .prof de cProfile por etapa
+PROFILE_RSS_INTERVAL = 0.05  # Segundos entre muestras de RSS
+PROFILE_REGRESSION_THRESHOLD = 0.10  # Aumento relativo a partir del cual una etapa se marca como regresión
+
 # ==================== UMBRALES DE MONITOREO ====================
 KS_THRESHOLD = 0.05  # Umbral para el test Kolmogorov-Smirnov
 CHI2_THRESHOLD = 0.05  # Umbral para el test Chi-cuadrado
@@ -0,0 +1,267 @@
+"""
+Módulo de validación cruzada estratificada.
+Define FoldCache, que prepara cada fold una sola vez (ajuste del preprocesador y
+remuestreo) y lo cachea en disco, y CrossValidator, que evalúa en paralelo todos
+los pares (modelo, fold) y agrega las métricas con intervalos de confianza.
+"""
+
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import joblib
+import xgboost as xgb
+from joblib import Parallel, delayed
+from scipy import stats
+from sklearn.base import clone
+from sklearn.model_selection import StratifiedKFold, train_test_split
+try:
+    from mlops_pipeline.src.evaluation import evaluate_scores
+    from mlops_pipeline.src import config
+except ImportError:
+    from .evaluation import evaluate_scores
+    from . import config
+
+
+CV_METRICS = ['accuracy', 'precision', 'recall', 'f1_score', 'roc_auc']
+
+
+def _prepare_fold(fold_idx, X, y, train_idx, val_idx, preprocessor, resampler, path,
+                  stopping_size=None, random_state=None, full_train=True):
+    """
+    Ajusta el preprocesador con el train del fold, transforma y remuestrea.
+    Con stopping_size, además separa del train sin remuestrear la validación del early
+    stopping de XGBoost y remuestrea el resto, igual que ModelTrainer.fit_model. El
+    train completo remuestreado (un segundo remuestreo) solo se genera con full_train,
+    para los modelos que no usan early stopping.
+    El resultado se escribe en un temporal y se mueve a path, de modo que un fold
+    interrumpido nunca se toma por cacheado; los workers lo mapean en memoria.
+    """
+    X_tr, X_val = X.iloc[train_idx], X.iloc[val_idx]
+    y_tr, y_val = y.iloc[train_idx], y.iloc[val_idx]
+
+    fold_preprocessor = clone(preprocessor)
+    X_tr_processed = fold_preprocessor.fit_transform(X_tr)
+    X_val_processed = fold_preprocessor.transform(X_val)
+
+    fold = {'fold': fold_idx, 'X_val': X_val_processed, 'y_val': np.asarray(y_val)}
+    if stopping_size:
+        X_fit, X_stop, y_fit, y_stop = train_test_split(
+            X_tr_processed, y_tr, test_size=stopping_size, random_state=random_state, stratify=y_tr
+        )
+        if resampler is not None:
+            X_fit, y_fit = resampler(X_fit, y_fit)
+        fold.update({'X_fit': X_fit, 'y_fit': np.asarray(y_fit),
+                     'X_stop': X_stop, 'y_stop': np.asarray(y_stop)})
+
+    if full_train or not stopping_size:
+        if resampler is not None:
+            X_tr_processed, y_tr = resampler(X_tr_processed, y_tr)
+        fold.update({'X_train': X_tr_processed, 'y_train': np.asarray(y_tr)})
+
+    joblib.dump(fold, f'{path}.tmp')
+    os.replace(f'{path}.tmp', path)
+    return path
+
+
+def _fit_and_score(model_name, model, fold_path):
+    """
+    Entrena un clon del modelo sobre un fold cacheado y calcula sus métricas.
+    XGBoost se entrena con early stopping si el fold incluye su validación.
+    """
+    fold = joblib.load(fold_path, mmap_mode='r')
+    estimator = clone(model)
+    if isinstance(estimator, xgb.XGBClassifier) and 'X_stop' in fold:
+        estimator.set_params(early_stopping_rounds=config.XGB_EARLY_STOPPING_ROUNDS)
+        estimator.fit(fold['X_fit'], fold['y_fit'], eval_set=[(fold['X_stop'], fold['y_stop'])], verbose=False)
+    else:
+        estimator.fit(fold['X_train'], fold['y_train'])
+
+    y_prob = estimator.predict_proba(fold['X_val'])[:, 1]
+    evaluation = evaluate_scores(fold['y_val'], y_prob, n_bootstrap=0)
+    return model_name, fold['fold'], {metric: evaluation[metric] for metric in CV_METRICS}
+
+
+class FoldCache:
+    """
+    Genera los folds estratificados y los cachea en disco.
+    Cada fold se preprocesa y remuestrea una única vez; la clave de caché depende
+    de los datos, del preprocesador, del remuestreo, de la validación del early
+    stopping y de la semilla, de modo que ejecuciones posteriores con las mismas
+    entradas reutilizan los folds. Solo se
+    conservan los max_entries juegos de folds usados más recientemente.
+    """
+
+    def __init__(self, n_splits, preprocessor, resampler=None, random_state=None,
+                 cache_dir=None, n_jobs=None, max_entries=None, stopping_size=None):
+        """
+        Inicializa la caché de folds.
+
+        Args:
+            n_splits (int): Número de folds.
+            preprocessor: Preprocesador sin ajustar (se clona en cada fold).
+            resampler (callable, optional): Función (X, y) -> (X_res, y_res).
+            random_state (int, optional): Semilla de la partición.
+            cache_dir (str, optional): Directorio de la caché. Por defecto config.CV_CACHE_DIR.
+            n_jobs (int, optional): Procesos para preparar los folds. Por defecto config.CV_N_JOBS.
+            max_entries (int, optional): Juegos de folds conservados en disco. Por defecto
+                                         config.CV_CACHE_MAX_ENTRIES.
+            stopping_size (float, optional): Fracción del train de cada fold reservada para el
+                                             early stopping de XGBoost. Por defecto
+                                             config.XGB_VALIDATION_SIZE si
+                                             config.XGB_EARLY_STOPPING_ROUNDS está definido.
+        """
+        self.n_splits = n_splits
+        self.preprocessor = preprocessor
+        self.resampler = resampler
+        self.random_state = random_state if random_state is not None else config.RANDOM_STATE
+        self.cache_dir = cache_dir if cache_dir is not None else config.CV_CACHE_DIR
+        self.n_jobs = n_jobs if n_jobs is not None else config.CV_N_JOBS
+        self.max_entries = max_entries if max_entries is not None else config.CV_CACHE_MAX_ENTRIES
+        if stopping_size is None and config.XGB_EARLY_STOPPING_ROUNDS:
+            stopping_size = config.XGB_VALIDATION_SIZE
+        self.stopping_size = stopping_size
+
+    def _cache_key(self, X, y, full_train=True):
+        """Calcula la huella de las entradas que determinan el contenido de los folds."""
+        return joblib.hash((X, y, self.n_splits, self.random_state,
+                            self.preprocessor, self.resampler, self.stopping_size,
+                            full_train or not self.stopping_size))
+
+    def get_folds(self, X: pd.DataFrame, y: pd.Series, full_train=True):
+        """
+        Devuelve las rutas de los folds cacheados, preparándolos si no existen.
+
+        Args:
+            X (pd.DataFrame): Features sin preprocesar.
+            y (pd.Series): Variable objetivo.
+            full_train (bool): Si se genera también el train completo remuestreado. Con
+                               stopping_size, basta False cuando todos los modelos son XGBoost.
+
+        Returns:
+            list: Rutas de los archivos de cada fold.
+        """
+        fold_dir = os.path.join(self.cache_dir, self._cache_key(X, y, full_train))
+        paths = [os.path.join(fold_dir, f'fold_{i}.joblib') for i in range(self.n_splits)]
+
+        if all(os.path.exists(p) for p in paths):
+            print(f"  ✓ Folds reutilizados desde caché: {fold_dir}")
+            os.utime(fold_dir)
+            self._evict(fold_dir)
+            return paths
+
+        os.makedirs(fold_dir, exist_ok=True)
+        X = X.reset_index(drop=True)
+        y = y.reset_index(drop=True)
+        skf = StratifiedKFold(n_splits=self.n_splits, shuffle=True, random_state=self.random_state)
+
+        Parallel(n_jobs=self.n_jobs)(
+            delayed(_prepare_fold)(i, X, y, train_idx, val_idx,
+                                   self.preprocessor, self.resampler, paths[i],
+                                   self.stopping_size, self.random_state, full_train)
+            for i, (train_idx, val_idx) in enumerate(skf.split(X, y))
+        )
+        print(f"  ✓ {self.n_splits} folds preparados y cacheados en: {fold_dir}")
+        self._evict(fold_dir)
+        return paths
+
+    def _evict(self, current):
+        """Elimina los juegos de folds más antiguos por encima de max_entries (nunca el actual)."""
+        entries = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)]
+        entries = [path for path in entries if os.path.isdir(path) and path != current]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for path in entries[max(self.max_entries - 1, 0):]:
+            shutil.rmtree(path, ignore_errors=True)
+            print(f"  🗑️  Folds antiguos eliminados de la caché: {path}")
+
+
+class CrossValidator:
+    """
+    Evalúa modelos con validación cruzada estratificada.
+    Todos los pares (modelo, fold) se entrenan en paralelo sobre los folds cacheados
+    y las métricas se agregan con media, desviación e intervalo de confianza t-Student.
+    """
+
+    def __init__(self, fold_cache: FoldCache, n_jobs=None, confidence_level=None):
+        """
+        Inicializa el CrossValidator.
+
+        Args:
+            fold_cache (FoldCache): Caché que provee los folds.
+            n_jobs (int, optional): Procesos en paralelo. Por defecto config.CV_N_JOBS.
+            confidence_level (float, optional): Nivel de confianza. Por defecto config.CV_CONFIDENCE_LEVEL.
+        """
+        self.fold_cache = fold_cache
+        self.n_jobs = n_jobs if n_jobs is not None else config.CV_N_JOBS
+        self.confidence_level = confidence_level if confidence_level is not None else config.CV_CONFIDENCE_LEVEL
+
+    def evaluate(self, models: dict, X: pd.DataFrame, y: pd.Series) -> dict:
+        """
+        Ejecuta la validación cruzada de todos los modelos.
+
+        Args:
+            models (dict): Diccionario nombre -> estimador sin entrenar.
+            X (pd.DataFrame): Features sin preprocesar.
+            y (pd.Series): Variable objetivo.
+
+        Returns:
+            dict: Métricas agregadas por modelo ({métrica}_mean, _std, _ci_low, _ci_high)
+                  y los valores por fold en 'folds'.
+        """
+        # XGBoost con early stopping entrena sobre X_fit; el resto de modelos, sobre X_train
+        full_train = any(not isinstance(model, xgb.XGBClassifier) for model in models.values())
+        fold_paths = self.fold_cache.get_folds(X, y, full_train=full_train)
+
+        jobs = [(name, model, path) for name, model in models.items() for path in fold_paths]
+        print(f"  🔄 Evaluando {len(jobs)} pares (modelo, fold) en paralelo...")
+        outputs = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_and_score)(name, model, path) for name, model, path in jobs
+        )
+
+        per_model = {name: {} for name in models}
+        for name, fold_idx, metrics in outputs:
+            per_model[name][fold_idx] = metrics
+
+        return {name: self._aggregate(folds) for name, folds in per_model.items()}
+
+    def _aggregate(self, folds: dict) -> dict:
+        """
+        Agrega las métricas de los folds de un modelo.
+
+        Args:
+            folds (dict): Índice de fold -> diccionario de métricas.
+
+        Returns:
+            dict: Estadísticos agregados por métrica.
+        """
+        summary = {'folds': [folds[i] for i in sorted(folds)]}
+        n = len(folds)
+        t_crit = stats.t.ppf((1 + self.confidence_level) / 2, df=n - 1) if n > 1 else 0.0
+
+        for metric in CV_METRICS:
+            values = np.array([folds[i][metric] for i in sorted(folds)], dtype=float)
+            mean = values.mean()
+            std = values.std(ddof=1) if n > 1 else 0.0
+            half_width = t_crit * std / np.sqrt(n)
+            summary[f'{metric}_mean'] = mean
+            summary[f'{metric}_std'] = std
+            summary[f'{metric}_ci_low'] = mean - half_width
+            summary[f'{metric}_ci_high'] = mean + half_width
+
+        return summary
+
+
+def select_best_model(cv_results: dict, criterion=None) -> str:
+    """
+    Selecciona el mejor modelo a partir de los resultados agregados de la CV.
+
+    Args:
+        cv_results (dict): Salida de CrossValidator.evaluate.
+        criterion (str, optional): "mean" o "lower_ci". Por defecto config.CV_SELECTION_CRITERION.
+
+    Returns:
+        str: Nombre del modelo seleccionado.
+    """
+    criterion = criterion if criterion is not None else config.CV_SELECTION_CRITERION
+    key = 'roc_auc_ci_low' if criterion == 'lower_ci' else 'roc_auc_mean'
+    return max(cv_results, key=lambda name: (cv_results[name][key], cv_results[name]['roc_auc_mean']))
@@ -1,9 +1,17 @@
 """
 Módulo de validación de datos.
 Define la clase DataValidator que valida esquema, tipos, nulos y reglas de negocio.
+Todas las reglas se evalúan en una sola pasada vectorizada (validation_report), que
+devuelve un informe con el número de violaciones y filas de ejemplo de cada regla.
+validate_stream valida por bloques (en paralelo si se pide) combinando acumuladores, y
+quarantine aparta las filas inválidas en un CSV en lugar de rechazar el lote completo.
 """
 
+import os
+from datetime import datetime
+import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 try:
     from mlops_pipeline.src import config
 except ImportError:
@@ -13,24 +21,44 @@ except ImportError:
 class DataValidator:
     """
     Clase responsable de validar la calidad e integridad de los datos.
-    Implementa validaciones de esquema, tipos, nulos y reglas de negocio.
+    Implementa validaciones de esquema, tipos, nulos y reglas de negocio
+    (config.VALIDATION_RULES).
     """
     
-    def __init__(self):
-        """Inicializa el validador con las configuraciones del proyecto."""
+    def __init__(self, rules=None, sample_rows=None, block_rows=None, mode=None, max_reject_rate=None):
+        """
+        Inicializa el validador con las configuraciones del proyecto.
+        
+        Args:
+            rules (dict, optional): Reglas por fila. Por defecto config.VALIDATION_RULES.
+            sample_rows (int, optional): Filas de ejemplo por regla. Por defecto
+                                         config.VALIDATION_SAMPLE_ROWS.
+            block_rows (int, optional): Filas por bloque. Por defecto config.VALIDATION_BLOCK_ROWS.
+            mode (str, optional): "strict" o "quarantine" (validate_and_clean). Por defecto
+                                  config.VALIDATION_MODE.
+            max_reject_rate (float, optional): Fracción máxima de filas en cuarentena. Por
+                                               defecto config.MAX_REJECT_RATE.
+        """
         self.numerical_cols = config.NUMERICAL_COLS
         self.categorical_cols = config.CATEGORICAL_COLS
         self.expected_cols = self.numerical_cols + self.categorical_cols + [config.TARGET_VARIABLE]
         self.allowed_types = config.ALLOWED_TYPES
         self.target_variable = config.TARGET_VARIABLE
+        self.rules = rules if rules is not None else config.VALIDATION_RULES
+        self.sample_rows = sample_rows if sample_rows is not None else config.VALIDATION_SAMPLE_ROWS
+        self.block_rows = block_rows if block_rows is not None else config.VALIDATION_BLOCK_ROWS
+        self.mode = mode if mode is not None else config.VALIDATION_MODE
+        self.max_reject_rate = max_reject_rate if max_reject_rate is not None else config.MAX_REJECT_RATE
+        self.last_report = None
     
     def validate_data(self, df: pd.DataFrame) -> bool:
         """
         Ejecuta todas las validaciones sobre el DataFrame.
+        El informe completo queda en self.last_report.
         
         Args:
             df (pd.DataFrame): DataFrame a validar.
-            
+        
         Returns:
             bool: True si todas las validaciones pasan, False en caso contrario.
         """
@@ -38,22 +66,270 @@ class DataValidator:
         print("INICIANDO VALIDACIÓN DE DATOS")
         print("="*60)
         
-        try:
-            self.validate_schema(df)
-            self.validate_types(df)
-            self.validate_nulls(df)
-            self.validate_business_rules(df)
-            
+        report = self.validation_report(df)
+        self.last_report = report
+        self.print_report(report)
+        
+        if report['passed']:
             print("\n" + "="*60)
             print("✓ VALIDACIÓN EXITOSA - Todos los checks pasaron")
             print("="*60 + "\n")
             return True
-            
-        except (ValueError, TypeError) as e:
-            print("\n" + "="*60)
-            print(f"✗ VALIDACIÓN FALLIDA: {str(e)}")
-            print("="*60 + "\n")
-            return False
+        
+        failed = [name for name, rule in report['rules'].items() if not rule['passed']]
+        print("\n" + "="*60)
+        print(f"✗ VALIDACIÓN FALLIDA: {len(failed)} regla(s) incumplida(s): {failed}")
+        print("="*60 + "\n")
+        return False
+    
+    def validate_and_clean(self, df: pd.DataFrame):
+        """
+        Valida según self.mode: "strict" rechaza el lote completo ante cualquier violación
+        (validate_data); "quarantine" aparta solo las filas inválidas (quarantine).
+        
+        Args:
+            df (pd.DataFrame): DataFrame a validar.
+        
+        Returns:
+            tuple: (DataFrame con el que continuar, True si se puede continuar)
+        """
+        if self.mode == "quarantine":
+            clean, report = self.quarantine(df)
+            return clean, report['passed']
+        return df, self.validate_data(df)
+    
+    def quarantine(self, df: pd.DataFrame, max_reject_rate=None, output_dir=None):
+        """
+        Separa las filas válidas de las inválidas en vez de rechazar todo el lote.
+        
+        La misma pasada por bloques de validation_report marca en cada fila un bit por
+        regla incumplida. Las filas con algún bit se escriben, con sus motivos, en un CSV
+        aparte (la columna 'row' es su etiqueta en el índice de df) y se descartan. Las
+        columnas numéricas que traían texto se convierten a número en las filas limpias.
+        Un esquema incompleto no se puede resolver por filas y rechaza el lote.
+        
+        Args:
+            df (pd.DataFrame): DataFrame a validar.
+            max_reject_rate (float, optional): Fracción máxima de filas rechazadas. Por
+                                               defecto self.max_reject_rate.
+            output_dir (str, optional): Directorio de los CSV de cuarentena. Por defecto
+                                        config.QUARANTINE_DIR.
+        
+        Returns:
+            tuple: (DataFrame limpio, informe). El informe de validation_report se amplía
+                   con rejected_rows, reject_rate, max_reject_rate y quarantine_path; su
+                   'passed' indica si el esquema es correcto y la tasa de rechazo no supera
+                   el máximo.
+        """
+        max_reject_rate = max_reject_rate if max_reject_rate is not None else self.max_reject_rate
+        output_dir = output_dir or config.QUARANTINE_DIR
+        print("\n" + "="*60)
+        print("INICIANDO VALIDACIÓN CON CUARENTENA")
+        print("="*60)
+        
+        reasons = np.zeros(len(df), dtype=np.uint64)
+        state = self._evaluate(df, RULE_KINDS, reasons=reasons)
+        if len(state['rules']) > MAX_QUARANTINE_RULES:
+            raise ValueError(f"La cuarentena admite como máximo {MAX_QUARANTINE_RULES} reglas")
+        report = self.finalize(state)
+        self.print_report(report)
+        
+        rejected = reasons != 0
+        n_rejected = int(np.count_nonzero(rejected))
+        reject_rate = n_rejected / len(df) if len(df) else 0.0
+        schema_ok = report['rules']['schema']['passed']
+        report.update(rejected_rows=n_rejected, reject_rate=reject_rate, max_reject_rate=max_reject_rate,
+                      quarantine_path=None, passed=schema_ok and reject_rate <= max_reject_rate)
+        
+        clean = df
+        if n_rejected:
+            report['quarantine_path'] = _write_quarantine(df[rejected], reasons[rejected],
+                                                          list(state['rules']), output_dir)
+            clean = df[~rejected]
+        # Texto en columnas numéricas: tras apartar las filas no numéricas, el resto se convierte
+        coerced = {col: pd.to_numeric(clean[col]) for col in self.numerical_cols
+                   if not report['rules'].get(f"type:{col}", {'passed': True})['passed'] and col in clean}
+        if coerced:
+            clean = clean.assign(**coerced)
+        self.last_report = report
+        
+        print("\n" + "="*60)
+        if not schema_ok:
+            print(f"✗ VALIDACIÓN FALLIDA: {report['rules']['schema']['message']}")
+        elif not report['passed']:
+            print(f"✗ VALIDACIÓN FALLIDA: {n_rejected:,} filas inválidas ({reject_rate:.2%}), "
+                  f"por encima del máximo permitido ({max_reject_rate:.2%})")
+        elif n_rejected:
+            print(f"⚠️  {n_rejected:,} filas en cuarentena ({reject_rate:.2%}): {report['quarantine_path']}")
+            print(f"✓ VALIDACIÓN EXITOSA - Se continúa con {len(clean):,} filas válidas")
+        else:
+            print("✓ VALIDACIÓN EXITOSA - Todos los checks pasaron")
+        print("="*60 + "\n")
+        return clean, report
+    
+    def validation_report(self, df: pd.DataFrame, kinds=None) -> dict:
+        """
+        Evalúa todas las reglas en una sola pasada vectorizada, sin detenerse en la primera.
+        
+        Las filas se recorren por bloques de block_rows: en cada bloque se lee una vez cada
+        columna y se evalúan juntas su regla de nulos, sus reglas de rango o de valores
+        permitidos (las categóricas se comparan por códigos) y sus estadísticas. Las
+        máscaras temporales son del tamaño del bloque, así que la memoria extra no crece
+        con el DataFrame.
+        
+        Args:
+            df (pd.DataFrame): DataFrame a validar.
+            kinds (list, optional): Tipos de regla a evaluar ("schema", "type", "nulls",
+                                    "range", "allowed"). Por defecto todos.
+        
+        Returns:
+            dict: passed, n_rows, rules (por regla: kind, column, passed, violations,
+                  sample_rows con etiquetas del índice de df, y message) y columns (por
+                  columna: nulls, min, max y categories).
+        """
+        return self.finalize(self.update(self.new_state(kinds), df))
+    
+    def validate_stream(self, chunks, n_jobs=None, kinds=None) -> dict:
+        """
+        Valida un dataset por bloques sin tenerlo entero en memoria, con el mismo
+        veredicto que validation_report sobre el DataFrame completo.
+        
+        Cada bloque produce un estado con acumuladores combinables (nulos, mínimo y máximo,
+        categorías vistas, violaciones y filas de ejemplo por regla) que se combinan en el
+        orden de los bloques. Con n_jobs != 1 los bloques se validan en procesos (loky),
+        con como mucho 2 × n_jobs bloques despachados a la vez.
+        
+        Args:
+            chunks (iterable): DataFrames, por ejemplo DataLoader().iter_batches().
+            n_jobs (int, optional): Procesos. Por defecto config.VALIDATION_N_JOBS.
+            kinds (list, optional): Tipos de regla a evaluar. Por defecto todos.
+        
+        Returns:
+            dict: Informe con la misma estructura que validation_report.
+        """
+        n_jobs = n_jobs if n_jobs is not None else config.VALIDATION_N_JOBS
+        state = self.new_state(kinds)
+        if n_jobs == 1:
+            for chunk in chunks:
+                self.update(state, chunk)
+        else:
+            chunk_states = Parallel(n_jobs=n_jobs, backend='loky', return_as='generator')(
+                delayed(_chunk_state)(self, chunk, kinds) for chunk in chunks
+            )
+            for chunk_state in chunk_states:
+                merge_states(state, chunk_state)
+        return self.finalize(state)
+    
+    def new_state(self, kinds=None):
+        """Estado vacío de la validación; se llena con update y se combina con merge_states."""
+        return {
+            'kinds': list(kinds) if kinds is not None else list(RULE_KINDS),
+            'sample_rows': self.sample_rows,
+            'n_rows': 0,
+            'missing_columns': [],
+            'rules': {},
+            'columns': {}
+        }
+    
+    def update(self, state, df: pd.DataFrame):
+        """
+        Acumula en el estado la validación de un bloque de filas.
+        
+        Returns:
+            dict: El mismo estado, actualizado.
+        """
+        return merge_states(state, self._evaluate(df, state['kinds']))
+    
+    def finalize(self, state):
+        """Convierte un estado acumulado en el informe de validación."""
+        report = {'passed': True, 'n_rows': state['n_rows'], 'rules': {}, 'columns': {}}
+        for name, rule in state['rules'].items():
+            rule = dict(rule)
+            if rule['kind'] == 'schema':
+                missing_cols = state['missing_columns']
+                rule.update(passed=not missing_cols, violations=len(missing_cols),
+                            message=f"Faltan columnas: {missing_cols}" if missing_cols
+                            else "Todas las columnas esperadas están presentes")
+            elif rule['kind'] != 'type':
+                rule['passed'] = rule['violations'] == 0
+            report['rules'][name] = rule
+            report['passed'] = report['passed'] and rule['passed']
+        for col, stats in state['columns'].items():
+            report['columns'][col] = {
+                'nulls': stats['nulls'],
+                'min': stats['min'],
+                'max': stats['max'],
+                'categories': sorted(stats['categories'], key=str) if stats['categories'] is not None else None
+            }
+        return report
+    
+    def _evaluate(self, df, kinds, reasons=None):
+        """
+        Estado de un único bloque de filas (la pasada vectorizada por bloques).
+        Con reasons (array uint64 de len(df)) marca además en cada fila el bit de cada regla
+        que incumple; el bit de una regla es su posición en state['rules'].
+        """
+        kinds = set(kinds)
+        state = self.new_state(kinds)
+        state['n_rows'] = len(df)
+        state['missing_columns'] = [col for col in self.expected_cols if col not in df.columns]
+        if 'schema' in kinds:
+            _add_rule(state, 'schema', 'schema', None, "")
+        
+        # Plan por columna: valores a recorrer, detección de nulos y reglas por fila
+        plans = []
+        for col in self.expected_cols:
+            if col in state['missing_columns']:
+                continue
+            values, is_null, categories = self._column_values(df[col], col, state, kinds, reasons)
+            checks = []
+            if 'nulls' in kinds:
+                checks.append((_add_rule(state, f"nulls:{col}", 'nulls', col, f"'{col}' sin valores nulos"),
+                               None, _rule_bit(state)))
+            for name, rule in self.rules.items():
+                if rule['column'] != col:
+                    continue
+                kind = 'allowed' if 'allowed' in rule else 'range'
+                if kind in kinds:
+                    check = _rule_check(rule, values, categories)
+                    if check is not None:
+                        checks.append((_add_rule(state, name, kind, col, _rule_message(rule)), check,
+                                       _rule_bit(state)))
+            stats = {'nulls': 0, 'min': None, 'max': None, 'categories': None}
+            if categories is not None or values.dtype.kind == 'O':
+                stats['categories'] = set()
+            state['columns'][col] = stats
+            plans.append((values, is_null, categories, stats, checks))
+        
+        for start in range(0, len(df), self.block_rows):
+            stop = start + self.block_rows
+            for values, is_null, categories, stats, checks in plans:
+                block = values[start:stop]
+                null = is_null(block)
+                _update_stats(stats, block, null, categories)
+                for rule, check, bit in checks:
+                    mask = null if check is None else check(block, null)
+                    if mask is None:
+                        continue
+                    n_bad = int(np.count_nonzero(mask))
+                    if n_bad:
+                        rule['violations'] += n_bad
+                        if reasons is not None:
+                            np.bitwise_or(reasons[start:stop], bit, out=reasons[start:stop], where=mask)
+                        if len(rule['sample_rows']) < self.sample_rows:
+                            positions = np.flatnonzero(mask)[:self.sample_rows - len(rule['sample_rows'])]
+                            rule['sample_rows'].extend(df.index[positions + start].tolist())
+        return state
+    
+    def print_report(self, report):
+        """Imprime una línea por regla del informe de validation_report."""
+        print(f"\n  Filas validadas: {report['n_rows']:,}")
+        for name, rule in report['rules'].items():
+            if rule['passed']:
+                print(f"  ✓ {name}: {rule['message']}")
+            else:
+                examples = f" (filas de ejemplo: {rule['sample_rows']})" if rule['sample_rows'] else ""
+                print(f"  ✗ {name}: {rule['violations']:,} violaciones - {rule['message']}{examples}")
     
     def validate_schema(self, df: pd.DataFrame):
         """
@@ -61,17 +337,11 @@ class DataValidator:
         
         Args:
             df (pd.DataFrame): DataFrame a validar.
-            
+        
         Raises:
             ValueError: Si faltan columnas esperadas.
         """
-        print("\n[1/4] Validando esquema (columnas esperadas)...")
-        missing_cols = [col for col in self.expected_cols if col not in df.columns]
-        
-        if missing_cols:
-            raise ValueError(f"Faltan columnas en el DataFrame: {missing_cols}")
-        
-        print(f"  ✓ Todas las columnas esperadas están presentes: {self.expected_cols}")
+        _raise_failed(self.validation_report(df, kinds=['schema']), ValueError)
     
     def validate_types(self, df: pd.DataFrame):
         """
@@ -79,27 +349,11 @@ class DataValidator:
         
         Args:
             df (pd.DataFrame): DataFrame a validar.
-            
+        
         Raises:
             TypeError: Si alguna columna no tiene el tipo esperado.
         """
-        print("\n[2/4] Validando tipos de datos...")
-        
-        # Validar columnas numéricas
-        for col in self.numerical_cols:
-            if col in df.columns:
-                if not pd.api.types.is_numeric_dtype(df[col]):
-                    raise TypeError(f"Columna '{col}' debe ser numérica, pero es {df[col].dtype}")
-        
-        print(f"  ✓ Columnas numéricas validadas: {self.numerical_cols}")
-        
-        # Validar columnas categóricas
-        for col in self.categorical_cols:
-            if col in df.columns:
-                if not (pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_categorical_dtype(df[col])):
-                    raise TypeError(f"Columna '{col}' debe ser categórica/object, pero es {df[col].dtype}")
-        
-        print(f"  ✓ Columnas categóricas validadas: {self.categorical_cols}")
+        _raise_failed(self.validation_report(df, kinds=['type']), TypeError)
     
     def validate_nulls(self, df: pd.DataFrame):
         """
@@ -107,66 +361,240 @@ class DataValidator:
         
         Args:
             df (pd.DataFrame): DataFrame a validar.
-            
+        
         Raises:
             ValueError: Si se encuentran valores nulos.
         """
-        print("\n[3/4] Validando valores nulos...")
-        
-        null_counts = df.isnull().sum()
-        total_nulls = null_counts.sum()
-        
-        if total_nulls > 0:
-            print(f"  Valores nulos encontrados por columna:")
-            for col, count in null_counts[null_counts > 0].items():
-                print(f"    - {col}: {count} nulos")
-            raise ValueError(f"Se encontraron {total_nulls} valores nulos en el DataFrame.")
-        
-        print(f"  ✓ No se encontraron valores nulos")
+        _raise_failed(self.validation_report(df, kinds=['nulls']), ValueError)
     
     def validate_business_rules(self, df: pd.DataFrame):
         """
-        Valida reglas de negocio específicas identificadas en el EDA.
+        Valida reglas de negocio específicas identificadas en el EDA (config.VALIDATION_RULES).
         
         Args:
             df (pd.DataFrame): DataFrame a validar.
-            
+        
         Raises:
             ValueError: Si alguna regla de negocio no se cumple.
         """
-        print("\n[4/4] Validando reglas de negocio...")
-        
-        # Regla 1: 'amount' no puede ser negativo
-        if 'amount' in df.columns:
-            negative_amounts = (df['amount'] < 0).sum()
-            if negative_amounts > 0:
-                raise ValueError(f"Se encontraron {negative_amounts} valores negativos en 'amount'.")
-            print(f"  ✓ Regla 1: 'amount' >= 0 (todas las transacciones son válidas)")
-        
-        # Regla 2: 'customer_age' debe estar en un rango válido (18-100)
-        if 'customer_age' in df.columns:
-            invalid_age = ((df['customer_age'] < 18) | (df['customer_age'] > 100)).sum()
-            if invalid_age > 0:
-                raise ValueError(f"Se encontraron {invalid_age} edades inválidas (fuera del rango 18-100).")
-            print(f"  ✓ Regla 2: 'customer_age' está en rango válido (18-100)")
-        
-        # Regla 3: Variable objetivo debe ser binaria (0 o 1)
-        if self.target_variable in df.columns:
-            unique_targets = df[self.target_variable].unique()
-            if not all(val in [0, 1] for val in unique_targets):
-                raise ValueError(
-                    f"Variable objetivo '{self.target_variable}' debe ser binaria (0 o 1), "
-                    f"pero contiene: {unique_targets}"
-                )
-            print(f"  ✓ Regla 3: '{self.target_variable}' es binaria (0, 1)")
-        
-        # Regla 4: previous_transactions no puede ser negativo
-        if 'previous_transactions' in df.columns:
-            negative_trans = (df['previous_transactions'] < 0).sum()
-            if negative_trans > 0:
-                raise ValueError(f"Se encontraron {negative_trans} valores negativos en 'previous_transactions'.")
-            print(f"  ✓ Regla 4: 'previous_transactions' >= 0")
+        _raise_failed(self.validation_report(df, kinds=['range', 'allowed']), ValueError)
+    
+    def _column_values(self, series, col, state, kinds, reasons=None):
+        """
+        Valores de una columna en la forma que se recorre por bloques, su detector de nulos
+        y, si los valores son códigos de categoría, las categorías a las que corresponden.
+        Registra la regla de tipo de la columna: una numérica de otro tipo (texto o
+        categórica) se convierte a número (los valores no numéricos cuentan como
+        violaciones) para seguir evaluando sus reglas.
+        """
+        dtype = series.dtype
+        categories = None
+        if isinstance(dtype, pd.CategoricalDtype):
+            values, is_null = series.cat.codes.to_numpy(), _negative_codes
+            categories = dtype.categories
+        elif pd.api.types.is_numeric_dtype(dtype):
+            # Los tipos enteros con nulos de pandas (Int64, ...) se recorren como float con NaN
+            values = (series.to_numpy() if isinstance(dtype, np.dtype)
+                      else series.to_numpy(dtype=np.float64, na_value=np.nan))
+            is_null = _nan_mask if values.dtype.kind == 'f' else _no_nulls
+        else:
+            values, is_null = series.to_numpy(), _object_nulls
+        
+        if col in self.numerical_cols:
+            passed = pd.api.types.is_numeric_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype)
+            bad = np.empty(0, dtype=np.int64)
+            if not passed:
+                # Texto en una columna numérica: se evalúan las reglas sobre los valores convertidos
+                # (los valores no numéricos cuentan también en la regla de nulos)
+                numeric = pd.to_numeric(series.astype(object), errors='coerce').to_numpy(dtype=np.float64)
+                bad = np.flatnonzero(np.isnan(numeric) & ~series.isna().to_numpy())
+                values, is_null, categories = numeric, _nan_mask, None
+            expected = "numérica"
+        elif col in self.categorical_cols:
+            passed = pd.api.types.is_object_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype)
+            bad = np.empty(0, dtype=np.int64) if passed else np.flatnonzero(series.notna().to_numpy())
+            expected = "categórica/object"
+        else:
+            return values, is_null, categories
+        
+        if 'type' in kinds:
+            rule = _add_rule(state, f"type:{col}", 'type', col, f"'{col}' debe ser {expected} (es {dtype})")
+            rule.update(passed=bool(passed), violations=len(bad),
+                        sample_rows=series.index[bad[:self.sample_rows]].tolist())
+            if reasons is not None:
+                reasons[bad] |= _rule_bit(state)
+        return values, is_null, categories
+
+
+RULE_KINDS = ('schema', 'type', 'nulls', 'range', 'allowed')
+MAX_QUARANTINE_RULES = 64  # Un bit por regla en la máscara uint64 de motivos de rechazo
+
+
+def merge_states(state, other):
+    """
+    Combina en `state` el estado de un bloque posterior (`other`). Las sumas, mínimos,
+    máximos y uniones son asociativos, así que el orden de combinación solo afecta a las
+    filas de ejemplo, que se conservan en el orden de los bloques.
+    
+    Returns:
+        dict: `state`, actualizado.
+    """
+    limit = state['sample_rows']
+    state['n_rows'] += other['n_rows']
+    state['missing_columns'] = list(dict.fromkeys(state['missing_columns'] + other['missing_columns']))
+    for name, rule in other['rules'].items():
+        if name not in state['rules']:
+            state['rules'][name] = {**rule, 'sample_rows': list(rule['sample_rows'][:limit])}
+            continue
+        merged = state['rules'][name]
+        merged['violations'] += rule['violations']
+        merged['sample_rows'] = (merged['sample_rows'] + rule['sample_rows'])[:limit]
+        if merged['passed'] and not rule['passed']:
+            merged.update(passed=False, message=rule['message'])
+    for col, stats in other['columns'].items():
+        if col not in state['columns']:
+            state['columns'][col] = {**stats, 'categories': (set(stats['categories'])
+                                                             if stats['categories'] is not None else None)}
+            continue
+        merged = state['columns'][col]
+        merged['nulls'] += stats['nulls']
+        merged['min'] = _combine(min, merged['min'], stats['min'])
+        merged['max'] = _combine(max, merged['max'], stats['max'])
+        if stats['categories'] is not None:
+            merged['categories'] = (merged['categories'] or set()) | stats['categories']
+    return state
+
+
+def _chunk_state(validator, chunk, kinds):
+    """Estado de un bloque, calculado en un worker."""
+    return validator.update(validator.new_state(kinds), chunk)
+
+
+def _add_rule(state, name, kind, column, message):
+    """Registra una regla en el estado de un bloque y devuelve su acumulador."""
+    rule = {'kind': kind, 'column': column, 'passed': True, 'violations': 0, 'sample_rows': [],
+            'message': message}
+    state['rules'][name] = rule
+    return rule
+
+
+def _write_quarantine(rejected_df, reasons, rule_names, output_dir):
+    """Escribe las filas rechazadas con sus motivos (reglas separadas por ';') y devuelve la ruta."""
+    # Los motivos se decodifican una vez por combinación distinta de reglas incumplidas
+    codes, inverse = np.unique(reasons, return_inverse=True)
+    labels = np.array([';'.join(name for bit, name in enumerate(rule_names) if int(code) >> bit & 1)
+                       for code in codes], dtype=object)
+    rejected_df = rejected_df.assign(rejection_reasons=labels[inverse.ravel()])
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"quarantine_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.csv")
+    rejected_df.to_csv(path, index_label='row')
+    return path
+
+
+def _rule_bit(state):
+    """Bit de la última regla registrada en el estado (máscara de motivos de rechazo)."""
+    position = len(state['rules']) - 1
+    return np.uint64(1) << np.uint64(position) if position < MAX_QUARANTINE_RULES else np.uint64(0)
+
+
+def _update_stats(stats, block, null, categories):
+    """Actualiza nulos, mínimo/máximo y categorías vistas de una columna con un bloque."""
+    n_null = int(np.count_nonzero(null)) if null is not None else 0
+    stats['nulls'] += n_null
+    if n_null == len(block):
+        return
+    if categories is not None:
+        # Cuando ya se vieron todas las categorías no hace falta recorrer más códigos
+        if len(stats['categories']) < len(categories):
+            codes = block[block >= 0] if n_null else block
+            present = np.bincount(codes, minlength=len(categories)) > 0
+            stats['categories'].update(categories[present].tolist())
+    elif block.dtype.kind in 'biuf':
+        # fmin/fmax ignoran NaN
+        low = np.fmin.reduce(block) if block.dtype.kind == 'f' else block.min()
+        high = np.fmax.reduce(block) if block.dtype.kind == 'f' else block.max()
+        stats['min'] = _combine(min, stats['min'], low.item())
+        stats['max'] = _combine(max, stats['max'], high.item())
+    else:
+        stats['categories'].update(pd.unique(block[~null]).tolist())
+
+
+def _combine(fn, current, value):
+    if current is None:
+        return value
+    if value is None:
+        return current
+    return fn(current, value)
+
+
+def _negative_codes(codes):
+    return codes < 0
+
+
+def _nan_mask(values):
+    return np.isnan(values)
+
+
+def _no_nulls(values):
+    return None
+
+
+def _object_nulls(values):
+    return pd.isna(values)
+
+
+def _rule_check(rule, values, categories=None):
+    """
+    Función (bloque, nulos) -> máscara de violaciones de una regla por fila, o None si la
+    regla no aplica al tipo de la columna (ya lo informa la regla de tipo). Con categories,
+    los valores son códigos de esas categorías.
+    """
+    if 'allowed' in rule:
+        allowed = rule['allowed']
+        if categories is not None:
+            # Las categorías permitidas se traducen a códigos una sola vez
+            allowed_codes = categories.get_indexer(list(allowed))
+            allowed_codes = allowed_codes[allowed_codes >= 0]
+            return lambda block, null: ~np.isin(block, allowed_codes) & ~null
+        if values.dtype.kind in 'biuf':
+            allowed = np.asarray(allowed)
+
+            def check(block, null):
+                mask = ~np.isin(block, allowed)
+                return mask if null is None else mask & ~null
+            return check
+        allowed_set = set(allowed)
+        return lambda block, null: ~pd.Series(block).isin(allowed_set).to_numpy() & ~null
+    
+    if categories is not None or values.dtype.kind not in 'biuf':
+        return None
+    low, high = rule.get('min'), rule.get('max')
+    
+    def check(block, null):
+        # Las comparaciones con NaN son falsas: los nulos solo cuentan en su regla de nulos
+        mask = block < low if low is not None else np.zeros(len(block), dtype=bool)
+        if high is not None:
+            mask |= block > high
+        return mask
+    return check
+
+
+def _rule_message(rule):
+    col = rule['column']
+    if 'allowed' in rule:
+        return f"'{col}' debe estar en {list(rule['allowed'])}"
+    low, high = rule.get('min'), rule.get('max')
+    if low is not None and high is not None:
+        return f"'{col}' debe estar en el rango [{low}, {high}]"
+    return f"'{col}' >= {low}" if low is not None else f"'{col}' <= {high}"
+
 
+def _raise_failed(report, error):
+    """Lanza la excepción con las reglas incumplidas de un informe."""
+    failed = [f"{name}: {rule['violations']:,} violaciones - {rule['message']}"
+              for name, rule in report['rules'].items() if not rule['passed']]
+    if failed:
+        raise error("; ".join(failed))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,202 @@
+"""
+Módulo de evaluación de clasificadores binarios.
+Ordena las probabilidades una sola vez y deriva de los conteos acumulados las curvas
+ROC y Precision-Recall, el AUC, el average precision, un barrido de umbrales y las
+métricas en el umbral elegido. Los intervalos de confianza se obtienen con un
+bootstrap de Poisson vectorizado sobre bloques de scores, cuyo costo depende del
+número de bloques y no del número de filas.
+"""
+
+import numpy as np
+try:
+    from mlops_pipeline.src import config
+except ImportError:
+    from . import config
+
+
+CI_METRICS = ['accuracy', 'precision', 'recall', 'f1_score', 'roc_auc', 'average_precision']
+
+
+def _safe_divide(num, den):
+    """División elemento a elemento que devuelve 0 cuando el denominador es 0."""
+    num = np.asarray(num, dtype=np.float64)
+    den = np.asarray(den, dtype=np.float64)
+    return np.divide(num, den, out=np.zeros(np.broadcast(num, den).shape), where=den != 0)
+
+
+def _metrics_from_counts(tp, fp, total_pos, total_neg):
+    """
+    Calcula métricas a partir de conteos (escalares o arreglos de réplicas).
+    """
+    fn = total_pos - tp
+    tn = total_neg - fp
+    precision = _safe_divide(tp, tp + fp)
+    recall = _safe_divide(tp, total_pos)
+    return {
+        'accuracy': _safe_divide(tp + tn, total_pos + total_neg),
+        'precision': precision,
+        'recall': recall,
+        'f1_score': _safe_divide(2 * precision * recall, precision + recall)
+    }
+
+
+def _auc_from_cumulative(ctp, cfp):
+    """
+    ROC-AUC (trapecios) y average precision a partir de conteos acumulados por umbral.
+    Acepta arreglos 1D (una evaluación) o 2D (réplicas × umbrales).
+    """
+    total_pos = ctp[..., -1:]
+    total_neg = cfp[..., -1:]
+    tpr = _safe_divide(ctp, total_pos)
+    fpr = _safe_divide(cfp, total_neg)
+    zeros = np.zeros(ctp.shape[:-1] + (1,))
+    tpr_prev = np.concatenate([zeros, tpr[..., :-1]], axis=-1)
+    fpr_prev = np.concatenate([zeros, fpr[..., :-1]], axis=-1)
+    auc = np.sum((fpr - fpr_prev) * (tpr + tpr_prev) / 2, axis=-1)
+
+    precision = _safe_divide(ctp, ctp + cfp)
+    average_precision = np.sum((tpr - tpr_prev) * precision, axis=-1)
+    return auc, average_precision
+
+
+def _drop_intermediate(fps, tps):
+    """Índices de los vértices de la curva ROC (descarta puntos colineales)."""
+    if len(fps) <= 2:
+        return np.arange(len(fps))
+    keep = np.logical_or(np.diff(fps, 2), np.diff(tps, 2))
+    return np.flatnonzero(np.r_[True, keep, True])
+
+
+def evaluate_scores(y_true, y_score, threshold=None, n_bootstrap=None, confidence_level=None,
+                    random_state=None, sweep_points=None):
+    """
+    Evalúa un clasificador binario a partir de sus probabilidades.
+
+    Args:
+        y_true (array): Valores reales (0/1).
+        y_score (array): Probabilidad (o score) de la clase positiva.
+        threshold (float, optional): Umbral de decisión. Por defecto config.DECISION_THRESHOLD.
+        n_bootstrap (int, optional): Réplicas bootstrap. Por defecto config.BOOTSTRAP_ITERATIONS.
+        confidence_level (float, optional): Nivel de los intervalos. Por defecto config.BOOTSTRAP_CONFIDENCE_LEVEL.
+        random_state (int, optional): Semilla del bootstrap. Por defecto config.RANDOM_STATE.
+        sweep_points (int, optional): Umbrales del barrido. Por defecto config.THRESHOLD_SWEEP_POINTS.
+
+    Returns:
+        dict: Métricas en el umbral, 'confusion_matrix', 'roc_curve', 'pr_curve',
+              'threshold_sweep' y, si hay bootstrap, 'ci' con (inferior, superior) por métrica.
+    """
+    threshold = threshold if threshold is not None else config.DECISION_THRESHOLD
+    n_bootstrap = n_bootstrap if n_bootstrap is not None else config.BOOTSTRAP_ITERATIONS
+    confidence_level = confidence_level if confidence_level is not None else config.BOOTSTRAP_CONFIDENCE_LEVEL
+    random_state = random_state if random_state is not None else config.RANDOM_STATE
+    sweep_points = sweep_points if sweep_points is not None else config.THRESHOLD_SWEEP_POINTS
+
+    y_true = np.asarray(y_true).ravel()
+    y_score = np.asarray(y_score, dtype=np.float64).ravel()
+
+    # Único ordenamiento: scores de mayor a menor
+    order = np.argsort(-y_score, kind='mergesort')
+    scores_sorted = y_score[order]
+    y_sorted = (y_true[order] == 1).astype(np.int64)
+
+    # Último índice de cada grupo de scores iguales
+    group_end = np.r_[np.flatnonzero(np.diff(scores_sorted)), len(scores_sorted) - 1]
+    group_thresholds = scores_sorted[group_end]
+    ctp = np.cumsum(y_sorted)[group_end]
+    cfp = (group_end + 1) - ctp
+    total_pos, total_neg = int(ctp[-1]), int(cfp[-1])
+
+    auc, average_precision = _auc_from_cumulative(ctp, cfp)
+
+    # Métricas en un umbral: grupos con score >= umbral (búsqueda binaria sobre scores descendentes)
+    def counts_at(thresholds):
+        n_groups = np.searchsorted(-group_thresholds, -np.asarray(thresholds, dtype=np.float64), side='right')
+        tp = np.where(n_groups > 0, ctp[np.maximum(n_groups - 1, 0)], 0)
+        fp = np.where(n_groups > 0, cfp[np.maximum(n_groups - 1, 0)], 0)
+        return n_groups, tp, fp
+
+    n_groups_at, tp, fp = counts_at(threshold)
+    metrics = {k: float(v) for k, v in _metrics_from_counts(tp, fp, total_pos, total_neg).items()}
+    metrics['roc_auc'] = float(auc)
+    metrics['average_precision'] = float(average_precision)
+
+    result = dict(metrics)
+    result['threshold'] = threshold
+    result['confusion_matrix'] = np.array([
+        [total_neg - int(fp), int(fp)],
+        [total_pos - int(tp), int(tp)]
+    ])
+
+    # Curvas derivadas de los mismos conteos acumulados
+    keep = _drop_intermediate(cfp, ctp)
+    result['roc_curve'] = {
+        'fpr': np.r_[0.0, _safe_divide(cfp[keep], total_neg)],
+        'tpr': np.r_[0.0, _safe_divide(ctp[keep], total_pos)],
+        'thresholds': np.r_[np.inf, group_thresholds[keep]]
+    }
+    result['pr_curve'] = {
+        'precision': np.r_[_safe_divide(ctp, ctp + cfp)[::-1], 1.0],
+        'recall': np.r_[_safe_divide(ctp, total_pos)[::-1], 0.0],
+        'thresholds': group_thresholds[::-1]
+    }
+
+    sweep = np.linspace(0, 1, sweep_points + 2)[1:-1]
+    _, sweep_tp, sweep_fp = counts_at(sweep)
+    sweep_metrics = _metrics_from_counts(sweep_tp, sweep_fp, total_pos, total_neg)
+    result['threshold_sweep'] = [
+        {'threshold': float(t), **{k: float(v[i]) for k, v in sweep_metrics.items()}}
+        for i, t in enumerate(sweep)
+    ]
+
+    if n_bootstrap > 0 and total_pos > 0 and total_neg > 0:
+        group_pos = np.diff(np.r_[0, ctp])
+        group_neg = np.diff(np.r_[0, cfp])
+        result['ci'] = _bootstrap_ci(group_pos, group_neg, n_groups_at, n_bootstrap,
+                                     confidence_level, random_state)
+    return result
+
+
+def _bootstrap_ci(group_pos, group_neg, n_groups_at, n_bootstrap, confidence_level, random_state):
+    """
+    Intervalos de confianza percentil con bootstrap de Poisson.
+
+    En el bootstrap de Poisson cada fila recibe un peso ~ Poisson(1); la suma de los
+    pesos de c filas es ~ Poisson(c). Basta con muestrear un conteo por bloque de scores
+    y réplica, y todas las réplicas de un bloque vectorizado se evalúan a la vez.
+    Con más de config.BOOTSTRAP_MAX_BINS grupos se agrupan en bloques contiguos (los
+    scores de un bloque cuentan como empates); el umbral de decisión siempre es un
+    límite de bloque, por lo que las métricas en el umbral no se aproximan.
+    """
+    rng = np.random.default_rng(random_state)
+    if len(group_pos) > config.BOOTSTRAP_MAX_BINS:
+        bounds = np.linspace(0, len(group_pos), config.BOOTSTRAP_MAX_BINS + 1).astype(np.int64)[:-1]
+        starts = np.unique(np.r_[bounds, n_groups_at] if 0 < n_groups_at < len(group_pos) else bounds)
+        group_pos = np.add.reduceat(group_pos, starts)
+        group_neg = np.add.reduceat(group_neg, starts)
+        n_groups_at = int(np.searchsorted(starts, n_groups_at))
+    n_groups = len(group_pos)
+    chunk = max(1, int(config.BOOTSTRAP_MAX_CHUNK_ELEMENTS // max(n_groups, 1)))
+    samples = {metric: [] for metric in CI_METRICS}
+
+    for start in range(0, n_bootstrap, chunk):
+        size = min(chunk, n_bootstrap - start)
+        ctp = np.cumsum(rng.poisson(group_pos, size=(size, n_groups)), axis=1)
+        cfp = np.cumsum(rng.poisson(group_neg, size=(size, n_groups)), axis=1)
+
+        auc, average_precision = _auc_from_cumulative(ctp, cfp)
+        if n_groups_at > 0:
+            tp, fp = ctp[:, n_groups_at - 1], cfp[:, n_groups_at - 1]
+        else:
+            tp = fp = np.zeros(size)
+        replica = _metrics_from_counts(tp, fp, ctp[:, -1], cfp[:, -1])
+        replica['roc_auc'] = auc
+        replica['average_precision'] = average_precision
+
+        for metric in CI_METRICS:
+            samples[metric].append(replica[metric])
+
+    alpha = (1 - confidence_level) / 2
+    return {
+        metric: tuple(float(q) for q in np.quantile(np.concatenate(values), [alpha, 1 - alpha]))
+        for metric, values in samples.items()
+    }
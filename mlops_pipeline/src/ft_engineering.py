@@ -3,17 +3,57 @@ Módulo de ingeniería de características.
 Define la clase FeatureEngineer que crea features, divide datos y aplica preprocesamiento.
 """
 
+import numpy as np
 import pandas as pd
-import joblib
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.preprocessing import StandardScaler, OneHotEncoder, FunctionTransformer
 from sklearn.compose import ColumnTransformer
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_extraction import FeatureHasher
 try:
     from mlops_pipeline.src import config
+    from mlops_pipeline.src.artifacts import save_artifact, load_artifact
 except ImportError:
     from . import config
+    from .artifacts import save_artifact, load_artifact
+
+
+class HashingEncoder(BaseEstimator, TransformerMixin):
+    """
+    Codifica variables categóricas con el truco del hashing.
+    Cada valor se convierte en el token 'columna=valor' y se proyecta sobre un número
+    fijo de columnas dispersas, por lo que el ancho no depende del vocabulario y los
+    valores no vistos en el entrenamiento no requieren tratamiento especial.
+    """
+    
+    def __init__(self, n_features=1024, dtype=np.float64):
+        self.n_features = n_features
+        self.dtype = dtype
+    
+    def fit(self, X, y=None):
+        """No aprende nada: solo registra las columnas de entrada."""
+        self.feature_names_in_ = np.asarray(getattr(X, 'columns', range(np.shape(X)[1])), dtype=object)
+        self.n_features_in_ = len(self.feature_names_in_)
+        return self
+    
+    def transform(self, X):
+        """
+        Args:
+            X (pd.DataFrame o array): Columnas categóricas.
+        
+        Returns:
+            scipy.sparse.csr_matrix: Matriz (n_filas, n_features).
+        """
+        X = pd.DataFrame(X, columns=self.feature_names_in_) if not isinstance(X, pd.DataFrame) else X
+        tokens = [f'{col}=' + X[col].astype(str) for col in X.columns]
+        hasher = FeatureHasher(n_features=self.n_features, input_type='string',
+                               alternate_sign=False, dtype=self.dtype)
+        return hasher.transform(zip(*tokens))
+    
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray([f'hash_{i}' for i in range(self.n_features)], dtype=object)
 
 
 class FeatureEngineer:
@@ -22,17 +62,30 @@ class FeatureEngineer:
     Crea features derivados, divide los datos y aplica transformaciones.
     """
     
-    def __init__(self, random_state=None):
+    def __init__(self, random_state=None, use_float32=None, sparse_output=None,
+                 categorical_encoding=None):
         """
         Inicializa el FeatureEngineer.
         
         Args:
             random_state (int, optional): Semilla para reproducibilidad. 
                                          Si es None, usa el valor de config.RANDOM_STATE.
+            use_float32 (bool, optional): Generar la matriz transformada en float32.
+                                         Si es None, usa config.USE_FLOAT32.
+            sparse_output (bool, optional): Devolver matrices dispersas (CSR).
+                                         Si es None, usa config.SPARSE_OUTPUT.
+            categorical_encoding (str, optional): "onehot" o "hashing".
+                                         Si es None, usa config.CATEGORICAL_ENCODING.
         """
         self.random_state = random_state if random_state is not None else config.RANDOM_STATE
+        self.use_float32 = use_float32 if use_float32 is not None else config.USE_FLOAT32
+        self.sparse_output = sparse_output if sparse_output is not None else config.SPARSE_OUTPUT
+        self.categorical_encoding = (categorical_encoding if categorical_encoding is not None
+                                     else config.CATEGORICAL_ENCODING)
         self.preprocessor = None
         self.feature_names = None
+        self.X_train_raw = None
+        self.y_train_raw = None
     
     def create_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -92,16 +145,42 @@ class FeatureEngineer:
             if feat in df.columns:
                 numerical_features.append(feat)
         
+        dtype = np.float32 if self.use_float32 else np.float64
+        
         # Pipeline para features numéricas
-        numeric_transformer = Pipeline(steps=[
+        numeric_steps = [
             ('imputer', SimpleImputer(strategy='median')),
             ('scaler', StandardScaler())
-        ])
+        ]
+        if self.use_float32:
+            # Convertir antes de imputar: imputer y scaler conservan el dtype de entrada
+            numeric_steps.insert(0, ('float32', FunctionTransformer(
+                np.asarray, kw_args={'dtype': np.float32}, feature_names_out='one-to-one'
+            )))
+        numeric_transformer = Pipeline(steps=numeric_steps)
         
         # Pipeline para features categóricas
+        if self.categorical_encoding == 'hashing':
+            encoder = ('hashing', HashingEncoder(n_features=config.HASHING_N_FEATURES, dtype=dtype))
+        elif self.categorical_encoding == 'onehot':
+            # Con límite de frecuencia/categorías, las raras y las no vistas caen en 'infrequent'
+            capped = config.CATEGORY_MIN_FREQUENCY is not None or config.CATEGORY_MAX_CATEGORIES is not None
+            encoder = ('onehot', OneHotEncoder(
+                handle_unknown='infrequent_if_exist' if capped else 'ignore',
+                min_frequency=config.CATEGORY_MIN_FREQUENCY,
+                max_categories=config.CATEGORY_MAX_CATEGORIES,
+                sparse_output=self.sparse_output,
+                dtype=dtype
+            ))
+        else:
+            raise ValueError(
+                f"Codificación categórica desconocida: '{self.categorical_encoding}'. "
+                "Opciones: ['onehot', 'hashing']"
+            )
+        
         categorical_transformer = Pipeline(steps=[
             ('imputer', SimpleImputer(strategy='most_frequent')),
-            ('onehot', OneHotEncoder(handle_unknown='ignore', sparse_output=False))
+            encoder
         ])
         
         # Combinar transformadores
@@ -110,12 +189,14 @@ class FeatureEngineer:
                 ('num', numeric_transformer, numerical_features),
                 ('cat', categorical_transformer, config.CATEGORICAL_COLS)
             ],
-            remainder='drop'  # Eliminar columnas no especificadas
+            remainder='drop',  # Eliminar columnas no especificadas
+            # 1.0 conserva siempre la salida dispersa; 0 siempre la densifica
+            sparse_threshold=1.0 if self.sparse_output else 0.0
         )
         
         return preprocessor
     
-    def process(self, df: pd.DataFrame, test_size=None):
+    def process(self, df: pd.DataFrame, test_size=None, save=True):
         """
         Aplica ingeniería de características y preprocesamiento completo.
         
@@ -123,6 +204,8 @@ class FeatureEngineer:
             df (pd.DataFrame): DataFrame original.
             test_size (float, optional): Proporción del conjunto de test. 
                                         Si es None, usa config.TEST_SIZE.
+            save (bool): Si guarda el preprocesador ajustado en config.PREPROCESSOR_PATH.
+                         El DAG lo desactiva y lo guarda en su propia etapa.
         
         Returns:
             tuple: (X_train_processed, X_test_processed, y_train, y_test)
@@ -155,6 +238,9 @@ class FeatureEngineer:
         print(f"  ✓ Train set: {X_train.shape}")
         print(f"  ✓ Test set: {X_test.shape}")
         
+        # Conservar el train sin transformar para la validación cruzada
+        self.X_train_raw, self.y_train_raw = X_train, y_train
+        
         # Paso 4: Crear y ajustar el preprocesador SOLO con datos de entrenamiento
         print("\n[3/4] Creando y ajustando preprocesador...")
         self.preprocessor = self._create_preprocessor(X_train)
@@ -162,8 +248,8 @@ class FeatureEngineer:
         print("  ✓ Preprocesador ajustado con datos de entrenamiento")
         
         # Guardar el preprocesador
-        joblib.dump(self.preprocessor, config.PREPROCESSOR_PATH)
-        print(f"  ✓ Preprocesador guardado en: {config.PREPROCESSOR_PATH}")
+        if save:
+            self.save_preprocessor()
         
         # Paso 5: Transformar datos
         print("\n[4/4] Aplicando transformaciones...")
@@ -178,6 +264,36 @@ class FeatureEngineer:
         
         return X_train_processed, X_test_processed, y_train, y_test
     
+    def save_preprocessor(self, path=None, metadata=None):
+        """
+        Guarda el preprocesador ajustado con sus features de entrada y de salida en la cabecera.
+        
+        Args:
+            path (str, optional): Ruta de destino. Si es None, usa config.PREPROCESSOR_PATH.
+            metadata (dict, optional): Metadatos adicionales para la cabecera.
+        """
+        path = path or config.PREPROCESSOR_PATH
+        save_artifact(self.preprocessor, path, metadata={
+            'input_features': list(self.preprocessor.feature_names_in_),
+            'n_output_features': len(self.get_feature_names()),
+            **(metadata or {})
+        })
+        print(f"  ✓ Preprocesador guardado en: {path}")
+    
+    def get_feature_names(self):
+        """
+        Devuelve los nombres de las columnas generadas por el preprocesador ajustado.
+        
+        Returns:
+            list: Nombres de las features transformadas (vacía si no están disponibles).
+        """
+        if self.preprocessor is None:
+            return []
+        try:
+            return list(self.preprocessor.get_feature_names_out())
+        except (AttributeError, ValueError):
+            return []
+    
     def transform_new_data(self, df: pd.DataFrame):
         """
         Transforma nuevos datos usando el preprocesador ya ajustado.
@@ -191,7 +307,7 @@ class FeatureEngineer:
         """
         if self.preprocessor is None:
             try:
-                self.preprocessor = joblib.load(config.PREPROCESSOR_PATH)
+                self.preprocessor = load_artifact(config.PREPROCESSOR_PATH)
                 print(f"✓ Preprocesador cargado desde: {config.PREPROCESSOR_PATH}")
             except FileNotFoundError:
                 raise ValueError(
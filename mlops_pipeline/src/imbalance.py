@@ -0,0 +1,302 @@
+"""
+Módulo de estrategias para el manejo del desbalanceo de clases.
+Define estrategias intercambiables para ModelTrainer: solo ponderación de clases,
+submuestreo de la clase mayoritaria, SMOTE exacto (imblearn) y un SMOTE escalable
+con búsqueda de vecinos por lotes (aproximada en minoritarias grandes) y síntesis
+por bloques sobre un arreglo preasignado.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.neighbors import NearestNeighbors
+from imblearn.over_sampling import SMOTE
+try:
+    from mlops_pipeline.src import config
+except ImportError:
+    from . import config
+
+
+def _silent(*args, **kwargs):
+    """Reemplazo de print cuando verbose=False."""
+
+
+class ImbalanceStrategy:
+    """
+    Clase base de las estrategias de desbalanceo.
+    Las instancias son invocables (X, y) -> (X_res, y_res) y serializables, de modo
+    que pueden enviarse a los procesos de la validación cruzada.
+    """
+
+    name = None
+    # True si la estrategia no remuestrea y delega el balanceo en los pesos de clase
+    reweights = False
+
+    def __init__(self, random_state=None, ratio_threshold=None):
+        """
+        Inicializa la estrategia.
+
+        Args:
+            random_state (int, optional): Semilla. Si es None, usa config.RANDOM_STATE.
+            ratio_threshold (float, optional): Ratio a partir del cual se balancea.
+                                               Si es None, usa config.IMBALANCE_RATIO_THRESHOLD.
+        """
+        self.random_state = random_state if random_state is not None else config.RANDOM_STATE
+        self.ratio_threshold = (ratio_threshold if ratio_threshold is not None
+                                else config.IMBALANCE_RATIO_THRESHOLD)
+
+    def __repr__(self):
+        params = ', '.join(f'{k}={v!r}' for k, v in sorted(vars(self).items()))
+        return f'{type(self).__name__}({params})'
+
+    def fit_resample(self, X, y):
+        """
+        Balancea las clases. Solo se invoca cuando el ratio supera el umbral.
+
+        Args:
+            X (array o sparse): Features de entrenamiento.
+            y (array): Target binario.
+
+        Returns:
+            tuple: (X_res, y_res)
+        """
+        raise NotImplementedError
+
+    def __call__(self, X_train, y_train, verbose=False):
+        """
+        Detecta el desbalanceo y aplica la estrategia si el ratio supera el umbral.
+
+        Args:
+            X_train (array o sparse): Features de entrenamiento.
+            y_train (array): Target de entrenamiento.
+            verbose (bool): Si es True, imprime las distribuciones antes y después.
+
+        Returns:
+            tuple: (X_train_res, y_train_res)
+        """
+        log = print if verbose else _silent
+
+        fraud_counts = pd.Series(y_train).value_counts()
+        fraud_pct = pd.Series(y_train).value_counts(normalize=True) * 100
+
+        log(f"  Distribución original:")
+        log(f"    • Clase 0 (No Fraude): {fraud_counts.get(0, 0):,} ({fraud_pct.get(0, 0):.2f}%)")
+        log(f"    • Clase 1 (Fraude):    {fraud_counts.get(1, 0):,} ({fraud_pct.get(1, 0):.2f}%)")
+
+        if len(fraud_counts) != 2:
+            log(f"\n  ⚠️ Advertencia: Solo se detectó una clase en los datos")
+            return X_train, y_train
+
+        ratio = fraud_counts.max() / fraud_counts.min()
+        log(f"    • Ratio de desbalanceo: 1:{ratio:.1f}")
+
+        if ratio <= self.ratio_threshold:
+            log(f"\n  ✓ No se requiere balanceo (ratio aceptable)")
+            return X_train, y_train
+
+        log(f"\n  ⚠️ Desbalanceo detectado (ratio > {self.ratio_threshold:g}:1)")
+        if self.reweights:
+            log(f"  ✓ Estrategia '{self.name}': se mantienen los datos y se ponderan las clases")
+            return X_train, y_train
+
+        log(f"  🔄 Aplicando estrategia '{self.name}' para balancear clases...")
+        X_train_res, y_train_res = self.fit_resample(X_train, np.asarray(y_train))
+
+        balanced_counts = pd.Series(y_train_res).value_counts()
+        balanced_pct = pd.Series(y_train_res).value_counts(normalize=True) * 100
+
+        log(f"  ✅ Datos balanceados con '{self.name}':")
+        log(f"    • Clase 0 (No Fraude): {balanced_counts.get(0, 0):,} ({balanced_pct.get(0, 0):.2f}%)")
+        log(f"    • Clase 1 (Fraude):    {balanced_counts.get(1, 0):,} ({balanced_pct.get(1, 0):.2f}%)")
+        log(f"    • Shape resultante: {X_train_res.shape}")
+
+        return X_train_res, y_train_res
+
+    @staticmethod
+    def _split_classes(y):
+        """Devuelve (etiqueta_minoritaria, etiqueta_mayoritaria) según las frecuencias."""
+        labels, counts = np.unique(y, return_counts=True)
+        order = np.argsort(counts)
+        return labels[order[0]], labels[order[-1]]
+
+
+class ClassWeightStrategy(ImbalanceStrategy):
+    """
+    No modifica los datos: el balanceo se delega en class_weight='balanced'
+    y en el scale_pos_weight de XGBoost calculado a partir del train.
+    """
+
+    name = 'class_weight'
+    reweights = True
+
+    def fit_resample(self, X, y):
+        return X, y
+
+
+class RandomUnderSampleStrategy(ImbalanceStrategy):
+    """
+    Submuestrea la clase mayoritaria sin reemplazo hasta alcanzar el ratio deseado.
+    Reduce memoria y tiempo de entrenamiento a costa de descartar ejemplos.
+    """
+
+    name = 'undersample'
+
+    def __init__(self, random_state=None, ratio_threshold=None, sampling_ratio=1.0):
+        """
+        Args:
+            sampling_ratio (float): Filas mayoritarias conservadas por cada minoritaria.
+        """
+        super().__init__(random_state, ratio_threshold)
+        self.sampling_ratio = sampling_ratio
+
+    def fit_resample(self, X, y):
+        rng = np.random.default_rng(self.random_state)
+        minority, _ = self._split_classes(y)
+        minority_idx = np.flatnonzero(y == minority)
+        majority_idx = np.flatnonzero(y != minority)
+
+        n_keep = min(len(majority_idx), int(round(len(minority_idx) * self.sampling_ratio)))
+        kept = rng.choice(majority_idx, size=n_keep, replace=False)
+        idx = np.sort(np.concatenate([minority_idx, kept]))
+
+        return X[idx], y[idx]
+
+
+class SMOTEStrategy(ImbalanceStrategy):
+    """
+    SMOTE exacto de imblearn sobre todo el train (comportamiento original).
+    Adecuado para conjuntos pequeños o medianos.
+    """
+
+    name = 'smote'
+
+    def __init__(self, random_state=None, ratio_threshold=None, k_neighbors=None):
+        super().__init__(random_state, ratio_threshold)
+        self.k_neighbors = k_neighbors if k_neighbors is not None else config.SMOTE_K_NEIGHBORS
+
+    def fit_resample(self, X, y):
+        smote = SMOTE(random_state=self.random_state, k_neighbors=self.k_neighbors)
+        return smote.fit_resample(X, y)
+
+
+class ScalableSMOTEStrategy(ImbalanceStrategy):
+    """
+    SMOTE para conjuntos grandes.
+
+    - La búsqueda de vecinos se hace solo dentro de la clase minoritaria y por lotes,
+      acotando la memoria de las matrices de distancias.
+    - Si la minoritaria supera max_reference_size, los vecinos se buscan en una
+      muestra aleatoria de ese tamaño (búsqueda aproximada).
+    - Las muestras sintéticas se generan por bloques y se escriben en un arreglo
+      preasignado del dtype de entrada, sin copias intermedias de todo el train.
+    """
+
+    name = 'scalable_smote'
+
+    def __init__(self, random_state=None, ratio_threshold=None, k_neighbors=None,
+                 batch_size=None, max_reference_size=None):
+        super().__init__(random_state, ratio_threshold)
+        self.k_neighbors = k_neighbors if k_neighbors is not None else config.SMOTE_K_NEIGHBORS
+        self.batch_size = batch_size if batch_size is not None else config.SMOTE_BATCH_SIZE
+        self.max_reference_size = (max_reference_size if max_reference_size is not None
+                                   else config.SMOTE_MAX_REFERENCE_SIZE)
+
+    def _neighbors(self, X_min, rng):
+        """
+        Calcula los k vecinos de cada fila minoritaria (índices sobre X_min).
+        """
+        n_min = X_min.shape[0]
+        if n_min > self.max_reference_size:
+            reference = np.sort(rng.choice(n_min, size=self.max_reference_size, replace=False))
+        else:
+            reference = np.arange(n_min)
+
+        k = min(self.k_neighbors, len(reference) - 1)
+        index = NearestNeighbors(n_neighbors=k + 1).fit(X_min[reference])
+
+        # Posición de cada fila en la referencia (-1 si no forma parte de la muestra)
+        position = np.full(n_min, -1, dtype=np.int64)
+        position[reference] = np.arange(len(reference))
+
+        neighbors = np.empty((n_min, k), dtype=np.int64)
+        for start in range(0, n_min, self.batch_size):
+            stop = min(start + self.batch_size, n_min)
+            _, found = index.kneighbors(X_min[start:stop])
+            # Se descarta la propia fila, que no siempre sale primera (duplicados a distancia 0);
+            # las filas fuera de la referencia conservan sus k vecinos más cercanos
+            drop = found == position[start:stop, None]
+            drop[~drop.any(axis=1), -1] = True
+            neighbors[start:stop] = reference[found[~drop].reshape(-1, k)]
+        return neighbors
+
+    def fit_resample(self, X, y):
+        rng = np.random.default_rng(self.random_state)
+        minority, _ = self._split_classes(y)
+        minority_idx = np.flatnonzero(y == minority)
+        n_synthetic = (len(y) - len(minority_idx)) - len(minority_idx)
+
+        if n_synthetic <= 0 or len(minority_idx) < 2:
+            return X, y
+
+        X_min = X[minority_idx]
+        neighbors = self._neighbors(X_min, rng)
+        is_sparse = sparse.issparse(X)
+        dtype = X.dtype if np.issubdtype(X.dtype, np.floating) else np.float64
+
+        if is_sparse:
+            blocks = [X.astype(dtype)]
+        else:
+            X_res = np.empty((X.shape[0] + n_synthetic, X.shape[1]), dtype=dtype)
+            X_res[:X.shape[0]] = X
+
+        for start in range(0, n_synthetic, self.batch_size):
+            size = min(self.batch_size, n_synthetic - start)
+            base = rng.integers(0, X_min.shape[0], size=size)
+            nn = neighbors[base, rng.integers(0, neighbors.shape[1], size=size)]
+            gap = rng.random(size, dtype=np.float32 if dtype == np.float32 else np.float64)
+
+            if is_sparse:
+                diff = X_min[nn] - X_min[base]
+                blocks.append((X_min[base] + sparse.diags(gap) @ diff).astype(dtype))
+            else:
+                row = X.shape[0] + start
+                X_res[row:row + size] = X_min[base] + gap[:, None] * (X_min[nn] - X_min[base])
+
+        if is_sparse:
+            X_res = sparse.vstack(blocks, format='csr')
+
+        y_res = np.concatenate([y, np.full(n_synthetic, minority, dtype=y.dtype)])
+        return X_res, y_res
+
+
+IMBALANCE_STRATEGIES = {
+    strategy.name: strategy
+    for strategy in (ClassWeightStrategy, RandomUnderSampleStrategy, SMOTEStrategy, ScalableSMOTEStrategy)
+}
+
+
+def get_imbalance_strategy(strategy=None, random_state=None) -> ImbalanceStrategy:
+    """
+    Construye una estrategia de desbalanceo a partir de su nombre.
+
+    Args:
+        strategy (str o ImbalanceStrategy, optional): Nombre registrado en IMBALANCE_STRATEGIES
+            o una instancia ya configurada. Si es None, usa config.IMBALANCE_STRATEGY.
+        random_state (int, optional): Semilla de la estrategia.
+
+    Returns:
+        ImbalanceStrategy: Estrategia lista para usar.
+
+    Raises:
+        ValueError: Si el nombre no corresponde a ninguna estrategia.
+    """
+    if isinstance(strategy, ImbalanceStrategy):
+        return strategy
+
+    name = strategy if strategy is not None else config.IMBALANCE_STRATEGY
+    if name not in IMBALANCE_STRATEGIES:
+        raise ValueError(
+            f"Estrategia de desbalanceo desconocida: '{name}'. "
+            f"Opciones: {list(IMBALANCE_STRATEGIES)}"
+        )
+    return IMBALANCE_STRATEGIES[name](random_state=random_state)
@@ -0,0 +1,282 @@
+"""
+Módulo de reentrenamiento incremental.
+Define la clase IncrementalTrainer, que carga el modelo desplegado y el preprocesador
+ya ajustado, continúa el entrenamiento solo con las transacciones nuevas y reemplaza
+el modelo únicamente si el candidato no empeora las métricas en un holdout de los
+datos nuevos (puerta de promoción). Al promover, la cascada y el modelo de respaldo
+exportados con el modelo anterior se actualizan para que la API los siga usando.
+
+Cómo continúa el entrenamiento cada tipo de modelo:
+    - XGBoost: añade rondas de boosting sobre el booster existente (xgb_model).
+    - RandomForest: añade árboles entrenados con los datos nuevos (warm_start).
+    - Modelos con partial_fit (SGDClassifier...): una pasada de partial_fit.
+    - LogisticRegression: no tiene partial_fit; parte de los coeficientes actuales
+      (warm_start) con un número acotado de iteraciones.
+
+Uso:
+    python -m mlops_pipeline.src.incremental nuevas_transacciones.csv
+"""
+
+import os
+import sys
+import copy
+import warnings
+from datetime import datetime
+import pandas as pd
+import xgboost as xgb
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+try:
+    from mlops_pipeline.src.data_validation import DataValidator
+    from mlops_pipeline.src.ft_engineering import FeatureEngineer
+    from mlops_pipeline.src.imbalance import get_imbalance_strategy
+    from mlops_pipeline.src.evaluation import evaluate_scores
+    from mlops_pipeline.src.artifacts import (save_artifact, load_artifact, read_artifact_metadata,
+                                              artifact_checksum)
+    from mlops_pipeline.src.cascade import calibrate_band
+    from mlops_pipeline.src import config
+except ImportError:
+    from .data_validation import DataValidator
+    from .ft_engineering import FeatureEngineer
+    from .imbalance import get_imbalance_strategy
+    from .evaluation import evaluate_scores
+    from .artifacts import save_artifact, load_artifact, read_artifact_metadata, artifact_checksum
+    from .cascade import calibrate_band
+    from . import config
+
+
+def continue_training(model, X, y, xgb_rounds=None, rf_trees=None, linear_max_iter=None):
+    """
+    Continúa el entrenamiento de un modelo con datos nuevos.
+    El modelo recibido no se modifica: se devuelve una copia actualizada.
+
+    Args:
+        model: Modelo entrenado (XGBoost, RandomForest, LogisticRegression o con partial_fit).
+        X (array o sparse): Features nuevas ya preprocesadas.
+        y (array): Target de los datos nuevos.
+        xgb_rounds (int, optional): Rondas adicionales. Por defecto config.INCREMENTAL_XGB_ROUNDS.
+        rf_trees (int, optional): Árboles adicionales. Por defecto config.INCREMENTAL_RF_TREES.
+        linear_max_iter (int, optional): Iteraciones de LogisticRegression.
+                                         Por defecto config.INCREMENTAL_LINEAR_MAX_ITER.
+
+    Returns:
+        Modelo actualizado.
+
+    Raises:
+        TypeError: Si el tipo de modelo no admite entrenamiento incremental.
+    """
+    xgb_rounds = xgb_rounds if xgb_rounds is not None else config.INCREMENTAL_XGB_ROUNDS
+    rf_trees = rf_trees if rf_trees is not None else config.INCREMENTAL_RF_TREES
+    linear_max_iter = linear_max_iter if linear_max_iter is not None else config.INCREMENTAL_LINEAR_MAX_ITER
+
+    if isinstance(model, xgb.XGBClassifier):
+        candidate = clone(model).set_params(n_estimators=xgb_rounds)
+        candidate.fit(X, y, xgb_model=model.get_booster())
+        # n_estimators refleja las rondas totales del booster, no solo las añadidas
+        candidate.set_params(n_estimators=candidate.get_booster().num_boosted_rounds())
+        return candidate
+
+    candidate = copy.deepcopy(model)
+
+    if isinstance(candidate, RandomForestClassifier):
+        candidate.set_params(warm_start=True, n_estimators=len(candidate.estimators_) + rf_trees)
+        with warnings.catch_warnings():
+            # class_weight se recalcula con los datos nuevos, que es lo buscado
+            warnings.filterwarnings('ignore', message='.*class_weight.*warm_start.*')
+            candidate.fit(X, y)
+        return candidate
+
+    if hasattr(candidate, 'partial_fit'):
+        candidate.partial_fit(X, y, classes=candidate.classes_)
+        return candidate
+
+    if isinstance(candidate, LogisticRegression):
+        candidate.set_params(warm_start=True, max_iter=linear_max_iter)
+        with warnings.catch_warnings():
+            # Detenerse antes de converger mantiene el modelo cerca de la solución previa
+            warnings.simplefilter('ignore', ConvergenceWarning)
+            candidate.fit(X, y)
+        return candidate
+
+    raise TypeError(f"El modelo {type(model).__name__} no admite entrenamiento incremental.")
+
+
+class IncrementalTrainer:
+    """
+    Actualiza el modelo desplegado con transacciones nuevas sin reentrenar desde cero.
+    """
+
+    def __init__(self, model_path=None, preprocessor_path=None, holdout_size=None,
+                 promotion_tolerance=None, promotion_metrics=None, random_state=None,
+                 imbalance_strategy=None, cascade_path=None, fallback_path=None):
+        """
+        Inicializa el IncrementalTrainer.
+
+        Args:
+            model_path (str, optional): Modelo desplegado. Por defecto config.MODEL_PATH.
+            preprocessor_path (str, optional): Preprocesador ajustado. Por defecto config.PREPROCESSOR_PATH.
+            holdout_size (float, optional): Fracción de los datos nuevos para la puerta de promoción.
+                                            Por defecto config.INCREMENTAL_HOLDOUT_SIZE.
+            promotion_tolerance (float, optional): Caída máxima permitida por métrica.
+                                                   Por defecto config.PROMOTION_TOLERANCE.
+            promotion_metrics (list, optional): Métricas vigiladas. Por defecto config.PROMOTION_METRICS.
+            random_state (int, optional): Semilla. Por defecto config.RANDOM_STATE.
+            imbalance_strategy (str o ImbalanceStrategy, optional): Estrategia de desbalanceo
+                                      aplicada a los datos nuevos. Por defecto config.IMBALANCE_STRATEGY.
+            cascade_path (str, optional): Cascada a actualizar al promover. Por defecto
+                                          config.CASCADE_MODEL_PATH.
+            fallback_path (str, optional): Modelo de respaldo a actualizar al promover. Por
+                                           defecto config.FALLBACK_MODEL_PATH.
+        """
+        self.model_path = model_path or config.MODEL_PATH
+        self.preprocessor_path = preprocessor_path or config.PREPROCESSOR_PATH
+        self.holdout_size = holdout_size if holdout_size is not None else config.INCREMENTAL_HOLDOUT_SIZE
+        self.promotion_tolerance = (promotion_tolerance if promotion_tolerance is not None
+                                    else config.PROMOTION_TOLERANCE)
+        self.promotion_metrics = promotion_metrics if promotion_metrics is not None else config.PROMOTION_METRICS
+        self.random_state = random_state if random_state is not None else config.RANDOM_STATE
+        self.imbalance_strategy = get_imbalance_strategy(imbalance_strategy, self.random_state)
+        self.cascade_path = cascade_path or config.CASCADE_MODEL_PATH
+        self.fallback_path = fallback_path or config.FALLBACK_MODEL_PATH
+        self.validator = DataValidator()
+        self.engineer = FeatureEngineer(random_state=self.random_state)
+
+    def _prepare(self, df_new):
+        """Valida, crea features, separa el holdout y transforma con el preprocesador existente."""
+        df_new, is_valid = self.validator.validate_and_clean(df_new)
+        if not is_valid:
+            raise ValueError("Los datos nuevos no pasaron la validación.")
+
+        df_features = self.engineer.create_features(df_new)
+        X = df_features.drop(config.TARGET_VARIABLE, axis=1)
+        y = df_features[config.TARGET_VARIABLE]
+        X_train, X_holdout, y_train, y_holdout = train_test_split(
+            X, y, test_size=self.holdout_size, random_state=self.random_state, stratify=y
+        )
+
+        self.engineer.preprocessor = load_artifact(self.preprocessor_path)
+        return (self.engineer.preprocessor.transform(X_train), self.engineer.preprocessor.transform(X_holdout),
+                y_train, y_holdout)
+
+    def gate(self, current_metrics, candidate_metrics):
+        """
+        Puerta de promoción: ninguna métrica vigilada puede caer más que la tolerancia.
+
+        Returns:
+            tuple: (promover, lista de métricas que empeoraron)
+        """
+        regressions = [
+            metric for metric in self.promotion_metrics
+            if candidate_metrics[metric] < current_metrics[metric] - self.promotion_tolerance
+        ]
+        return not regressions, regressions
+
+    def run(self, df_new):
+        """
+        Ejecuta una actualización incremental.
+
+        Args:
+            df_new (pd.DataFrame): Transacciones nuevas (con la variable objetivo).
+
+        Returns:
+            dict: Decisión de la puerta de promoción y métricas del modelo actual y del candidato.
+        """
+        print("\n" + "="*60)
+        print("REENTRENAMIENTO INCREMENTAL")
+        print("="*60)
+
+        header = read_artifact_metadata(self.model_path)
+        base_checksum = artifact_checksum(self.model_path)
+        current = load_artifact(self.model_path)
+        print(f"✓ Modelo actual cargado: {type(current).__name__} ({self.model_path})")
+
+        X_train, X_holdout, y_train, y_holdout = self._prepare(df_new)
+        print(f"✓ Datos nuevos: {X_train.shape[0]:,} filas para entrenar, "
+              f"{X_holdout.shape[0]:,} para la puerta de promoción")
+
+        X_train_res, y_train_res = self.imbalance_strategy(X_train, y_train)
+        candidate = continue_training(current, X_train_res, y_train_res)
+        print(f"✓ Entrenamiento continuado sobre el modelo existente")
+
+        current_eval = evaluate_scores(y_holdout, current.predict_proba(X_holdout)[:, 1], n_bootstrap=0)
+        candidate_eval = evaluate_scores(y_holdout, candidate.predict_proba(X_holdout)[:, 1], n_bootstrap=0)
+        promote, regressions = self.gate(current_eval, candidate_eval)
+
+        print(f"\n📊 MÉTRICAS EN EL HOLDOUT (tolerancia = {self.promotion_tolerance}):")
+        print(f"  {'Métrica':<20}{'Actual':>10}{'Candidato':>12}")
+        for metric in self.promotion_metrics:
+            flag = '  ⚠️' if metric in regressions else ''
+            print(f"  {metric:<20}{current_eval[metric]:>10.4f}{candidate_eval[metric]:>12.4f}{flag}")
+
+        if promote:
+            metadata = dict(header.get('metadata', {}))
+            metadata.update({
+                'incremental_updates': metadata.get('incremental_updates', 0) + 1,
+                'base_checksum': header.get('checksum'),
+                'updated_at': datetime.now().isoformat(),
+                'holdout_metrics': {m: candidate_eval[m] for m in self.promotion_metrics}
+            })
+            if isinstance(candidate, xgb.XGBClassifier):
+                metadata['boosting_rounds'] = candidate.get_booster().num_boosted_rounds()
+            save_artifact(candidate, self.model_path, metadata=metadata)
+            print(f"\n✅ Candidato promovido: modelo actualizado en {self.model_path}")
+            self._refresh_derived(base_checksum, candidate, X_holdout, y_holdout)
+        else:
+            print(f"\n❌ Candidato rechazado: empeoran {', '.join(regressions)}. Se mantiene el modelo actual")
+
+        return {
+            'promoted': promote,
+            'regressions': regressions,
+            'current': {m: current_eval[m] for m in self.promotion_metrics},
+            'candidate': {m: candidate_eval[m] for m in self.promotion_metrics}
+        }
+
+    def _refresh_derived(self, base_checksum, candidate, X_holdout, y_holdout):
+        """
+        Actualiza la cascada y el modelo de respaldo exportados junto al modelo reemplazado.
+
+        La cascada recibe el candidato como etapa 2 y recalibra su banda con el holdout de
+        los datos nuevos. El respaldo no cambia (el preprocesador es el mismo): solo se
+        actualiza el checksum del mejor modelo en su cabecera. Los artefactos de otro
+        entrenamiento no se tocan; la API ya los descarta.
+        """
+        checksum = artifact_checksum(self.model_path)
+
+        if _derived_from(self.cascade_path, 'second_stage_checksum', base_checksum):
+            metadata = dict(read_artifact_metadata(self.cascade_path)['metadata'])
+            cascade = load_artifact(self.cascade_path, mmap_mode=False)
+            band = calibrate_band(cascade.first_stage.predict_proba(X_holdout)[:, 1],
+                                  candidate.predict_proba(X_holdout)[:, 1],
+                                  y_true=y_holdout, threshold=cascade.threshold)
+            cascade.second_stage, cascade.low, cascade.high = candidate, band['low'], band['high']
+            metadata['cascade'] = {**metadata.get('cascade', {}),
+                                   **{k: float(v) for k, v in band.items() if k != 'threshold'}}
+            metadata['second_stage_checksum'] = checksum
+            save_artifact(cascade, self.cascade_path, metadata=metadata)
+            print(f"✓ Cascada actualizada: banda [{band['low']:.4f}, {band['high']:.4f}) recalibrada "
+                  f"en el holdout ({self.cascade_path})")
+
+        if _derived_from(self.fallback_path, 'best_model_checksum', base_checksum):
+            metadata = dict(read_artifact_metadata(self.fallback_path)['metadata'])
+            metadata['best_model_checksum'] = checksum
+            save_artifact(load_artifact(self.fallback_path, mmap_mode=False), self.fallback_path,
+                          metadata=metadata)
+            print(f"✓ Modelo de respaldo vinculado al modelo actualizado ({self.fallback_path})")
+
+
+def _derived_from(path, key, checksum):
+    """Indica si el artefacto derivado existe y se exportó junto al modelo con ese checksum."""
+    return os.path.exists(path) and read_artifact_metadata(path).get('metadata', {}).get(key) == checksum
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Uso: python -m mlops_pipeline.src.incremental <nuevas_transacciones.csv>")
+        sys.exit(2)
+
+    df_new = pd.read_csv(sys.argv[1]).drop(columns=config.IRRELEVANT_COLS, errors='ignore')
+    result = IncrementalTrainer().run(df_new)
+    sys.exit(0 if result['promoted'] else 1)
@@ -0,0 +1,177 @@
+"""
+Módulo de medición de latencia de inferencia.
+Mide para cada modelo candidato la latencia de predicción de una fila y de lotes
+(p50/p99), el throughput, la memoria pico asignada durante la predicción y el tamaño
+del modelo serializado, y selecciona el modelo con mejor métrica dentro del
+presupuesto de latencia y tamaño. LatencyTracker estima el mismo costo en vivo, en
+la API, para decidir qué modelo puede responder antes de un deadline.
+"""
+
+import time
+import threading
+import pickle
+import tracemalloc
+import numpy as np
+try:
+    from mlops_pipeline.src import config
+except ImportError:
+    from . import config
+
+
+def _percentiles_ms(times):
+    times_ms = np.asarray(times) * 1000
+    return float(np.percentile(times_ms, 50)), float(np.percentile(times_ms, 99))
+
+
+def model_size_mb(model):
+    """Tamaño del modelo serializado (pickle protocolo 5) en MB."""
+    return len(pickle.dumps(model, protocol=5)) / 1024 ** 2
+
+
+def benchmark_model(model, X, single_calls=None, batch_size=None, batch_calls=None):
+    """
+    Mide la latencia de inferencia de un modelo.
+
+    Args:
+        model: Modelo entrenado con predict_proba.
+        X (array o sparse): Filas ya preprocesadas (por ejemplo, el conjunto de test).
+        single_calls (int, optional): Predicciones de una fila. Por defecto config.LATENCY_SINGLE_ROW_CALLS.
+        batch_size (int, optional): Filas por lote. Por defecto config.LATENCY_BATCH_SIZE.
+        batch_calls (int, optional): Lotes medidos. Por defecto config.LATENCY_BATCH_CALLS.
+
+    Returns:
+        dict: single_p50_ms, single_p99_ms, batch_p50_ms, batch_p99_ms, batch_rows_per_s,
+              predict_peak_mb y model_size_mb.
+    """
+    single_calls = single_calls if single_calls is not None else config.LATENCY_SINGLE_ROW_CALLS
+    batch_size = batch_size if batch_size is not None else config.LATENCY_BATCH_SIZE
+    batch_calls = batch_calls if batch_calls is not None else config.LATENCY_BATCH_CALLS
+
+    n_rows = X.shape[0]
+    batch_size = min(batch_size, n_rows)
+    model.predict_proba(X[:1])  # Calentamiento
+
+    single_times = []
+    for i in range(single_calls):
+        row = X[i % n_rows:i % n_rows + 1]
+        start = time.perf_counter()
+        model.predict_proba(row)
+        single_times.append(time.perf_counter() - start)
+
+    batch_times = []
+    for i in range(batch_calls):
+        offset = (i * batch_size) % max(n_rows - batch_size + 1, 1)
+        batch = X[offset:offset + batch_size]
+        start = time.perf_counter()
+        model.predict_proba(batch)
+        batch_times.append(time.perf_counter() - start)
+
+    # La memoria se mide en una llamada aparte: tracemalloc distorsiona los tiempos
+    tracemalloc.start()
+    try:
+        model.predict_proba(X[:batch_size])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    single_p50, single_p99 = _percentiles_ms(single_times)
+    batch_p50, batch_p99 = _percentiles_ms(batch_times)
+    return {
+        'single_p50_ms': single_p50,
+        'single_p99_ms': single_p99,
+        'batch_p50_ms': batch_p50,
+        'batch_p99_ms': batch_p99,
+        'batch_rows_per_s': batch_size / float(np.median(batch_times)),
+        'predict_peak_mb': peak / 1024 ** 2,
+        'model_size_mb': model_size_mb(model)
+    }
+
+
+def within_budget(latency, budget_ms=None, max_size_mb=None):
+    """
+    Indica si un modelo cumple el presupuesto de latencia p99 (una fila) y de tamaño.
+
+    Args:
+        latency (dict): Resultado de benchmark_model.
+        budget_ms (float, optional): p99 máximo en ms. Por defecto config.LATENCY_BUDGET_MS_P99.
+        max_size_mb (float, optional): Tamaño máximo en MB. Por defecto config.MAX_MODEL_SIZE_MB.
+    """
+    budget_ms = budget_ms if budget_ms is not None else config.LATENCY_BUDGET_MS_P99
+    max_size_mb = max_size_mb if max_size_mb is not None else config.MAX_MODEL_SIZE_MB
+    if budget_ms is not None and latency['single_p99_ms'] > budget_ms:
+        return False
+    if max_size_mb is not None and latency['model_size_mb'] > max_size_mb:
+        return False
+    return True
+
+
+class LatencyTracker:
+    """
+    Estimación en vivo del costo de inferencia de cada modelo cargado.
+
+    Modela el tiempo de una llamada como overhead + por_fila × filas y actualiza ambos
+    términos con medias móviles exponenciales (EWMA): las llamadas de una fila corrigen
+    el overhead y las de lotes el costo por fila. Puede sembrarse con las mediciones
+    offline de benchmark_model guardadas en los metadatos del artefacto.
+    """
+
+    def __init__(self, alpha=None):
+        """
+        Args:
+            alpha (float, optional): Peso de cada nueva observación. Por defecto config.LATENCY_EWMA_ALPHA.
+        """
+        self.alpha = alpha if alpha is not None else config.LATENCY_EWMA_ALPHA
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def seed(self, name, latency):
+        """
+        Inicializa las estimaciones de un modelo con el resultado de benchmark_model.
+        """
+        with self._lock:
+            self.stats[name] = {
+                'overhead_ms': float(latency['single_p50_ms']),
+                'per_row_ms': 1000.0 / float(latency['batch_rows_per_s']),
+                'calls': 0
+            }
+
+    def update(self, name, n_rows, elapsed_ms):
+        """Registra una llamada observada de n_rows filas."""
+        n_rows = max(int(n_rows), 1)
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                self.stats[name] = {'overhead_ms': elapsed_ms if n_rows == 1 else 0.0,
+                                    'per_row_ms': 0.0 if n_rows == 1 else elapsed_ms / n_rows,
+                                    'calls': 1}
+                return
+            if n_rows == 1:
+                observed = elapsed_ms - stats['per_row_ms']
+                stats['overhead_ms'] += self.alpha * (max(observed, 0.0) - stats['overhead_ms'])
+            else:
+                observed = (elapsed_ms - stats['overhead_ms']) / n_rows
+                stats['per_row_ms'] += self.alpha * (max(observed, 0.0) - stats['per_row_ms'])
+            stats['calls'] += 1
+
+    def estimate(self, name, n_rows):
+        """Tiempo estimado en ms para puntuar n_rows filas, o None si no hay datos del modelo."""
+        stats = self.stats.get(name)
+        if stats is None:
+            return None
+        return stats['overhead_ms'] + stats['per_row_ms'] * n_rows
+
+    def rows_within(self, name, budget_ms):
+        """Máximo de filas que se estima puntuar en budget_ms (None si no hay datos)."""
+        stats = self.stats.get(name)
+        if stats is None:
+            return None
+        available = budget_ms - stats['overhead_ms']
+        if available <= 0:
+            return 0
+        if stats['per_row_ms'] <= 0:
+            return None
+        return int(available // stats['per_row_ms'])
+
+    def snapshot(self):
+        with self._lock:
+            return {name: dict(stats) for name, stats in self.stats.items()}
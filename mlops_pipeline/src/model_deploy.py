@@ -3,10 +3,11 @@ Módulo de despliegue del modelo con FastAPI.
 Crea una API REST para servir predicciones del modelo de detección de fraude.
 """
 
-import joblib
+import os
+import time
 import pandas as pd
 import numpy as np
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header
 from pydantic import BaseModel, Field, validator
 from typing import List, Optional
 import uvicorn
@@ -14,8 +15,12 @@ from datetime import datetime
 
 try:
     from mlops_pipeline.src import config
+    from mlops_pipeline.src.artifacts import load_artifact, read_artifact_metadata, artifact_checksum
+    from mlops_pipeline.src.latency import LatencyTracker
 except ImportError:
     from . import config
+    from .artifacts import load_artifact, read_artifact_metadata, artifact_checksum
+    from .latency import LatencyTracker
 
 
 # ==================== MODELOS PYDANTIC ====================
@@ -54,6 +59,8 @@ class PredictionResponse(BaseModel):
     fraud_probability: float
     risk_level: str
     timestamp: str
+    stage: Optional[int] = None  # Etapa de la cascada que produjo el score (solo en modo cascada)
+    model: Optional[str] = None  # Modelo que produjo el score
 
 
 class BatchPredictionResponse(BaseModel):
@@ -62,6 +69,8 @@ class BatchPredictionResponse(BaseModel):
     total_transactions: int
     fraud_detected: int
     processing_time_ms: float
+    routing: Optional[dict] = None  # Fracción del lote puntuada por cada etapa (solo en modo cascada)
+    partial: bool = False  # True si el deadline solo permitió puntuar las primeras transacciones
 
 
 class HealthResponse(BaseModel):
@@ -86,6 +95,13 @@ app = FastAPI(
 # Variables globales para el modelo y preprocesador
 model = None
 preprocessor = None
+model_path = config.MODEL_PATH
+serving_mode = "single"
+routing_counts = {1: 0, 2: 0}  # Transacciones puntuadas por cada etapa desde el arranque
+model_name = None
+fallback_model = None  # Modelo más rápido para peticiones con deadline
+fallback_name = None
+latency_tracker = LatencyTracker()
 
 
 @app.on_event("startup")
@@ -93,18 +109,42 @@ async def load_model_and_preprocessor():
     """
     Carga el modelo y el preprocesador al iniciar la aplicación.
     """
-    global model, preprocessor
+    global model, preprocessor, model_path, serving_mode, model_name, fallback_model, fallback_name
     
     try:
         print("🔄 Cargando modelo y preprocesador...")
         
         # Cargar preprocesador
-        preprocessor = joblib.load(config.PREPROCESSOR_PATH)
+        preprocessor = load_artifact(config.PREPROCESSOR_PATH)
         print(f"✓ Preprocesador cargado desde: {config.PREPROCESSOR_PATH}")
         
-        # Cargar modelo
-        model = joblib.load(config.MODEL_PATH)
-        print(f"✓ Modelo cargado desde: {config.MODEL_PATH}")
+        # Cargar modelo (la cascada si está configurada y corresponde al mejor modelo actual)
+        model_path, serving_mode = config.MODEL_PATH, "single"
+        if config.SERVING_MODE == "cascade":
+            stale = _stale_reason(config.CASCADE_MODEL_PATH, {
+                'second_stage_checksum': config.MODEL_PATH,
+                'preprocessor_checksum': config.PREPROCESSOR_PATH
+            })
+            if stale is None:
+                model_path, serving_mode = config.CASCADE_MODEL_PATH, "cascade"
+            else:
+                print(f"⚠️  Cascada descartada ({config.CASCADE_MODEL_PATH}): {stale}; se sirve el mejor modelo")
+        model = load_artifact(model_path)
+        model_name = _register_latency(model_path, model)
+        print(f"✓ Modelo cargado desde: {model_path} (modo {serving_mode})")
+        
+        # Cargar modelo de respaldo para peticiones con deadline (opcional, del mismo entrenamiento)
+        fallback_model, fallback_name = None, None
+        stale = _stale_reason(config.FALLBACK_MODEL_PATH, {
+            'best_model_checksum': config.MODEL_PATH,
+            'preprocessor_checksum': config.PREPROCESSOR_PATH
+        })
+        if stale is None:
+            fallback_model = load_artifact(config.FALLBACK_MODEL_PATH)
+            fallback_name = _register_latency(config.FALLBACK_MODEL_PATH, fallback_model)
+            print(f"✓ Modelo de respaldo cargado desde: {config.FALLBACK_MODEL_PATH} ({fallback_name})")
+        elif os.path.exists(config.FALLBACK_MODEL_PATH):
+            print(f"⚠️  Modelo de respaldo descartado ({config.FALLBACK_MODEL_PATH}): {stale}")
         
         print("✅ API lista para servir predicciones")
         
@@ -116,6 +156,125 @@ async def load_model_and_preprocessor():
         print(f"❌ Error inesperado al cargar modelo: {str(e)}")
 
 
+# ==================== SCORING ====================
+
+def _stale_reason(path, bindings):
+    """
+    Comprueba que un artefacto derivado (cascada, modelo de respaldo) corresponda a los
+    artefactos actuales: su cabecera guarda el checksum de cada artefacto del que depende.
+    
+    Args:
+        path (str): Artefacto derivado.
+        bindings (dict): Clave de la cabecera -> ruta del artefacto del que depende.
+    
+    Returns:
+        str: Motivo por el que no se puede usar, o None si corresponde.
+    """
+    if not os.path.exists(path):
+        return "no existe"
+    metadata = read_artifact_metadata(path).get('metadata', {})
+    for key, source in bindings.items():
+        if key not in metadata:
+            return f"la cabecera no incluye '{key}'"
+        if metadata[key] != artifact_checksum(source):
+            return f"no corresponde al artefacto actual {source}"
+    return None
+
+
+def _register_latency(path, loaded_model):
+    """
+    Devuelve el nombre del modelo según sus metadatos y siembra su estimación de
+    costo con la latencia medida al entrenar, si el artefacto la incluye.
+    """
+    metadata = read_artifact_metadata(path).get('metadata', {})
+    name = metadata.get('model_name', type(loaded_model).__name__)
+    if 'latency' in metadata:
+        latency_tracker.seed(name, metadata['latency'])
+    return name
+
+
+def _plan(n_rows, deadline_ms, elapsed_ms):
+    """
+    Elige el modelo y las filas a puntuar para responder antes del deadline.
+    
+    Prueba el modelo principal y luego el de respaldo con el lote completo. Si ninguno
+    llega, puntúa con el más rápido las filas que se estima que caben (lote parcial).
+    Un modelo sin estimación todavía se considera dentro del deadline.
+    
+    Returns:
+        tuple: (usar el modelo de respaldo, filas a puntuar)
+    """
+    if deadline_ms is None:
+        return False, n_rows
+    remaining_ms = (deadline_ms - elapsed_ms) / config.DEADLINE_SAFETY_FACTOR
+    candidates = [(False, model_name)]
+    if fallback_model is not None:
+        candidates.append((True, fallback_name))
+    for use_fallback, name in candidates:
+        estimate = latency_tracker.estimate(name, n_rows)
+        if estimate is None or estimate <= remaining_ms:
+            return use_fallback, n_rows
+    
+    use_fallback, name = candidates[-1]
+    rows = latency_tracker.rows_within(name, remaining_ms)
+    return use_fallback, n_rows if rows is None else min(rows, n_rows)
+
+def _build_features(df):
+    """Crea los features derivados (igual que en ft_engineering.py)."""
+    df['amount_per_transaction'] = df['amount'] / (df['previous_transactions'] + 1)
+    df['age_group'] = pd.cut(df['customer_age'], 
+                             bins=[0, 25, 35, 50, 100], 
+                             labels=['young', 'adult', 'middle_age', 'senior'])
+    df['age_group'] = df['age_group'].astype(str)
+    amount_threshold = df['amount'].quantile(0.75)
+    df['high_amount'] = (df['amount'] > amount_threshold).astype(int)
+    return df
+
+
+def _score(X_processed, use_fallback=False):
+    """
+    Puntúa filas preprocesadas con el modelo principal o con el de respaldo y registra
+    el tiempo observado en el LatencyTracker.
+    
+    Returns:
+        tuple: (probabilidades de fraude, etapa de cada score o None fuera del modo cascada,
+                modelo que produjo cada score)
+    """
+    start = time.perf_counter()
+    n_rows = X_processed.shape[0]
+    if use_fallback:
+        name = fallback_name
+        probabilities, stages = fallback_model.predict_proba(X_processed)[:, 1], None
+        producers = [fallback_name] * n_rows
+    elif serving_mode == "cascade":
+        name = model_name
+        probabilities, stages = model.predict_proba_with_stage(X_processed)
+        routing_counts[1] += int((stages == 1).sum())
+        routing_counts[2] += int((stages == 2).sum())
+        producers = np.where(stages == 1, model.first_stage_name, model.second_stage_name).tolist()
+    else:
+        name = model_name
+        probabilities, stages = model.predict_proba(X_processed)[:, 1], None
+        producers = [model_name] * n_rows
+    latency_tracker.update(name, n_rows, (time.perf_counter() - start) * 1000)
+    return probabilities, stages, producers
+
+
+def _routing_fractions(stages):
+    """Fracción de transacciones puntuadas por cada etapa."""
+    if stages is None or len(stages) == 0:
+        return None
+    return {f"stage_{k}": round(float((stages == k).mean()), 4) for k in (1, 2)}
+
+
+def _risk_level(probability):
+    if probability < 0.3:
+        return "Bajo"
+    elif probability < 0.7:
+        return "Medio"
+    return "Alto"
+
+
 # ==================== ENDPOINTS ====================
 
 @app.get("/", response_model=dict)
@@ -150,12 +309,15 @@ async def health_check():
 
 
 @app.post("/predict", response_model=PredictionResponse)
-async def predict_single(transaction: Transaction):
+async def predict_single(transaction: Transaction,
+                         deadline_ms: Optional[float] = Header(None, alias=config.DEADLINE_HEADER)):
     """
     Predice si una transacción individual es fraudulenta.
     
     Args:
         transaction: Objeto Transaction con los datos de la transacción.
+        deadline_ms: Tiempo máximo de respuesta (cabecera X-Deadline-Ms). Si el modelo
+                     principal no llega, se usa el modelo de respaldo.
     
     Returns:
         PredictionResponse: Predicción y probabilidad de fraude.
@@ -168,42 +330,30 @@ async def predict_single(transaction: Transaction):
     
     try:
         start_time = datetime.now()
+        start = time.perf_counter()
         
-        # Convertir a DataFrame
-        df = pd.DataFrame([transaction.dict()])
-        
-        # Crear features derivados (igual que en ft_engineering.py)
-        df['amount_per_transaction'] = df['amount'] / (df['previous_transactions'] + 1)
-        df['age_group'] = pd.cut(df['customer_age'], 
-                                 bins=[0, 25, 35, 50, 100], 
-                                 labels=['young', 'adult', 'middle_age', 'senior'])
-        df['age_group'] = df['age_group'].astype(str)
-        amount_threshold = df['amount'].quantile(0.75)
-        df['high_amount'] = (df['amount'] > amount_threshold).astype(int)
+        # Convertir a DataFrame y crear features derivados
+        df = _build_features(pd.DataFrame([transaction.dict()]))
         
         # Preprocesar
         X_processed = preprocessor.transform(df)
         
-        # Predecir
-        prediction = int(model.predict(X_processed)[0])
-        probability = float(model.predict_proba(X_processed)[0, 1])
-        
-        # Determinar nivel de riesgo
-        if probability < 0.3:
-            risk_level = "Bajo"
-        elif probability < 0.7:
-            risk_level = "Medio"
-        else:
-            risk_level = "Alto"
+        # Predecir (una sola fila: sin lote parcial, a lo sumo el modelo de respaldo)
+        use_fallback, _ = _plan(1, deadline_ms, (time.perf_counter() - start) * 1000)
+        probabilities, stages, producers = _score(X_processed, use_fallback)
+        probability = float(probabilities[0])
+        threshold = getattr(fallback_model if use_fallback else model, 'threshold', config.DECISION_THRESHOLD)
         
         processing_time = (datetime.now() - start_time).total_seconds() * 1000
         
         return PredictionResponse(
             index=0,
-            is_fraud=prediction,
+            is_fraud=int(probability >= threshold),
             fraud_probability=round(probability, 4),
-            risk_level=risk_level,
-            timestamp=datetime.now().isoformat()
+            risk_level=_risk_level(probability),
+            timestamp=datetime.now().isoformat(),
+            stage=int(stages[0]) if stages is not None else None,
+            model=producers[0]
         )
     
     except Exception as e:
@@ -214,12 +364,16 @@ async def predict_single(transaction: Transaction):
 
 
 @app.post("/predict/batch", response_model=BatchPredictionResponse)
-async def predict_batch(batch: TransactionBatch):
+async def predict_batch(batch: TransactionBatch,
+                        deadline_ms: Optional[float] = Header(None, alias=config.DEADLINE_HEADER)):
     """
     Predice fraude para múltiples transacciones en lote.
     
     Args:
         batch: TransactionBatch con lista de transacciones.
+        deadline_ms: Tiempo máximo de respuesta (cabecera X-Deadline-Ms). Si ningún modelo
+                     puede puntuar el lote completo a tiempo, se devuelven solo las primeras
+                     transacciones y la respuesta se marca como parcial.
     
     Returns:
         BatchPredictionResponse: Lista de predicciones.
@@ -232,43 +386,36 @@ async def predict_batch(batch: TransactionBatch):
     
     try:
         start_time = datetime.now()
+        start = time.perf_counter()
         
-        # Convertir a DataFrame
-        df = pd.DataFrame([t.dict() for t in batch.transactions])
-        
-        # Crear features derivados
-        df['amount_per_transaction'] = df['amount'] / (df['previous_transactions'] + 1)
-        df['age_group'] = pd.cut(df['customer_age'], 
-                                 bins=[0, 25, 35, 50, 100], 
-                                 labels=['young', 'adult', 'middle_age', 'senior'])
-        df['age_group'] = df['age_group'].astype(str)
-        amount_threshold = df['amount'].quantile(0.75)
-        df['high_amount'] = (df['amount'] > amount_threshold).astype(int)
+        # Convertir a DataFrame y crear features derivados
+        df = _build_features(pd.DataFrame([t.dict() for t in batch.transactions]))
         
         # Preprocesar
         X_processed = preprocessor.transform(df)
         
-        # Predecir
-        predictions = model.predict(X_processed)
-        probabilities = model.predict_proba(X_processed)[:, 1]
+        # Predecir con el modelo y las filas que caben en el deadline
+        n_rows = len(batch.transactions)
+        use_fallback, n_scored = _plan(n_rows, deadline_ms, (time.perf_counter() - start) * 1000)
+        if n_scored > 0:
+            probabilities, stages, producers = _score(X_processed[:n_scored], use_fallback)
+        else:
+            probabilities, stages, producers = np.empty(0), None, []
+        threshold = getattr(fallback_model if use_fallback else model, 'threshold', config.DECISION_THRESHOLD)
+        predictions = (probabilities >= threshold).astype(int)
         
         # Formatear respuestas
         results = []
         for i, (pred, prob) in enumerate(zip(predictions, probabilities)):
-            if prob < 0.3:
-                risk_level = "Bajo"
-            elif prob < 0.7:
-                risk_level = "Medio"
-            else:
-                risk_level = "Alto"
-            
             results.append(
                 PredictionResponse(
                     index=i,
                     is_fraud=int(pred),
                     fraud_probability=round(float(prob), 4),
-                    risk_level=risk_level,
-                    timestamp=datetime.now().isoformat()
+                    risk_level=_risk_level(prob),
+                    timestamp=datetime.now().isoformat(),
+                    stage=int(stages[i]) if stages is not None else None,
+                    model=producers[i]
                 )
             )
         
@@ -279,7 +426,9 @@ async def predict_batch(batch: TransactionBatch):
             predictions=results,
             total_transactions=len(batch.transactions),
             fraud_detected=int(fraud_count),
-            processing_time_ms=round(processing_time, 2)
+            processing_time_ms=round(processing_time, 2),
+            routing=_routing_fractions(stages),
+            partial=n_scored < n_rows
         )
     
     except Exception as e:
@@ -300,15 +449,30 @@ async def model_info():
             detail="Modelo no disponible"
         )
     
-    return {
+    header = read_artifact_metadata(model_path)
+    
+    info = {
         "model_type": type(model).__name__,
-        "model_path": config.MODEL_PATH,
+        "serving_mode": serving_mode,
+        "artifact_format": header.get('format'),
+        "artifact_metadata": header.get('metadata', {}),
+        "model_path": model_path,
         "preprocessor_path": config.PREPROCESSOR_PATH,
         "features": {
             "numerical": config.NUMERICAL_COLS,
             "categorical": config.CATEGORICAL_COLS
         }
     }
+    info["model_name"] = model_name
+    info["fallback_model"] = fallback_name
+    info["latency_estimates"] = latency_tracker.snapshot()
+    if serving_mode == "cascade":
+        total = sum(routing_counts.values())
+        info["routing"] = {
+            "total_transactions": total,
+            **{f"stage_{k}": round(v / total, 4) if total else 0.0 for k, v in routing_counts.items()}
+        }
+    return info
 
 
 # ==================== MAIN ====================
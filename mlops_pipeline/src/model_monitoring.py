@@ -23,11 +23,17 @@ sys.path.insert(0, str(project_root))
 
 try:
     from mlops_pipeline.src import config
+    from mlops_pipeline.src.cargar_datos import DataLoader
+    from mlops_pipeline.src.data_validation import DataValidator
 except ImportError:
     try:
         from . import config
+        from .cargar_datos import DataLoader
+        from .data_validation import DataValidator
     except ImportError:
         import config
+        from cargar_datos import DataLoader
+        from data_validation import DataValidator
 
 
 # ==================== CONFIGURACIÓN DE LA PÁGINA ====================
@@ -78,15 +84,18 @@ st.markdown("""
 def load_baseline_data():
     """
     Carga los datos históricos (baseline) para comparación.
+    Usa DataLoader: tipos explícitos y, tras la primera carga, la caché columnar mapeada en memoria.
     """
     try:
-        df = pd.read_csv(config.DATA_PATH)
-        # Eliminar columnas irrelevantes
-        df = df.drop(columns=config.IRRELEVANT_COLS, errors='ignore')
+        loader = DataLoader()
+        if not loader.source_files():
+            st.error(f"❌ Error: No se encontró el archivo baseline en '{config.DATA_PATH}'")
+            return None
+        df = loader.load_data()
+        if df.empty:
+            st.error(f"❌ Error al cargar datos baseline desde '{config.DATA_PATH}'")
+            return None
         return df
-    except FileNotFoundError:
-        st.error(f"❌ Error: No se encontró el archivo baseline en '{config.DATA_PATH}'")
-        return None
     except Exception as e:
         st.error(f"❌ Error al cargar datos baseline: {str(e)}")
         return None
@@ -497,6 +506,20 @@ def main():
             with st.expander("🔍 Ver muestra de datos actuales"):
                 st.dataframe(current_df.head(100))
             
+            # Validación de los datos subidos (una sola pasada, informe por regla)
+            report = DataValidator().validation_report(current_df)
+            failed_rules = {name: rule for name, rule in report['rules'].items() if not rule['passed']}
+            if failed_rules:
+                st.warning(f"⚠️ {len(failed_rules)} regla(s) de validación incumplida(s)")
+                with st.expander("🧪 Ver informe de validación"):
+                    st.dataframe(pd.DataFrame([
+                        {'Regla': name, 'Violaciones': rule['violations'],
+                         'Filas de ejemplo': str(rule['sample_rows']), 'Detalle': rule['message']}
+                        for name, rule in failed_rules.items()
+                    ]), use_container_width=True, hide_index=True)
+            else:
+                st.success(f"✅ Validación: {len(report['rules'])} reglas cumplidas")
+            
             st.markdown("---")
             
             # ==================== ANÁLISIS DE DRIFT ====================
@@ -3,36 +3,42 @@ Módulo de entrenamiento y evaluación de modelos.
 Define la clase ModelTrainer que orquesta todo el pipeline de ML.
 """
 
+import os
+import json
 import pandas as pd
 import numpy as np
-import joblib
 import xgboost as xgb
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import (
-    classification_report, 
-    roc_auc_score, 
-    f1_score, 
-    confusion_matrix, 
-    roc_curve,
-    precision_recall_curve,
-    accuracy_score,
-    precision_score,
-    recall_score
-)
-from imblearn.over_sampling import SMOTE
-import matplotlib.pyplot as plt
-import seaborn as sns
+from sklearn.model_selection import train_test_split
 
 try:
     from mlops_pipeline.src.cargar_datos import DataLoader
     from mlops_pipeline.src.data_validation import DataValidator
     from mlops_pipeline.src.ft_engineering import FeatureEngineer
+    from mlops_pipeline.src.cross_validation import FoldCache, CrossValidator, select_best_model
+    from mlops_pipeline.src.reporting import TrainingReport
+    from mlops_pipeline.src.imbalance import get_imbalance_strategy
+    from mlops_pipeline.src.profiling import PipelineProfiler
+    from mlops_pipeline.src.artifacts import save_artifact, artifact_checksum
+    from mlops_pipeline.src.evaluation import evaluate_scores
+    from mlops_pipeline.src.sharded_training import ShardedTrainer, is_mergeable
+    from mlops_pipeline.src.latency import benchmark_model, within_budget
+    from mlops_pipeline.src.cascade import CascadeClassifier, calibrate_band
     from mlops_pipeline.src import config
 except ImportError:
     from .cargar_datos import DataLoader
     from .data_validation import DataValidator
     from .ft_engineering import FeatureEngineer
+    from .cross_validation import FoldCache, CrossValidator, select_best_model
+    from .reporting import TrainingReport
+    from .imbalance import get_imbalance_strategy
+    from .profiling import PipelineProfiler
+    from .artifacts import save_artifact, artifact_checksum
+    from .evaluation import evaluate_scores
+    from .sharded_training import ShardedTrainer, is_mergeable
+    from .latency import benchmark_model, within_budget
+    from .cascade import CascadeClassifier, calibrate_band
     from . import config
 
 
@@ -42,14 +48,23 @@ class ModelTrainer:
     Integra carga, validación, preprocesamiento, entrenamiento y evaluación.
     """
     
-    def __init__(self, random_state=None):
+    def __init__(self, random_state=None, cv_folds=None, imbalance_strategy=None, n_shards=None):
         """
         Inicializa el ModelTrainer.
         
         Args:
             random_state (int, optional): Semilla para reproducibilidad.
+            cv_folds (int, optional): Folds de la validación cruzada usada para elegir
+                                      el mejor modelo. Si es None, usa config.CV_FOLDS.
+            imbalance_strategy (str o ImbalanceStrategy, optional): Estrategia de manejo del
+                                      desbalanceo. Si es None, usa config.IMBALANCE_STRATEGY.
+            n_shards (int, optional): Shards de filas para entrenar en paralelo los modelos
+                                      combinables. Si es None, usa config.SHARDED_TRAINING_SHARDS.
         """
         self.random_state = random_state if random_state is not None else config.RANDOM_STATE
+        self.cv_folds = cv_folds if cv_folds is not None else config.CV_FOLDS
+        self.imbalance_strategy = get_imbalance_strategy(imbalance_strategy, self.random_state)
+        self.n_shards = n_shards if n_shards is not None else config.SHARDED_TRAINING_SHARDS
         self.loader = DataLoader()
         self.validator = DataValidator()
         self.engineer = FeatureEngineer(random_state=self.random_state)
@@ -57,14 +72,29 @@ class ModelTrainer:
         self.best_model_name = None
         self.best_auc = 0.0
         self.results = {}
+        self.models = {}
+        self.cv_results = None
+        self.latency = {}
+        self.report = TrainingReport()
+        self.profiler = PipelineProfiler()
     
-    def build_models(self):
+    def build_models(self, y_train=None):
         """
         Construye el diccionario de modelos a entrenar.
         
+        Args:
+            y_train (array, optional): Target de entrenamiento. Si la estrategia de
+                                       desbalanceo pondera clases en lugar de remuestrear,
+                                       se usa para calcular el scale_pos_weight de XGBoost.
+        
         Returns:
             dict: Diccionario con nombre y objeto de modelo.
         """
+        scale_pos_weight = 10  # Ajustar según el desbalanceo
+        if self.imbalance_strategy.reweights and y_train is not None:
+            counts = pd.Series(y_train).value_counts()
+            scale_pos_weight = counts.get(0, 0) / max(counts.get(1, 0), 1)
+        
         models = {
             'LogisticRegression': LogisticRegression(
                 random_state=self.random_state, 
@@ -79,116 +109,124 @@ class ModelTrainer:
             ),
             'XGBoost': xgb.XGBClassifier(
                 random_state=self.random_state,
-                use_label_encoder=False,
+                n_estimators=config.XGB_N_ESTIMATORS,
+                tree_method=config.XGB_TREE_METHOD,
+                max_bin=config.XGB_MAX_BIN,
+                n_jobs=config.XGB_N_JOBS,
                 eval_metric='logloss',
-                scale_pos_weight=10  # Ajustar según el desbalanceo
+                scale_pos_weight=scale_pos_weight
             )
         }
         return models
     
-    def summarize_classification(self, model_name, y_test, y_pred, y_prob):
+    def summarize_classification(self, model_name, y_test, y_prob):
         """
         Resume y muestra las métricas de clasificación.
         
+        Todas las métricas, las curvas y los intervalos bootstrap se derivan de un
+        único ordenamiento de las probabilidades (ver evaluation.evaluate_scores).
+        
         Args:
             model_name (str): Nombre del modelo.
             y_test (array): Valores reales.
-            y_pred (array): Predicciones.
             y_prob (array): Probabilidades de la clase positiva.
         """
         print("\n" + "="*60)
         print(f"MÉTRICAS DE EVALUACIÓN - {model_name}")
         print("="*60)
         
-        # Métricas principales
-        accuracy = accuracy_score(y_test, y_pred)
-        precision = precision_score(y_test, y_pred)
-        recall = recall_score(y_test, y_pred)
-        f1 = f1_score(y_test, y_pred)
-        roc_auc = roc_auc_score(y_test, y_prob)
+        evaluation = evaluate_scores(y_test, y_prob)
+        ci = evaluation.get('ci', {})
+        
+        print(f"\n📊 MÉTRICAS GENERALES (umbral = {evaluation['threshold']:.2f}):")
+        for label, key in [('Accuracy', 'accuracy'), ('Precision', 'precision'), ('Recall', 'recall'),
+                           ('F1-Score', 'f1_score'), ('ROC-AUC', 'roc_auc'), ('Avg Prec', 'average_precision')]:
+            interval = f"  IC {config.BOOTSTRAP_CONFIDENCE_LEVEL:.0%} [{ci[key][0]:.4f}, {ci[key][1]:.4f}]" if key in ci else ''
+            print(f"  • {label + ':':<10} {evaluation[key]:.4f}{interval}")
         
-        print("\n📊 MÉTRICAS GENERALES:")
-        print(f"  • Accuracy:  {accuracy:.4f}")
-        print(f"  • Precision: {precision:.4f}")
-        print(f"  • Recall:    {recall:.4f}")
-        print(f"  • F1-Score:  {f1:.4f}")
-        print(f"  • ROC-AUC:   {roc_auc:.4f}")
+        tn, fp = evaluation['confusion_matrix'][0]
+        fn, tp = evaluation['confusion_matrix'][1]
+        print("\n📋 MATRIZ DE CONFUSIÓN:")
+        print(f"  {'':<12}{'Pred. No Fraude':>17}{'Pred. Fraude':>14}")
+        print(f"  {'No Fraude':<12}{tn:>17}{fp:>14}")
+        print(f"  {'Fraude':<12}{fn:>17}{tp:>14}")
         
-        print("\n📋 REPORTE DE CLASIFICACIÓN:")
-        print(classification_report(y_test, y_pred, target_names=['No Fraude', 'Fraude']))
+        best = max(evaluation['threshold_sweep'], key=lambda row: row['f1_score'])
+        print(f"\n🎚️  Mejor umbral del barrido por F1: {best['threshold']:.2f} "
+              f"(F1 = {best['f1_score']:.4f}, precision = {best['precision']:.4f}, recall = {best['recall']:.4f})")
         
         # Almacenar resultados
-        self.results[model_name] = {
-            'accuracy': accuracy,
-            'precision': precision,
-            'recall': recall,
-            'f1_score': f1,
-            'roc_auc': roc_auc,
-            'y_pred': y_pred,
-            'y_prob': y_prob
-        }
+        y_pred = (np.asarray(y_prob) >= evaluation['threshold']).astype(int)
+        self.results[model_name] = {**evaluation, 'y_pred': y_pred, 'y_prob': y_prob}
         
-        # Matriz de confusión
-        self._plot_confusion_matrix(y_test, y_pred, model_name)
+        # Registrar para el reporte (los gráficos se generan al final, fuera del entrenamiento)
+        self.report.add_evaluation(model_name, y_test, y_prob, evaluation)
         
-        return roc_auc
+        return evaluation['roc_auc']
     
-    def _plot_confusion_matrix(self, y_test, y_pred, model_name):
+    def cross_validate(self, X, y):
         """
-        Genera y muestra la matriz de confusión.
+        Evalúa todos los modelos con validación cruzada estratificada.
+        
+        Cada fold ajusta su propio preprocesador y aplica la estrategia de desbalanceo
+        una sola vez; los folds quedan cacheados y los pares (modelo, fold) se entrenan
+        en paralelo.
         
         Args:
-            y_test (array): Valores reales.
-            y_pred (array): Predicciones.
-            model_name (str): Nombre del modelo.
+            X (pd.DataFrame): Features de entrenamiento sin preprocesar.
+            y (pd.Series): Target de entrenamiento.
+        
+        Returns:
+            dict: Métricas agregadas por modelo con intervalos de confianza.
         """
-        cm = confusion_matrix(y_test, y_pred)
-        
-        plt.figure(figsize=(8, 6))
-        sns.heatmap(
-            cm, 
-            annot=True, 
-            fmt='d', 
-            cmap='Blues',
-            xticklabels=['No Fraude', 'Fraude'],
-            yticklabels=['No Fraude', 'Fraude']
+        print("\n" + "="*60)
+        print(f"VALIDACIÓN CRUZADA ESTRATIFICADA ({self.cv_folds} folds)")
+        print("="*60)
+        
+        fold_cache = FoldCache(
+            n_splits=self.cv_folds,
+            preprocessor=self.engineer._create_preprocessor(X),
+            resampler=self.imbalance_strategy,
+            random_state=self.random_state
         )
-        plt.title(f'Matriz de Confusión - {model_name}')
-        plt.ylabel('Real')
-        plt.xlabel('Predicción')
-        plt.tight_layout()
-        plt.savefig(f'confusion_matrix_{model_name.lower().replace(" ", "_")}.png', dpi=300)
-        plt.show()
-        
-        print(f"\n  ✓ Matriz de confusión guardada como: confusion_matrix_{model_name.lower().replace(' ', '_')}.png")
+        validator = CrossValidator(fold_cache)
+        self.cv_results = validator.evaluate(self.build_models(y), X, y)
+        
+        level = int(validator.confidence_level * 100)
+        print(f"\n📊 ROC-AUC POR MODELO (media ± IC {level}%):")
+        for name, summary in self.cv_results.items():
+            print(f"  • {name:<20} {summary['roc_auc_mean']:.4f} "
+                  f"[{summary['roc_auc_ci_low']:.4f}, {summary['roc_auc_ci_high']:.4f}]")
+        
+        return self.cv_results
     
-    def plot_roc_curves(self, y_test):
+    def _select_best_model(self):
         """
-        Genera curvas ROC comparativas para todos los modelos.
+        Selecciona el mejor modelo entre los entrenados.
         
-        Args:
-            y_test (array): Valores reales del conjunto de test.
+        Solo compiten los modelos que cumplen el presupuesto de latencia p99 y de tamaño
+        (config.LATENCY_BUDGET_MS_P99 y config.MAX_MODEL_SIZE_MB). Entre ellos, si hay
+        resultados de validación cruzada decide el criterio configurado en
+        config.CV_SELECTION_CRITERION; si no, el ROC-AUC del conjunto de test.
         """
-        plt.figure(figsize=(10, 8))
-        
-        for model_name, metrics in self.results.items():
-            fpr, tpr, _ = roc_curve(y_test, metrics['y_prob'])
-            auc = metrics['roc_auc']
-            plt.plot(fpr, tpr, label=f'{model_name} (AUC = {auc:.4f})', linewidth=2)
-        
-        plt.plot([0, 1], [0, 1], 'k--', label='Random Classifier')
-        plt.xlim([0.0, 1.0])
-        plt.ylim([0.0, 1.05])
-        plt.xlabel('False Positive Rate', fontsize=12)
-        plt.ylabel('True Positive Rate', fontsize=12)
-        plt.title('Curvas ROC - Comparación de Modelos', fontsize=14)
-        plt.legend(loc='lower right', fontsize=10)
-        plt.grid(alpha=0.3)
-        plt.tight_layout()
-        plt.savefig('roc_curves_comparison.png', dpi=300)
-        plt.show()
-        
-        print("\n✓ Curvas ROC guardadas como: roc_curves_comparison.png")
+        feasible = [n for n in self.models if n not in self.latency or within_budget(self.latency[n])]
+        for n in self.models:
+            if n not in feasible:
+                print(f"  ⚠️ {n} excluido: p99 {self.latency[n]['single_p99_ms']:.2f} ms, "
+                      f"{self.latency[n]['model_size_mb']:.1f} MB (fuera del presupuesto)")
+        
+        if not feasible:
+            name = min(self.models, key=lambda n: self.latency[n]['single_p99_ms'])
+            print(f"  ⚠️ Ningún modelo cumple el presupuesto: se elige el más rápido")
+        elif self.cv_results:
+            name = select_best_model({n: self.cv_results[n] for n in feasible})
+            print(f"  ✓ Selección por validación cruzada (criterio: {config.CV_SELECTION_CRITERION})")
+        else:
+            name = max(feasible, key=lambda n: self.results[n]['roc_auc'])
+        
+        self.best_model_name = name
+        self.best_model = self.models[name]
+        self.best_auc = self.results[name]['roc_auc']
     
     def train_and_evaluate(self, X_train, X_test, y_train, y_test):
         """
@@ -204,44 +242,14 @@ class ModelTrainer:
         print("ENTRENAMIENTO Y EVALUACIÓN DE MODELOS")
         print("="*60)
         
-        # Manejo del desbalanceo con SMOTE (Oversampling)
+        # Manejo del desbalanceo con la estrategia configurada
         print("\n[1/3] Detectando desbalanceo en la variable objetivo...")
-        fraud_counts = pd.Series(y_train).value_counts()
-        fraud_pct = pd.Series(y_train).value_counts(normalize=True) * 100
-        
-        print(f"  Distribución original:")
-        print(f"    • Clase 0 (No Fraude): {fraud_counts.get(0, 0):,} ({fraud_pct.get(0, 0):.2f}%)")
-        print(f"    • Clase 1 (Fraude):    {fraud_counts.get(1, 0):,} ({fraud_pct.get(1, 0):.2f}%)")
-        
-        # Verificar si hay desbalanceo significativo
-        if len(fraud_counts) == 2:
-            ratio = fraud_counts.max() / fraud_counts.min()
-            print(f"    • Ratio de desbalanceo: 1:{ratio:.1f}")
-            
-            if ratio > 2:  # Si el ratio es mayor a 2:1, aplicar SMOTE
-                print(f"\n  ⚠️ Desbalanceo detectado (ratio > 2:1)")
-                print(f"  🔄 Aplicando SMOTE (Oversampling) para balancear clases...")
-                
-                smote = SMOTE(random_state=self.random_state)
-                X_train_res, y_train_res = smote.fit_resample(X_train, y_train)
-                
-                balanced_counts = pd.Series(y_train_res).value_counts()
-                balanced_pct = pd.Series(y_train_res).value_counts(normalize=True) * 100
-                
-                print(f"  ✅ Datos balanceados con SMOTE:")
-                print(f"    • Clase 0 (No Fraude): {balanced_counts.get(0, 0):,} ({balanced_pct.get(0, 0):.2f}%)")
-                print(f"    • Clase 1 (Fraude):    {balanced_counts.get(1, 0):,} ({balanced_pct.get(1, 0):.2f}%)")
-                print(f"    • Shape resultante: {X_train_res.shape}")
-            else:
-                print(f"\n  ✓ No se requiere balanceo (ratio aceptable)")
-                X_train_res, y_train_res = X_train, y_train
-        else:
-            print(f"\n  ⚠️ Advertencia: Solo se detectó una clase en los datos")
-            X_train_res, y_train_res = X_train, y_train
+        with self.profiler.stage('resample'):
+            X_train_res, y_train_res = self.imbalance_strategy(X_train, y_train, verbose=True)
         
         # Construir modelos
         print("\n[2/3] Entrenando modelos...")
-        models = self.build_models()
+        models = self.build_models(y_train)
         
         for i, (name, model) in enumerate(models.items(), 1):
             print(f"\n{'='*60}")
@@ -249,40 +257,253 @@ class ModelTrainer:
             print(f"{'='*60}")
             
             # Entrenar
-            model.fit(X_train_res, y_train_res)
+            with self.profiler.stage(f'fit:{name}'):
+                model = self.fit_model(model, X_train_res, y_train_res, X_train, y_train)
             print(f"  ✓ Modelo entrenado")
             
-            # Predecir
-            y_pred = model.predict(X_test)
-            y_prob = model.predict_proba(X_test)[:, 1]
-            
-            # Evaluar
-            auc = self.summarize_classification(name, y_test, y_pred, y_prob)
-            
-            # Actualizar mejor modelo
-            if auc > self.best_auc:
-                self.best_auc = auc
-                self.best_model = model
-                self.best_model_name = name
+            # Predecir y evaluar
+            with self.profiler.stage(f'evaluate:{name}'):
+                self.evaluate_model(name, model, X_test, y_test)
+        
+        self.select_and_export()
+    
+    def fit_model(self, model, X_train_res, y_train_res, X_train, y_train):
+        """
+        Entrena un modelo.
+        
+        Con n_shards > 1, los modelos combinables (LogisticRegression, RandomForest) se
+        entrenan por shards de filas en procesos paralelos, cada uno remuestreando su
+        shard, y se combinan en un único modelo. XGBoost, si config.XGB_EARLY_STOPPING_ROUNDS
+        está definido, se entrena con early stopping. El resto usa los datos remuestreados.
+        
+        Args:
+            model: Modelo sin entrenar.
+            X_train_res (array): Features remuestreadas.
+            y_train_res (array): Target remuestreado.
+            X_train (array): Features sin remuestrear (para el modo por shards).
+            y_train (array): Target sin remuestrear (para el modo por shards).
+        
+        Returns:
+            Modelo entrenado.
+        """
+        if self.n_shards > 1 and is_mergeable(model):
+            sharded = ShardedTrainer(n_shards=self.n_shards, resampler=self.imbalance_strategy,
+                                     random_state=self.random_state)
+            print(f"  🔀 Entrenando en {self.n_shards} shards en paralelo...")
+            return sharded.fit(model, X_train, y_train)
+        if isinstance(model, xgb.XGBClassifier) and config.XGB_EARLY_STOPPING_ROUNDS:
+            return self._fit_xgb_early_stopping(model, X_train, y_train)
+        return model.fit(X_train_res, y_train_res)
+    
+    def _fit_xgb_early_stopping(self, model, X_train, y_train):
+        """
+        Entrena XGBoost con early stopping sobre un split de validación.
+        
+        La validación se separa antes de remuestrear, para medir con la distribución
+        real de clases. Al terminar, el booster se recorta a las rondas seleccionadas:
+        el modelo guardado no evalúa árboles que no se usan.
+        """
+        X_fit, X_val, y_fit, y_val = train_test_split(
+            X_train, y_train,
+            test_size=config.XGB_VALIDATION_SIZE,
+            random_state=self.random_state,
+            stratify=y_train
+        )
+        X_fit_res, y_fit_res = self.imbalance_strategy(X_fit, y_fit)
         
-        # Comparación final
-        print("\n[3/3] Generando comparación de modelos...")
-        self.plot_roc_curves(y_test)
+        model.set_params(early_stopping_rounds=config.XGB_EARLY_STOPPING_ROUNDS)
+        model.fit(X_fit_res, y_fit_res, eval_set=[(X_val, y_val)], verbose=False)
         
+        rounds = model.best_iteration + 1
+        model._Booster = model.get_booster()[:rounds]
+        model.set_params(n_estimators=rounds, early_stopping_rounds=None)
+        print(f"  ⏹️  Early stopping: {rounds} de {config.XGB_N_ESTIMATORS} rondas conservadas")
+        return model
+    
+    def evaluate_model(self, name, model, X_test, y_test):
+        """
+        Evalúa un modelo entrenado en el conjunto de test y lo registra como candidato.
+        
+        Args:
+            name (str): Nombre del modelo.
+            model: Modelo entrenado.
+            X_test (array): Features de test.
+            y_test (array): Target de test.
+        """
+        y_prob = model.predict_proba(X_test)[:, 1]
+        self.summarize_classification(name, y_test, y_prob)
+        self.models[name] = model
+        
+        self.latency[name] = benchmark_model(model, X_test)
+        latency = self.latency[name]
+        print(f"\n⚡ LATENCIA: p99 una fila {latency['single_p99_ms']:.2f} ms | "
+              f"p99 lote {latency['batch_p99_ms']:.2f} ms | "
+              f"{latency['batch_rows_per_s']:,.0f} filas/s | {latency['model_size_mb']:.2f} MB")
+    
+    def select_and_export(self):
+        """
+        Selecciona el mejor modelo entre los evaluados, muestra la tabla comparativa,
+        guarda el modelo y genera el reporte.
+        """
         print("\n" + "="*60)
         print("SELECCIÓN DEL MEJOR MODELO")
         print("="*60)
+        self._select_best_model()
         print(f"\n🏆 Mejor modelo: {self.best_model_name}")
-        print(f"   ROC-AUC: {self.best_auc:.4f}")
+        print(f"   ROC-AUC (test): {self.best_auc:.4f}")
+        if self.cv_results:
+            summary = self.cv_results[self.best_model_name]
+            print(f"   ROC-AUC (CV):   {summary['roc_auc_mean']:.4f} "
+                  f"[{summary['roc_auc_ci_low']:.4f}, {summary['roc_auc_ci_high']:.4f}]")
         
         # Tabla comparativa
         print("\n📊 TABLA COMPARATIVA DE MODELOS:")
-        comparison_df = pd.DataFrame(self.results).T[['accuracy', 'precision', 'recall', 'f1_score', 'roc_auc']]
+        comparison_df = pd.DataFrame(self.results).T[
+            ['accuracy', 'precision', 'recall', 'f1_score', 'roc_auc', 'average_precision']
+        ]
+        if self.cv_results:
+            for stat in ['roc_auc_mean', 'roc_auc_ci_low', 'roc_auc_ci_high']:
+                comparison_df[f'cv_{stat}'] = pd.Series({n: r[stat] for n, r in self.cv_results.items()})
+        if self.latency:
+            for stat in ['single_p99_ms', 'batch_p99_ms', 'batch_rows_per_s', 'predict_peak_mb', 'model_size_mb']:
+                comparison_df[stat] = pd.Series({n: r[stat] for n, r in self.latency.items()})
+            comparison_df['within_budget'] = pd.Series({n: within_budget(r) for n, r in self.latency.items()})
         print(comparison_df.to_string())
         
-        # Guardar el mejor modelo
-        joblib.dump(self.best_model, config.MODEL_PATH)
-        print(f"\n✓ Mejor modelo guardado en: {config.MODEL_PATH}")
+        # Guardar el mejor modelo y la tabla de compromisos junto al artefacto
+        self.save_best_model()
+        self.save_tradeoffs(comparison_df)
+        self.save_fallback_model()
+        if config.CASCADE_ENABLED:
+            self.save_cascade()
+        
+        # Reporte de evaluación (matrices de confusión y curvas ROC)
+        print("\n[3/3] Generando reporte de comparación de modelos...")
+        with self.profiler.stage('report'):
+            self.report.render()
+    
+    def save_tradeoffs(self, comparison_df, path=None):
+        """
+        Guarda la tabla de compromisos (métricas, latencia y tamaño) junto al modelo.
+        
+        Args:
+            comparison_df (pd.DataFrame): Tabla comparativa de modelos.
+            path (str, optional): Ruta de destino. Si es None, usa <MODEL_PATH>_tradeoffs.json.
+        """
+        path = path or f"{os.path.splitext(config.MODEL_PATH)[0]}_tradeoffs.json"
+        tradeoffs = {
+            'selected_model': self.best_model_name,
+            'latency_budget_ms_p99': config.LATENCY_BUDGET_MS_P99,
+            'max_model_size_mb': config.MAX_MODEL_SIZE_MB,
+            'models': json.loads(comparison_df.to_json(orient='index'))
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(tradeoffs, f, indent=2)
+        print(f"✓ Tabla de compromisos guardada en: {path}")
+    
+    def save_cascade(self, path=None):
+        """
+        Calibra la banda incierta de la cascada (modelo barato + mejor modelo) y la guarda.
+        
+        La banda se calibra con las probabilidades de test de ambos modelos, de modo que
+        las decisiones de la cascada difieran de las del mejor modelo en como máximo
+        config.CASCADE_MAX_ACCURACY_LOSS de las transacciones. La cabecera guarda el
+        checksum del mejor modelo y del preprocesador exportados, para que la API descarte
+        una cascada que no corresponda a ellos. Si la cascada se omite, se elimina la de
+        una ejecución anterior.
+        
+        Args:
+            path (str, optional): Ruta de destino. Si es None, usa config.CASCADE_MODEL_PATH.
+        """
+        path = path or config.CASCADE_MODEL_PATH
+        first_name = config.CASCADE_FIRST_STAGE
+        if first_name not in self.models or first_name == self.best_model_name:
+            print(f"\n⚠️  Cascada omitida: la primera etapa ({first_name}) no está entrenada "
+                  f"o ya es el mejor modelo")
+            _remove_stale(path)
+            return None
+        
+        band = calibrate_band(self.results[first_name]['y_prob'],
+                              self.results[self.best_model_name]['y_prob'],
+                              y_true=self.report.y_true)
+        cascade = CascadeClassifier(self.models[first_name], self.best_model,
+                                    low=band['low'], high=band['high'], threshold=band['threshold'],
+                                    first_stage_name=first_name, second_stage_name=self.best_model_name)
+        metadata = {
+            'model_name': f"Cascade({first_name} -> {self.best_model_name})",
+            'features': self.engineer.get_feature_names(),
+            'threshold': band['threshold'],
+            'cascade': {'first_stage': first_name, 'second_stage': self.best_model_name,
+                        **{k: float(v) for k, v in band.items() if k != 'threshold'}},
+            'second_stage_checksum': artifact_checksum(config.MODEL_PATH),
+            'preprocessor_checksum': artifact_checksum(config.PREPROCESSOR_PATH)
+        }
+        save_artifact(cascade, path, metadata=metadata)
+        print(f"\n🔀 Cascada {first_name} -> {self.best_model_name}: "
+              f"banda [{band['low']:.4f}, {band['high']:.4f}) | "
+              f"{band['second_stage_fraction']:.1%} del tráfico a la etapa 2 | "
+              f"desacuerdo {band['disagreement']:.2%} (máx. {band['max_disagreement']:.2%})")
+        print(f"✓ Cascada guardada en: {path}")
+        return band
+    
+    def save_best_model(self, path=None):
+        """
+        Guarda el mejor modelo con una cabecera de metadatos legible sin deserializar.
+        
+        Args:
+            path (str, optional): Ruta de destino. Si es None, usa config.MODEL_PATH.
+        """
+        path = path or config.MODEL_PATH
+        metrics = {k: v for k, v in self.results.get(self.best_model_name, {}).items()
+                   if k in ('accuracy', 'precision', 'recall', 'f1_score', 'roc_auc', 'average_precision')}
+        metadata = {
+            'model_name': self.best_model_name,
+            'features': self.engineer.get_feature_names(),
+            'threshold': config.DECISION_THRESHOLD,
+            'metrics': {k: float(v) for k, v in metrics.items()}
+        }
+        if isinstance(self.best_model, xgb.XGBClassifier):
+            metadata['boosting_rounds'] = self.best_model.get_booster().num_boosted_rounds()
+        if self.best_model_name in self.latency:
+            metadata['latency'] = self.latency[self.best_model_name]
+        save_artifact(self.best_model, path, metadata=metadata)
+        print(f"\n✓ Mejor modelo guardado en: {path}")
+    
+    def save_fallback_model(self, path=None):
+        """
+        Guarda el modelo evaluado más rápido (p99 de una fila) como respaldo de la API
+        cuando el mejor modelo no puede responder antes del deadline de la petición.
+        La cabecera guarda el checksum del mejor modelo y del preprocesador exportados;
+        si el respaldo se omite, se elimina el de una ejecución anterior.
+        
+        Args:
+            path (str, optional): Ruta de destino. Si es None, usa config.FALLBACK_MODEL_PATH.
+        """
+        path = path or config.FALLBACK_MODEL_PATH
+        if self.best_model_name not in self.latency:
+            print(f"\n⚠️  Modelo de respaldo omitido: no hay latencia medida de {self.best_model_name}")
+            _remove_stale(path)
+            return None
+        name = min(self.latency, key=lambda n: self.latency[n]['single_p99_ms'])
+        if name == self.best_model_name:
+            print(f"\n⚠️  Modelo de respaldo omitido: {name} ya es el mejor modelo y el más rápido")
+            _remove_stale(path)
+            return None
+        
+        metadata = {
+            'model_name': name,
+            'features': self.engineer.get_feature_names(),
+            'threshold': config.DECISION_THRESHOLD,
+            'metrics': {k: float(v) for k, v in self.results[name].items()
+                        if k in ('accuracy', 'precision', 'recall', 'f1_score', 'roc_auc', 'average_precision')},
+            'latency': self.latency[name],
+            'best_model_checksum': artifact_checksum(config.MODEL_PATH),
+            'preprocessor_checksum': artifact_checksum(config.PREPROCESSOR_PATH)
+        }
+        save_artifact(self.models[name], path, metadata=metadata)
+        print(f"✓ Modelo de respaldo ({name}, p99 {self.latency[name]['single_p99_ms']:.2f} ms) "
+              f"guardado en: {path}")
+        return name
     
     def run_pipeline(self):
         """
@@ -294,7 +515,8 @@ class ModelTrainer:
         
         # Paso 1: Cargar datos
         print("\n[PASO 1/4] CARGANDO DATOS...")
-        df = self.loader.load_data()
+        with self.profiler.stage('load'):
+            df = self.loader.load_data()
         
         if df.empty:
             print("✗ Error: No se pudieron cargar los datos. Pipeline abortado.")
@@ -302,23 +524,43 @@ class ModelTrainer:
         
         # Paso 2: Validar datos
         print("\n[PASO 2/4] VALIDANDO DATOS...")
-        if not self.validator.validate_data(df):
+        with self.profiler.stage('validate'):
+            # En modo cuarentena se continúa con las filas válidas si la tasa de rechazo lo permite
+            df, is_valid = self.validator.validate_and_clean(df)
+        if not is_valid:
             print("✗ Error: Los datos no pasaron la validación. Pipeline abortado.")
             return
         
         # Paso 3: Ingeniería de características
         print("\n[PASO 3/4] APLICANDO INGENIERÍA DE CARACTERÍSTICAS...")
-        X_train, X_test, y_train, y_test = self.engineer.process(df)
+        with self.profiler.stage('features'):
+            X_train, X_test, y_train, y_test = self.engineer.process(df)
+        
+        if self.cv_folds > 1:
+            with self.profiler.stage('cross_validation'):
+                self.cross_validate(self.engineer.X_train_raw, self.engineer.y_train_raw)
         
         # Paso 4: Entrenar y evaluar modelos
         print("\n[PASO 4/4] ENTRENANDO Y EVALUANDO MODELOS...")
-        self.train_and_evaluate(X_train, X_test, y_train, y_test)
+        with self.profiler.stage('train'):
+            self.train_and_evaluate(X_train, X_test, y_train, y_test)
+        
+        if self.profiler.enabled:
+            self.profiler.summary()
+            self.profiler.save()
         
         print("\n" + "="*80)
         print(" "*25 + "✅ PIPELINE COMPLETADO CON ÉXITO")
         print("="*80)
 
 
+def _remove_stale(path):
+    """Elimina un artefacto derivado de una ejecución anterior que ya no corresponde."""
+    if os.path.exists(path):
+        os.remove(path)
+        print(f"  🗑️  Artefacto anterior eliminado: {path}")
+
+
 if __name__ == "__main__":
     """
     Punto de entrada principal para ejecutar el pipeline completo.
@@ -0,0 +1,429 @@
+"""
+Módulo de ejecución del pipeline como un DAG de etapas.
+Define PipelineRunner, que ejecuta etapas con entradas declaradas y cachea sus
+salidas en disco indexadas por una huella (parámetros de la etapa + huellas de sus
+entradas), y build_training_dag, que modela el pipeline de entrenamiento:
+
+    load → validate → features → resample → train:<modelo> (en paralelo) → export
+                                └──────────→ cross_validation ───────────────┘
+                                └──────────→ preprocessor ───────────────────┘
+
+- Una etapa cuya huella ya está en caché no se ejecuta: su salida se lee del disco
+  solo si otra etapa la necesita.
+- Las etapas sin dependencias pendientes entre sí se ejecutan a la vez en hilos.
+- 'preprocessor' guarda preprocessor.joblib: no se cachea, de modo que comprueba el
+  archivo en cada ejecución aunque 'features' se lea de la caché, y solo lo reescribe
+  si no contiene el preprocesador de la huella actual de 'features'.
+- Cualquier etapa puede forzarse para volver a ejecutarse a partir de las salidas
+  cacheadas de sus etapas previas.
+
+La huella incluye el código de la función de la etapa, pero no el de los módulos que
+llama: tras modificar esos módulos, fuerza la etapa afectada (--force).
+
+Uso:
+    python -m mlops_pipeline.src.pipeline_runner                  # pipeline completo
+    python -m mlops_pipeline.src.pipeline_runner features         # hasta 'features'
+    python -m mlops_pipeline.src.pipeline_runner --force train:XGBoost
+"""
+
+import os
+import glob
+import time
+import inspect
+import argparse
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import joblib
+import xgboost as xgb
+try:
+    from mlops_pipeline.src import config
+    from mlops_pipeline.src.artifacts import artifact_checksum, read_artifact_metadata
+except ImportError:
+    from . import config
+    from .artifacts import artifact_checksum, read_artifact_metadata
+
+
+def file_signature(path):
+    """Firma barata de un archivo (tamaño y fecha de modificación) para las huellas."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def config_params(*names):
+    """Valores actuales de las constantes de config.py que afectan a una etapa."""
+    return {name: getattr(config, name) for name in names}
+
+
+class Stage:
+    """
+    Etapa del pipeline: una función que recibe un dict {etapa: salida} con sus entradas.
+    """
+
+    def __init__(self, name, fn, inputs=(), params=None, cache=True):
+        self.name = name
+        self.fn = fn
+        self.inputs = list(inputs)
+        self.params = params or {}
+        self.cache = cache
+
+    def source(self):
+        """Código de la función de la etapa (forma parte de la huella)."""
+        try:
+            return inspect.getsource(self.fn)
+        except (OSError, TypeError):
+            return getattr(self.fn, '__qualname__', repr(self.fn))
+
+
+class PipelineRunner:
+    """
+    Ejecutor de un DAG de etapas con caché en disco y ejecución concurrente.
+    """
+
+    def __init__(self, cache_dir=None, max_workers=None, profiler=None):
+        """
+        Inicializa el runner.
+
+        Args:
+            cache_dir (str, optional): Directorio de la caché. Por defecto config.PIPELINE_CACHE_DIR.
+            max_workers (int, optional): Etapas simultáneas. Por defecto config.PIPELINE_MAX_WORKERS.
+            profiler (PipelineProfiler, optional): Si se indica, mide cada etapa ejecutada y
+                                                   guarda el perfil JSON al terminar cada run().
+        """
+        self.cache_dir = cache_dir if cache_dir is not None else config.PIPELINE_CACHE_DIR
+        self.max_workers = max_workers if max_workers is not None else config.PIPELINE_MAX_WORKERS
+        self.profiler = profiler
+        self.stages = {}
+        self.records = []
+        self._fingerprints = {}
+
+    def add_stage(self, name, fn, inputs=(), params=None, cache=True):
+        """
+        Declara una etapa. Sus entradas deben declararse antes (el orden es topológico).
+
+        Args:
+            name (str): Nombre único de la etapa.
+            fn (callable): Función fn(inputs) que devuelve la salida de la etapa.
+            inputs (list): Etapas cuyas salidas necesita.
+            params (dict, optional): Parámetros que, al cambiar, invalidan la caché.
+            cache (bool): Si es False la etapa se ejecuta siempre (efectos secundarios).
+        """
+        if name in self.stages:
+            raise ValueError(f"La etapa '{name}' ya está declarada.")
+        missing = [dep for dep in inputs if dep not in self.stages]
+        if missing:
+            raise ValueError(f"La etapa '{name}' depende de etapas no declaradas: {missing}")
+        self.stages[name] = Stage(name, fn, inputs, params, cache)
+        self._fingerprints.clear()
+
+    # ------------------------------------------------------------------ caché
+
+    def fingerprint(self, name):
+        """Huella de una etapa: nombre, código, parámetros y huellas de sus entradas."""
+        if name not in self._fingerprints:
+            stage = self.stages[name]
+            self._fingerprints[name] = joblib.hash((
+                name,
+                stage.source(),
+                stage.params,
+                [self.fingerprint(dep) for dep in stage.inputs]
+            ))
+        return self._fingerprints[name]
+
+    def _cache_path(self, name):
+        safe_name = name.replace(':', '_').replace('/', '_')
+        return os.path.join(self.cache_dir, f'{safe_name}-{self.fingerprint(name)}.joblib')
+
+    def is_cached(self, name):
+        """Indica si la salida de la etapa para su huella actual está en caché."""
+        return self.stages[name].cache and os.path.exists(self._cache_path(name))
+
+    def _store(self, name, output):
+        """Guarda la salida de una etapa y elimina las versiones anteriores de esa etapa."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._cache_path(name)
+        joblib.dump(output, f'{path}.tmp')
+        os.replace(f'{path}.tmp', path)
+        prefix = os.path.basename(path).rsplit('-', 1)[0]
+        for old in glob.glob(os.path.join(self.cache_dir, f'{prefix}-*.joblib')):
+            if old != path:
+                os.remove(old)
+
+    def invalidate(self, names=None):
+        """Elimina de la caché las salidas de las etapas indicadas (todas por defecto)."""
+        for name in names or list(self.stages):
+            prefix = name.replace(':', '_').replace('/', '_')
+            for path in glob.glob(os.path.join(self.cache_dir, f'{prefix}-*.joblib')):
+                os.remove(path)
+
+    # ------------------------------------------------------------------ ejecución
+
+    def _required(self, targets):
+        """Etapas necesarias para producir los objetivos, en orden topológico."""
+        required = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in self.stages:
+                raise ValueError(f"Etapa desconocida: '{name}'. Etapas: {list(self.stages)}")
+            if name not in required:
+                required.add(name)
+                pending.extend(self.stages[name].inputs)
+        return [name for name in self.stages if name in required]
+
+    def plan(self, targets=None, force=()):
+        """
+        Decide qué etapas se ejecutan: las forzadas, las no cacheables, las que no
+        están en caché y todas las que dependen de una etapa que se ejecuta.
+
+        Returns:
+            list: Etapas a ejecutar, en orden topológico.
+        """
+        targets = list(targets) if targets else list(self.stages)
+        force = set(force)
+        to_run = []
+        for name in self._required(targets):
+            stage = self.stages[name]
+            if (name in force or not self.is_cached(name)
+                    or any(dep in to_run for dep in stage.inputs)):
+                to_run.append(name)
+        return to_run
+
+    def run(self, targets=None, force=()):
+        """
+        Ejecuta el DAG hasta las etapas objetivo.
+
+        Args:
+            targets (list, optional): Etapas objetivo. Por defecto todas.
+            force (list): Etapas a ejecutar aunque estén en caché.
+
+        Returns:
+            dict: Salidas de las etapas objetivo (y de las ejecutadas).
+        """
+        targets = list(targets) if targets else list(self.stages)
+        to_run = self.plan(targets, force)
+        outputs = {}
+        self.records = []
+        if self.profiler is not None:
+            self.profiler.reset()
+
+        print("\n" + "="*60)
+        print("EJECUCIÓN DEL PIPELINE (DAG)")
+        print("="*60)
+        for name in self._required(targets):
+            status = '▶️  ejecutar' if name in to_run else '♻️  caché'
+            print(f"  {status:<12} {name}")
+
+        def load_output(name):
+            if name not in outputs:
+                outputs[name] = joblib.load(self._cache_path(name))
+            return outputs[name]
+
+        def execute(name):
+            stage = self.stages[name]
+            inputs = {dep: load_output(dep) for dep in stage.inputs}
+            start = time.perf_counter()
+            with self.profiler.stage(name) if self.profiler is not None else nullcontext():
+                output = stage.fn(inputs)
+            wall_s = time.perf_counter() - start
+            if stage.cache:
+                self._store(name, output)
+            return output, wall_s
+
+        for name in self._required(targets):
+            if name not in to_run:
+                self.records.append({'stage': name, 'status': 'caché', 'wall_s': 0.0})
+
+        pending = list(to_run)
+        running = {}
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            while pending or running:
+                # Las entradas cacheadas se cargan en este hilo antes de lanzar la etapa
+                ready = [name for name in pending
+                         if not any(dep in pending or dep in running.values()
+                                    for dep in self.stages[name].inputs)]
+                for name in ready:
+                    pending.remove(name)
+                    for dep in self.stages[name].inputs:
+                        load_output(dep)
+                    running[executor.submit(execute, name)] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        outputs[name], wall_s = future.result()
+                    except Exception:
+                        for other in running:
+                            other.cancel()
+                        print(f"\n✗ La etapa '{name}' falló")
+                        raise
+                    self.records.append({'stage': name, 'status': 'ejecutada', 'wall_s': wall_s})
+
+        for name in targets:
+            load_output(name)
+        self.summary()
+        if self.profiler is not None and self.profiler.enabled:
+            # Solo las etapas ejecutadas: las leídas de la caché no tienen costo que medir
+            self.profiler.summary()
+            self.profiler.save()
+        return outputs
+
+    def summary(self):
+        """Imprime el estado y el tiempo de cada etapa de la última ejecución."""
+        print("\n⏱️  ETAPAS DEL DAG:")
+        print(f"  {'Etapa':<32}{'Estado':<12}{'Pared (s)':>10}")
+        order = list(self.stages)
+        for record in sorted(self.records, key=lambda r: order.index(r['stage'])):
+            print(f"  {record['stage']:<32}{record['status']:<12}{record['wall_s']:>10.3f}")
+
+
+def build_training_dag(trainer=None, runner=None):
+    """
+    Declara el pipeline de entrenamiento de ModelTrainer como un DAG.
+
+    Args:
+        trainer (ModelTrainer, optional): Entrenador cuyos componentes se usan.
+        runner (PipelineRunner, optional): Runner donde declarar las etapas.
+
+    Returns:
+        tuple: (runner, trainer)
+    """
+    try:
+        from mlops_pipeline.src.model_training_evaluation import ModelTrainer
+    except ImportError:
+        from .model_training_evaluation import ModelTrainer
+
+    trainer = trainer or ModelTrainer()
+    runner = runner or PipelineRunner(profiler=trainer.profiler)
+
+    def load(inputs):
+        df = trainer.loader.load_data()
+        if df.empty:
+            raise ValueError("No se pudieron cargar los datos.")
+        return df
+
+    def validate(inputs):
+        df, is_valid = trainer.validator.validate_and_clean(inputs['load'])
+        if not is_valid:
+            raise ValueError("Los datos no pasaron la validación.")
+        result = {'rows': len(df), 'report': trainer.validator.last_report}
+        if len(df) != len(inputs['load']):
+            # Solo se guarda una copia de los datos si hubo filas en cuarentena
+            result['data'] = df
+        return result
+
+    def features(inputs):
+        df = inputs['validate'].get('data', inputs['load'])
+        # El preprocesador se guarda en la etapa 'preprocessor', que no se cachea
+        X_train, X_test, y_train, y_test = trainer.engineer.process(df, save=False)
+        return {
+            'X_train': X_train, 'X_test': X_test, 'y_train': y_train, 'y_test': y_test,
+            'X_train_raw': trainer.engineer.X_train_raw, 'y_train_raw': trainer.engineer.y_train_raw,
+            'preprocessor': trainer.engineer.preprocessor
+        }
+
+    def save_preprocessor(inputs):
+        # Reescribir el mismo preprocesador cambiaría su checksum y dejaría obsoletos los
+        # artefactos vinculados a él: solo se guarda si el archivo es de otra ejecución
+        path = config.PREPROCESSOR_PATH
+        source = runner.fingerprint('features')
+        saved = (not os.path.exists(path)
+                 or read_artifact_metadata(path).get('metadata', {}).get('features_fingerprint') != source)
+        if saved:
+            trainer.engineer.preprocessor = inputs['features']['preprocessor']
+            trainer.engineer.save_preprocessor(path, metadata={'features_fingerprint': source})
+        else:
+            print(f"  ♻️  Preprocesador vigente en: {path}")
+        return {'path': path, 'checksum': artifact_checksum(path), 'saved': saved}
+
+    def resample(inputs):
+        data = inputs['features']
+        return trainer.imbalance_strategy(data['X_train'], data['y_train'], verbose=True)
+
+    def cross_validation(inputs):
+        data = inputs['features']
+        return trainer.cross_validate(data['X_train_raw'], data['y_train_raw'])
+
+    def make_train(model_name):
+        def train(inputs):
+            X_train_res, y_train_res = inputs['resample']
+            data = inputs['features']
+            model = trainer.build_models(data['y_train'])[model_name]
+            model = trainer.fit_model(model, X_train_res, y_train_res, data['X_train'], data['y_train'])
+            print(f"  ✓ Modelo entrenado: {model_name}")
+            return model
+        return train
+
+    def export(inputs):
+        data = inputs['features']
+        trainer.engineer.preprocessor = data['preprocessor']
+        trainer.cv_results = inputs.get('cross_validation')
+        for stage_name in train_stages:
+            trainer.evaluate_model(stage_name.split(':', 1)[1], inputs[stage_name], data['X_test'], data['y_test'])
+        trainer.select_and_export()
+        return {'best_model_name': trainer.best_model_name, 'best_auc': trainer.best_auc}
+
+    feature_params = config_params(
+        'TARGET_VARIABLE', 'NUMERICAL_COLS', 'CATEGORICAL_COLS', 'TEST_SIZE', 'USE_FLOAT32',
+        'SPARSE_OUTPUT', 'CATEGORICAL_ENCODING', 'CATEGORY_MIN_FREQUENCY',
+        'CATEGORY_MAX_CATEGORIES', 'HASHING_N_FEATURES'
+    )
+    feature_params['random_state'] = trainer.random_state
+    resample_params = {
+        'strategy': type(trainer.imbalance_strategy).__name__,
+        'attributes': {k: repr(v) for k, v in vars(trainer.imbalance_strategy).items()}
+    }
+
+    runner.add_stage('load', load, params={
+        'data': [file_signature(path) for path in trainer.loader.source_files()],
+        'irrelevant_cols': trainer.loader.irrelevant_cols,
+        'use_float32': trainer.loader.use_float32,
+        'dtypes': config.COLUMN_DTYPES
+    })
+    runner.add_stage('validate', validate, inputs=['load'],
+                     params=config_params('NUMERICAL_COLS', 'CATEGORICAL_COLS', 'ALLOWED_TYPES',
+                                         'VALIDATION_RULES', 'VALIDATION_MODE', 'MAX_REJECT_RATE'))
+    runner.add_stage('features', features, inputs=['load', 'validate'], params=feature_params)
+    runner.add_stage('preprocessor', save_preprocessor, inputs=['features'],
+                     params=config_params('PREPROCESSOR_PATH'), cache=False)
+    runner.add_stage('resample', resample, inputs=['features'], params=resample_params)
+
+    export_inputs = ['features', 'preprocessor']
+    if trainer.cv_folds > 1:
+        runner.add_stage('cross_validation', cross_validation, inputs=['features'], params={
+            'cv_folds': trainer.cv_folds,
+            'resample': resample_params,
+            **config_params('CV_CONFIDENCE_LEVEL', 'DECISION_THRESHOLD',
+                            'XGB_EARLY_STOPPING_ROUNDS', 'XGB_VALIDATION_SIZE')
+        })
+        export_inputs.append('cross_validation')
+
+    train_stages = []
+    for model_name, model in trainer.build_models().items():
+        stage_name = f'train:{model_name}'
+        params = {k: repr(v) for k, v in model.get_params().items()}
+        params['n_shards'] = trainer.n_shards
+        params['random_state'] = trainer.random_state
+        if isinstance(model, xgb.XGBClassifier):
+            # El early stopping decide las rondas conservadas fuera de get_params()
+            params.update(config_params('XGB_EARLY_STOPPING_ROUNDS', 'XGB_VALIDATION_SIZE',
+                                        'XGB_N_ESTIMATORS', 'XGB_TREE_METHOD', 'XGB_MAX_BIN', 'XGB_N_JOBS'))
+        runner.add_stage(stage_name, make_train(model_name), inputs=['features', 'resample'], params=params)
+        train_stages.append(stage_name)
+
+    runner.add_stage('export', export, inputs=export_inputs + train_stages, cache=False)
+    return runner, trainer
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ejecuta el pipeline de entrenamiento como DAG")
+    parser.add_argument('targets', nargs='*', help="Etapas objetivo (por defecto todas)")
+    parser.add_argument('--force', nargs='+', default=[], help="Etapas a re-ejecutar aunque estén en caché")
+    parser.add_argument('--force-all', action='store_true', help="Ignorar la caché")
+    args = parser.parse_args()
+
+    dag, _ = build_training_dag()
+    dag.run(args.targets, force=list(dag.stages) if args.force_all else args.force)
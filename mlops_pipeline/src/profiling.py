@@ -0,0 +1,325 @@
+"""
+Módulo de profiling del pipeline de entrenamiento.
+Define la clase PipelineProfiler, que mide por etapa el tiempo de pared, el tiempo
+de CPU, la memoria pico asignada (tracemalloc) y el RSS muestreado en segundo plano,
+y guarda un perfil JSON por ejecución. Opcionalmente vuelca un archivo de cProfile
+por etapa.
+
+Comparar dos ejecuciones para detectar regresiones:
+    python -m mlops_pipeline.src.profiling profiles/profile_A.json profiles/profile_B.json
+"""
+
+import os
+import sys
+import json
+import time
+import cProfile
+import platform
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+try:
+    import psutil
+except ImportError:
+    psutil = None
+try:
+    from mlops_pipeline.src import config
+except ImportError:
+    from . import config
+
+
+PROFILE_METRICS = ['wall_s', 'cpu_s', 'traced_peak_mb', 'rss_peak_mb']
+
+# Variaciones absolutas por debajo de estos valores se consideran ruido
+NOISE_FLOOR = {'wall_s': 0.05, 'cpu_s': 0.05, 'traced_peak_mb': 1.0, 'rss_peak_mb': 5.0}
+
+
+def current_rss_mb():
+    """
+    Devuelve el RSS actual del proceso en MB, o None si no puede medirse.
+    Usa psutil si está instalado y /proc/self/statm en Linux como alternativa.
+    """
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class PipelineProfiler:
+    """
+    Instrumentación por etapas del pipeline.
+    Las etapas se delimitan con el context manager stage() y pueden anidarse. Cada hilo
+    anida sus propias etapas, así que las que corren a la vez en hilos distintos (las del
+    DAG) quedan como hermanas; su memoria pico (tracemalloc y RSS) es la del proceso e
+    incluye la de las etapas simultáneas.
+    """
+
+    def __init__(self, enabled=None, trace_memory=None, cprofile=None, output_dir=None,
+                 rss_interval=None):
+        """
+        Inicializa el profiler.
+
+        Args:
+            enabled (bool, optional): Activar la instrumentación. Por defecto config.PROFILING_ENABLED.
+            trace_memory (bool, optional): Medir memoria con tracemalloc. Por defecto config.PROFILE_TRACE_MEMORY.
+            cprofile (bool, optional): Volcar cProfile por etapa. Por defecto config.PROFILE_CPROFILE.
+            output_dir (str, optional): Directorio de salida. Por defecto config.PROFILE_DIR.
+            rss_interval (float, optional): Segundos entre muestras de RSS. Por defecto config.PROFILE_RSS_INTERVAL.
+        """
+        self.enabled = enabled if enabled is not None else config.PROFILING_ENABLED
+        self.trace_memory = trace_memory if trace_memory is not None else config.PROFILE_TRACE_MEMORY
+        self.cprofile = cprofile if cprofile is not None else config.PROFILE_CPROFILE
+        self.output_dir = output_dir if output_dir is not None else config.PROFILE_DIR
+        self.rss_interval = rss_interval if rss_interval is not None else config.PROFILE_RSS_INTERVAL
+
+        self.run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.started_at = None
+        self.stages = []
+        self._local = threading.local()  # Pila de etapas abiertas de cada hilo
+        self._active = []  # Etapas abiertas en cualquier hilo (muestreo de RSS)
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._stop_sampling = threading.Event()
+        self._cprofile_active = False
+
+    # ------------------------------------------------------------------ muestreo RSS
+
+    def _sample_rss(self):
+        """Hilo en segundo plano que actualiza el RSS pico de las etapas activas."""
+        while not self._stop_sampling.wait(self.rss_interval):
+            rss = current_rss_mb()
+            if rss is None:
+                return
+            with self._lock:
+                for record in self._active:
+                    record['rss_peak_mb'] = max(record['rss_peak_mb'] or 0.0, rss)
+
+    def _ensure_sampler(self):
+        if self._sampler is None and current_rss_mb() is not None:
+            self._stop_sampling.clear()
+            self._sampler = threading.Thread(target=self._sample_rss, name='rss-sampler', daemon=True)
+            self._sampler.start()
+
+    def close(self):
+        """Detiene el muestreo de RSS y tracemalloc."""
+        if self._sampler is not None:
+            self._stop_sampling.set()
+            self._sampler.join()
+            self._sampler = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    # ------------------------------------------------------------------ etapas
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Mide una etapa del pipeline.
+
+        Args:
+            name (str): Nombre de la etapa (por ejemplo 'load' o 'fit:XGBoost').
+        """
+        if not self.enabled:
+            yield
+            return
+
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._ensure_sampler()
+
+        stack = self._thread_stack()
+        parent = stack[-1] if stack else None
+        rss = current_rss_mb()
+        record = {
+            'stage': name,
+            'parent': parent['stage'] if parent else None,
+            'start_s': time.perf_counter() - self.started_at,
+            'wall_s': None,
+            'cpu_s': None,
+            'traced_peak_mb': None,
+            'rss_start_mb': rss,
+            'rss_end_mb': None,
+            'rss_peak_mb': rss,
+            '_traced_peak': 0
+        }
+
+        if self.trace_memory:
+            # El pico de la etapa padre se conserva antes de reiniciar el contador
+            _, peak = tracemalloc.get_traced_memory()
+            if parent:
+                parent['_traced_peak'] = max(parent['_traced_peak'], peak)
+            tracemalloc.reset_peak()
+
+        profiler = None
+        if self.cprofile and not self._cprofile_active:
+            # cProfile no admite perfiles anidados: solo se perfila la etapa más externa
+            profiler = cProfile.Profile()
+            self._cprofile_active = True
+            profiler.enable()
+
+        with self._lock:
+            stack.append(record)
+            self._active.append(record)
+            self.stages.append(record)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+        try:
+            yield
+        finally:
+            record['wall_s'] = time.perf_counter() - wall_start
+            record['cpu_s'] = time.process_time() - cpu_start
+
+            if profiler is not None:
+                profiler.disable()
+                self._cprofile_active = False
+                record['cprofile'] = self._dump_cprofile(profiler, name)
+
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                stage_peak = max(record['_traced_peak'], peak)
+                record['traced_peak_mb'] = stage_peak / 1024 ** 2
+                if parent:
+                    parent['_traced_peak'] = max(parent['_traced_peak'], stage_peak)
+                tracemalloc.reset_peak()
+
+            rss = current_rss_mb()
+            with self._lock:
+                stack.pop()
+                self._active.remove(record)
+                record['rss_end_mb'] = rss
+                if rss is not None:
+                    record['rss_peak_mb'] = max(record['rss_peak_mb'] or 0.0, rss)
+                    if parent:
+                        parent['rss_peak_mb'] = max(parent['rss_peak_mb'] or 0.0, record['rss_peak_mb'])
+
+            del record['_traced_peak']
+
+    def _thread_stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def reset(self):
+        """Empieza un perfil nuevo (otro run_id y sin etapas) con la misma configuración."""
+        self.close()
+        self.run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.started_at = None
+        self.stages = []
+
+    def _dump_cprofile(self, profiler, name):
+        """Guarda las estadísticas de cProfile de una etapa y devuelve la ruta."""
+        stage_dir = os.path.join(self.output_dir, f'cprofile_{self.run_id}')
+        os.makedirs(stage_dir, exist_ok=True)
+        path = os.path.join(stage_dir, f"{name.replace(':', '_').replace('/', '_')}.prof")
+        profiler.dump_stats(path)
+        return path
+
+    # ------------------------------------------------------------------ salida
+
+    def to_dict(self):
+        """Devuelve el perfil de la ejecución como diccionario serializable."""
+        return {
+            'run_id': self.run_id,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'trace_memory': self.trace_memory,
+            'total_wall_s': sum(s['wall_s'] for s in self.stages if s['parent'] is None),
+            'stages': self.stages
+        }
+
+    def save(self, path=None):
+        """
+        Guarda el perfil JSON de la ejecución.
+
+        Args:
+            path (str, optional): Ruta del archivo. Por defecto PROFILE_DIR/profile_<run_id>.json.
+
+        Returns:
+            str: Ruta del perfil guardado, o None si el profiler está desactivado.
+        """
+        if not self.enabled:
+            return None
+        self.close()
+        path = path or os.path.join(self.output_dir, f'profile_{self.run_id}.json')
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        print(f"✓ Perfil de la ejecución guardado en: {path}")
+        return path
+
+    def summary(self):
+        """Imprime una tabla con las métricas de cada etapa."""
+        print("\n⏱️  PERFIL POR ETAPA:")
+        print(f"  {'Etapa':<32}{'Pared (s)':>11}{'CPU (s)':>10}{'Traced (MB)':>13}{'RSS pico (MB)':>15}")
+        for s in self.stages:
+            indent = '  ' if s['parent'] else ''
+            traced = f"{s['traced_peak_mb']:.1f}" if s['traced_peak_mb'] is not None else '-'
+            rss = f"{s['rss_peak_mb']:.1f}" if s['rss_peak_mb'] is not None else '-'
+            print(f"  {indent + s['stage']:<32}{s['wall_s']:>11.3f}{s['cpu_s']:>10.3f}{traced:>13}{rss:>15}")
+
+
+def load_profile(path):
+    """Carga un perfil JSON guardado por PipelineProfiler."""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_profiles(baseline, current, threshold=None):
+    """
+    Compara dos perfiles etapa por etapa.
+
+    Args:
+        baseline (dict): Perfil de referencia.
+        current (dict): Perfil a evaluar.
+        threshold (float, optional): Aumento relativo considerado regresión.
+                                     Por defecto config.PROFILE_REGRESSION_THRESHOLD.
+
+    Returns:
+        list: Una fila por (etapa, métrica) con valores, cambio relativo y marca de regresión.
+    """
+    threshold = threshold if threshold is not None else config.PROFILE_REGRESSION_THRESHOLD
+    base_stages = {s['stage']: s for s in baseline['stages']}
+    rows = []
+
+    for stage in current['stages']:
+        base = base_stages.get(stage['stage'])
+        if base is None:
+            continue
+        for metric in PROFILE_METRICS:
+            before, after = base.get(metric), stage.get(metric)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before if before else 0.0
+            rows.append({
+                'stage': stage['stage'],
+                'metric': metric,
+                'baseline': before,
+                'current': after,
+                'change': change,
+                'regression': change > threshold and (after - before) > NOISE_FLOOR[metric]
+            })
+    return rows
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Uso: python -m mlops_pipeline.src.profiling <perfil_base.json> <perfil_actual.json>")
+        sys.exit(2)
+
+    rows = compare_profiles(load_profile(sys.argv[1]), load_profile(sys.argv[2]))
+    print(f"{'Etapa':<32}{'Métrica':<16}{'Base':>12}{'Actual':>12}{'Cambio':>10}")
+    for row in rows:
+        flag = '  ⚠️ REGRESIÓN' if row['regression'] else ''
+        print(f"{row['stage']:<32}{row['metric']:<16}{row['baseline']:>12.3f}"
+              f"{row['current']:>12.3f}{row['change']:>+10.1%}{flag}")
+
+    regressions = [r for r in rows if r['regression']]
+    print(f"\n{'❌' if regressions else '✅'} {len(regressions)} regresiones detectadas")
+    sys.exit(1 if regressions else 0)
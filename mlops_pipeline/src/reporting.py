@@ -0,0 +1,216 @@
+"""
+Módulo de reportes de entrenamiento.
+Define la clase TrainingReport, que recolecta los resultados de evaluación,
+los almacena en disco y genera los gráficos (matrices de confusión y curvas ROC)
+en un proceso en segundo plano con un backend no interactivo.
+
+Las curvas ROC y las matrices de confusión se guardan ya calculadas por el módulo de
+evaluación, por lo que el renderizado no vuelve a recorrer las predicciones.
+
+Los gráficos también pueden regenerarse bajo demanda desde las métricas guardadas:
+    python -m mlops_pipeline.src.reporting [directorio_del_reporte]
+"""
+
+import os
+import sys
+import json
+import multiprocessing
+import numpy as np
+try:
+    from mlops_pipeline.src import config
+except ImportError:
+    from . import config
+
+
+METRICS_FILE = "metrics.json"
+EVALUATIONS_FILE = "evaluations.npz"
+METRIC_KEYS = ['threshold', 'accuracy', 'precision', 'recall', 'f1_score', 'roc_auc', 'average_precision']
+
+
+def _file_stem(model_name):
+    """Normaliza el nombre del modelo para usarlo en nombres de archivo."""
+    return model_name.lower().replace(" ", "_")
+
+
+def render_report(report_dir, formats=None, dpi=None):
+    """
+    Genera los gráficos del reporte a partir de las métricas almacenadas.
+
+    Usa el backend 'Agg' de matplotlib, por lo que funciona en ejecuciones
+    sin pantalla y nunca bloquea esperando una ventana.
+
+    Args:
+        report_dir (str): Directorio con metrics.json y evaluations.npz.
+        formats (list, optional): Formatos de salida. Por defecto config.REPORT_FORMATS.
+        dpi (int, optional): Resolución. Por defecto config.REPORT_DPI.
+
+    Returns:
+        list: Rutas de los archivos generados.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    formats = formats if formats is not None else config.REPORT_FORMATS
+    dpi = dpi if dpi is not None else config.REPORT_DPI
+
+    with open(os.path.join(report_dir, METRICS_FILE), encoding='utf-8') as f:
+        metrics = json.load(f)
+    evaluations = np.load(os.path.join(report_dir, EVALUATIONS_FILE))
+
+    generated = []
+
+    def _save(fig, stem):
+        for fmt in formats:
+            path = os.path.join(report_dir, f"{stem}.{fmt}")
+            fig.savefig(path, dpi=dpi)
+            generated.append(path)
+        plt.close(fig)
+
+    # Matrices de confusión
+    for model_name in metrics:
+        stem = _file_stem(model_name)
+        cm = evaluations[f'{stem}__confusion_matrix']
+
+        fig = plt.figure(figsize=(8, 6))
+        sns.heatmap(
+            cm,
+            annot=True,
+            fmt='d',
+            cmap='Blues',
+            xticklabels=['No Fraude', 'Fraude'],
+            yticklabels=['No Fraude', 'Fraude']
+        )
+        plt.title(f'Matriz de Confusión - {model_name}')
+        plt.ylabel('Real')
+        plt.xlabel('Predicción')
+        plt.tight_layout()
+        _save(fig, f'confusion_matrix_{stem}')
+
+    # Curvas ROC comparativas
+    fig = plt.figure(figsize=(10, 8))
+    for model_name, model_metrics in metrics.items():
+        stem = _file_stem(model_name)
+        fpr, tpr = evaluations[f'{stem}__fpr'], evaluations[f'{stem}__tpr']
+        plt.plot(fpr, tpr, label=f"{model_name} (AUC = {model_metrics['roc_auc']:.4f})", linewidth=2)
+
+    plt.plot([0, 1], [0, 1], 'k--', label='Random Classifier')
+    plt.xlim([0.0, 1.0])
+    plt.ylim([0.0, 1.05])
+    plt.xlabel('False Positive Rate', fontsize=12)
+    plt.ylabel('True Positive Rate', fontsize=12)
+    plt.title('Curvas ROC - Comparación de Modelos', fontsize=14)
+    plt.legend(loc='lower right', fontsize=10)
+    plt.grid(alpha=0.3)
+    plt.tight_layout()
+    _save(fig, 'roc_curves_comparison')
+
+    return generated
+
+
+class TrainingReport:
+    """
+    Recolecta los resultados de evaluación de cada modelo y genera el reporte.
+    El renderizado se delega a un proceso aparte para que el tiempo de
+    entrenamiento no incluya la generación de gráficos.
+    """
+
+    def __init__(self, output_dir=None, formats=None, dpi=None, background=None):
+        """
+        Inicializa el reporte.
+
+        Args:
+            output_dir (str, optional): Directorio del reporte. Por defecto config.REPORT_DIR.
+            formats (list, optional): Formatos de los gráficos. Por defecto config.REPORT_FORMATS.
+            dpi (int, optional): Resolución. Por defecto config.REPORT_DPI.
+            background (bool, optional): Renderizar en segundo plano. Por defecto config.REPORT_BACKGROUND.
+        """
+        self.output_dir = output_dir if output_dir is not None else config.REPORT_DIR
+        self.formats = formats if formats is not None else config.REPORT_FORMATS
+        self.dpi = dpi if dpi is not None else config.REPORT_DPI
+        self.background = background if background is not None else config.REPORT_BACKGROUND
+        self.y_true = None
+        self.metrics = {}
+        self.arrays = {}
+        self._process = None
+
+    def add_evaluation(self, model_name, y_true, y_prob, evaluation):
+        """
+        Registra la evaluación de un modelo.
+
+        Args:
+            model_name (str): Nombre del modelo.
+            y_true (array): Valores reales.
+            y_prob (array): Probabilidades de la clase positiva.
+            evaluation (dict): Resultado de evaluation.evaluate_scores.
+        """
+        self.y_true = np.asarray(y_true)
+        stem = _file_stem(model_name)
+        self.arrays[f'{stem}__y_prob'] = np.asarray(y_prob)
+        self.arrays[f'{stem}__fpr'] = evaluation['roc_curve']['fpr']
+        self.arrays[f'{stem}__tpr'] = evaluation['roc_curve']['tpr']
+        self.arrays[f'{stem}__confusion_matrix'] = evaluation['confusion_matrix']
+        self.metrics[model_name] = {k: float(evaluation[k]) for k in METRIC_KEYS}
+        if 'ci' in evaluation:
+            self.metrics[model_name]['ci'] = evaluation['ci']
+        self.metrics[model_name]['threshold_sweep'] = evaluation['threshold_sweep']
+
+    def save(self):
+        """
+        Almacena las métricas y las predicciones en el directorio del reporte.
+
+        Returns:
+            str: Directorio del reporte.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(os.path.join(self.output_dir, METRICS_FILE), 'w', encoding='utf-8') as f:
+            json.dump(self.metrics, f, indent=2)
+        np.savez(os.path.join(self.output_dir, EVALUATIONS_FILE), y_true=self.y_true, **self.arrays)
+        print(f"  ✓ Métricas del reporte guardadas en: {self.output_dir}")
+        return self.output_dir
+
+    def render(self):
+        """
+        Guarda el reporte y genera los gráficos.
+        En modo background lanza un proceso independiente y retorna de inmediato.
+        """
+        self.save()
+
+        if not self.background:
+            generated = render_report(self.output_dir, self.formats, self.dpi)
+            print(f"  ✓ {len(generated)} gráficos generados en: {self.output_dir}")
+            return
+
+        ctx = multiprocessing.get_context('spawn')
+        self._process = ctx.Process(
+            target=render_report,
+            args=(self.output_dir, self.formats, self.dpi),
+            name='training-report'
+        )
+        self._process.start()
+        print(f"  🔄 Gráficos generándose en segundo plano en: {self.output_dir}")
+
+    def wait(self, timeout=None):
+        """
+        Espera a que termine el renderizado en segundo plano.
+
+        Args:
+            timeout (float, optional): Segundos máximos de espera.
+
+        Returns:
+            bool: True si el renderizado terminó correctamente.
+        """
+        if self._process is None:
+            return True
+        self._process.join(timeout)
+        return self._process.exitcode == 0
+
+
+if __name__ == "__main__":
+    # Regenerar los gráficos bajo demanda desde las métricas almacenadas
+    report_dir = sys.argv[1] if len(sys.argv) > 1 else config.REPORT_DIR
+    files = render_report(report_dir)
+    print(f"✓ {len(files)} gráficos generados en: {report_dir}")
+    for path in files:
+        print(f"  - {path}")
@@ -0,0 +1,286 @@
+"""
+Módulo de índice de filas por offset de bytes.
+Define RowIndex: recorre una vez un CSV sin comprimir y guarda en disco el offset de
+inicio de cada fila (y la etiqueta de cada fila para el muestreo estratificado). Con
+el índice se leen rangos o filas arbitrarias con un seek, sin parsear el archivo
+completo, y se toman muestras uniformes o estratificadas por la variable objetivo en
+tiempo proporcional al tamaño de la muestra. Si el archivo crece por el final, el
+índice se actualiza recorriendo solo la parte nueva.
+
+Limitación: las filas se delimitan por saltos de línea, así que no se admiten campos
+entrecomillados con saltos de línea dentro.
+"""
+
+import io
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+try:
+    from mlops_pipeline.src import config
+    from mlops_pipeline.src.columnar_cache import prefix_hash
+except ImportError:
+    from . import config
+    from .columnar_cache import prefix_hash
+
+
+INDEX_VERSION = 1
+
+
+class RowIndex:
+    """
+    Índice persistente de offsets de filas de un CSV.
+    """
+
+    def __init__(self, path, index_dir=None, target=None):
+        """
+        Args:
+            path (str): CSV sin comprimir.
+            index_dir (str, optional): Directorio del índice. Por defecto config.ROW_INDEX_DIR.
+            target (str, optional): Columna para el muestreo estratificado. Por defecto
+                                    config.TARGET_VARIABLE.
+        """
+        self.path = path
+        self.index_dir = index_dir or config.ROW_INDEX_DIR
+        self.target = target if target is not None else config.TARGET_VARIABLE
+        key = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+        self.prefix = os.path.join(self.index_dir, f"{os.path.basename(path)}-{key}")
+        self.meta = None
+        self.offsets = None
+        self.labels = None
+
+    @property
+    def n_rows(self):
+        return 0 if self.offsets is None else len(self.offsets) - 1
+
+    # ------------------------------------------------------------------ construcción
+
+    def update(self):
+        """
+        Crea el índice o lo pone al día con el archivo.
+
+        Si el archivo solo creció por el final (cabecera y extremos de la parte indexada
+        intactos), se recorre únicamente la parte nueva; si cambió de otra forma, se
+        reconstruye.
+
+        Returns:
+            RowIndex: self.
+        """
+        meta = self._read_meta()
+        size = os.path.getsize(self.path)
+        # Se liberan los mapeos actuales antes de truncar o extender los archivos del índice
+        self.offsets = self.labels = None
+        if meta is not None and self._is_prefix_intact(meta, size):
+            if size == meta['indexed_end']:
+                self._load(meta)
+                return self
+            print(f"🔄 Actualizando índice de filas: {size - meta['indexed_end']:,} bytes nuevos")
+            self._scan(meta)
+        else:
+            print(f"🔄 Construyendo índice de filas de {self.path}")
+            self._scan(None)
+        self._load(self._read_meta())
+        print(f"✓ Índice de filas: {self.n_rows:,} filas")
+        return self
+
+    def _scan(self, meta):
+        """Recorre el archivo desde el final de la parte indexada y añade offsets y etiquetas."""
+        os.makedirs(self.index_dir, exist_ok=True)
+        block_bytes = config.ROW_INDEX_BLOCK_BYTES
+        offsets_path, labels_path = f"{self.prefix}.offsets.bin", f"{self.prefix}.labels.bin"
+
+        with open(self.path, 'rb') as f:
+            header = f.readline()
+            if meta is None:
+                start, terminated = len(header), True
+                for path in (offsets_path, labels_path):
+                    open(path, 'wb').close()
+                with open(offsets_path, 'ab') as out:
+                    np.array([start], dtype=np.int64).tofile(out)
+            else:
+                start, terminated = meta['indexed_end'], meta['terminated']
+                if not terminated:
+                    # La última fila no tenía salto de línea: se vuelve a indexar
+                    start = self._drop_last_row(meta)
+            has_target = self.target in _parse_header(header)
+
+            f.seek(start)
+            position, pending = start, b''
+            with open(offsets_path, 'ab') as offsets_out, open(labels_path, 'ab') as labels_out:
+                while True:
+                    block = f.read(block_bytes)
+                    if not block:
+                        break
+                    data = pending + block
+                    last_newline = data.rfind(b'\n')
+                    if last_newline < 0:
+                        pending = data
+                        continue
+                    complete, pending = data[:last_newline + 1], data[last_newline + 1:]
+                    ends = np.flatnonzero(np.frombuffer(complete, dtype=np.uint8) == 10) + 1 + position
+                    ends.astype(np.int64).tofile(offsets_out)
+                    if has_target:
+                        _parse_labels(header, complete, self.target).tofile(labels_out)
+                    position += len(complete)
+                terminated = not pending
+                if pending:
+                    # Última fila sin salto de línea: se indexa y se revisa en la próxima actualización
+                    np.array([position + len(pending)], dtype=np.int64).tofile(offsets_out)
+                    if has_target:
+                        _parse_labels(header, pending + b'\n', self.target).tofile(labels_out)
+                    position += len(pending)
+
+        self._write_meta({
+            'version': INDEX_VERSION,
+            'header': header.decode('utf-8', errors='replace'),
+            'indexed_end': position,
+            'terminated': terminated,
+            'has_target': has_target,
+            'prefix_hash': prefix_hash(self.path, position)
+        })
+
+    def _drop_last_row(self, meta):
+        """Quita la última fila indexada (sin salto de línea) y devuelve su offset de inicio."""
+        offsets_path, labels_path = f"{self.prefix}.offsets.bin", f"{self.prefix}.labels.bin"
+        n_offsets = os.path.getsize(offsets_path) // 8
+        offsets = np.memmap(offsets_path, dtype=np.int64, mode='r', shape=(n_offsets,))
+        start = int(offsets[-2])
+        del offsets
+        os.truncate(offsets_path, (n_offsets - 1) * 8)
+        if meta.get('has_target') and os.path.getsize(labels_path):
+            os.truncate(labels_path, os.path.getsize(labels_path) - 1)
+        return start
+
+    def _is_prefix_intact(self, meta, size):
+        if meta.get('version') != INDEX_VERSION or size < meta['indexed_end']:
+            return False
+        return meta['prefix_hash'] == prefix_hash(self.path, meta['indexed_end'])
+
+    def _read_meta(self):
+        path = f"{self.prefix}.json"
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_meta(self, meta):
+        tmp = f"{self.prefix}.json.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, f"{self.prefix}.json")
+
+    def _load(self, meta):
+        """Mapea en memoria los offsets y las etiquetas: abrir el índice no lee el archivo."""
+        self.meta = meta
+        self.offsets = _map_array(f"{self.prefix}.offsets.bin", np.int64)
+        labels_path = f"{self.prefix}.labels.bin"
+        self.labels = _map_array(labels_path, np.int8) if meta['has_target'] else None
+
+    # ------------------------------------------------------------------ lectura
+
+    def read_range(self, start, stop, **read_csv_kwargs):
+        """
+        Lee las filas [start, stop) con una sola lectura contigua.
+
+        Args:
+            start, stop (int): Rango de filas de datos (sin contar la cabecera).
+            **read_csv_kwargs: Argumentos de pd.read_csv (por ejemplo usecols y dtype).
+
+        Returns:
+            pd.DataFrame: Filas leídas, con su número de fila como índice.
+        """
+        start, stop = max(start, 0), min(stop, self.n_rows)
+        if stop <= start:
+            return self._parse([], np.empty(0, dtype=np.int64), read_csv_kwargs)
+        with open(self.path, 'rb') as f:
+            f.seek(self.offsets[start])
+            data = f.read(int(self.offsets[stop] - self.offsets[start]))
+        return self._parse([data], np.arange(start, stop), read_csv_kwargs)
+
+    def read_rows(self, rows, **read_csv_kwargs):
+        """
+        Lee filas arbitrarias. Las filas consecutivas se agrupan en una sola lectura.
+
+        Args:
+            rows (array): Números de fila de datos.
+            **read_csv_kwargs: Argumentos de pd.read_csv (por ejemplo usecols y dtype).
+
+        Returns:
+            pd.DataFrame: Filas leídas en orden ascendente, con su número de fila como índice.
+        """
+        rows = np.unique(np.asarray(rows, dtype=np.int64))
+        if len(rows) and (rows[0] < 0 or rows[-1] >= self.n_rows):
+            raise IndexError(f"Filas fuera de rango: el índice tiene {self.n_rows} filas")
+        # Inicio de cada tramo de filas consecutivas
+        breaks = np.flatnonzero(np.diff(rows) != 1) + 1
+        run_starts = np.r_[0, breaks] if len(rows) else np.empty(0, dtype=np.int64)
+        run_stops = np.r_[breaks, len(rows)] if len(rows) else np.empty(0, dtype=np.int64)
+        chunks = []
+        with open(self.path, 'rb') as f:
+            for i, j in zip(run_starts, run_stops):
+                first, last = rows[i], rows[j - 1]
+                f.seek(self.offsets[first])
+                chunks.append(f.read(int(self.offsets[last + 1] - self.offsets[first])))
+        return self._parse(chunks, rows, read_csv_kwargs)
+
+    def sample(self, n=None, frac=None, stratify=False, random_state=None, **read_csv_kwargs):
+        """
+        Muestra aleatoria sin reemplazo leyendo solo las filas elegidas.
+
+        Args:
+            n (int, optional): Tamaño de la muestra.
+            frac (float, optional): Fracción de filas (si no se da n).
+            stratify (bool): Conservar la proporción de cada clase de la variable objetivo.
+            random_state (int, optional): Semilla. Por defecto config.RANDOM_STATE.
+            **read_csv_kwargs: Argumentos de pd.read_csv.
+
+        Returns:
+            pd.DataFrame: Filas muestreadas, con su número de fila como índice.
+        """
+        random_state = random_state if random_state is not None else config.RANDOM_STATE
+        rng = np.random.default_rng(random_state)
+        n = min(int(n) if n is not None else int(round(frac * self.n_rows)), self.n_rows)
+
+        if not stratify:
+            rows = rng.choice(self.n_rows, size=n, replace=False)
+        else:
+            if self.labels is None:
+                raise ValueError(f"El archivo no tiene la columna '{self.target}' para estratificar")
+            classes, counts = np.unique(self.labels, return_counts=True)
+            # Asignación proporcional por restos mayores: el redondeo no sesga la tasa de fraude
+            quotas = counts / counts.sum() * n
+            allocation = np.floor(quotas).astype(int)
+            allocation[np.argsort(allocation - quotas, kind='stable')[:n - allocation.sum()]] += 1
+            rows = np.concatenate([
+                rng.choice(np.flatnonzero(self.labels == c), size=min(k, count), replace=False)
+                for c, k, count in zip(classes, allocation, counts)
+            ])
+        return self.read_rows(rows, **read_csv_kwargs)
+
+    def _parse(self, chunks, rows, read_csv_kwargs):
+        data = self.meta['header'].encode('utf-8') + b''.join(chunks)
+        if chunks and not data.endswith(b'\n'):
+            data += b'\n'
+        df = pd.read_csv(io.BytesIO(data), engine='c', **read_csv_kwargs)
+        df.index = pd.Index(rows[:len(df)], name='row')
+        return df
+
+
+def _map_array(path, dtype):
+    """Mapeo de solo lectura de un array binario (np.memmap no admite archivos vacíos)."""
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r')
+
+
+def _parse_header(header):
+    return pd.read_csv(io.BytesIO(header), nrows=0).columns
+
+
+def _parse_labels(header, complete, target):
+    """Etiquetas de la variable objetivo de un bloque de filas completas (-1 si faltan)."""
+    labels = pd.read_csv(io.BytesIO(header + complete), usecols=[target], engine='c',
+                         skip_blank_lines=False)[target]
+    return pd.to_numeric(labels, errors='coerce').fillna(-1).to_numpy().astype(np.int8)
+
@@ -0,0 +1,173 @@
+"""
+Módulo de entrenamiento distribuido por shards de filas.
+Divide el conjunto de entrenamiento en shards estratificados, entrena un modelo por
+shard en paralelo y combina los resultados en un único modelo:
+
+    - LogisticRegression: promedio de coeficientes e intercepto ponderado por filas.
+    - RandomForest: concatenación de los árboles (cada shard entrena su parte del bosque).
+
+La ejecución se delega a un ShardBackend. LocalProcessBackend usa procesos locales;
+un backend multinodo solo necesita implementar map() con la misma semántica.
+"""
+
+import copy
+from abc import ABC, abstractmethod
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+try:
+    from mlops_pipeline.src import config
+except ImportError:
+    from . import config
+
+
+MERGEABLE_MODELS = (LogisticRegression, RandomForestClassifier)
+
+
+def is_mergeable(model):
+    """Indica si los modelos de este tipo pueden entrenarse por shards y combinarse."""
+    return isinstance(model, MERGEABLE_MODELS)
+
+
+class ShardBackend(ABC):
+    """
+    Interfaz de ejecución de tareas por shard.
+    Cada tarea es una tupla de argumentos para fn; map() devuelve los resultados en el
+    mismo orden que las tareas.
+    """
+
+    @abstractmethod
+    def map(self, fn, tasks):
+        """Ejecuta fn(*task) para cada tarea y devuelve los resultados en orden."""
+
+
+class LocalProcessBackend(ShardBackend):
+    """
+    Ejecuta los shards en procesos locales (joblib/loky).
+    Los arreglos grandes se comparten con los workers mediante memmap.
+    """
+
+    def __init__(self, n_jobs=None):
+        """
+        Args:
+            n_jobs (int, optional): Procesos. Por defecto config.SHARDED_TRAINING_N_JOBS.
+        """
+        self.n_jobs = n_jobs if n_jobs is not None else config.SHARDED_TRAINING_N_JOBS
+
+    def map(self, fn, tasks):
+        return Parallel(n_jobs=self.n_jobs, backend='loky')(delayed(fn)(*task) for task in tasks)
+
+
+def make_shards(y, n_shards, random_state=None):
+    """
+    Particiona las filas en shards disjuntos que conservan la proporción de clases.
+
+    Returns:
+        list: Un arreglo de índices por shard.
+    """
+    random_state = random_state if random_state is not None else config.RANDOM_STATE
+    y = np.asarray(y)
+    splitter = StratifiedKFold(n_splits=n_shards, shuffle=True, random_state=random_state)
+    return [np.sort(idx) for _, idx in splitter.split(np.zeros(len(y)), y)]
+
+
+def _train_shard(model, X, y, resampler):
+    """Tarea de un worker: remuestrea su shard y entrena su copia del modelo."""
+    if resampler is not None:
+        X, y = resampler(X, y)
+    return model.fit(X, y), len(y)
+
+
+def merge_models(models, weights=None):
+    """
+    Combina los modelos entrenados en cada shard.
+
+    Args:
+        models (list): Modelos del mismo tipo, uno por shard.
+        weights (list, optional): Peso de cada shard (filas de entrenamiento).
+
+    Returns:
+        Modelo combinado.
+
+    Raises:
+        TypeError: Si el tipo de modelo no admite combinación.
+    """
+    merged = copy.deepcopy(models[0])
+
+    if isinstance(merged, LogisticRegression):
+        weights = np.asarray(weights if weights is not None else [1] * len(models), dtype=np.float64)
+        weights = weights / weights.sum()
+        merged.coef_ = np.tensordot(weights, np.stack([m.coef_ for m in models]), axes=1)
+        merged.intercept_ = np.tensordot(weights, np.stack([m.intercept_ for m in models]), axes=1)
+        return merged
+
+    if isinstance(merged, RandomForestClassifier):
+        merged.estimators_ = [tree for m in models for tree in m.estimators_]
+        merged.n_estimators = len(merged.estimators_)
+        return merged
+
+    raise TypeError(f"El modelo {type(merged).__name__} no admite entrenamiento por shards.")
+
+
+class ShardedTrainer:
+    """
+    Entrena un modelo combinable repartiendo las filas entre workers.
+    """
+
+    def __init__(self, n_shards=None, backend=None, resampler=None, random_state=None):
+        """
+        Inicializa el ShardedTrainer.
+
+        Args:
+            n_shards (int, optional): Número de shards. Por defecto config.SHARDED_TRAINING_SHARDS.
+            backend (ShardBackend, optional): Ejecutor de los shards. Por defecto LocalProcessBackend.
+            resampler (ImbalanceStrategy, optional): Estrategia de desbalanceo aplicada en cada shard.
+            random_state (int, optional): Semilla. Por defecto config.RANDOM_STATE.
+        """
+        self.n_shards = n_shards if n_shards is not None else config.SHARDED_TRAINING_SHARDS
+        self.backend = backend if backend is not None else LocalProcessBackend()
+        self.resampler = resampler
+        self.random_state = random_state if random_state is not None else config.RANDOM_STATE
+
+    def _shard_model(self, model, shard_id):
+        """Copia del modelo para un shard: semilla propia y, en bosques, su parte de los árboles."""
+        shard_model = clone(model)
+        params = shard_model.get_params()
+        if 'random_state' in params:
+            base = params['random_state'] if params['random_state'] is not None else self.random_state
+            shard_model.set_params(random_state=base + shard_id)
+        if isinstance(shard_model, RandomForestClassifier):
+            # Los primeros n_estimators % n_shards shards entrenan un árbol más: el total es exacto
+            n_trees, extra = divmod(params['n_estimators'], self.n_shards)
+            shard_model.set_params(n_estimators=n_trees + (shard_id < extra))
+        return shard_model
+
+    def fit(self, model, X, y):
+        """
+        Entrena el modelo por shards y devuelve el modelo combinado.
+
+        Args:
+            model: Modelo sin entrenar (LogisticRegression o RandomForest).
+            X (array o sparse): Features de entrenamiento sin remuestrear.
+            y (array): Target de entrenamiento.
+
+        Returns:
+            Modelo combinado.
+        """
+        if not is_mergeable(model):
+            raise TypeError(f"El modelo {type(model).__name__} no admite entrenamiento por shards.")
+        if isinstance(model, RandomForestClassifier) and model.n_estimators < self.n_shards:
+            raise ValueError(f"RandomForest con {model.n_estimators} árboles no se puede repartir "
+                             f"en {self.n_shards} shards.")
+
+        y = np.asarray(y)
+        shards = make_shards(y, self.n_shards, self.random_state)
+        tasks = [(self._shard_model(model, i), X[idx], y[idx], self.resampler)
+                 for i, idx in enumerate(shards)]
+        results = self.backend.map(_train_shard, tasks)
+
+        models, sizes = zip(*results)
+        return merge_models(list(models), weights=sizes)
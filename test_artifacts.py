@@ -0,0 +1,160 @@
+"""
+Script de prueba del formato de artefactos.
+Verifica el guardado y la carga de modelos en formato compacto (con y sin compresión),
+la lectura de la cabecera sin deserializar, la compatibilidad con archivos joblib y
+que un artefacto corrupto se rechace por checksum.
+"""
+
+import os
+import shutil
+import tempfile
+
+import joblib
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+
+from mlops_pipeline.src.artifacts import (save_artifact, load_artifact, read_artifact_metadata,
+                                          is_compact_artifact)
+
+WORK_DIR = tempfile.mkdtemp(prefix="artifacts_")
+X, y = make_classification(n_samples=2000, n_features=8, random_state=0)
+MODEL = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+EXPECTED = MODEL.predict_proba(X)
+
+
+def print_separator():
+    print("\n" + "="*70)
+
+
+def test_compact_round_trip():
+    """Prueba que un modelo guardado sin compresión prediga igual al cargarlo mapeado."""
+    print_separator()
+    print("🔍 TEST 1: Formato compacto sin compresión")
+    print_separator()
+
+    path = os.path.join(WORK_DIR, "model.joblib")
+    header = save_artifact(MODEL, path, metadata={'threshold': 0.5}, artifact_format='compact',
+                           compression='none')
+    loaded = load_artifact(path, mmap_mode=True, verify=True)
+    print(f"Buffers fuera del pickle: {len(header['buffers'])} | tamaño: {os.path.getsize(path):,} bytes")
+    assert (is_compact_artifact(path) and len(header['buffers']) > 0
+            and np.array_equal(loaded.predict_proba(X), EXPECTED))
+
+
+def test_compressed_round_trip():
+    """Prueba el formato compacto con compresión zlib."""
+    print_separator()
+    print("🔍 TEST 2: Formato compacto con compresión")
+    print_separator()
+
+    path = os.path.join(WORK_DIR, "model_zlib.joblib")
+    save_artifact(MODEL, path, artifact_format='compact', compression='zlib', level=3)
+    loaded = load_artifact(path, verify=True)
+    print(f"Tamaño comprimido: {os.path.getsize(path):,} bytes")
+    assert np.array_equal(loaded.predict_proba(X), EXPECTED)
+
+
+def test_header_without_unpickling():
+    """Prueba que la cabecera y los metadatos se lean sin deserializar el modelo."""
+    print_separator()
+    print("🔍 TEST 3: Cabecera legible sin deserializar")
+    print_separator()
+
+    path = os.path.join(WORK_DIR, "model.joblib")
+    header = read_artifact_metadata(path)
+    print(f"Tipo: {header['model_type']} | checksum: {header['checksum'][:20]}...")
+    assert (header['format'] == 'compact' and header['model_type'] == 'RandomForestClassifier'
+            and header['metadata'] == {'threshold': 0.5} and header['checksum'].startswith('sha256:'))
+
+
+def test_legacy_joblib():
+    """Prueba que los archivos joblib anteriores se sigan cargando."""
+    print_separator()
+    print("🔍 TEST 4: Compatibilidad con joblib")
+    print_separator()
+
+    path = os.path.join(WORK_DIR, "legacy.joblib")
+    joblib.dump(MODEL, path)
+    loaded = load_artifact(path)
+    print(f"Cabecera: {read_artifact_metadata(path)}")
+    assert (not is_compact_artifact(path) and read_artifact_metadata(path) == {'format': 'joblib'}
+            and np.array_equal(loaded.predict_proba(X), EXPECTED))
+
+
+def test_corrupted_artifact_rejected():
+    """Prueba que un byte alterado en el contenido haga fallar la verificación del checksum."""
+    print_separator()
+    print("🔍 TEST 5: Artefacto corrupto")
+    print_separator()
+
+    path = os.path.join(WORK_DIR, "corrupt.joblib")
+    save_artifact(MODEL, path, artifact_format='compact', compression='none')
+    with open(path, 'r+b') as f:
+        f.seek(-10, os.SEEK_END)
+        byte = f.read(1)
+        f.seek(-10, os.SEEK_END)
+        f.write(bytes([byte[0] ^ 0xFF]))
+    try:
+        load_artifact(path, verify=True)
+    except ValueError as e:
+        print(f"Error esperado: {e}")
+    else:
+        raise AssertionError("El artefacto corrupto se cargó sin error")
+
+
+def run_all_tests():
+    """Ejecuta todos los tests."""
+    print("\n" + "="*70)
+    print("🚀 INICIANDO PRUEBAS DE ARTEFACTOS")
+    print("="*70)
+
+    tests = [
+        ("Compacto sin compresión", test_compact_round_trip),
+        ("Compacto con compresión", test_compressed_round_trip),
+        ("Cabecera sin deserializar", test_header_without_unpickling),
+        ("Compatibilidad joblib", test_legacy_joblib),
+        ("Checksum inválido", test_corrupted_artifact_rejected)
+    ]
+
+    results = []
+    try:
+        for name, test_func in tests:
+            try:
+                test_func()
+                results.append((name, True))
+            except AssertionError:
+                print(f"\n❌ Comprobación fallida en test '{name}'")
+                results.append((name, False))
+            except Exception as e:
+                print(f"\n❌ Error en test '{name}': {str(e)}")
+                results.append((name, False))
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    # Resumen final
+    print_separator()
+    print("📊 RESUMEN DE PRUEBAS")
+    print_separator()
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+
+    for name, result in results:
+        status = "✅ PASÓ" if result else "❌ FALLÓ"
+        print(f"{status} - {name}")
+
+    print_separator()
+    print(f"Resultado: {passed}/{total} tests pasaron ({passed/total*100:.1f}%)")
+
+    if passed == total:
+        print("🎉 ¡TODOS LOS TESTS PASARON EXITOSAMENTE!")
+    else:
+        print(f"⚠️  {total - passed} test(s) fallaron")
+
+    print_separator()
+    return passed == total
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_all_tests() else 1)
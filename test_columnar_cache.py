@@ -0,0 +1,192 @@
+"""
+Script de prueba de la caché columnar.
+Verifica que load_data con caché devuelva el mismo DataFrame que el parseo del CSV,
+que la segunda carga se mapee desde la caché, que el DataFrame mapeado admita
+asignaciones sin modificar la caché en disco, que un cambio del origen la invalide y
+que un archivo con texto en una columna numérica se cargue con los mismos tipos que
+sin caché (el parseo sin tipos declarados no se cachea).
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from mlops_pipeline.src import config
+from mlops_pipeline.src.cargar_datos import DataLoader, WatermarkStore
+from mlops_pipeline.src.columnar_cache import ColumnarCache
+
+WORK_DIR = tempfile.mkdtemp(prefix="columnar_cache_")
+DATA_FILE = os.path.join(WORK_DIR, "transactions.csv")
+
+
+def print_separator():
+    print("\n" + "="*70)
+
+
+def write_rows(n_rows):
+    """Copia la cabecera y las primeras n_rows filas del dataset del proyecto."""
+    with open(config.DATA_PATH, 'rb') as f:
+        lines = f.read().splitlines(keepends=True)
+    with open(DATA_FILE, 'wb') as f:
+        f.writelines(lines[:n_rows + 1])
+
+
+def make_loader(use_cache=True):
+    loader = DataLoader(use_cache=use_cache)
+    loader.data_path = DATA_FILE
+    loader.cache = ColumnarCache(os.path.join(WORK_DIR, "cache"))
+    loader.watermarks = WatermarkStore(os.path.join(WORK_DIR, "watermarks.json"))
+    return loader
+
+
+def cache_entry(loader):
+    """DataFrame mapeado desde la caché (None si la entrada no es válida)."""
+    return loader.cache.load(DATA_FILE, loader.read_csv_kwargs(DATA_FILE))
+
+
+def is_mapped(values):
+    """Indica si un array está respaldado por un np.memmap."""
+    base = values
+    while base is not None:
+        if isinstance(base, np.memmap):
+            return True
+        base = base.base
+    return False
+
+
+def same_frame(actual, expected):
+    try:
+        pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected.reset_index(drop=True))
+        return True
+    except AssertionError as e:
+        print(f"❌ Diferencias: {str(e)[:300]}")
+        return False
+
+
+def test_cached_load_matches_csv():
+    """Prueba que la carga con caché coincida con el parseo y que la segunda sea un acierto."""
+    print_separator()
+    print("🔍 TEST 1: Carga con caché vs parseo del CSV")
+    print_separator()
+
+    write_rows(5000)
+    expected = make_loader(use_cache=False).load_data()
+    loader = make_loader()
+    first = loader.load_data()
+    hit = cache_entry(loader)
+    second = loader.load_data()
+    print(f"Filas: {len(second)} | acierto de caché: {hit is not None} | "
+          f"amount mapeada: {is_mapped(second['amount'].to_numpy())}")
+    assert (hit is not None and is_mapped(second['amount'].to_numpy())
+            and same_frame(first, expected) and same_frame(second, expected))
+
+
+def test_cached_frame_accepts_assignment():
+    """Prueba que el DataFrame mapeado admita asignaciones sin escribir en la caché."""
+    print_separator()
+    print("🔍 TEST 2: Asignación sobre el DataFrame mapeado")
+    print_separator()
+
+    loader = make_loader()
+    df = loader.load_data()
+    original = df.loc[0, 'amount']
+    df.loc[0, 'amount'] = 5.0
+    df['amount'] *= 2
+    reloaded = loader.load_data()
+    print(f"amount[0]: modificado {df.loc[0, 'amount']} | recargado {reloaded.loc[0, 'amount']} "
+          f"(original {original})")
+    assert df.loc[0, 'amount'] == 10.0 and reloaded.loc[0, 'amount'] == original
+
+
+def test_source_change_invalidates():
+    """Prueba que reescribir el origen (no solo crecer) invalide la entrada."""
+    print_separator()
+    print("🔍 TEST 3: Invalidación al cambiar el origen")
+    print_separator()
+
+    write_rows(3000)
+    loader = make_loader()
+    stale = cache_entry(loader)
+    df = loader.load_data()
+    expected = make_loader(use_cache=False).load_data()
+    print(f"Entrada previa válida: {stale is not None} | filas recargadas: {len(df)}")
+    assert stale is None and same_frame(df, expected)
+
+
+def test_untyped_parse_not_cached():
+    """Prueba que el texto en una columna numérica no convierta la columna en categórica."""
+    print_separator()
+    print("🔍 TEST 4: Texto en una columna numérica")
+    print_separator()
+
+    raw = pd.read_csv(DATA_FILE)
+    raw['amount'] = raw['amount'].astype(object)
+    raw.loc[5, 'amount'] = 'abc'
+    raw.to_csv(DATA_FILE, index=False)
+    expected = make_loader(use_cache=False).load_data()
+    loader = make_loader()
+    first, second = loader.load_data(), loader.load_data()
+    print(f"dtype de amount: sin caché {expected['amount'].dtype} | con caché {second['amount'].dtype} | "
+          f"entrada en caché: {cache_entry(loader) is not None}")
+    assert (cache_entry(loader) is None and expected['amount'].dtype == object
+            and same_frame(first, expected) and same_frame(second, expected))
+
+
+def run_all_tests():
+    """Ejecuta todos los tests (en orden: cada uno parte de la caché que deja el anterior)."""
+    print("\n" + "="*70)
+    print("🚀 INICIANDO PRUEBAS DE LA CACHÉ COLUMNAR")
+    print("="*70)
+    print(f"Directorio temporal: {WORK_DIR}")
+
+    tests = [
+        ("Carga con caché vs parseo", test_cached_load_matches_csv),
+        ("Asignación sobre el DataFrame mapeado", test_cached_frame_accepts_assignment),
+        ("Invalidación al cambiar el origen", test_source_change_invalidates),
+        ("Texto en una columna numérica", test_untyped_parse_not_cached)
+    ]
+
+    results = []
+    try:
+        for name, test_func in tests:
+            try:
+                test_func()
+                results.append((name, True))
+            except AssertionError:
+                print(f"\n❌ Comprobación fallida en test '{name}'")
+                results.append((name, False))
+            except Exception as e:
+                print(f"\n❌ Error en test '{name}': {str(e)}")
+                results.append((name, False))
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    # Resumen final
+    print_separator()
+    print("📊 RESUMEN DE PRUEBAS")
+    print_separator()
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+
+    for name, result in results:
+        status = "✅ PASÓ" if result else "❌ FALLÓ"
+        print(f"{status} - {name}")
+
+    print_separator()
+    print(f"Resultado: {passed}/{total} tests pasaron ({passed/total*100:.1f}%)")
+
+    if passed == total:
+        print("🎉 ¡TODOS LOS TESTS PASARON EXITOSAMENTE!")
+    else:
+        print(f"⚠️  {total - passed} test(s) fallaron")
+
+    print_separator()
+    return passed == total
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_all_tests() else 1)
@@ -0,0 +1,221 @@
+"""
+Script de prueba de la validación cruzada.
+Verifica los intervalos de confianza t-Student de CrossValidator, el criterio de
+selección por cota inferior, la reutilización y limpieza de la caché de folds, que
+XGBoost se evalúe con el mismo early stopping con el que se entrena y que, si solo se
+evalúa XGBoost, cada fold se remuestree una sola vez.
+"""
+
+import os
+import shutil
+import tempfile
+
+import joblib
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from scipy import stats
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from mlops_pipeline.src.cross_validation import FoldCache, CrossValidator, select_best_model
+
+WORK_DIR = tempfile.mkdtemp(prefix="cross_validation_")
+
+
+def print_separator():
+    print("\n" + "="*70)
+
+
+def make_data(n_rows=400, seed=0):
+    """Dataset sintético con una señal lineal y ~20% de positivos."""
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame({'a': rng.normal(size=n_rows), 'b': rng.normal(size=n_rows)})
+    y = pd.Series((X['a'] + rng.normal(scale=0.5, size=n_rows) > 0.85).astype(int))
+    return X, y
+
+
+class CountingResampler:
+    """Remuestreo identidad que cuenta sus llamadas."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, X, y):
+        self.calls += 1
+        return X, y
+
+
+def make_cache(max_entries=3, stopping_size=None, resampler=None):
+    return FoldCache(n_splits=3, preprocessor=StandardScaler(), resampler=resampler, random_state=42,
+                     cache_dir=os.path.join(WORK_DIR, "cache"), n_jobs=1, max_entries=max_entries,
+                     stopping_size=stopping_size)
+
+
+def test_confidence_interval():
+    """Prueba que el IC agregado coincida con el intervalo t-Student de los folds."""
+    print_separator()
+    print("🔍 TEST 1: Intervalo de confianza t-Student")
+    print_separator()
+
+    values = [0.80, 0.84, 0.90, 0.86]
+    folds = {i: {metric: v for metric in ('accuracy', 'precision', 'recall', 'f1_score', 'roc_auc')}
+             for i, v in enumerate(values)}
+    summary = CrossValidator(make_cache(), n_jobs=1, confidence_level=0.95)._aggregate(folds)
+
+    low, high = stats.t.interval(0.95, df=len(values) - 1, loc=np.mean(values), scale=stats.sem(values))
+    print(f"IC calculado: [{summary['roc_auc_ci_low']:.4f}, {summary['roc_auc_ci_high']:.4f}] | "
+          f"esperado: [{low:.4f}, {high:.4f}]")
+    assert np.isclose(summary['roc_auc_ci_low'], low) and np.isclose(summary['roc_auc_ci_high'], high)
+
+
+def test_lower_ci_selection():
+    """Prueba que el criterio lower_ci penalice al modelo con más varianza entre folds."""
+    print_separator()
+    print("🔍 TEST 2: Selección por cota inferior del IC")
+    print_separator()
+
+    cv_results = {
+        'estable': {'roc_auc_mean': 0.85, 'roc_auc_ci_low': 0.83},
+        'variable': {'roc_auc_mean': 0.87, 'roc_auc_ci_low': 0.75}
+    }
+    by_mean = select_best_model(cv_results, criterion='mean')
+    by_lower = select_best_model(cv_results, criterion='lower_ci')
+    print(f"Media: {by_mean} | Cota inferior: {by_lower}")
+    assert by_mean == 'variable' and by_lower == 'estable'
+
+
+def test_evaluate_uses_cached_folds():
+    """Prueba la CV de extremo a extremo y que una segunda llamada reutilice los folds."""
+    print_separator()
+    print("🔍 TEST 3: Evaluación y reutilización de folds")
+    print_separator()
+
+    X, y = make_data()
+    cache = make_cache()
+    results = CrossValidator(cache, n_jobs=1).evaluate({'LogisticRegression': LogisticRegression()}, X, y)
+    summary = results['LogisticRegression']
+    print(f"ROC-AUC: {summary['roc_auc_mean']:.4f} "
+          f"[{summary['roc_auc_ci_low']:.4f}, {summary['roc_auc_ci_high']:.4f}]")
+
+    paths = cache.get_folds(X, y)
+    mtimes = [os.path.getmtime(p) for p in paths]
+    reused = cache.get_folds(X, y)
+    assert (len(summary['folds']) == 3 and summary['roc_auc_ci_low'] <= summary['roc_auc_mean']
+            and summary['roc_auc_mean'] > 0.8 and reused == paths
+            and mtimes == [os.path.getmtime(p) for p in reused])
+
+
+def test_cache_eviction():
+    """Prueba que la caché conserve solo los juegos de folds usados más recientemente."""
+    print_separator()
+    print("🔍 TEST 4: Límite de entradas de la caché de folds")
+    print_separator()
+
+    cache_dir = os.path.join(WORK_DIR, "cache")
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    cache = make_cache(max_entries=2)
+    dirs = [os.path.dirname(cache.get_folds(*make_data(seed=seed))[0]) for seed in range(3)]
+    remaining = sorted(os.path.join(cache_dir, name) for name in os.listdir(cache_dir))
+    print(f"Entradas en caché: {len(remaining)}")
+    assert remaining == sorted(dirs[1:])
+
+
+def test_xgb_early_stopping_folds():
+    """Prueba que los folds reserven la validación del early stopping y que XGBoost la use."""
+    print_separator()
+    print("🔍 TEST 5: Early stopping de XGBoost en la CV")
+    print_separator()
+
+    X, y = make_data(n_rows=1000)
+    cache = make_cache(stopping_size=0.2)
+    fold = joblib.load(cache.get_folds(X, y)[0])
+    n_train = len(fold['y_train'])
+    print(f"Train del fold: {n_train} | ajuste: {len(fold['y_fit'])} | early stopping: {len(fold['y_stop'])}")
+
+    model = xgb.XGBClassifier(n_estimators=300, max_depth=2, learning_rate=0.3, random_state=0)
+    summary = CrossValidator(cache, n_jobs=1).evaluate({'XGBoost': model}, X, y)['XGBoost']
+    print(f"ROC-AUC: {summary['roc_auc_mean']:.4f}")
+    assert (len(fold['y_fit']) + len(fold['y_stop']) == n_train
+            and len(fold['y_stop']) == int(np.ceil(0.2 * n_train))
+            and np.isclose(fold['y_stop'].mean(), fold['y_train'].mean(), atol=0.01)
+            and cache._cache_key(X, y) != make_cache(stopping_size=0.1)._cache_key(X, y)
+            and summary['roc_auc_mean'] > 0.8)
+
+
+def test_xgb_only_single_resample():
+    """Prueba que sin modelos sin early stopping no se genere el train completo remuestreado."""
+    print_separator()
+    print("🔍 TEST 6: Un remuestreo por fold con solo XGBoost")
+    print_separator()
+
+    X, y = make_data(n_rows=1000)
+    resampler = CountingResampler()
+    cache = make_cache(stopping_size=0.2, resampler=resampler)
+    model = xgb.XGBClassifier(n_estimators=50, max_depth=2, random_state=0)
+    CrossValidator(cache, n_jobs=1).evaluate({'XGBoost': model}, X, y)
+    xgb_only = resampler.calls
+    paths = cache.get_folds(X, y, full_train=False)
+    fold = joblib.load(paths[0])
+    leftovers = [name for name in os.listdir(os.path.dirname(paths[0])) if name.endswith('.tmp')]
+    print(f"Remuestreos: {xgb_only} | claves del fold: {sorted(fold)} | temporales: {leftovers}")
+    assert xgb_only == 3 and 'X_train' not in fold and 'X_fit' in fold and not leftovers
+    assert cache._cache_key(X, y, full_train=False) != cache._cache_key(X, y)
+
+
+def run_all_tests():
+    """Ejecuta todos los tests."""
+    print("\n" + "="*70)
+    print("🚀 INICIANDO PRUEBAS DE VALIDACIÓN CRUZADA")
+    print("="*70)
+
+    tests = [
+        ("Intervalo de confianza", test_confidence_interval),
+        ("Selección por cota inferior", test_lower_ci_selection),
+        ("Evaluación con folds cacheados", test_evaluate_uses_cached_folds),
+        ("Límite de la caché de folds", test_cache_eviction),
+        ("Early stopping de XGBoost", test_xgb_early_stopping_folds),
+        ("Un remuestreo por fold con solo XGBoost", test_xgb_only_single_resample)
+    ]
+
+    results = []
+    try:
+        for name, test_func in tests:
+            try:
+                test_func()
+                results.append((name, True))
+            except AssertionError:
+                print(f"\n❌ Comprobación fallida en test '{name}'")
+                results.append((name, False))
+            except Exception as e:
+                print(f"\n❌ Error en test '{name}': {str(e)}")
+                results.append((name, False))
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    # Resumen final
+    print_separator()
+    print("📊 RESUMEN DE PRUEBAS")
+    print_separator()
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+
+    for name, result in results:
+        status = "✅ PASÓ" if result else "❌ FALLÓ"
+        print(f"{status} - {name}")
+
+    print_separator()
+    print(f"Resultado: {passed}/{total} tests pasaron ({passed/total*100:.1f}%)")
+
+    if passed == total:
+        print("🎉 ¡TODOS LOS TESTS PASARON EXITOSAMENTE!")
+    else:
+        print(f"⚠️  {total - passed} test(s) fallaron")
+
+    print_separator()
+    return passed == total
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_all_tests() else 1)
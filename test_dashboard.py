@@ -6,7 +6,6 @@ import sys
 from pathlib import Path
 import pandas as pd
 import numpy as np
-import joblib
 
 project_root = Path.cwd()
 sys.path.insert(0, str(project_root))
@@ -55,8 +54,9 @@ print('🤖 3. Probando carga del modelo...')
 modelo = None
 preprocessor = None
 try:
-    modelo = joblib.load('best_model.joblib')
-    preprocessor = joblib.load('preprocessor.joblib')
+    from mlops_pipeline.src.artifacts import load_artifact
+    modelo = load_artifact('best_model.joblib')
+    preprocessor = load_artifact('preprocessor.joblib')
     print(f'   ✅ Modelo cargado: {type(modelo).__name__}')
     print(f'   ✅ Preprocessor cargado')
 except Exception as e:
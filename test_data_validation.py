@@ -0,0 +1,359 @@
+"""
+Script de prueba de la validación de datos.
+Verifica que la validación por bloques en streaming (en serie y en procesos) dé el
+mismo informe que validation_report sobre el DataFrame completo, con y sin
+violaciones, que el tamaño de bloque no cambie el resultado, y el modo cuarentena:
+CSV de filas rechazadas con sus motivos, conversión de texto numérico en las filas
+limpias, puerta de tasa máxima de rechazo y modo estricto, también con una columna
+numérica que llega como categórica. El streaming debe coincidir también con un nulo en
+una columna entera y texto en una columna numérica, y un valor numérico mal formado
+cargado a través de la caché debe ir a cuarentena sin abortar la ejecución.
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from mlops_pipeline.src import config
+from mlops_pipeline.src.cargar_datos import DataLoader, _full_watermark
+from mlops_pipeline.src.columnar_cache import ColumnarCache
+from mlops_pipeline.src.data_validation import DataValidator
+
+WORK_DIR = tempfile.mkdtemp(prefix="data_validation_")
+DIRTY_FILE = os.path.join(WORK_DIR, "dirty.csv")
+INVALID_FILE = os.path.join(WORK_DIR, "invalid.csv")
+QUARANTINE_DIR = os.path.join(WORK_DIR, "quarantine")
+# Violaciones inyectadas: fila -> (columna, valor)
+VIOLATIONS = {
+    3: ('amount', -5), 4500: ('amount', -5), 9999: ('amount', -5),
+    7: ('customer_age', 150), 6000: ('customer_age', 150),
+    2222: ('is_fraud', 2),
+    8123: ('merchant_category', np.nan)
+}
+
+
+def print_separator():
+    print("\n" + "="*70)
+
+
+def write_dirty_file():
+    """Copia el dataset del proyecto con las violaciones de VIOLATIONS."""
+    raw = pd.read_csv(config.DATA_PATH)
+    for row, (col, value) in VIOLATIONS.items():
+        raw.loc[row, col] = value
+    raw.to_csv(DIRTY_FILE, index=False)
+
+
+def write_invalid_file(values):
+    """Copia el dataset del proyecto con los valores de values (fila -> (columna, valor))."""
+    raw = pd.read_csv(config.DATA_PATH).astype({'amount': object})
+    for row, (col, value) in values.items():
+        raw.loc[row, col] = value
+    raw.to_csv(INVALID_FILE, index=False)
+
+
+def make_loader(path, use_cache=False):
+    loader = DataLoader(use_cache=use_cache)
+    loader.data_path = path
+    loader.cache = ColumnarCache(os.path.join(WORK_DIR, "cache"))
+    return loader
+
+
+def compare(reports):
+    """Indica si todos los informes coinciden con el primero (veredicto, reglas y columnas)."""
+    reference = reports[0]
+    ok = True
+    for report in reports[1:]:
+        for key in ('passed', 'n_rows', 'columns'):
+            if report[key] != reference[key]:
+                print(f"❌ Diferencia en '{key}'")
+                ok = False
+        for name, rule in reference['rules'].items():
+            if report['rules'].get(name) != rule:
+                print(f"❌ Diferencia en la regla '{name}': {report['rules'].get(name)} vs {rule}")
+                ok = False
+    return ok
+
+
+def compare_close(reports):
+    """Como compare, pero tolera los mensajes de tipo y la precisión de min/max.
+
+    El streaming lee los bloques válidos con los tipos declarados (float32, int16) y la
+    carga completa infiere float64/int64 cuando el archivo no encaja en ellos.
+    """
+    reference = reports[0]
+    ok = True
+    for report in reports[1:]:
+        if (report['passed'], report['n_rows']) != (reference['passed'], reference['n_rows']):
+            print("❌ Diferencia en el veredicto o el número de filas")
+            ok = False
+        for name, rule in reference['rules'].items():
+            other = report['rules'].get(name, {})
+            if any(other.get(key) != rule[key] for key in ('passed', 'violations', 'sample_rows')):
+                print(f"❌ Diferencia en la regla '{name}': {other} vs {rule}")
+                ok = False
+        for col, stats in reference['columns'].items():
+            other = report['columns'][col]
+            close = all(other[key] == stats[key] if stats[key] is None or other[key] is None
+                        else np.isclose(other[key], stats[key], rtol=1e-6) for key in ('min', 'max'))
+            if (other['nulls'], other['categories']) != (stats['nulls'], stats['categories']) or not close:
+                print(f"❌ Diferencia en la columna '{col}': {other} vs {stats}")
+                ok = False
+    return ok
+
+
+def test_clean_stream_matches_full():
+    """Prueba que el streaming del dataset del proyecto dé el mismo informe que la pasada completa."""
+    print_separator()
+    print("🔍 TEST 1: Streaming vs DataFrame completo (datos limpios)")
+    print_separator()
+
+    loader = make_loader(config.DATA_PATH)
+    validator = DataValidator()
+    full = validator.validation_report(loader.load_data())
+    stream = validator.validate_stream(loader.iter_batches(batch_size=1000), n_jobs=1)
+    print(f"Filas: {stream['n_rows']:,} | completo: {full['passed']} | streaming: {stream['passed']}")
+    assert full['passed'] and compare([full, stream])
+
+
+def test_dirty_stream_matches_full():
+    """Prueba que el streaming en serie y en procesos detecte las mismas violaciones y filas."""
+    print_separator()
+    print("🔍 TEST 2: Streaming vs DataFrame completo (violaciones inyectadas)")
+    print_separator()
+
+    write_dirty_file()
+    loader = make_loader(DIRTY_FILE)
+    validator = DataValidator()
+    full = validator.validation_report(loader.load_data())
+    serial = validator.validate_stream(loader.iter_batches(batch_size=1000), n_jobs=1)
+    parallel = validator.validate_stream(loader.iter_batches(batch_size=1000), n_jobs=2)
+
+    failed = {name: rule['sample_rows'] for name, rule in full['rules'].items() if not rule['passed']}
+    for name, rows in failed.items():
+        print(f"  {name:<36} filas: {rows}")
+    assert (not full['passed'] and compare([full, serial, parallel])
+            and failed['amount_non_negative'] == [3, 4500, 9999]
+            and failed['customer_age_range'] == [7, 6000]
+            and failed['is_fraud_binary'] == [2222]
+            and failed['nulls:merchant_category'] == [8123])
+
+
+def test_block_size_invariant():
+    """Prueba que el tamaño de bloque de la pasada vectorizada no cambie el informe."""
+    print_separator()
+    print("🔍 TEST 3: Tamaño de bloque")
+    print_separator()
+
+    df = make_loader(DIRTY_FILE).load_data()
+    reports = [DataValidator(block_rows=block_rows).validation_report(df) for block_rows in (None, 777, 1)]
+    print(f"Violaciones de amount por tamaño de bloque: "
+          f"{[report['rules']['amount_non_negative']['violations'] for report in reports]}")
+    assert compare(reports)
+
+
+def test_quarantine_csv():
+    """Prueba que la cuarentena aparte solo las filas inválidas y escriba sus motivos."""
+    print_separator()
+    print("🔍 TEST 4: CSV de cuarentena")
+    print_separator()
+
+    df = make_loader(DIRTY_FILE).load_data()
+    clean, report = DataValidator().quarantine(df, max_reject_rate=0.01, output_dir=QUARANTINE_DIR)
+    rejected = pd.read_csv(report['quarantine_path'], index_col='row')
+    reasons = rejected['rejection_reasons'].to_dict()
+    print(f"Filas limpias: {len(clean):,} | rechazadas: {report['rejected_rows']} | motivos: {reasons}")
+    assert (report['passed'] and report['rejected_rows'] == len(VIOLATIONS)
+            and len(clean) == len(df) - len(VIOLATIONS)
+            and not clean.index.isin(list(VIOLATIONS)).any()
+            and reasons == {3: 'amount_non_negative', 7: 'customer_age_range',
+                            2222: 'is_fraud_binary', 4500: 'amount_non_negative',
+                            6000: 'customer_age_range', 8123: 'nulls:merchant_category',
+                            9999: 'amount_non_negative'}
+            and DataValidator().validation_report(clean)['passed'])
+
+
+def test_numeric_text_coerced():
+    """Prueba que el texto no numérico se aparte y el resto de la columna se convierta a número."""
+    print_separator()
+    print("🔍 TEST 5: Texto en columnas numéricas")
+    print_separator()
+
+    df = make_loader(config.DATA_PATH).load_data().head(1000)
+    df = df.astype({'amount': object})
+    df.loc[5, 'amount'] = 'abc'
+    df.loc[6, 'amount'] = '12.5'
+    clean, report = DataValidator().quarantine(df, output_dir=QUARANTINE_DIR)
+    rejected = pd.read_csv(report['quarantine_path'], index_col='row')
+    print(f"Rechazadas: {list(rejected.index)} | dtype de amount: {clean['amount'].dtype} | "
+          f"fila 6: {clean.loc[6, 'amount']}")
+    # El texto no convertible cuenta además como nulo de la columna
+    assert (list(rejected.index) == [5] and 'type:amount' in rejected.loc[5, 'rejection_reasons'].split(';')
+            and pd.api.types.is_float_dtype(clean['amount']) and clean.loc[6, 'amount'] == 12.5)
+
+
+def test_reject_rate_gate():
+    """Prueba que la tasa de rechazo por encima del máximo, o un esquema incompleto, aborten."""
+    print_separator()
+    print("🔍 TEST 6: Puerta de tasa máxima de rechazo")
+    print_separator()
+
+    df = make_loader(DIRTY_FILE).load_data()
+    validator = DataValidator(max_reject_rate=0.0)
+    _, strict_rate = validator.quarantine(df, output_dir=QUARANTINE_DIR)
+    _, default_rate = DataValidator(max_reject_rate=0.01).quarantine(df, output_dir=QUARANTINE_DIR)
+    _, no_schema = DataValidator().quarantine(df.drop(columns=['amount']), output_dir=QUARANTINE_DIR)
+    print(f"Máximo 0%: {strict_rate['passed']} | máximo 1%: {default_rate['passed']} | "
+          f"sin 'amount': {no_schema['passed']}")
+    assert not strict_rate['passed'] and default_rate['passed'] and not no_schema['passed']
+
+
+def test_strict_mode():
+    """Prueba que el modo estricto rechace el lote completo y el modo cuarentena solo las filas."""
+    print_separator()
+    print("🔍 TEST 7: Modo estricto vs cuarentena")
+    print_separator()
+
+    df = make_loader(DIRTY_FILE).load_data()
+    original = config.QUARANTINE_DIR
+    config.QUARANTINE_DIR = QUARANTINE_DIR  # validate_and_clean escribe en el directorio de config
+    try:
+        strict_df, strict_ok = DataValidator(mode='strict').validate_and_clean(df)
+        clean_df, clean_ok = DataValidator(mode='quarantine').validate_and_clean(df)
+    finally:
+        config.QUARANTINE_DIR = original
+    print(f"Estricto: {strict_ok} ({len(strict_df):,} filas) | cuarentena: {clean_ok} ({len(clean_df):,} filas)")
+    assert (not strict_ok and strict_df is df
+            and clean_ok and len(clean_df) == len(df) - len(VIOLATIONS))
+
+
+def test_categorical_numeric_column():
+    """Prueba que una columna numérica categórica se valide convirtiendo sus valores a número."""
+    print_separator()
+    print("🔍 TEST 8: Columna numérica categórica")
+    print_separator()
+
+    # Entrada de caché con 'amount' categórica (como las escritas antes de cachear solo
+    # DataFrames tipados): load_data la devuelve tal cual
+    loader = make_loader(DIRTY_FILE, use_cache=True)
+    df = make_loader(DIRTY_FILE).load_data()
+    df['amount'] = df['amount'].astype(str).astype('category').cat.rename_categories({'-5.0': 'abc'})
+    kwargs = loader.read_csv_kwargs(DIRTY_FILE)
+    loader.cache.store(df, DIRTY_FILE, kwargs, watermark=_full_watermark(DIRTY_FILE, len(df)))
+    df = loader.load_data()
+
+    report = DataValidator().validation_report(df)
+    strict_ok = DataValidator().validate_data(df)
+    clean, quarantined = DataValidator().quarantine(df, output_dir=QUARANTINE_DIR)
+    amount = report['rules']['type:amount']
+    print(f"dtype: {df['amount'].dtype} | type:amount: {amount['violations']} filas {amount['sample_rows']} | "
+          f"rechazadas: {quarantined['rejected_rows']}")
+    assert isinstance(df['amount'].dtype, pd.CategoricalDtype)
+    assert not strict_ok and amount['sample_rows'] == [3, 4500, 9999]
+    assert report['columns']['amount']['categories'] is None and report['columns']['amount']['min'] >= 0
+    assert quarantined['passed'] and quarantined['rejected_rows'] == len(VIOLATIONS)
+    assert pd.api.types.is_float_dtype(clean['amount'])
+
+
+def test_invalid_values_stream_matches_full():
+    """Prueba el streaming con un nulo en una columna entera y texto en una numérica."""
+    print_separator()
+    print("🔍 TEST 9: Streaming vs DataFrame completo (nulos y texto no numérico)")
+    print_separator()
+
+    write_invalid_file({2500: ('amount', 'abc'), 7000: ('customer_age', np.nan)})
+    loader = make_loader(INVALID_FILE)
+    validator = DataValidator()
+    full = validator.validation_report(loader.load_data())
+    serial = validator.validate_stream(loader.iter_batches(batch_size=1000), n_jobs=1)
+    parallel = validator.validate_stream(loader.iter_batches(batch_size=1000), n_jobs=2)
+
+    failed = {name: rule['sample_rows'] for name, rule in full['rules'].items() if not rule['passed']}
+    print(f"Reglas incumplidas: {failed}")
+    assert compare_close([full, serial, parallel])
+    assert failed == {'type:amount': [2500], 'nulls:amount': [2500], 'nulls:customer_age': [7000]}
+
+
+def test_malformed_value_cached_quarantine():
+    """Prueba que un número mal formado cargado con caché vaya a cuarentena sin abortar."""
+    print_separator()
+    print("🔍 TEST 10: Número mal formado con caché en modo cuarentena")
+    print_separator()
+
+    write_invalid_file({2500: ('amount', '12,5')})
+    loader = make_loader(INVALID_FILE, use_cache=True)
+    original = config.QUARANTINE_DIR
+    config.QUARANTINE_DIR = QUARANTINE_DIR  # validate_and_clean escribe en el directorio de config
+    try:
+        runs = [DataValidator(mode='quarantine').validate_and_clean(loader.load_data()) for _ in range(2)]
+    finally:
+        config.QUARANTINE_DIR = original
+    for clean, ok in runs:
+        print(f"Válido: {ok} | filas limpias: {len(clean):,} | dtype de amount: {clean['amount'].dtype}")
+        assert ok and len(clean) == 9999 and 2500 not in clean.index
+        assert pd.api.types.is_float_dtype(clean['amount'])
+
+
+def run_all_tests():
+    """Ejecuta todos los tests (en orden: el test 2 genera el archivo con violaciones)."""
+    print("\n" + "="*70)
+    print("🚀 INICIANDO PRUEBAS DE VALIDACIÓN DE DATOS")
+    print("="*70)
+
+    tests = [
+        ("Streaming con datos limpios", test_clean_stream_matches_full),
+        ("Streaming con violaciones", test_dirty_stream_matches_full),
+        ("Tamaño de bloque", test_block_size_invariant),
+        ("CSV de cuarentena", test_quarantine_csv),
+        ("Texto en columnas numéricas", test_numeric_text_coerced),
+        ("Puerta de tasa de rechazo", test_reject_rate_gate),
+        ("Modo estricto", test_strict_mode),
+        ("Columna numérica categórica", test_categorical_numeric_column),
+        ("Streaming con nulos y texto no numérico", test_invalid_values_stream_matches_full),
+        ("Número mal formado con caché", test_malformed_value_cached_quarantine)
+    ]
+
+    results = []
+    try:
+        for name, test_func in tests:
+            try:
+                test_func()
+                results.append((name, True))
+            except AssertionError:
+                print(f"\n❌ Comprobación fallida en test '{name}'")
+                results.append((name, False))
+            except Exception as e:
+                print(f"\n❌ Error en test '{name}': {str(e)}")
+                results.append((name, False))
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    # Resumen final
+    print_separator()
+    print("📊 RESUMEN DE PRUEBAS")
+    print_separator()
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+
+    for name, result in results:
+        status = "✅ PASÓ" if result else "❌ FALLÓ"
+        print(f"{status} - {name}")
+
+    print_separator()
+    print(f"Resultado: {passed}/{total} tests pasaron ({passed/total*100:.1f}%)")
+
+    if passed == total:
+        print("🎉 ¡TODOS LOS TESTS PASARON EXITOSAMENTE!")
+    else:
+        print(f"⚠️  {total - passed} test(s) fallaron")
+
+    print_separator()
+    return passed == total
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_all_tests() else 1)
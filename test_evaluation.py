@@ -0,0 +1,138 @@
+"""
+Script de prueba del motor de evaluación.
+Verifica que evaluate_scores coincida con scikit-learn (métricas en el umbral, AUC,
+average precision y curvas), también con scores empatados, y que los intervalos
+bootstrap contengan la estimación puntual.
+"""
+
+import numpy as np
+from sklearn.metrics import (accuracy_score, precision_score, recall_score, f1_score, roc_auc_score,
+                             average_precision_score, confusion_matrix, roc_curve, precision_recall_curve)
+
+from mlops_pipeline.src.evaluation import evaluate_scores
+
+RNG = np.random.default_rng(0)
+Y_TRUE = (RNG.random(5000) < 0.1).astype(int)
+# Scores redondeados a 2 decimales: muchos empates, como en modelos de árboles
+Y_SCORE = np.round(np.clip(0.3 * Y_TRUE + RNG.random(5000) * 0.7, 0, 1), 2)
+
+
+def print_separator():
+    print("\n" + "="*70)
+
+
+def test_threshold_metrics_match_sklearn():
+    """Prueba las métricas en el umbral y la matriz de confusión."""
+    print_separator()
+    print("🔍 TEST 1: Métricas en el umbral vs scikit-learn")
+    print_separator()
+
+    result = evaluate_scores(Y_TRUE, Y_SCORE, threshold=0.5, n_bootstrap=0)
+    y_pred = (Y_SCORE >= 0.5).astype(int)
+    expected = {
+        'accuracy': accuracy_score(Y_TRUE, y_pred),
+        'precision': precision_score(Y_TRUE, y_pred),
+        'recall': recall_score(Y_TRUE, y_pred),
+        'f1_score': f1_score(Y_TRUE, y_pred)
+    }
+    for metric, value in expected.items():
+        print(f"  {metric:<10} {result[metric]:.6f} | sklearn {value:.6f}")
+    assert (all(np.isclose(result[m], v) for m, v in expected.items())
+            and np.array_equal(result['confusion_matrix'], confusion_matrix(Y_TRUE, y_pred)))
+
+
+def test_ranking_metrics_match_sklearn():
+    """Prueba ROC-AUC y average precision con empates."""
+    print_separator()
+    print("🔍 TEST 2: ROC-AUC y average precision vs scikit-learn")
+    print_separator()
+
+    result = evaluate_scores(Y_TRUE, Y_SCORE, n_bootstrap=0)
+    auc, ap = roc_auc_score(Y_TRUE, Y_SCORE), average_precision_score(Y_TRUE, Y_SCORE)
+    print(f"ROC-AUC {result['roc_auc']:.6f} | sklearn {auc:.6f}")
+    print(f"AP      {result['average_precision']:.6f} | sklearn {ap:.6f}")
+    assert np.isclose(result['roc_auc'], auc) and np.isclose(result['average_precision'], ap)
+
+
+def test_curves_match_sklearn():
+    """Prueba que las curvas ROC y Precision-Recall tengan los mismos puntos."""
+    print_separator()
+    print("🔍 TEST 3: Curvas ROC y Precision-Recall vs scikit-learn")
+    print_separator()
+
+    result = evaluate_scores(Y_TRUE, Y_SCORE, n_bootstrap=0)
+    fpr, tpr, _ = roc_curve(Y_TRUE, Y_SCORE)
+    precision, recall, _ = precision_recall_curve(Y_TRUE, Y_SCORE)
+    roc, pr = result['roc_curve'], result['pr_curve']
+    print(f"Puntos ROC: {len(roc['fpr'])} | sklearn {len(fpr)}")
+    print(f"Puntos PR:  {len(pr['precision'])} | sklearn {len(precision)}")
+    assert (np.allclose(roc['fpr'], fpr) and np.allclose(roc['tpr'], tpr)
+            and np.allclose(pr['precision'], precision) and np.allclose(pr['recall'], recall))
+
+
+def test_bootstrap_intervals():
+    """Prueba que cada intervalo bootstrap esté ordenado y contenga la estimación."""
+    print_separator()
+    print("🔍 TEST 4: Intervalos bootstrap")
+    print_separator()
+
+    result = evaluate_scores(Y_TRUE, Y_SCORE, threshold=0.5, n_bootstrap=500, random_state=0)
+    ok = True
+    for metric, (low, high) in result['ci'].items():
+        print(f"  {metric:<18} {result[metric]:.4f} [{low:.4f}, {high:.4f}]")
+        ok = ok and low <= result[metric] <= high and low < high
+    again = evaluate_scores(Y_TRUE, Y_SCORE, threshold=0.5, n_bootstrap=500, random_state=0)
+    assert ok and again['ci'] == result['ci']
+
+
+def run_all_tests():
+    """Ejecuta todos los tests."""
+    print("\n" + "="*70)
+    print("🚀 INICIANDO PRUEBAS DEL MOTOR DE EVALUACIÓN")
+    print("="*70)
+
+    tests = [
+        ("Métricas en el umbral", test_threshold_metrics_match_sklearn),
+        ("ROC-AUC y average precision", test_ranking_metrics_match_sklearn),
+        ("Curvas", test_curves_match_sklearn),
+        ("Intervalos bootstrap", test_bootstrap_intervals)
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            test_func()
+            results.append((name, True))
+        except AssertionError:
+            print(f"\n❌ Comprobación fallida en test '{name}'")
+            results.append((name, False))
+        except Exception as e:
+            print(f"\n❌ Error en test '{name}': {str(e)}")
+            results.append((name, False))
+
+    # Resumen final
+    print_separator()
+    print("📊 RESUMEN DE PRUEBAS")
+    print_separator()
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+
+    for name, result in results:
+        status = "✅ PASÓ" if result else "❌ FALLÓ"
+        print(f"{status} - {name}")
+
+    print_separator()
+    print(f"Resultado: {passed}/{total} tests pasaron ({passed/total*100:.1f}%)")
+
+    if passed == total:
+        print("🎉 ¡TODOS LOS TESTS PASARON EXITOSAMENTE!")
+    else:
+        print(f"⚠️  {total - passed} test(s) fallaron")
+
+    print_separator()
+    return passed == total
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_all_tests() else 1)
@@ -0,0 +1,131 @@
+"""
+Script de prueba de las estrategias de desbalanceo.
+Verifica que los vecinos de ScalableSMOTE excluyan a la propia fila (también con
+puntos duplicados), que las filas fuera de la muestra de referencia conserven sus k
+vecinos más cercanos y que el remuestreo equilibre las clases.
+"""
+
+import numpy as np
+from sklearn.neighbors import NearestNeighbors
+
+from mlops_pipeline.src.imbalance import ScalableSMOTEStrategy
+
+RNG = np.random.default_rng(0)
+X_MIN = RNG.normal(size=(500, 4))
+X_MIN[11] = X_MIN[10]  # Punto duplicado: su vecino a distancia 0 puede salir antes que él mismo
+K = 5
+
+
+def print_separator():
+    print("\n" + "="*70)
+
+
+def make_strategy(max_reference_size=10_000):
+    return ScalableSMOTEStrategy(random_state=0, k_neighbors=K, batch_size=64,
+                                 max_reference_size=max_reference_size)
+
+
+def exact_neighbors(X_query, X_reference, exclude=None):
+    """k vecinos más cercanos por fuerza bruta, excluyendo opcionalmente un índice por fila."""
+    _, found = NearestNeighbors(n_neighbors=K + 1).fit(X_reference).kneighbors(X_query)
+    if exclude is None:
+        return found[:, :K]
+    return np.array([[j for j in row if j != own][:K] for row, own in zip(found, exclude)])
+
+
+def test_neighbors_exclude_self():
+    """Prueba que ninguna fila sea su propio vecino y que los vecinos coincidan con la búsqueda exacta."""
+    print_separator()
+    print("🔍 TEST 1: Vecinos sin la propia fila")
+    print_separator()
+
+    neighbors = make_strategy()._neighbors(X_MIN, np.random.default_rng(0))
+    expected = exact_neighbors(X_MIN, X_MIN, exclude=np.arange(len(X_MIN)))
+    print(f"Vecinos de las filas duplicadas: 10 → {neighbors[10]} | 11 → {neighbors[11]}")
+    assert not (neighbors == np.arange(len(X_MIN))[:, None]).any()
+    assert neighbors[10, 0] == 11 and neighbors[11, 0] == 10
+    assert np.array_equal(np.sort(neighbors, axis=1), np.sort(expected, axis=1))
+
+
+def test_sampled_reference():
+    """Prueba que con referencia muestreada las filas fuera de ella conserven sus k vecinos."""
+    print_separator()
+    print("🔍 TEST 2: Referencia muestreada")
+    print_separator()
+
+    rng = np.random.default_rng(0)
+    neighbors = make_strategy(max_reference_size=200)._neighbors(X_MIN, rng)
+    # Misma muestra que _neighbors: primera extracción con la misma semilla
+    reference = np.sort(np.random.default_rng(0).choice(len(X_MIN), size=200, replace=False))
+    outside = np.setdiff1d(np.arange(len(X_MIN)), reference)
+    expected = reference[exact_neighbors(X_MIN[outside], X_MIN[reference])]
+    print(f"Filas fuera de la referencia: {len(outside)} | vecinos de la fila {outside[0]}: {neighbors[outside[0]]}")
+    assert not (neighbors == np.arange(len(X_MIN))[:, None]).any()
+    assert np.array_equal(np.sort(neighbors[outside], axis=1), np.sort(expected, axis=1))
+
+
+def test_resample_balances_classes():
+    """Prueba que fit_resample genere tantas muestras minoritarias como mayoritarias."""
+    print_separator()
+    print("🔍 TEST 3: Clases equilibradas")
+    print_separator()
+
+    X = np.vstack([X_MIN[:100], RNG.normal(loc=3.0, size=(900, 4))]).astype(np.float32)
+    y = np.array([1] * 100 + [0] * 900)
+    X_res, y_res = make_strategy().fit_resample(X, y)
+    counts = np.bincount(y_res)
+    print(f"Filas: {len(y)} → {len(y_res)} | por clase: {counts} | dtype: {X_res.dtype}")
+    assert counts[0] == counts[1] == 900 and X_res.dtype == np.float32
+    assert np.array_equal(X_res[:len(X)], X)
+
+
+def run_all_tests():
+    """Ejecuta todos los tests."""
+    print("\n" + "="*70)
+    print("🚀 INICIANDO PRUEBAS DE DESBALANCEO")
+    print("="*70)
+
+    tests = [
+        ("Vecinos sin la propia fila", test_neighbors_exclude_self),
+        ("Referencia muestreada", test_sampled_reference),
+        ("Clases equilibradas", test_resample_balances_classes)
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            test_func()
+            results.append((name, True))
+        except AssertionError:
+            print(f"\n❌ Comprobación fallida en test '{name}'")
+            results.append((name, False))
+        except Exception as e:
+            print(f"\n❌ Error en test '{name}': {str(e)}")
+            results.append((name, False))
+
+    # Resumen final
+    print_separator()
+    print("📊 RESUMEN DE PRUEBAS")
+    print_separator()
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+
+    for name, result in results:
+        status = "✅ PASÓ" if result else "❌ FALLÓ"
+        print(f"{status} - {name}")
+
+    print_separator()
+    print(f"Resultado: {passed}/{total} tests pasaron ({passed/total*100:.1f}%)")
+
+    if passed == total:
+        print("🎉 ¡TODOS LOS TESTS PASARON EXITOSAMENTE!")
+    else:
+        print(f"⚠️  {total - passed} test(s) fallaron")
+
+    print_separator()
+    return passed == total
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_all_tests() else 1)
@@ -0,0 +1,242 @@
+"""
+Script de prueba de la ingesta incremental.
+Verifica que DataLoader.load_new lea solo las transacciones añadidas, que la caché
+columnar extendida en el sitio coincida con una recarga completa del archivo y que
+iter_batches acepte, como load_data, un archivo con valores que no encajan en los
+tipos declarados.
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from mlops_pipeline.src import config
+from mlops_pipeline.src.cargar_datos import DataLoader, WatermarkStore
+from mlops_pipeline.src.columnar_cache import ColumnarCache
+
+WORK_DIR = tempfile.mkdtemp(prefix="incremental_ingestion_")
+DATA_FILE = os.path.join(WORK_DIR, "transactions.csv")
+
+
+def print_separator():
+    print("\n" + "="*70)
+
+
+def source_lines():
+    """Cabecera y filas del dataset del proyecto."""
+    with open(config.DATA_PATH, 'rb') as f:
+        lines = f.read().splitlines(keepends=True)
+    return lines[0], lines[1:]
+
+
+def write_rows(rows, mode='ab'):
+    with open(DATA_FILE, mode) as f:
+        f.writelines(rows)
+
+
+def make_loader(use_cache=True):
+    loader = DataLoader(use_cache=use_cache)
+    loader.data_path = DATA_FILE
+    loader.cache = ColumnarCache(os.path.join(WORK_DIR, "cache"))
+    loader.watermarks = WatermarkStore(os.path.join(WORK_DIR, "watermarks.json"))
+    return loader
+
+
+def full_reload():
+    """Referencia: lectura completa del archivo, sin caché."""
+    return make_loader(use_cache=False).load_data()
+
+
+def same_frame(actual, expected, align_categories=False):
+    """Compara con la referencia; las filas nuevas solo traen las categorías que contienen."""
+    if align_categories:
+        actual = actual.assign(**{col: actual[col].cat.set_categories(expected[col].cat.categories)
+                                  for col in actual.select_dtypes('category')})
+    try:
+        pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected.reset_index(drop=True))
+        return True
+    except AssertionError as e:
+        print(f"❌ Diferencias: {str(e)[:300]}")
+        return False
+
+
+def test_load_new_reads_only_appended_rows():
+    """Prueba que load_new devuelva solo las filas añadidas desde la llamada anterior."""
+    print_separator()
+    print("🔍 TEST 1: load_new lee solo las filas nuevas")
+    print_separator()
+
+    header, rows = source_lines()
+    write_rows([header] + rows[:4000], mode='wb')
+    loader = make_loader()
+    first = loader.load_new()
+
+    write_rows(rows[4000:6000])
+    second = loader.load_new()
+    third = loader.load_new()
+
+    expected = full_reload()
+    ok = (len(first) == 4000 and len(second) == 2000 and len(third) == 0
+          and same_frame(second, expected.iloc[4000:6000], align_categories=True))
+    print(f"Filas: primera={len(first)}, segunda={len(second)}, tercera={len(third)}")
+    assert ok
+
+
+def test_partial_last_row_waits():
+    """Prueba que una fila a medio escribir se lea en la siguiente llamada, completa."""
+    print_separator()
+    print("🔍 TEST 2: Fila sin salto de línea al final")
+    print_separator()
+
+    _, rows = source_lines()
+    loader = make_loader()
+    row = rows[6000]
+    write_rows([row[:10]])
+    pending = loader.load_new()
+    write_rows([row[10:]])
+    completed = loader.load_new()
+
+    expected = full_reload()
+    ok = (len(pending) == 0 and len(completed) == 1
+          and same_frame(completed, expected.iloc[[6000]], align_categories=True))
+    print(f"Filas: a medio escribir={len(pending)}, completada={len(completed)}")
+    assert ok
+
+
+def test_cache_extended_in_place():
+    """Prueba que la caché extendida coincida con una recarga completa."""
+    print_separator()
+    print("🔍 TEST 3: Caché columnar extendida en el sitio")
+    print_separator()
+
+    _, rows = source_lines()
+    loader = make_loader()
+    loader.load_data()
+    entry = loader.cache.entry_dir(DATA_FILE)
+    files_before = set(os.listdir(entry))
+
+    write_rows(rows[6001:8000])
+    extended = loader.load_data()
+    files_after = set(os.listdir(entry))
+    print(f"Filas tras extender: {len(extended):,}")
+    assert files_before == files_after and same_frame(extended, full_reload())
+
+
+def test_new_category_rewrites_codes():
+    """Prueba que una categoría nueva deje las categorías igual que una carga completa."""
+    print_separator()
+    print("🔍 TEST 4: Categoría nueva en las filas añadidas")
+    print_separator()
+
+    header, rows = source_lines()
+    columns = header.decode().strip().split(',')
+    values = rows[8000].decode().strip().split(',')
+    values[columns.index('merchant_category')] = 'aaa_new_category'
+    write_rows([(','.join(values) + '\n').encode()] + rows[8001:])
+
+    loader = make_loader()
+    extended = loader.load_data()
+    print(f"Categorías: {list(extended['merchant_category'].cat.categories)}")
+    assert same_frame(extended, full_reload())
+
+
+def test_rewritten_file_is_reloaded():
+    """Prueba que un archivo reescrito (no solo ampliado) se relea completo."""
+    print_separator()
+    print("🔍 TEST 5: Archivo reescrito")
+    print_separator()
+
+    header, rows = source_lines()
+    write_rows([header] + rows[:3000], mode='wb')
+    loader = make_loader()
+    new_rows = loader.load_new()
+    cached = loader.load_data()
+    print(f"Filas: load_new={len(new_rows)}, load_data={len(cached)}")
+    assert len(new_rows) == 3000 and same_frame(cached, full_reload())
+
+
+def test_iter_batches_invalid_values():
+    """Prueba que los lotes con valores inválidos se lean sin tipos y el resto con los declarados."""
+    print_separator()
+    print("🔍 TEST 6: iter_batches con valores inválidos")
+    print_separator()
+
+    raw = pd.read_csv(config.DATA_PATH)
+    raw['amount'] = raw['amount'].astype(object)
+    raw.loc[2500, 'amount'] = 'abc'
+    raw.loc[7000, 'customer_age'] = np.nan
+    raw.to_csv(DATA_FILE, index=False)
+
+    batches = list(make_loader(use_cache=False).iter_batches(batch_size=1000))
+    df = pd.concat(batches)
+    untyped = [batch.index[0] for batch in batches if batch['customer_age'].dtype != np.int16]
+    expected = full_reload()
+    print(f"Lotes: {len(batches)} | filas: {len(df):,} | lotes sin tipos declarados: {untyped}")
+    assert untyped == [2000, 7000] and df.index.equals(pd.RangeIndex(len(expected)))
+    assert df.loc[2500, 'amount'] == 'abc' and np.isnan(df.loc[7000, 'customer_age'])
+    numeric = pd.to_numeric(df['amount'], errors='coerce').to_numpy(dtype=np.float64)
+    reference = pd.to_numeric(expected['amount'], errors='coerce').to_numpy(dtype=np.float64)
+    assert np.allclose(numeric, reference, rtol=1e-6, equal_nan=True)
+    assert (df['merchant_category'].astype(str).to_numpy() == expected['merchant_category'].astype(str).to_numpy()).all()
+
+
+def run_all_tests():
+    """Ejecuta todos los tests (en orden: cada uno parte del archivo que deja el anterior)."""
+    print("\n" + "="*70)
+    print("🚀 INICIANDO PRUEBAS DE INGESTA INCREMENTAL")
+    print("="*70)
+    print(f"Directorio temporal: {WORK_DIR}")
+    
+    tests = [
+        ("load_new lee solo filas nuevas", test_load_new_reads_only_appended_rows),
+        ("Fila a medio escribir", test_partial_last_row_waits),
+        ("Caché extendida vs recarga completa", test_cache_extended_in_place),
+        ("Categoría nueva", test_new_category_rewrites_codes),
+        ("Archivo reescrito", test_rewritten_file_is_reloaded),
+        ("iter_batches con valores inválidos", test_iter_batches_invalid_values)
+    ]
+    
+    results = []
+    try:
+        for name, test_func in tests:
+            try:
+                test_func()
+                results.append((name, True))
+            except AssertionError:
+                print(f"\n❌ Comprobación fallida en test '{name}'")
+                results.append((name, False))
+            except Exception as e:
+                print(f"\n❌ Error en test '{name}': {str(e)}")
+                results.append((name, False))
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+    
+    # Resumen final
+    print_separator()
+    print("📊 RESUMEN DE PRUEBAS")
+    print_separator()
+    
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    
+    for name, result in results:
+        status = "✅ PASÓ" if result else "❌ FALLÓ"
+        print(f"{status} - {name}")
+    
+    print_separator()
+    print(f"Resultado: {passed}/{total} tests pasaron ({passed/total*100:.1f}%)")
+    
+    if passed == total:
+        print("🎉 ¡TODOS LOS TESTS PASARON EXITOSAMENTE!")
+    else:
+        print(f"⚠️  {total - passed} test(s) fallaron")
+    
+    print_separator()
+    return passed == total
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_all_tests() else 1)
@@ -0,0 +1,195 @@
+"""
+Script de prueba del reentrenamiento incremental.
+Verifica que XGBoost continúe el booster existente con n_estimators coherente, la
+puerta de promoción y que al promover se actualicen el modelo, la cascada y el
+modelo de respaldo exportados con el modelo anterior.
+"""
+
+import functools
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import xgboost as xgb
+from sklearn.linear_model import LogisticRegression
+
+from mlops_pipeline.src import config
+from mlops_pipeline.src.artifacts import save_artifact, load_artifact, read_artifact_metadata, artifact_checksum
+from mlops_pipeline.src.cargar_datos import DataLoader
+from mlops_pipeline.src.cascade import CascadeClassifier, calibrate_band
+from mlops_pipeline.src.ft_engineering import FeatureEngineer
+from mlops_pipeline.src.incremental import IncrementalTrainer, continue_training
+from mlops_pipeline.src.model_deploy import _stale_reason
+
+WORK_DIR = tempfile.mkdtemp(prefix="incremental_training_")
+PATHS = {name: os.path.join(WORK_DIR, f"{name}.joblib")
+         for name in ('model', 'preprocessor', 'cascade', 'fallback')}
+BASE_ROUNDS = 20
+
+
+def print_separator():
+    print("\n" + "="*70)
+
+
+@functools.lru_cache(maxsize=None)
+def prepare_deployment():
+    """
+    Entrena y exporta un despliegue de prueba con las primeras filas del dataset:
+    preprocesador, XGBoost, cascada y modelo de respaldo. Devuelve las filas restantes.
+    Se ejecuta una sola vez: los tests comparten el despliegue.
+    """
+    df = DataLoader(use_cache=False).load_data()
+    base, new = df.iloc[:6000], df.iloc[6000:]
+    engineer = FeatureEngineer(random_state=config.RANDOM_STATE)
+    features = engineer.create_features(base)
+    X_raw = features.drop(config.TARGET_VARIABLE, axis=1)
+    y = features[config.TARGET_VARIABLE]
+    preprocessor = engineer._create_preprocessor(X_raw).fit(X_raw)
+    X = preprocessor.transform(X_raw)
+    save_artifact(preprocessor, PATHS['preprocessor'])
+
+    model = xgb.XGBClassifier(n_estimators=BASE_ROUNDS, max_depth=3, random_state=config.RANDOM_STATE).fit(X, y)
+    save_artifact(model, PATHS['model'], metadata={'model_name': 'XGBoost', 'boosting_rounds': BASE_ROUNDS})
+    bindings = {'preprocessor_checksum': artifact_checksum(PATHS['preprocessor'])}
+
+    first = LogisticRegression(max_iter=1000).fit(X, y)
+    band = calibrate_band(first.predict_proba(X)[:, 1], model.predict_proba(X)[:, 1], y_true=y)
+    cascade = CascadeClassifier(first, model, low=band['low'], high=band['high'], threshold=band['threshold'])
+    save_artifact(cascade, PATHS['cascade'], metadata={
+        'second_stage_checksum': artifact_checksum(PATHS['model']), **bindings
+    })
+    save_artifact(first, PATHS['fallback'], metadata={
+        'best_model_checksum': artifact_checksum(PATHS['model']), **bindings
+    })
+    return X, y, new
+
+
+def make_trainer(promotion_tolerance):
+    return IncrementalTrainer(model_path=PATHS['model'], preprocessor_path=PATHS['preprocessor'],
+                              cascade_path=PATHS['cascade'], fallback_path=PATHS['fallback'],
+                              promotion_tolerance=promotion_tolerance)
+
+
+def test_xgb_rounds_consistent():
+    """Prueba que el XGBoost continuado informe en n_estimators las rondas totales del booster."""
+    print_separator()
+    print("🔍 TEST 1: Rondas de XGBoost continuado")
+    print_separator()
+
+    X, y, _ = prepare_deployment()
+    model = load_artifact(PATHS['model'])
+    candidate = continue_training(model, X, y, xgb_rounds=5)
+    rounds = candidate.get_booster().num_boosted_rounds()
+    print(f"n_estimators={candidate.get_params()['n_estimators']} | rondas del booster={rounds}")
+    assert rounds == BASE_ROUNDS + 5 and candidate.get_params()['n_estimators'] == rounds
+
+
+def test_promotion_gate():
+    """Prueba que la puerta rechace solo caídas mayores que la tolerancia."""
+    print_separator()
+    print("🔍 TEST 2: Puerta de promoción")
+    print_separator()
+
+    trainer = make_trainer(promotion_tolerance=0.01)
+    current = {'roc_auc': 0.90, 'average_precision': 0.60}
+    within = trainer.gate(current, {'roc_auc': 0.895, 'average_precision': 0.61})
+    beyond = trainer.gate(current, {'roc_auc': 0.95, 'average_precision': 0.58})
+    print(f"Caída dentro de la tolerancia: {within} | fuera: {beyond}")
+    assert within == (True, []) and beyond == (False, ['average_precision'])
+
+
+def test_rejected_candidate_keeps_model():
+    """Prueba que un candidato rechazado no modifique ningún artefacto."""
+    print_separator()
+    print("🔍 TEST 3: Candidato rechazado")
+    print_separator()
+
+    _, _, new = prepare_deployment()
+    before = {name: artifact_checksum(path) for name, path in PATHS.items()}
+    # Tolerancia negativa: el candidato tendría que mejorar todas las métricas en más de 1
+    result = make_trainer(promotion_tolerance=-1.0).run(new)
+    after = {name: artifact_checksum(path) for name, path in PATHS.items()}
+    assert not result['promoted'] and before == after
+
+
+def test_promotion_refreshes_artifacts():
+    """Prueba que al promover se actualicen el modelo, la cascada y el respaldo."""
+    print_separator()
+    print("🔍 TEST 4: Promoción y artefactos derivados")
+    print_separator()
+
+    _, _, new = prepare_deployment()
+    result = make_trainer(promotion_tolerance=1.0).run(new)
+    header = read_artifact_metadata(PATHS['model'])['metadata']
+    model = load_artifact(PATHS['model'])
+    cascade = load_artifact(PATHS['cascade'])
+    rounds = BASE_ROUNDS + config.INCREMENTAL_XGB_ROUNDS
+    cascade_stale = _stale_reason(PATHS['cascade'], {'second_stage_checksum': PATHS['model'],
+                                                     'preprocessor_checksum': PATHS['preprocessor']})
+    fallback_stale = _stale_reason(PATHS['fallback'], {'best_model_checksum': PATHS['model'],
+                                                       'preprocessor_checksum': PATHS['preprocessor']})
+    print(f"Rondas: metadatos={header['boosting_rounds']}, n_estimators={model.get_params()['n_estimators']}, "
+          f"etapa 2 de la cascada={cascade.second_stage.get_booster().num_boosted_rounds()}")
+    print(f"Cascada: {cascade_stale or 'vigente'} | respaldo: {fallback_stale or 'vigente'}")
+    assert (result['promoted'] and header['boosting_rounds'] == rounds
+            and model.get_params()['n_estimators'] == rounds
+            and cascade.second_stage.get_booster().num_boosted_rounds() == rounds
+            and cascade_stale is None and fallback_stale is None)
+
+
+def run_all_tests():
+    """Ejecuta todos los tests (en orden: el último promueve el modelo de prueba)."""
+    print("\n" + "="*70)
+    print("🚀 INICIANDO PRUEBAS DE REENTRENAMIENTO INCREMENTAL")
+    print("="*70)
+    print(f"Directorio temporal: {WORK_DIR}")
+
+    tests = [
+        ("Rondas de XGBoost", test_xgb_rounds_consistent),
+        ("Puerta de promoción", test_promotion_gate),
+        ("Candidato rechazado", test_rejected_candidate_keeps_model),
+        ("Promoción y artefactos derivados", test_promotion_refreshes_artifacts)
+    ]
+
+    results = []
+    try:
+        for name, test_func in tests:
+            try:
+                test_func()
+                results.append((name, True))
+            except AssertionError:
+                print(f"\n❌ Comprobación fallida en test '{name}'")
+                results.append((name, False))
+            except Exception as e:
+                print(f"\n❌ Error en test '{name}': {str(e)}")
+                results.append((name, False))
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    # Resumen final
+    print_separator()
+    print("📊 RESUMEN DE PRUEBAS")
+    print_separator()
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+
+    for name, result in results:
+        status = "✅ PASÓ" if result else "❌ FALLÓ"
+        print(f"{status} - {name}")
+
+    print_separator()
+    print(f"Resultado: {passed}/{total} tests pasaron ({passed/total*100:.1f}%)")
+
+    if passed == total:
+        print("🎉 ¡TODOS LOS TESTS PASARON EXITOSAMENTE!")
+    else:
+        print(f"⚠️  {total - passed} test(s) fallaron")
+
+    print_separator()
+    return passed == total
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_all_tests() else 1)
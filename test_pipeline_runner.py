@@ -0,0 +1,213 @@
+"""
+Script de prueba del ejecutor del pipeline por etapas (DAG).
+Verifica la reutilización de la caché, la invalidación de una etapa y de las que
+dependen de ella al cambiar sus parámetros, las etapas forzadas, que cada ejecución
+guarde el perfil JSON de las etapas ejecutadas, que la huella del entrenamiento de
+XGBoost cubra su configuración de early stopping y que el preprocesador se guarde en
+su propia etapa aunque 'features' se lea de la caché.
+"""
+
+import os
+import json
+import shutil
+import tempfile
+
+from mlops_pipeline.src import config
+from mlops_pipeline.src.pipeline_runner import PipelineRunner, build_training_dag
+from mlops_pipeline.src.profiling import PipelineProfiler
+
+WORK_DIR = tempfile.mkdtemp(prefix="pipeline_runner_")
+CALLS = []
+
+
+def print_separator():
+    print("\n" + "="*70)
+
+
+def load(inputs):
+    CALLS.append('load')
+    return list(range(10))
+
+
+def scale(inputs):
+    CALLS.append('scale')
+    return [2 * x for x in inputs['load']]
+
+
+def total(inputs):
+    CALLS.append('total')
+    return sum(inputs['scale'])
+
+
+def make_runner(factor=2, profiler=None):
+    """DAG de prueba load → scale → total; 'factor' es un parámetro de 'scale'."""
+    runner = PipelineRunner(cache_dir=os.path.join(WORK_DIR, "cache"), max_workers=2, profiler=profiler)
+    runner.add_stage('load', load)
+    runner.add_stage('scale', scale, inputs=['load'], params={'factor': factor})
+    runner.add_stage('total', total, inputs=['scale'])
+    return runner
+
+
+def run(runner, **kwargs):
+    """Ejecuta el DAG y devuelve (salida de 'total', etapas ejecutadas)."""
+    CALLS.clear()
+    outputs = runner.run(**kwargs)
+    return outputs['total'], sorted(CALLS)
+
+
+def test_cache_reused():
+    """Prueba que una segunda ejecución sin cambios lea todas las etapas de la caché."""
+    print_separator()
+    print("🔍 TEST 1: Reutilización de la caché")
+    print_separator()
+
+    first = run(make_runner())
+    second = run(make_runner())
+    print(f"Primera: {first} | segunda: {second}")
+    assert first == (90, ['load', 'scale', 'total']) and second == (90, [])
+
+
+def test_param_change_invalidates_downstream():
+    """Prueba que cambiar un parámetro re-ejecute la etapa y sus dependientes, no las previas."""
+    print_separator()
+    print("🔍 TEST 2: Invalidación por cambio de parámetros")
+    print_separator()
+
+    changed = run(make_runner(factor=3))
+    print(f"Ejecutadas: {changed[1]}")
+    assert changed[1] == ['scale', 'total']
+
+
+def test_forced_stage():
+    """Prueba que una etapa forzada se re-ejecute a partir de las salidas cacheadas previas."""
+    print_separator()
+    print("🔍 TEST 3: Etapa forzada")
+    print_separator()
+
+    forced = run(make_runner(factor=3), force=['total'])
+    print(f"Ejecutadas: {forced[1]}")
+    assert forced == (90, ['total'])
+
+
+def test_profile_saved():
+    """Prueba que cada ejecución guarde un perfil con las etapas ejecutadas."""
+    print_separator()
+    print("🔍 TEST 4: Perfil JSON por ejecución")
+    print_separator()
+
+    profiler = PipelineProfiler(enabled=True, output_dir=os.path.join(WORK_DIR, "profiles"))
+    run(make_runner(factor=4, profiler=profiler))
+    profiles = os.listdir(profiler.output_dir)
+    with open(os.path.join(profiler.output_dir, profiles[0]), encoding='utf-8') as f:
+        stages = [stage['stage'] for stage in json.load(f)['stages']]
+    print(f"Perfiles: {profiles} | etapas: {stages}")
+    assert len(profiles) == 1 and sorted(stages) == ['scale', 'total']
+
+
+def test_xgb_config_in_fingerprint():
+    """Prueba que cambiar el early stopping de XGBoost invalide solo su entrenamiento y la CV."""
+    print_separator()
+    print("🔍 TEST 5: Configuración de XGBoost en la huella")
+    print_separator()
+
+    def fingerprints():
+        runner, _ = build_training_dag(runner=PipelineRunner(cache_dir=os.path.join(WORK_DIR, "dag")))
+        return {name: runner.fingerprint(name) for name in runner.stages}
+
+    original = config.XGB_EARLY_STOPPING_ROUNDS
+    before = fingerprints()
+    try:
+        config.XGB_EARLY_STOPPING_ROUNDS = original + 10
+        after = fingerprints()
+    finally:
+        config.XGB_EARLY_STOPPING_ROUNDS = original
+    changed = sorted(name for name in before if before[name] != after[name])
+    print(f"Etapas invalidadas: {changed}")
+    assert changed == sorted({'train:XGBoost', 'cross_validation', 'export'} & set(before))
+
+
+def test_preprocessor_stage():
+    """Prueba que 'preprocessor' guarde el archivo si falta y no reescriba uno vigente."""
+    print_separator()
+    print("🔍 TEST 6: Etapa de guardado del preprocesador")
+    print_separator()
+
+    path = os.path.join(WORK_DIR, "preprocessor.joblib")
+    original = config.PREPROCESSOR_PATH
+    config.PREPROCESSOR_PATH = path
+    try:
+        runs, checksums = [], []
+        # Sin archivo, con el archivo vigente y tras borrarlo (features ya en caché)
+        for remove in (False, True, False):
+            runner, trainer = build_training_dag(runner=PipelineRunner(cache_dir=os.path.join(WORK_DIR, "dag")))
+            trainer.loader.use_cache = False
+            output = runner.run(['preprocessor'])['preprocessor']
+            status = {record['stage']: record['status'] for record in runner.records}
+            runs.append((status['features'], output['saved']))
+            checksums.append(output['checksum'])
+            if remove:
+                os.remove(path)
+        exists = os.path.exists(path)
+    finally:
+        config.PREPROCESSOR_PATH = original
+    print(f"(features, guardado): {runs}")
+    assert runs == [('ejecutada', True), ('caché', False), ('caché', True)] and exists
+    assert checksums[0] == checksums[1]
+
+
+def run_all_tests():
+    """Ejecuta todos los tests (en orden: cada uno parte de la caché que deja el anterior)."""
+    print("\n" + "="*70)
+    print("🚀 INICIANDO PRUEBAS DEL DAG DEL PIPELINE")
+    print("="*70)
+
+    tests = [
+        ("Reutilización de la caché", test_cache_reused),
+        ("Invalidación por parámetros", test_param_change_invalidates_downstream),
+        ("Etapa forzada", test_forced_stage),
+        ("Perfil por ejecución", test_profile_saved),
+        ("Configuración de XGBoost en la huella", test_xgb_config_in_fingerprint),
+        ("Etapa de guardado del preprocesador", test_preprocessor_stage)
+    ]
+
+    results = []
+    try:
+        for name, test_func in tests:
+            try:
+                test_func()
+                results.append((name, True))
+            except AssertionError:
+                print(f"\n❌ Comprobación fallida en test '{name}'")
+                results.append((name, False))
+            except Exception as e:
+                print(f"\n❌ Error en test '{name}': {str(e)}")
+                results.append((name, False))
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    # Resumen final
+    print_separator()
+    print("📊 RESUMEN DE PRUEBAS")
+    print_separator()
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+
+    for name, result in results:
+        status = "✅ PASÓ" if result else "❌ FALLÓ"
+        print(f"{status} - {name}")
+
+    print_separator()
+    print(f"Resultado: {passed}/{total} tests pasaron ({passed/total*100:.1f}%)")
+
+    if passed == total:
+        print("🎉 ¡TODOS LOS TESTS PASARON EXITOSAMENTE!")
+    else:
+        print(f"⚠️  {total - passed} test(s) fallaron")
+
+    print_separator()
+    return passed == total
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_all_tests() else 1)
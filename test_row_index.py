@@ -0,0 +1,168 @@
+"""
+Script de prueba del índice de filas por offset.
+Verifica que las lecturas por rango y por filas sueltas coincidan con pandas, que el
+muestreo estratificado conserve la tasa de fraude, que el índice se abra mapeado en
+memoria y que se actualice con las filas añadidas (incluida una fila a medio escribir).
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from mlops_pipeline.src import config
+from mlops_pipeline.src.row_index import RowIndex
+
+WORK_DIR = tempfile.mkdtemp(prefix="row_index_")
+DATA_FILE = os.path.join(WORK_DIR, "transactions.csv")
+
+
+def print_separator():
+    print("\n" + "="*70)
+
+
+def source_lines():
+    """Cabecera y filas del dataset del proyecto."""
+    with open(config.DATA_PATH, 'rb') as f:
+        lines = f.read().splitlines(keepends=True)
+    return lines[0], lines[1:]
+
+
+def write_rows(rows, mode='ab'):
+    with open(DATA_FILE, mode) as f:
+        f.writelines(rows)
+
+
+def make_index():
+    return RowIndex(DATA_FILE, index_dir=os.path.join(WORK_DIR, "index")).update()
+
+
+def same_rows(actual, expected):
+    try:
+        pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected.reset_index(drop=True))
+        return True
+    except AssertionError as e:
+        print(f"❌ Diferencias: {str(e)[:300]}")
+        return False
+
+
+def test_reads_match_pandas():
+    """Prueba que read_range y read_rows devuelvan las mismas filas que pandas."""
+    print_separator()
+    print("🔍 TEST 1: Lecturas por rango y por filas vs pandas")
+    print_separator()
+
+    header, rows = source_lines()
+    write_rows([header] + rows[:5000], mode='wb')
+    index = make_index()
+    expected = pd.read_csv(DATA_FILE)
+    picked = np.random.default_rng(0).choice(len(expected), size=300, replace=False)
+    by_range = index.read_range(1200, 1800)
+    by_rows = index.read_rows(picked)
+    print(f"Filas indexadas: {index.n_rows} | rango: {len(by_range)} | sueltas: {len(by_rows)}")
+    assert (index.n_rows == 5000 and same_rows(by_range, expected.iloc[1200:1800])
+            and same_rows(by_rows, expected.iloc[np.sort(picked)])
+            and list(by_rows.index) == sorted(picked))
+
+
+def test_index_is_mapped():
+    """Prueba que al reabrir el índice los offsets y etiquetas se mapeen en lugar de leerse."""
+    print_separator()
+    print("🔍 TEST 2: Índice mapeado en memoria")
+    print_separator()
+
+    index = make_index()
+    print(f"offsets: {type(index.offsets).__name__} | labels: {type(index.labels).__name__}")
+    assert isinstance(index.offsets, np.memmap) and isinstance(index.labels, np.memmap)
+
+
+def test_stratified_sample():
+    """Prueba que la muestra estratificada conserve la tasa de fraude del archivo."""
+    print_separator()
+    print("🔍 TEST 3: Muestra estratificada")
+    print_separator()
+
+    index = make_index()
+    sample = index.sample(n=1000, stratify=True, random_state=0)
+    target = config.TARGET_VARIABLE
+    rate, expected = sample[target].mean(), pd.read_csv(DATA_FILE)[target].mean()
+    print(f"Tasa de fraude: muestra {rate:.4f} | archivo {expected:.4f}")
+    assert len(sample) == 1000 and abs(rate - expected) <= 1 / 1000
+
+
+def test_update_with_appended_rows():
+    """Prueba la actualización con filas nuevas y con una última fila sin salto de línea."""
+    print_separator()
+    print("🔍 TEST 4: Actualización con filas añadidas")
+    print_separator()
+
+    _, rows = source_lines()
+    index = make_index()
+    write_rows(rows[5000:6000] + [rows[6000].rstrip(b'\r\n')])
+    partial = index.update()
+    partial_rows = partial.n_rows
+    write_rows([b'\n'] + rows[6001:7000])
+    index.update()
+    expected = pd.read_csv(DATA_FILE)
+    print(f"Filas: con fila a medio escribir {partial_rows} | final {index.n_rows}")
+    assert (partial_rows == 6001 and index.n_rows == len(expected) == 7000
+            and same_rows(index.read_range(4990, 7000), expected.iloc[4990:7000]))
+
+
+def run_all_tests():
+    """Ejecuta todos los tests (en orden: cada uno parte del archivo que deja el anterior)."""
+    print("\n" + "="*70)
+    print("🚀 INICIANDO PRUEBAS DEL ÍNDICE DE FILAS")
+    print("="*70)
+    print(f"Directorio temporal: {WORK_DIR}")
+
+    tests = [
+        ("Lecturas vs pandas", test_reads_match_pandas),
+        ("Índice mapeado en memoria", test_index_is_mapped),
+        ("Muestra estratificada", test_stratified_sample),
+        ("Actualización con filas añadidas", test_update_with_appended_rows)
+    ]
+
+    results = []
+    try:
+        for name, test_func in tests:
+            try:
+                test_func()
+                results.append((name, True))
+            except AssertionError:
+                print(f"\n❌ Comprobación fallida en test '{name}'")
+                results.append((name, False))
+            except Exception as e:
+                print(f"\n❌ Error en test '{name}': {str(e)}")
+                results.append((name, False))
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    # Resumen final
+    print_separator()
+    print("📊 RESUMEN DE PRUEBAS")
+    print_separator()
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+
+    for name, result in results:
+        status = "✅ PASÓ" if result else "❌ FALLÓ"
+        print(f"{status} - {name}")
+
+    print_separator()
+    print(f"Resultado: {passed}/{total} tests pasaron ({passed/total*100:.1f}%)")
+
+    if passed == total:
+        print("🎉 ¡TODOS LOS TESTS PASARON EXITOSAMENTE!")
+    else:
+        print(f"⚠️  {total - passed} test(s) fallaron")
+
+    print_separator()
+    return passed == total
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_all_tests() else 1)
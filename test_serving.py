@@ -0,0 +1,238 @@
+"""
+Script de prueba de los modos de scoring de la API.
+Verifica la calibración de la banda de la cascada, la planificación de peticiones con
+deadline y que la API descarte una cascada o un modelo de respaldo que no correspondan
+al mejor modelo y al preprocesador actuales.
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+
+from mlops_pipeline.src import config
+from mlops_pipeline.src import model_deploy
+from mlops_pipeline.src.artifacts import save_artifact, artifact_checksum
+from mlops_pipeline.src.cascade import CascadeClassifier, calibrate_band
+from mlops_pipeline.src.latency import LatencyTracker
+from mlops_pipeline.src.model_deploy import _stale_reason
+from mlops_pipeline.src.model_training_evaluation import ModelTrainer
+
+WORK_DIR = tempfile.mkdtemp(prefix="serving_")
+RNG = np.random.default_rng(0)
+
+
+def print_separator():
+    print("\n" + "="*70)
+
+
+class ColumnModel:
+    """Modelo de prueba: la probabilidad de fraude es una columna de X."""
+
+    def __init__(self, column):
+        self.column = column
+
+    def predict_proba(self, X):
+        proba = X[:, self.column]
+        return np.column_stack([1 - proba, proba])
+
+
+def make_artifacts(seed=0):
+    """Guarda un mejor modelo y un preprocesador de prueba y devuelve sus rutas."""
+    X, y = make_classification(n_samples=300, n_features=5, random_state=seed)
+    best_path = os.path.join(WORK_DIR, "best_model.joblib")
+    preprocessor_path = os.path.join(WORK_DIR, "preprocessor.joblib")
+    save_artifact(LogisticRegression(C=1.0 + seed).fit(X, y), best_path)
+    save_artifact({'preprocessor': seed}, preprocessor_path)
+    return best_path, preprocessor_path
+
+
+def test_cascade_band_calibration():
+    """Prueba que la cascada calibrada respete el desacuerdo máximo con el modelo caro."""
+    print_separator()
+    print("🔍 TEST 1: Calibración de la banda de la cascada")
+    print_separator()
+
+    y = (RNG.random(20000) < 0.1).astype(int)
+    second = np.clip(0.6 * y + RNG.normal(0.2, 0.15, len(y)), 0, 1)
+    first = np.clip(second + RNG.normal(0, 0.1, len(y)), 0, 1)
+    band = calibrate_band(first, second, y_true=y, threshold=0.5, max_disagreement=0.01)
+
+    cascade = CascadeClassifier(ColumnModel(0), ColumnModel(1), low=band['low'], high=band['high'],
+                                threshold=0.5)
+    X = np.column_stack([first, second])
+    proba, stage = cascade.predict_proba_with_stage(X)
+    disagreement = ((proba >= 0.5) != (second >= 0.5)).mean()
+    print(f"Banda [{band['low']:.4f}, {band['high']:.4f}) | etapa 2: {(stage == 2).mean():.1%} | "
+          f"desacuerdo: {disagreement:.2%}")
+    assert (disagreement <= 0.01 and np.isclose(disagreement, band['disagreement'])
+            and np.isclose((stage == 2).mean(), band['second_stage_fraction'])
+            and band['second_stage_fraction'] < 0.5)
+
+
+def test_stale_cascade_rejected():
+    """Prueba que la API descarte una cascada de un mejor modelo o preprocesador anterior."""
+    print_separator()
+    print("🔍 TEST 2: Cascada de una ejecución anterior")
+    print_separator()
+
+    best_path, preprocessor_path = make_artifacts(seed=0)
+    cascade_path = os.path.join(WORK_DIR, "cascade_model.joblib")
+    bindings = {'second_stage_checksum': best_path, 'preprocessor_checksum': preprocessor_path}
+    save_artifact({'cascade': 0}, cascade_path, metadata={
+        'second_stage_checksum': artifact_checksum(best_path),
+        'preprocessor_checksum': artifact_checksum(preprocessor_path)
+    })
+    current = _stale_reason(cascade_path, bindings)
+
+    make_artifacts(seed=1)  # Nuevo entrenamiento: cambian el mejor modelo y el preprocesador
+    stale = _stale_reason(cascade_path, bindings)
+    save_artifact({'cascade': 0}, cascade_path)
+    legacy = _stale_reason(cascade_path, bindings)
+    print(f"Actual: {current} | tras reentrenar: {stale} | sin checksums: {legacy}")
+    assert current is None and stale is not None and legacy is not None
+
+
+def test_skipped_cascade_removed():
+    """Prueba que omitir la cascada elimine la de una ejecución anterior."""
+    print_separator()
+    print("🔍 TEST 3: Cascada omitida elimina la anterior")
+    print_separator()
+
+    cascade_path = os.path.join(WORK_DIR, "cascade_model.joblib")
+    save_artifact({'cascade': 0}, cascade_path)
+    trainer = ModelTrainer(cv_folds=1)
+    trainer.models = {config.CASCADE_FIRST_STAGE: LogisticRegression()}
+    trainer.best_model_name = config.CASCADE_FIRST_STAGE
+    band = trainer.save_cascade(path=cascade_path)
+    assert band is None and not os.path.exists(cascade_path)
+
+
+def test_deadline_planning():
+    """Prueba la elección entre modelo principal, respaldo y lote parcial según el deadline."""
+    print_separator()
+    print("🔍 TEST 4: Planificación con deadline")
+    print_separator()
+
+    # Principal: 2 ms + 0.1 ms/fila; respaldo: 0.5 ms + 0.01 ms/fila (margen de seguridad 1.2)
+    tracker = LatencyTracker()
+    tracker.seed('Principal', {'single_p50_ms': 2.0, 'batch_rows_per_s': 10000})
+    tracker.seed('Respaldo', {'single_p50_ms': 0.5, 'batch_rows_per_s': 100000})
+    model_deploy.latency_tracker = tracker
+    model_deploy.model_name, model_deploy.fallback_name = 'Principal', 'Respaldo'
+    model_deploy.fallback_model = ColumnModel(0)
+
+    plans = {
+        'sin deadline': model_deploy._plan(1000, None, 0.0),
+        'principal llega': model_deploy._plan(100, 20.0, 0.0),
+        'solo respaldo': model_deploy._plan(1000, 20.0, 0.0),
+        'lote parcial': model_deploy._plan(10000, 20.0, 0.0)
+    }
+    model_deploy.fallback_model = None
+    plans['sin respaldo'] = model_deploy._plan(1000, 20.0, 0.0)
+    for case, plan in plans.items():
+        print(f"  {case:<16} respaldo={plan[0]} filas={plan[1]}")
+    # Lote parcial: (20 / 1.2 - 0.5) / 0.01 = 1616 filas
+    assert plans == {
+        'sin deadline': (False, 1000),
+        'principal llega': (False, 100),
+        'solo respaldo': (True, 1000),
+        'lote parcial': (True, 1616),
+        'sin respaldo': (False, 146)
+    }
+
+
+def test_stale_fallback_rejected():
+    """Prueba que la API descarte un modelo de respaldo de un entrenamiento anterior."""
+    print_separator()
+    print("🔍 TEST 5: Modelo de respaldo de una ejecución anterior")
+    print_separator()
+
+    best_path, preprocessor_path = make_artifacts(seed=0)
+    fallback_path = os.path.join(WORK_DIR, "fallback_model.joblib")
+    bindings = {'best_model_checksum': best_path, 'preprocessor_checksum': preprocessor_path}
+    save_artifact(ColumnModel(0), fallback_path, metadata={
+        'best_model_checksum': artifact_checksum(best_path),
+        'preprocessor_checksum': artifact_checksum(preprocessor_path)
+    })
+    current = _stale_reason(fallback_path, bindings)
+    make_artifacts(seed=1)
+    stale = _stale_reason(fallback_path, bindings)
+    print(f"Actual: {current} | tras reentrenar: {stale}")
+    assert current is None and stale is not None
+
+
+def test_skipped_fallback_removed():
+    """Prueba que omitir el respaldo (el mejor modelo es el más rápido) elimine el anterior."""
+    print_separator()
+    print("🔍 TEST 6: Respaldo omitido elimina el anterior")
+    print_separator()
+
+    fallback_path = os.path.join(WORK_DIR, "fallback_model.joblib")
+    save_artifact(ColumnModel(0), fallback_path)
+    trainer = ModelTrainer(cv_folds=1)
+    trainer.best_model_name = 'Rápido'
+    trainer.latency = {'Rápido': {'single_p99_ms': 0.1}, 'Lento': {'single_p99_ms': 5.0}}
+    name = trainer.save_fallback_model(path=fallback_path)
+    assert name is None and not os.path.exists(fallback_path)
+
+
+def run_all_tests():
+    """Ejecuta todos los tests."""
+    print("\n" + "="*70)
+    print("🚀 INICIANDO PRUEBAS DE LOS MODOS DE SCORING")
+    print("="*70)
+
+    tests = [
+        ("Calibración de la cascada", test_cascade_band_calibration),
+        ("Cascada desactualizada", test_stale_cascade_rejected),
+        ("Cascada omitida", test_skipped_cascade_removed),
+        ("Planificación con deadline", test_deadline_planning),
+        ("Respaldo desactualizado", test_stale_fallback_rejected),
+        ("Respaldo omitido", test_skipped_fallback_removed)
+    ]
+
+    results = []
+    try:
+        for name, test_func in tests:
+            try:
+                test_func()
+                results.append((name, True))
+            except AssertionError:
+                print(f"\n❌ Comprobación fallida en test '{name}'")
+                results.append((name, False))
+            except Exception as e:
+                print(f"\n❌ Error en test '{name}': {str(e)}")
+                results.append((name, False))
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    # Resumen final
+    print_separator()
+    print("📊 RESUMEN DE PRUEBAS")
+    print_separator()
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+
+    for name, result in results:
+        status = "✅ PASÓ" if result else "❌ FALLÓ"
+        print(f"{status} - {name}")
+
+    print_separator()
+    print(f"Resultado: {passed}/{total} tests pasaron ({passed/total*100:.1f}%)")
+
+    if passed == total:
+        print("🎉 ¡TODOS LOS TESTS PASARON EXITOSAMENTE!")
+    else:
+        print(f"⚠️  {total - passed} test(s) fallaron")
+
+    print_separator()
+    return passed == total
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_all_tests() else 1)
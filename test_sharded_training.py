@@ -0,0 +1,158 @@
+"""
+Script de prueba del entrenamiento por shards.
+Verifica que los shards sean disjuntos y estratificados, que el bosque combinado tenga
+exactamente los árboles configurados, que la regresión logística combinada promedie
+los coeficientes ponderados por filas, que el modelo combinado sea comparable al
+entrenado con todas las filas y que un backend sin map() no pueda instanciarse.
+"""
+
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+
+from mlops_pipeline.src.sharded_training import (ShardedTrainer, ShardBackend, LocalProcessBackend,
+                                                 make_shards, merge_models)
+
+X, y = make_classification(n_samples=3000, n_features=10, weights=[0.9], random_state=0)
+X_TEST, Y_TEST = X[2400:], y[2400:]
+X, y = X[:2400], y[:2400]
+
+
+def print_separator():
+    print("\n" + "="*70)
+
+
+def make_trainer(n_shards):
+    return ShardedTrainer(n_shards=n_shards, backend=LocalProcessBackend(n_jobs=1), random_state=0)
+
+
+def test_shards_partition():
+    """Prueba que los shards cubran todas las filas una sola vez y conserven la tasa de positivos."""
+    print_separator()
+    print("🔍 TEST 1: Partición estratificada en shards")
+    print_separator()
+
+    shards = make_shards(y, 3, random_state=0)
+    rates = [y[idx].mean() for idx in shards]
+    print(f"Filas por shard: {[len(idx) for idx in shards]} | tasa de positivos: {np.round(rates, 3)}")
+    assert (np.array_equal(np.sort(np.concatenate(shards)), np.arange(len(y)))
+            and max(rates) - min(rates) < 0.01)
+
+
+def test_forest_tree_count():
+    """Prueba que el bosque combinado tenga exactamente n_estimators árboles."""
+    print_separator()
+    print("🔍 TEST 2: Árboles del bosque combinado")
+    print_separator()
+
+    counts = {}
+    for n_estimators, n_shards in [(100, 3), (10, 4), (6, 6)]:
+        model = RandomForestClassifier(n_estimators=n_estimators, max_depth=4, random_state=0)
+        merged = make_trainer(n_shards).fit(model, X, y)
+        counts[(n_estimators, n_shards)] = (len(merged.estimators_), merged.n_estimators)
+        print(f"  {n_estimators} árboles en {n_shards} shards → {len(merged.estimators_)}")
+    assert all(c == (n, n) for (n, _), c in counts.items())
+
+
+def test_logistic_weighted_average():
+    """Prueba que la regresión logística combinada sea el promedio ponderado por filas."""
+    print_separator()
+    print("🔍 TEST 3: Promedio ponderado de la regresión logística")
+    print_separator()
+
+    models = [LogisticRegression().fit(X[:600], y[:600]), LogisticRegression().fit(X[600:], y[600:])]
+    merged = merge_models(models, weights=[600, 1800])
+    expected = 0.25 * models[0].coef_ + 0.75 * models[1].coef_
+    print(f"Coeficientes combinados (3 primeros): {np.round(merged.coef_[0, :3], 4)}")
+    assert (np.allclose(merged.coef_, expected)
+            and np.allclose(merged.intercept_, 0.25 * models[0].intercept_ + 0.75 * models[1].intercept_))
+
+
+def test_merged_model_quality():
+    """Prueba que el modelo combinado tenga un ROC-AUC cercano al entrenado sin shards."""
+    print_separator()
+    print("🔍 TEST 4: Calidad del modelo combinado")
+    print_separator()
+
+    for model in (LogisticRegression(max_iter=1000),
+                  RandomForestClassifier(n_estimators=60, max_depth=6, random_state=0)):
+        full = roc_auc_score(Y_TEST, model.fit(X, y).predict_proba(X_TEST)[:, 1])
+        merged = make_trainer(3).fit(model, X, y)
+        sharded = roc_auc_score(Y_TEST, merged.predict_proba(X_TEST)[:, 1])
+        print(f"  {type(model).__name__:<24} completo {full:.4f} | shards {sharded:.4f}")
+        assert sharded > full - 0.03
+
+
+def test_backend_interface():
+    """Prueba que ShardBackend sea abstracto y exija implementar map()."""
+    print_separator()
+    print("🔍 TEST 5: Interfaz de backend")
+    print_separator()
+
+    class IncompleteBackend(ShardBackend):
+        pass
+
+    for backend_cls in (ShardBackend, IncompleteBackend):
+        try:
+            backend_cls()
+        except TypeError as e:
+            print(f"  {backend_cls.__name__}: {e}")
+        else:
+            raise AssertionError(f"{backend_cls.__name__} no debería poder instanciarse")
+    assert isinstance(LocalProcessBackend(n_jobs=1), ShardBackend)
+
+
+def run_all_tests():
+    """Ejecuta todos los tests."""
+    print("\n" + "="*70)
+    print("🚀 INICIANDO PRUEBAS DE ENTRENAMIENTO POR SHARDS")
+    print("="*70)
+
+    tests = [
+        ("Partición en shards", test_shards_partition),
+        ("Árboles del bosque combinado", test_forest_tree_count),
+        ("Promedio de la regresión logística", test_logistic_weighted_average),
+        ("Calidad del modelo combinado", test_merged_model_quality),
+        ("Interfaz de backend", test_backend_interface)
+    ]
+
+    results = []
+    for name, test_func in tests:
+        try:
+            test_func()
+            results.append((name, True))
+        except AssertionError:
+            print(f"\n❌ Comprobación fallida en test '{name}'")
+            results.append((name, False))
+        except Exception as e:
+            print(f"\n❌ Error en test '{name}': {str(e)}")
+            results.append((name, False))
+
+    # Resumen final
+    print_separator()
+    print("📊 RESUMEN DE PRUEBAS")
+    print_separator()
+
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+
+    for name, result in results:
+        status = "✅ PASÓ" if result else "❌ FALLÓ"
+        print(f"{status} - {name}")
+
+    print_separator()
+    print(f"Resultado: {passed}/{total} tests pasaron ({passed/total*100:.1f}%)")
+
+    if passed == total:
+        print("🎉 ¡TODOS LOS TESTS PASARON EXITOSAMENTE!")
+    else:
+        print(f"⚠️  {total - passed} test(s) fallaron")
+
+    print_separator()
+    return passed == total
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if run_all_tests() else 1)